@@ -0,0 +1,38 @@
+"""Add line_items_count to inventory_item_masters
+
+Revision ID: 1a77162a9c81
+Revises: c5d814f88329
+Create Date: 2025-07-02 10:14:37.205113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '1a77162a9c81'
+down_revision = 'c5d814f88329'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'inventory_item_masters',
+        sa.Column('line_items_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # One-time backfill from the active line items
+    op.execute("""
+        UPDATE inventory_item_masters AS m
+        SET line_items_count = c.line_items_count
+        FROM (
+            SELECT inventory_item_master_id, COUNT(*) AS line_items_count
+            FROM line_items
+            WHERE is_active = true
+            GROUP BY inventory_item_master_id
+        ) AS c
+        WHERE c.inventory_item_master_id = m.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('inventory_item_masters', 'line_items_count')
@@ -0,0 +1,36 @@
+"""Add (sort column, id) indexes for seek pagination
+
+Revision ID: 4b9e2d7c1f3a
+Revises: 1a77162a9c81
+Create Date: 2025-07-03 09:21:48.613402
+
+"""
+from alembic import op
+
+revision = '4b9e2d7c1f3a'
+down_revision = '1a77162a9c81'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('warehouse_name_id_idx', 'warehouses', ['name', 'id']),
+    ('warehouse_label_id_idx', 'warehouses', ['label', 'id']),
+    ('warehouse_created_at_id_idx', 'warehouses', ['created_at', 'id']),
+    ('packaging_name_id_idx', 'item_packaging', ['name', 'id']),
+    ('packaging_label_id_idx', 'item_packaging', ['label', 'id']),
+    ('packaging_unit_id_idx', 'item_packaging', ['unit', 'id']),
+    ('packaging_created_at_id_idx', 'item_packaging', ['created_at', 'id']),
+    ('uom_name_id_idx', 'unit_of_measurement', ['name', 'id']),
+    ('uom_abbreviation_id_idx', 'unit_of_measurement', ['abbreviation', 'id']),
+    ('uom_created_at_id_idx', 'unit_of_measurement', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,25 @@
+"""Add (item_sub_category_id, is_active) index to inventory_item_masters
+
+Revision ID: 7c3f5a1e9b20
+Revises: 4b9e2d7c1f3a
+Create Date: 2025-07-03 15:02:11.480236
+
+"""
+from alembic import op
+
+revision = '7c3f5a1e9b20'
+down_revision = '4b9e2d7c1f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_inventory_item_masters_subcategory_active',
+        'inventory_item_masters',
+        ['item_sub_category_id', 'is_active'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_item_masters_subcategory_active', table_name='inventory_item_masters')
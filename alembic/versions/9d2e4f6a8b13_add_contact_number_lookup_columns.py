@@ -0,0 +1,46 @@
+"""Add normalized and reversed-digit lookup columns to contact_numbers
+
+Revision ID: 9d2e4f6a8b13
+Revises: 7c3f5a1e9b20
+Create Date: 2025-07-04 10:41:27.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '9d2e4f6a8b13'
+down_revision = '7c3f5a1e9b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('contact_numbers', sa.Column('normalized_number', sa.String(length=20), nullable=True))
+    op.add_column('contact_numbers', sa.Column('reversed_digits', sa.String(length=20), nullable=True))
+
+    # Same rules as PhoneNumber.international_format()
+    op.execute("""
+        UPDATE contact_numbers
+        SET normalized_number = CASE
+            WHEN number LIKE '+%' THEN number
+            WHEN length(number) = 10 THEN '+1' || number
+            WHEN length(number) = 11 AND number LIKE '1%' THEN '+' || number
+            ELSE number
+        END
+    """)
+    op.execute("UPDATE contact_numbers SET reversed_digits = reverse(regexp_replace(normalized_number, '\\D', '', 'g'))")
+
+    op.create_index('ix_contact_numbers_normalized_number', 'contact_numbers', ['normalized_number'])
+    op.create_index(
+        'ix_contact_numbers_reversed_digits',
+        'contact_numbers',
+        ['reversed_digits'],
+        postgresql_ops={'reversed_digits': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_numbers_reversed_digits', table_name='contact_numbers')
+    op.drop_index('ix_contact_numbers_normalized_number', table_name='contact_numbers')
+    op.drop_column('contact_numbers', 'reversed_digits')
+    op.drop_column('contact_numbers', 'normalized_number')
@@ -0,0 +1,32 @@
+"""Create collection_versions
+
+Revision ID: a6d2c9e4b571
+Revises: f8b2d6e3c419
+Create Date: 2025-07-21 09:42:18.615307
+
+One row per collection, bumped on every change to the tables its list
+responses are built from, so conditional list requests read a single row.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'a6d2c9e4b571'
+down_revision = 'f8b2d6e3c419'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(
+        "INSERT INTO collection_versions (name, version) VALUES ('inventory_items', 1), ('purchase_orders', 1), ('warehouses', 1)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
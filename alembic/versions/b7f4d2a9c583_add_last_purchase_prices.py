@@ -0,0 +1,53 @@
+"""Add last_purchase_prices
+
+Revision ID: b7f4d2a9c583
+Revises: c8e1b5d3f274
+Create Date: 2025-07-11 14:22:09.516308
+
+The latest price per item and vendor is backfilled here; afterwards it can be
+recomputed at any time with
+``python -m src.infrastructure.database.maintenance rebuild-last-purchase-prices``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'b7f4d2a9c583'
+down_revision = 'c8e1b5d3f274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('last_purchase_prices',
+    sa.Column('inventory_item_master_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('vendor_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('purchase_order_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('line_item_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('order_date', sa.Date(), nullable=False),
+    sa.Column('ordered_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('discount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('inventory_item_master_id', 'vendor_id')
+    )
+
+    op.execute("""
+        INSERT INTO last_purchase_prices (
+            inventory_item_master_id, vendor_id, purchase_order_id, line_item_id, order_date, ordered_at,
+            quantity, unit_price, discount, tax_amount
+        )
+        SELECT DISTINCT ON (li.inventory_item_master_id, po.vendor_id)
+            li.inventory_item_master_id, po.vendor_id, po.id, li.id, po.order_date, po.created_at,
+            li.quantity, li.unit_price, li.discount, li.tax_amount
+        FROM purchase_order_line_items li
+        JOIN purchase_orders po ON po.id = li.purchase_order_id
+        WHERE po.is_active AND li.is_active AND po.status <> 'CANCELLED'
+        ORDER BY li.inventory_item_master_id, po.vendor_id,
+                 po.order_date DESC, po.created_at DESC, li.created_at DESC, li.id DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('last_purchase_prices')
@@ -0,0 +1,32 @@
+"""Create dedupe_keys table for customer and vendor duplicate detection
+
+Revision ID: b81f3c5d7e24
+Revises: 9d2e4f6a8b13
+Create Date: 2025-07-04 16:12:03.905114
+
+The keys are derived in Python; fill the table for existing rows with
+``python -m src.infrastructure.database.maintenance rebuild-dedupe-keys``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'b81f3c5d7e24'
+down_revision = '9d2e4f6a8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('dedupe_keys',
+    sa.Column('entity_type', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=300), nullable=False),
+    sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.PrimaryKeyConstraint('entity_type', 'key', 'entity_id')
+    )
+    op.create_index('ix_dedupe_keys_entity', 'dedupe_keys', ['entity_type', 'entity_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dedupe_keys_entity', table_name='dedupe_keys')
+    op.drop_table('dedupe_keys')
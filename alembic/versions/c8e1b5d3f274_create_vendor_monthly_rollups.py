@@ -0,0 +1,66 @@
+"""Add purchase_orders.received_date and vendor_monthly_rollups
+
+Revision ID: c8e1b5d3f274
+Revises: a3d5f8c2e691
+Create Date: 2025-07-09 10:06:31.842657
+
+Received orders are given their last update date as received date. The
+rollups are backfilled here; afterwards they can be recomputed at any time
+with ``python -m src.infrastructure.database.maintenance rebuild-vendor-rollups``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'c8e1b5d3f274'
+down_revision = 'a3d5f8c2e691'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('purchase_orders', sa.Column('received_date', sa.Date(), nullable=True))
+    op.execute("UPDATE purchase_orders SET received_date = updated_at::date WHERE status = 'RECEIVED'")
+
+    op.create_table('vendor_monthly_rollups',
+    sa.Column('vendor_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_order_count', sa.Integer(), nullable=False),
+    sa.Column('spend', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('discount_amount', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('received_order_count', sa.Integer(), nullable=False),
+    sa.Column('lead_time_order_count', sa.Integer(), nullable=False),
+    sa.Column('total_delivery_delay_days', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('vendor_id', 'month')
+    )
+    op.create_index('ix_vendor_monthly_rollups_month', 'vendor_monthly_rollups', ['month'], unique=False)
+
+    op.execute("""
+        INSERT INTO vendor_monthly_rollups (
+            vendor_id, month, order_count, cancelled_order_count, spend, tax_amount, discount_amount,
+            received_order_count, lead_time_order_count, total_delivery_delay_days
+        )
+        SELECT
+            vendor_id,
+            date_trunc('month', order_date)::date,
+            count(*),
+            count(*) FILTER (WHERE status = 'CANCELLED'),
+            coalesce(sum(grand_total) FILTER (WHERE status <> 'CANCELLED'), 0),
+            coalesce(sum(total_tax_amount) FILTER (WHERE status <> 'CANCELLED'), 0),
+            coalesce(sum(total_discount) FILTER (WHERE status <> 'CANCELLED'), 0),
+            count(*) FILTER (WHERE status = 'RECEIVED'),
+            count(*) FILTER (WHERE status = 'RECEIVED' AND expected_delivery_date IS NOT NULL),
+            coalesce(sum(received_date - expected_delivery_date)
+                     FILTER (WHERE status = 'RECEIVED' AND expected_delivery_date IS NOT NULL), 0)
+        FROM purchase_orders
+        WHERE is_active
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendor_monthly_rollups_month', table_name='vendor_monthly_rollups')
+    op.drop_table('vendor_monthly_rollups')
+    op.drop_column('purchase_orders', 'received_date')
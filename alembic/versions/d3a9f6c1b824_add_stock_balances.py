@@ -0,0 +1,40 @@
+"""Add stock_balances
+
+Revision ID: d3a9f6c1b824
+Revises: b7f4d2a9c583
+Create Date: 2025-07-14 10:05:37.204118
+
+The balances are backfilled from line_items here; afterwards drift can be
+found and corrected with
+``python -m src.infrastructure.database.maintenance check-stock-balances --fix``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'd3a9f6c1b824'
+down_revision = 'b7f4d2a9c583'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_balances',
+    sa.Column('inventory_item_master_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', postgresql.ENUM('AVAILABLE', 'RENTED', 'SOLD', 'MAINTENANCE', 'RETIRED', 'LOST', name='inventoryitemstatus', create_type=False), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('inventory_item_master_id', 'warehouse_id', 'status')
+    )
+
+    op.execute("""
+        INSERT INTO stock_balances (inventory_item_master_id, warehouse_id, status, quantity)
+        SELECT inventory_item_master_id, warehouse_id, status, sum(quantity)
+        FROM line_items
+        WHERE is_active
+        GROUP BY inventory_item_master_id, warehouse_id, status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('stock_balances')
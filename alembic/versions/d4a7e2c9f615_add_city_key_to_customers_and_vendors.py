@@ -0,0 +1,37 @@
+"""Add normalized city_key columns to customers and vendors
+
+Revision ID: d4a7e2c9f615
+Revises: b81f3c5d7e24
+Create Date: 2025-07-06 09:12:44.530127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd4a7e2c9f615'
+down_revision = 'b81f3c5d7e24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ('customers', 'vendors'):
+        op.add_column(table, sa.Column('city_key', sa.String(length=255), nullable=True))
+        # Same rules as domain.value_objects.city.city_key()
+        op.execute(f"""
+            UPDATE {table}
+            SET city_key = NULLIF(lower(btrim(regexp_replace(city, '\\s+', ' ', 'g'))), '')
+            WHERE city IS NOT NULL
+        """)
+        op.create_index(
+            f'ix_{table}_city_key',
+            table,
+            ['city_key'],
+            postgresql_ops={'city_key': 'varchar_pattern_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table in ('vendors', 'customers'):
+        op.drop_index(f'ix_{table}_city_key', table_name=table)
+        op.drop_column(table, 'city_key')
@@ -0,0 +1,38 @@
+"""Add stock_snapshots and stock_snapshot_levels
+
+Revision ID: e5c1a8d4f937
+Revises: d3a9f6c1b824
+Create Date: 2025-07-16 09:41:52.318640
+
+Nothing is backfilled; the first
+``python -m src.infrastructure.database.maintenance take-stock-snapshot``
+seeds the snapshots from stock_balances.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'e5c1a8d4f937'
+down_revision = 'd3a9f6c1b824'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_snapshots',
+    sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('taken_at')
+    )
+    op.create_table('stock_snapshot_levels',
+    sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('inventory_item_master_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['taken_at'], ['stock_snapshots.taken_at'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('taken_at', 'inventory_item_master_id', 'warehouse_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stock_snapshot_levels')
+    op.drop_table('stock_snapshots')
@@ -0,0 +1,21 @@
+"""Index line_items by inventory item and warehouse for stock receipts
+
+Revision ID: e6b3c8d1a427
+Revises: d4a7e2c9f615
+Create Date: 2025-07-07 11:03:52.641980
+
+"""
+from alembic import op
+
+revision = 'e6b3c8d1a427'
+down_revision = 'd4a7e2c9f615'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_line_items_item_warehouse', 'line_items', ['inventory_item_master_id', 'warehouse_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_line_items_item_warehouse', table_name='line_items')
@@ -0,0 +1,33 @@
+"""Composite purchase order indexes for filtered, keyset-paged listings
+
+Revision ID: f2c9a4e7b318
+Revises: e6b3c8d1a427
+Create Date: 2025-07-08 09:41:17.305214
+
+"""
+from alembic import op
+
+revision = 'f2c9a4e7b318'
+down_revision = 'e6b3c8d1a427'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_purchase_orders_status', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_order_date', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_vendor', table_name='purchase_orders')
+    op.create_index(
+        'ix_purchase_orders_vendor_status_date', 'purchase_orders', ['vendor_id', 'status', 'order_date', 'id']
+    )
+    op.create_index('ix_purchase_orders_status_date', 'purchase_orders', ['status', 'order_date', 'id'])
+    op.create_index('ix_purchase_orders_order_date', 'purchase_orders', ['order_date', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchase_orders_order_date', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_status_date', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_vendor_status_date', table_name='purchase_orders')
+    op.create_index('ix_purchase_orders_vendor', 'purchase_orders', ['vendor_id'])
+    op.create_index('ix_purchase_orders_order_date', 'purchase_orders', ['order_date'])
+    op.create_index('ix_purchase_orders_status', 'purchase_orders', ['status'])
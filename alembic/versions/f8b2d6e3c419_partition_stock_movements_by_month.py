@@ -0,0 +1,108 @@
+"""Partition inventory_item_stock_movements by month
+
+Revision ID: f8b2d6e3c419
+Revises: e5c1a8d4f937
+Create Date: 2025-07-18 16:27:05.842913
+
+The table is rebuilt as a parent range partitioned on created_at, with one
+partition per month from the oldest movement to three months ahead, and the
+rows are copied over. The primary key becomes (id, created_at), as
+partitioning requires. The created_at index becomes a BRIN index and
+inventory_item_id gets a B-tree; both are created on every partition. Later
+months are created by
+``python -m src.infrastructure.database.maintenance create-movement-partitions``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'f8b2d6e3c419'
+down_revision = 'e5c1a8d4f937'
+branch_labels = None
+depends_on = None
+
+MOVEMENT_TYPES = ('PURCHASE', 'PURCHASE_RETURN', 'SELL', 'SELL_RETURN', 'RENT', 'RENT_RETURN', 'RECONCILIATION', 'INTER_WAREHOUSE_TRANSFER')
+COLUMNS = (
+    'id, created_at, updated_at, created_by, is_active, inventory_item_id, movement_type, '
+    'inventory_transaction_id, quantity, quantity_on_hand_before, quantity_on_hand_after, '
+    'warehouse_from_id, warehouse_to_id, notes'
+)
+
+
+def _create_movements_table(name, **kw):
+    op.create_table(name,
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+    sa.Column('inventory_item_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('movement_type', postgresql.ENUM(*MOVEMENT_TYPES, name='movementtype', create_type=False), nullable=False),
+    sa.Column('inventory_transaction_id', sa.String(length=255), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('quantity_on_hand_before', sa.Integer(), nullable=False),
+    sa.Column('quantity_on_hand_after', sa.Integer(), nullable=False),
+    sa.Column('warehouse_from_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('warehouse_to_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['inventory_item_id'], ['line_items.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_from_id'], ['warehouses.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_to_id'], ['warehouses.id'], ),
+    **kw
+    )
+
+
+def upgrade() -> None:
+    # Index and primary key names are unique per schema, so the keys and
+    # indexes of the new table are only added once the old one is gone
+    op.rename_table('inventory_item_stock_movements', 'inventory_item_stock_movements_old')
+    _create_movements_table('inventory_item_stock_movements', postgresql_partition_by='RANGE (created_at)')
+
+    op.execute("""
+        DO $$
+        DECLARE
+            month timestamp;
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months';
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')
+            INTO month FROM inventory_item_stock_movements_old;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF inventory_item_stock_movements FOR VALUES FROM (%L) TO (%L)',
+                    'inventory_item_stock_movements_p' || to_char(month, 'YYYYMM'),
+                    month::text || '+00',
+                    (month + interval '1 month')::text || '+00'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+    """)
+    op.execute(
+        f"INSERT INTO inventory_item_stock_movements ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM inventory_item_stock_movements_old"
+    )
+    op.drop_table('inventory_item_stock_movements_old')
+
+    op.create_primary_key('inventory_item_stock_movements_pkey', 'inventory_item_stock_movements', ['id', 'created_at'])
+    op.create_index(op.f('ix_inventory_item_stock_movements_id'), 'inventory_item_stock_movements', ['id'], unique=False)
+    op.create_index(op.f('ix_inventory_item_stock_movements_inventory_transaction_id'), 'inventory_item_stock_movements', ['inventory_transaction_id'], unique=False)
+    op.create_index('ix_inventory_movements_type', 'inventory_item_stock_movements', ['movement_type'], unique=False)
+    op.create_index('ix_inventory_movements_created_at', 'inventory_item_stock_movements', ['created_at'], unique=False, postgresql_using='brin')
+    op.create_index('ix_inventory_movements_inventory_item_id', 'inventory_item_stock_movements', ['inventory_item_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Rows of partitions detached since the upgrade are not brought back
+    op.rename_table('inventory_item_stock_movements', 'inventory_item_stock_movements_partitioned')
+    _create_movements_table('inventory_item_stock_movements')
+    op.execute(
+        f"INSERT INTO inventory_item_stock_movements ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM inventory_item_stock_movements_partitioned"
+    )
+    op.drop_table('inventory_item_stock_movements_partitioned')
+
+    op.create_primary_key('inventory_item_stock_movements_pkey', 'inventory_item_stock_movements', ['id'])
+    op.create_index(op.f('ix_inventory_item_stock_movements_id'), 'inventory_item_stock_movements', ['id'], unique=False)
+    op.create_index(op.f('ix_inventory_item_stock_movements_inventory_transaction_id'), 'inventory_item_stock_movements', ['inventory_transaction_id'], unique=False)
+    op.create_index('ix_inventory_movements_type', 'inventory_item_stock_movements', ['movement_type'], unique=False)
+    op.create_index('ix_inventory_movements_created_at', 'inventory_item_stock_movements', ['created_at'], unique=False)
@@ -0,0 +1,51 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ....application.services.contact_number_service import ContactNumberService
+from ....core.config.database import get_db_session
+from ....infrastructure.repositories.contact_number_repository_impl import SQLAlchemyContactNumberRepository
+from ..schemas.contact_number_schemas import ContactNumberOwnerSchema, ContactNumberResponseSchema
+
+router = APIRouter(prefix="/contact-numbers", tags=["contact-numbers"])
+
+
+def get_contact_number_service(db: Session = Depends(get_db_session)) -> ContactNumberService:
+    contact_number_repository = SQLAlchemyContactNumberRepository(db)
+    return ContactNumberService(contact_number_repository)
+
+
+@router.get("/lookup", response_model=List[ContactNumberOwnerSchema])
+async def lookup_contact_number(
+    number: str = Query(..., min_length=1, description="Full number or its last digits"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
+    contact_number_service: ContactNumberService = Depends(get_contact_number_service),
+):
+    """Find the customers and vendors whose number ends with the given digits."""
+    try:
+        owners = await contact_number_service.lookup_number_owners(number, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return [
+        ContactNumberOwnerSchema(
+            contact=ContactNumberResponseSchema(
+                id=owner.contact.id,
+                number=owner.contact.phone_number.number,
+                entity_type=owner.contact.entity_type,
+                entity_id=owner.contact.entity_id,
+                created_at=owner.contact.created_at,
+                updated_at=owner.contact.updated_at,
+                created_by=owner.contact.created_by,
+                is_active=owner.contact.is_active,
+                formatted_number=owner.contact.phone_number.formatted(),
+                international_format=owner.contact.phone_number.international_format(),
+            ),
+            owner_type=owner.owner_type,
+            owner_id=owner.contact.entity_id,
+            owner_name=owner.owner_name,
+            owner_email=owner.owner_email,
+        )
+        for owner in owners
+    ]
@@ -5,10 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ....application.services.customer_service import CustomerService
+from ....application.services.duplicate_detection_service import DuplicateDetectionService
+from ....domain.entities.contact_number import ContactNumber
+from ....domain.services.duplicate_matching import PossibleDuplicateError
 from ....domain.value_objects.address import Address
 from ....core.config.database import get_db_session
 from ....infrastructure.repositories.customer_repository_impl import SQLAlchemyCustomerRepository
 from ....infrastructure.repositories.contact_number_repository_impl import SQLAlchemyContactNumberRepository
+from ....infrastructure.repositories.duplicate_candidate_repository_impl import SQLAlchemyDuplicateCandidateRepository
 from ..schemas.customer_schemas import (
     CustomerCreateSchema,
     CustomerUpdateSchema,
@@ -19,6 +23,9 @@ from ..schemas.customer_schemas import (
     AddressSchema,
 )
 from ..schemas.contact_number_schemas import ContactNumberResponseSchema
+from ..schemas.duplicate_schemas import DuplicateClusterSchema, DuplicateMatchSchema
+from ..schemas.facet_schemas import CityFacetSchema
+from ..utils.duplicates import duplicate_cluster_to_schema, duplicate_match_to_schema, possible_duplicate_exception
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
@@ -26,7 +33,8 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 def get_customer_service(db: Session = Depends(get_db_session)) -> CustomerService:
     customer_repository = SQLAlchemyCustomerRepository(db)
     contact_number_repository = SQLAlchemyContactNumberRepository(db)
-    return CustomerService(customer_repository, contact_number_repository)
+    duplicate_detector = DuplicateDetectionService(SQLAlchemyDuplicateCandidateRepository(db), "Customer")
+    return CustomerService(customer_repository, contact_number_repository, duplicate_detector)
 
 
 def address_schema_to_value_object(address_schema: AddressSchema) -> Address:
@@ -49,16 +57,19 @@ def address_value_object_to_schema(address: Address) -> AddressSchema:
     )
 
 
-async def customer_to_response_schema(customer, customer_service: CustomerService = None) -> CustomerResponseSchema:
+async def customer_to_response_schema(
+    customer, customer_service: CustomerService = None, contacts: Optional[List[ContactNumber]] = None
+) -> CustomerResponseSchema:
     # Convert address_vo to schema if it exists
     address_vo_schema = None
     if customer.address_vo:
         address_vo_schema = address_value_object_to_schema(customer.address_vo)
     
-    # Get contact numbers if service is provided
-    contact_numbers = None
-    if customer_service:
+    # Get contact numbers if service is provided and they were not preloaded
+    if contacts is None and customer_service:
         contacts = await customer_service.get_customer_contact_numbers(customer.id)
+    contact_numbers = None
+    if contacts is not None:
         contact_numbers = [
             ContactNumberResponseSchema(
                 id=contact.id,
@@ -88,6 +99,17 @@ async def customer_to_response_schema(customer, customer_service: CustomerServic
     )
 
 
+async def customers_to_response_schemas(customers, customer_service: CustomerService) -> List[CustomerResponseSchema]:
+    """Build responses for a page of customers, loading all their contact numbers in one query."""
+    contacts_by_customer = await customer_service.get_contact_numbers_for_customers(
+        [customer.id for customer in customers]
+    )
+    return [
+        await customer_to_response_schema(customer, contacts=contacts_by_customer.get(customer.id, []))
+        for customer in customers
+    ]
+
+
 @router.post("/", response_model=CustomerResponseSchema, status_code=201)
 async def create_customer(
     customer_data: CustomerCreateSchema,
@@ -112,14 +134,50 @@ async def create_customer(
             city=customer_data.city,
             address_vo=address_vo,
             contact_numbers=contact_numbers,
-            created_by=customer_data.created_by
+            created_by=customer_data.created_by,
+            allow_duplicates=customer_data.allow_duplicates,
         )
         
         return await customer_to_response_schema(customer, customer_service)
+    except PossibleDuplicateError as e:
+        raise possible_duplicate_exception(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/duplicates/check", response_model=List[DuplicateMatchSchema])
+async def check_customer_duplicates(
+    name: str = Query(..., min_length=1, description="Customer name"),
+    email: Optional[str] = Query(None, description="Customer email"),
+    phone: Optional[List[str]] = Query(None, description="Contact numbers"),
+    exclude_id: Optional[UUID] = Query(None, description="Customer to leave out, when editing"),
+    customer_service: CustomerService = Depends(get_customer_service),
+):
+    """Existing customers that look like the one described, best match first."""
+    matches = await customer_service.find_duplicate_customers(name, email, phone, exclude_id)
+    return [duplicate_match_to_schema(match) for match in matches]
+
+
+@router.get("/duplicates/", response_model=List[DuplicateClusterSchema])
+async def list_customer_duplicate_clusters(
+    customer_service: CustomerService = Depends(get_customer_service),
+):
+    """Groups of existing customers that look like duplicates of each other."""
+    clusters = await customer_service.find_duplicate_customer_clusters()
+    return [duplicate_cluster_to_schema(cluster) for cluster in clusters]
+
+
+@router.get("/facets/cities", response_model=List[CityFacetSchema])
+async def get_customer_city_facets(
+    limit: int = Query(10, ge=1, le=100, description="Number of cities to return"),
+    prefix: Optional[str] = Query(None, description="Only cities starting with this text"),
+    customer_service: CustomerService = Depends(get_customer_service),
+):
+    """Cities with the most active customers, with counts, for building filters."""
+    facets = await customer_service.get_customer_city_facets(limit, prefix)
+    return [CityFacetSchema(city_key=facet.city_key, city=facet.city, count=facet.count) for facet in facets]
+
+
 @router.get("/{customer_id}", response_model=CustomerResponseSchema)
 async def get_customer(
     customer_id: UUID,
@@ -184,7 +242,7 @@ async def list_customers(
 ):
     customers = await customer_service.list_customers(skip=skip, limit=limit)
     
-    customer_responses = [await customer_to_response_schema(customer, customer_service) for customer in customers]
+    customer_responses = await customers_to_response_schemas(customers, customer_service)
     
     return CustomersListResponseSchema(
         customers=customer_responses,
@@ -202,7 +260,7 @@ async def search_customers(
     customer_service: CustomerService = Depends(get_customer_service),
 ):
     customers = await customer_service.search_customers(query, search_fields, limit)
-    return [await customer_to_response_schema(customer, customer_service) for customer in customers]
+    return await customers_to_response_schemas(customers, customer_service)
 
 
 @router.get("/by-email/{email}", response_model=CustomerResponseSchema)
@@ -221,10 +279,11 @@ async def get_customer_by_email(
 async def get_customers_by_city(
     city: str,
     limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of results"),
+    prefix: bool = Query(False, description="Match cities starting with the given text"),
     customer_service: CustomerService = Depends(get_customer_service),
 ):
-    customers = await customer_service.get_customers_by_city(city, limit)
-    return [await customer_to_response_schema(customer, customer_service) for customer in customers]
+    customers = await customer_service.get_customers_by_city(city, limit, prefix)
+    return await customers_to_response_schemas(customers, customer_service)
 
 
 # Contact Number Management Endpoints
@@ -1,14 +1,21 @@
+import asyncio
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
 
 from ....application.services.inventory_item_master_service import InventoryItemMasterService
 from ....core.config.database import get_db_session
 from ....infrastructure.repositories.inventory_item_master_repository_impl import SQLAlchemyInventoryItemMasterRepository
-from ....infrastructure.database.models import InventoryItemMasterModel, ItemSubCategoryModel, ItemCategoryModel, UnitOfMeasurementModel, ItemPackagingModel, LineItemModel
+from ....infrastructure.repositories.stock_balance_repository_impl import SQLAlchemyStockBalanceRepository
+from ....infrastructure.database.models import InventoryItemMasterModel
+from ....infrastructure.database.collection_versions import INVENTORY_ITEMS, collection_version
+from ....infrastructure.cache.lookup_name_cache import InventoryLookupNames, lookup_name_cache
+from ....infrastructure.cache.stats_snapshots import stats_snapshots
+from ..utils.conditional_requests import build_etag, build_collection_etag, check_not_modified
+from ..utils.single_flight import single_flight
 from ..schemas.inventory_item_master_schemas import (
     InventoryItemMasterCreateSchema,
     InventoryItemMasterUpdateSchema,
@@ -18,6 +25,9 @@ from ..schemas.inventory_item_master_schemas import (
     InventoryItemMasterQuantityUpdateSchema,
     InventoryItemMasterDimensionsUpdateSchema,
     InventoryItemMasterStatsSchema,
+    StockBalanceSchema,
+    StockOnHandSchema,
+    StockAsOfSchema,
 )
 
 router = APIRouter(prefix="/inventory-items", tags=["inventory-items"])
@@ -25,7 +35,8 @@ router = APIRouter(prefix="/inventory-items", tags=["inventory-items"])
 
 def get_inventory_item_master_service(db: Session = Depends(get_db_session)) -> InventoryItemMasterService:
     repository = SQLAlchemyInventoryItemMasterRepository(db)
-    return InventoryItemMasterService(repository)
+    stock_balance_repository = SQLAlchemyStockBalanceRepository(db)
+    return InventoryItemMasterService(repository, stock_balance_repository)
 
 
 def inventory_item_to_response_schema(inventory_item) -> InventoryItemMasterResponseSchema:
@@ -56,7 +67,11 @@ def inventory_item_to_response_schema(inventory_item) -> InventoryItemMasterResp
     )
 
 
-def inventory_model_to_response_schema(model, line_items_count: int = 0) -> InventoryItemMasterResponseSchema:
+def inventory_model_to_response_schema(
+    model,
+    lookup_names: InventoryLookupNames,
+    line_items_count: int = 0,
+) -> InventoryItemMasterResponseSchema:
     """Convert SQLAlchemy model to response schema with related names and line items count"""
     can_delete = line_items_count == 0
     
@@ -84,11 +99,8 @@ def inventory_model_to_response_schema(model, line_items_count: int = 0) -> Inve
         updated_at=model.updated_at,
         created_by=model.created_by,
         is_active=model.is_active,
-        # Related names from joined tables
-        item_category_name=model.subcategory.item_category.name if model.subcategory and model.subcategory.item_category else None,
-        item_sub_category_name=model.subcategory.name if model.subcategory else None,
-        unit_of_measurement_name=model.unit_of_measurement.name if model.unit_of_measurement else None,
-        packaging_name=model.packaging.label if model.packaging else None,
+        # Related names from the in-process lookup cache
+        **lookup_names.for_item(model.item_sub_category_id, model.unit_of_measurement_id, model.packaging_id),
         # Delete functionality fields
         line_items_count=line_items_count,
         can_delete=can_delete,
@@ -127,20 +139,53 @@ async def create_inventory_item(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def compute_inventory_item_stats(db: Session) -> dict:
+    return asyncio.run(get_inventory_item_master_service(db).get_stats())
+
+
+stats_snapshots.register(
+    "inventory_items", compute_inventory_item_stats, tables=[InventoryItemMasterModel.__tablename__]
+)
+
+
 @router.get("/stats", response_model=InventoryItemMasterStatsSchema)
 async def get_inventory_item_stats(
-    service: InventoryItemMasterService = Depends(get_inventory_item_master_service),
+    fresh: bool = Query(False, description="Recompute instead of serving the latest snapshot"),
 ):
     """Get statistics for inventory item masters"""
-    stats = await service.get_stats()
-    return InventoryItemMasterStatsSchema(**stats)
+    snapshot = await stats_snapshots.get("inventory_items", fresh=fresh)
+    return InventoryItemMasterStatsSchema(**snapshot.as_response())
+
+
+@router.get("/stock/as-of", response_model=StockAsOfSchema)
+async def get_stock_as_of(
+    as_of: datetime = Query(..., description="Point in time; without an offset it is taken as UTC"),
+    inventory_item_master_id: Optional[UUID] = Query(None, description="Only this item"),
+    warehouse_id: Optional[UUID] = Query(None, description="Only this warehouse"),
+    service: InventoryItemMasterService = Depends(get_inventory_item_master_service),
+):
+    """Stock on hand per item and warehouse at a past moment, from the nearest daily snapshot and the movements since"""
+    try:
+        stock = await service.get_stock_as_of(as_of, inventory_item_master_id, warehouse_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StockAsOfSchema.model_validate(stock)
 
 
 @router.get("/{item_id}", response_model=InventoryItemMasterResponseSchema)
 async def get_inventory_item(
     item_id: UUID,
+    request: Request,
+    response: Response,
     service: InventoryItemMasterService = Depends(get_inventory_item_master_service),
 ):
+    last_modified = await service.get_inventory_item_master_version(item_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    not_modified = check_not_modified(request, response, build_etag(item_id, last_modified), last_modified)
+    if not_modified:
+        return not_modified
+
     inventory_item = await service.get_inventory_item_master(item_id)
     if not inventory_item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
@@ -158,6 +203,25 @@ async def get_inventory_item_by_sku(
     return inventory_item_to_response_schema(inventory_item)
 
 
+@router.get("/{item_id}/stock", response_model=StockOnHandSchema)
+async def get_inventory_item_stock(
+    item_id: UUID,
+    warehouse_id: Optional[UUID] = Query(None, description="Only this warehouse"),
+    status: Optional[str] = Query(None, description="Only line items with this status, e.g. AVAILABLE"),
+    service: InventoryItemMasterService = Depends(get_inventory_item_master_service),
+):
+    """Stock on hand of an item per warehouse and status, read from the maintained balances"""
+    try:
+        balances = await service.get_stock_balances(item_id, warehouse_id, status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StockOnHandSchema(
+        inventory_item_master_id=item_id,
+        total_quantity=sum(balance.quantity for balance in balances),
+        balances=[StockBalanceSchema.model_validate(balance) for balance in balances],
+    )
+
+
 @router.put("/{item_id}", response_model=InventoryItemMasterResponseSchema)
 async def update_inventory_item(
     item_id: UUID,
@@ -203,9 +267,8 @@ async def delete_inventory_item(
         raise HTTPException(status_code=404, detail="Inventory item not found")
     
     # Check if item can be deleted (no associated line items)
-    can_delete = await service.can_delete_inventory_item_master(item_id)
-    if not can_delete:
-        line_items_count = await service.get_line_items_count(item_id)
+    line_items_count = await service.get_line_items_count(item_id)
+    if line_items_count > 0:
         raise HTTPException(
             status_code=400, 
             detail=f"Cannot delete inventory item. It has {line_items_count} associated line items. Remove all line items first."
@@ -218,32 +281,25 @@ async def delete_inventory_item(
 
 
 @router.get("/", response_model=InventoryItemMastersListResponseSchema)
+@single_flight()
 def list_inventory_items(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db_session),
 ):
-    # Subquery to get line items count for each inventory item master
-    line_items_subquery = db.query(
-        LineItemModel.inventory_item_master_id,
-        func.count(LineItemModel.id).label('line_items_count')
-    ).filter(
-        LineItemModel.is_active == True
-    ).group_by(LineItemModel.inventory_item_master_id).subquery()
-    
-    # Query with joins to get related names and line items count
-    query_result = db.query(
-        InventoryItemMasterModel,
-        func.coalesce(line_items_subquery.c.line_items_count, 0).label('line_items_count')
-    ).options(
-        joinedload(InventoryItemMasterModel.subcategory)
-        .joinedload(ItemSubCategoryModel.item_category),
-        joinedload(InventoryItemMasterModel.unit_of_measurement),
-        joinedload(InventoryItemMasterModel.packaging)
-    ).outerjoin(
-        line_items_subquery,
-        InventoryItemMasterModel.id == line_items_subquery.c.inventory_item_master_id
-    ).filter(
+    # The maintained version covers the masters and the lookup tables the names come from
+    version, last_modified = collection_version(db, INVENTORY_ITEMS)
+    not_modified = check_not_modified(
+        request, response, build_collection_etag(request, version, last_modified), last_modified
+    )
+    if not_modified:
+        return not_modified
+
+    # Related names come from the lookup cache and line_items_count is a
+    # maintained column, so the page is a single-table query
+    query_result = db.query(InventoryItemMasterModel).filter(
         InventoryItemMasterModel.is_active == True
     ).offset(skip).limit(limit).all()
     
@@ -251,10 +307,12 @@ def list_inventory_items(
     total = db.query(InventoryItemMasterModel)\
         .filter(InventoryItemMasterModel.is_active == True).count()
     
+    lookup_names = lookup_name_cache.inventory_names(db, query_result)
+
     # Convert to response schemas with related names and line items count
     item_responses = [
-        inventory_model_to_response_schema(model, line_items_count) 
-        for model, line_items_count in query_result
+        inventory_model_to_response_schema(model, lookup_names, model.line_items_count)
+        for model in query_result
     ]
     
     return InventoryItemMastersListResponseSchema(
@@ -301,6 +359,7 @@ async def list_consumables(
 
 
 @router.get("/search/", response_model=List[InventoryItemMasterResponseSchema])
+@single_flight()
 async def search_inventory_items(
     query: str = Query(..., min_length=1, description="Search query"),
     search_fields: Optional[List[str]] = Query(None, description="Fields to search in"),
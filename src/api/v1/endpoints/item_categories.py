@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional
 from uuid import UUID
 
@@ -6,6 +7,8 @@ from sqlalchemy.orm import Session
 
 from ....application.services.item_category_service import ItemCategoryService, ItemSubCategoryService
 from ....core.config.database import get_db_session
+from ....infrastructure.cache.stats_snapshots import stats_snapshots
+from ....infrastructure.database.models import ItemCategoryModel, ItemSubCategoryModel
 from ....infrastructure.repositories.item_category_repository_impl import (
     SQLAlchemyItemCategoryRepository,
     SQLAlchemyItemSubCategoryRepository
@@ -20,6 +23,9 @@ from ..schemas.item_category_schemas import (
     ItemSubCategoryResponseSchema,
     ItemSubCategoriesListResponseSchema,
     ItemCategoryWithSubcategoriesResponseSchema,
+    ItemCategoryTreeNodeSchema,
+    ItemSubCategoryTreeNodeSchema,
+    ItemCategoryTreeResponseSchema,
 )
 
 router = APIRouter(prefix="/item-categories", tags=["item-categories"])
@@ -64,6 +70,20 @@ def subcategory_to_response_schema(subcategory) -> ItemSubCategoryResponseSchema
     )
 
 
+def tree_node_to_response_schema(node) -> ItemCategoryTreeNodeSchema:
+    return ItemCategoryTreeNodeSchema(
+        **category_to_response_schema(node.category, node.active_subcategory_count).dict(),
+        item_count=node.item_count,
+        subcategories=[
+            ItemSubCategoryTreeNodeSchema(
+                **subcategory_to_response_schema(child.subcategory).dict(),
+                item_count=child.item_count,
+            )
+            for child in node.subcategories
+        ],
+    )
+
+
 # Item Category endpoints
 
 @router.post("/", response_model=ItemCategoryResponseSchema, status_code=201)
@@ -131,20 +151,33 @@ async def list_categories(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category_service: ItemCategoryService = Depends(get_category_service),
-    subcategory_service: ItemSubCategoryService = Depends(get_subcategory_service),
 ):
-    categories = await category_service.list_categories(skip=skip, limit=limit)
-    
-    # Get subcategory counts for each category
-    category_responses = []
-    for category in categories:
-        # Count active subcategories for this category
-        subcategory_count = await subcategory_service.count_subcategories_by_category(category.id)
-        category_responses.append(category_to_response_schema(category, subcategory_count))
+    tree = await category_service.get_category_tree(skip=skip, limit=limit)
+    category_responses = [
+        category_to_response_schema(node.category, node.active_subcategory_count) for node in tree
+    ]
     
     return ItemCategoriesListResponseSchema(
         categories=category_responses,
-        total=len(category_responses),
+        total=await category_service.count_categories(),
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/tree/", response_model=ItemCategoryTreeResponseSchema)
+async def get_category_tree(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    is_active: bool = Query(True, description="Whether to return only active categories and subcategories"),
+    category_service: ItemCategoryService = Depends(get_category_service),
+):
+    """Get categories with their subcategories and active item counts."""
+    tree = await category_service.get_category_tree(skip=skip, limit=limit, active_only=is_active)
+    
+    return ItemCategoryTreeResponseSchema(
+        categories=[tree_node_to_response_schema(node) for node in tree],
+        total=await category_service.count_categories(active_only=is_active),
         skip=skip,
         limit=limit,
     )
@@ -160,15 +193,11 @@ async def search_categories(
     return [category_to_response_schema(category) for category in categories]
 
 
-@router.get("/stats/overview")
-async def get_category_statistics(
-    category_service: ItemCategoryService = Depends(get_category_service),
-    subcategory_service: ItemSubCategoryService = Depends(get_subcategory_service),
-):
-    """Get comprehensive category and subcategory statistics."""
-    # Get all categories and subcategories
-    categories = await category_service.list_categories(skip=0, limit=1000)
-    subcategories = await subcategory_service.list_subcategories(skip=0, limit=1000)
+def compute_category_statistics(db: Session) -> dict:
+    # The whole tree comes back from a single query
+    tree = asyncio.run(get_category_service(db).get_category_tree())
+    categories = [node.category for node in tree]
+    subcategories = [child.subcategory for node in tree for child in node.subcategories]
     
     # Calculate statistics
     total_categories = len(categories)
@@ -177,12 +206,8 @@ async def get_category_statistics(
     
     total_subcategories = len(subcategories)
     
-    # Count categories with subcategories
-    categories_with_subcategories = 0
-    for category in categories:
-        subcategory_count = await subcategory_service.count_subcategories_by_category(category.id)
-        if subcategory_count > 0:
-            categories_with_subcategories += 1
+    # Count categories with active subcategories
+    categories_with_subcategories = len([node for node in tree if node.active_subcategory_count > 0])
     
     # Count categories/subcategories with descriptions
     categories_with_description = len([c for c in categories if c.description])
@@ -219,6 +244,22 @@ async def get_category_statistics(
     }
 
 
+stats_snapshots.register(
+    "item_categories",
+    compute_category_statistics,
+    tables=[ItemCategoryModel.__tablename__, ItemSubCategoryModel.__tablename__],
+)
+
+
+@router.get("/stats/overview")
+async def get_category_statistics(
+    fresh: bool = Query(False, description="Recompute instead of serving the latest snapshot"),
+):
+    """Get comprehensive category and subcategory statistics."""
+    snapshot = await stats_snapshots.get("item_categories", fresh=fresh)
+    return snapshot.as_response()
+
+
 @router.get("/by-name/{name}", response_model=ItemCategoryResponseSchema)
 async def get_category_by_name(
     name: str,
@@ -1,12 +1,16 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ....core.config.database import get_db_session
+from ....infrastructure.cache.stats_snapshots import stats_snapshots
+from ....infrastructure.database.models import ItemPackagingModel
 from ....infrastructure.repositories.item_packaging_repository_impl import ItemPackagingRepositoryImpl
 from ....application.services.item_packaging_service import ItemPackagingService
 from ....application.use_cases.item_packaging_use_cases import ItemPackagingUseCases
+from ..utils.pagination import paginated_response
 from ..schemas.item_packaging_schemas import (
     ItemPackaging,
     ItemPackagingCreate,
@@ -56,56 +60,36 @@ async def get_item_packaging(
 
 @router.get("/")
 async def list_item_packagings(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     page_size: int = Query(20, ge=1, le=1000, description="Number of records per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next/previous link"),
     is_active: bool = Query(True, description="Whether to return only active records"),
     search: str = Query(None, description="Search term for name or label"),
     ordering: str = Query("-created_at", description="Ordering field"),
     use_cases: ItemPackagingUseCases = Depends(get_item_packaging_use_cases),
 ):
     """List all item packagings with pagination"""
-    skip = (page - 1) * page_size
-    
-    # If search is provided, use search functionality
-    if search:
-        item_packagings = await use_cases.search_item_packagings(search, skip, page_size)
-    else:
-        item_packagings = await use_cases.list_item_packagings(skip, page_size, active_only=is_active)
-    
-    # For now, return a simple count (we'll add a proper count method later)
-    total_count = len(item_packagings)
-    
-    # Sort results based on ordering parameter
-    if ordering == "name":
-        item_packagings.sort(key=lambda x: x.name)
-    elif ordering == "-name":
-        item_packagings.sort(key=lambda x: x.name, reverse=True)
-    elif ordering == "label":
-        item_packagings.sort(key=lambda x: x.label)
-    elif ordering == "-label":
-        item_packagings.sort(key=lambda x: x.label, reverse=True)
-    elif ordering == "unit":
-        item_packagings.sort(key=lambda x: x.unit)
-    elif ordering == "-unit":
-        item_packagings.sort(key=lambda x: x.unit, reverse=True)
-    elif ordering == "created_at":
-        item_packagings.sort(key=lambda x: x.created_at)
-    elif ordering == "-created_at":
-        item_packagings.sort(key=lambda x: x.created_at, reverse=True)
-    
-    # Calculate pagination info
-    has_next = len(item_packagings) == page_size  # Simple heuristic
-    has_previous = skip > 0
-    
-    next_url = f"/api/v1/item-packaging/?page={page + 1}&page_size={page_size}&is_active={is_active}" if has_next else None
-    previous_url = f"/api/v1/item-packaging/?page={page - 1}&page_size={page_size}&is_active={is_active}" if has_previous else None
-    
-    return {
-        "count": total_count,
-        "next": next_url,
-        "previous": previous_url,
-        "results": [ItemPackagingResponse.from_orm(ip).dict() for ip in item_packagings]
-    }
+    try:
+        result = await use_cases.list_item_packagings_page(
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            active_only=is_active,
+            search=search,
+            ordering=ordering,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return paginated_response(
+        "/api/v1/item-packaging/",
+        result,
+        [ItemPackagingResponse.from_orm(ip).dict() for ip in result.items],
+        page_size=page_size,
+        is_active=is_active,
+        search=search,
+        ordering=ordering,
+    )
 
 
 @router.get("/search/", response_model=List[ItemPackagingResponse])
@@ -176,40 +160,27 @@ async def activate_item_packaging(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+def compute_packaging_stats(db: Session) -> dict:
+    stats = asyncio.run(get_item_packaging_use_cases(db).get_item_packaging_stats(recent_days=30, top_units=5))
+    return {
+        "total_packaging": stats["total"],
+        "packaging_with_remarks": stats["with_remarks"],
+        "unique_units": stats["unique_units"],
+        "recent_packaging_30_days": stats["recent"],
+        "top_units": stats["top_units"],
+    }
+
+
+stats_snapshots.register("item_packaging", compute_packaging_stats, tables=[ItemPackagingModel.__tablename__])
+
+
 @router.get("/stats/overview")
 async def get_packaging_stats(
-    use_cases: ItemPackagingUseCases = Depends(get_item_packaging_use_cases),
+    fresh: bool = Query(False, description="Recompute instead of serving the latest snapshot"),
 ):
     """Get packaging statistics for overview"""
     try:
-        # Get all active packagings to calculate stats
-        all_packagings = await use_cases.list_item_packagings(skip=0, limit=10000, active_only=True)
-        
-        total_packaging = len(all_packagings)
-        packaging_with_remarks = len([p for p in all_packagings if p.remarks and p.remarks.strip()])
-        
-        # Get unique units
-        unique_units = len(set(p.unit for p in all_packagings))
-        
-        # Get units count for top units
-        unit_counts = {}
-        for p in all_packagings:
-            unit_counts[p.unit] = unit_counts.get(p.unit, 0) + 1
-        
-        # Sort by count and get top units
-        top_units = sorted(unit_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Calculate recent packagings (30 days) - simplified for now
-        from datetime import datetime, timedelta, timezone
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        recent_packaging_30_days = len([p for p in all_packagings if p.created_at >= thirty_days_ago])
-        
-        return {
-            "total_packaging": total_packaging,
-            "packaging_with_remarks": packaging_with_remarks,
-            "unique_units": unique_units,
-            "recent_packaging_30_days": recent_packaging_30_days,
-            "top_units": top_units[:5]  # Top 5 units
-        }
+        snapshot = await stats_snapshots.get("item_packaging", fresh=fresh)
+        return snapshot.as_response()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating stats: {str(e)}")
@@ -1,8 +1,10 @@
+import codecs
+import csv
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from ....application.services.purchase_order_service import PurchaseOrderService
@@ -11,7 +13,12 @@ from ....infrastructure.repositories.purchase_order_repository_impl import SQLAl
 from ....infrastructure.repositories.purchase_order_line_item_repository_impl import SQLAlchemyPurchaseOrderLineItemRepository
 from ....infrastructure.repositories.vendor_repository_impl import SQLAlchemyVendorRepository
 from ....infrastructure.repositories.inventory_item_master_repository_impl import SQLAlchemyInventoryItemMasterRepository
+from ....infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
+from ....infrastructure.repositories.vendor_rollup_repository_impl import SQLAlchemyVendorRollupRepository
 from ....domain.entities.purchase_order import PurchaseOrderStatus as DomainPurchaseOrderStatus
+from ..utils.conditional_requests import build_etag, build_collection_etag, check_not_modified
+from ..utils.idempotency import idempotent
+from ..utils.pagination import paginated_response
 from ..schemas.purchase_order_schemas import (
     PurchaseOrderCreateSchema,
     PurchaseOrderUpdateSchema,
@@ -21,6 +28,10 @@ from ..schemas.purchase_order_schemas import (
     PurchaseOrderListQuerySchema,
     PurchaseOrderSearchQuerySchema,
     PurchaseOrderSummaryResponseSchema,
+    VendorMonthlyRollupSchema,
+    LastPurchasePriceQuerySchema,
+    LastPurchasePriceSchema,
+    PurchaseOrderImportResponseSchema,
     PurchaseOrderStatus,
 )
 
@@ -32,6 +43,8 @@ def get_purchase_order_service(db: Session = Depends(get_db_session)) -> Purchas
     line_item_repository = SQLAlchemyPurchaseOrderLineItemRepository(db)
     vendor_repository = SQLAlchemyVendorRepository(db)
     inventory_repository = SQLAlchemyInventoryItemMasterRepository(db)
+    warehouse_repository = WarehouseRepositoryImpl(db)
+    vendor_rollup_repository = SQLAlchemyVendorRollupRepository(db)
     
     return PurchaseOrderService(
         purchase_order_repository,
@@ -39,6 +52,8 @@ def get_purchase_order_service(db: Session = Depends(get_db_session)) -> Purchas
         vendor_repository,
         inventory_repository,
         db,
+        warehouse_repository,
+        vendor_rollup_repository,
     )
 
 
@@ -64,7 +79,53 @@ def purchase_order_to_response_schema(purchase_order) -> PurchaseOrderResponseSc
     )
 
 
+def purchase_order_details_to_response_schema(details) -> PurchaseOrderDetailResponseSchema:
+    purchase_order = details.purchase_order
+    return PurchaseOrderDetailResponseSchema(
+        **purchase_order_to_response_schema(purchase_order).model_dump(),
+        vendor_name=details.vendor_name,
+        line_items=[
+            {
+                "id": item.id,
+                "purchase_order_id": item.purchase_order_id,
+                "inventory_item_master_id": item.inventory_item_master_id,
+                "warehouse_id": item.warehouse_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "serial_number": item.serial_number,
+                "discount": item.discount,
+                "tax_amount": item.tax_amount,
+                "received_quantity": item.received_quantity,
+                "reference_number": item.reference_number,
+                "warranty_period_type": item.warranty_period_type,
+                "warranty_period": item.warranty_period,
+                "rental_rate": item.rental_rate,
+                "replacement_cost": item.replacement_cost,
+                "late_fee_rate": item.late_fee_rate,
+                "sell_tax_rate": item.sell_tax_rate,
+                "rent_tax_rate": item.rent_tax_rate,
+                "rentable": item.rentable,
+                "sellable": item.sellable,
+                "selling_price": item.selling_price,
+                "amount": item.amount,
+                "total_price": item.total_price,
+                "is_fully_received": item.is_fully_received(),
+                "remaining_quantity": item.get_remaining_quantity(),
+                "created_at": item.created_at,
+                "updated_at": item.updated_at,
+                "created_by": item.created_by,
+                "is_active": item.is_active,
+            }
+            for item in details.line_items
+        ],
+        total_items=details.total_items,
+        items_received=details.items_received,
+        items_pending=details.items_pending,
+    )
+
+
 @router.post("/", response_model=PurchaseOrderResponseSchema, status_code=status.HTTP_201_CREATED)
+@idempotent(status_code=status.HTTP_201_CREATED)
 async def create_purchase_order(
     purchase_order_data: PurchaseOrderCreateSchema,
     purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
@@ -113,79 +174,81 @@ async def create_purchase_order(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create purchase order")
 
 
+@router.get("/reports/vendor-monthly", response_model=List[VendorMonthlyRollupSchema])
+async def get_vendor_monthly_report(
+    vendor_id: Optional[UUID] = Query(None, description="Only this vendor"),
+    start_month: Optional[date] = Query(None, description="First month to include (any day in it)"),
+    end_month: Optional[date] = Query(None, description="Last month to include (any day in it)"),
+    purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
+):
+    """Spend, tax, discount, order counts and delivery lag per vendor and month."""
+    try:
+        rollups = await purchase_order_service.get_vendor_monthly_rollups(vendor_id, start_month, end_month)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return [VendorMonthlyRollupSchema.model_validate(rollup) for rollup in rollups]
+
+
+@router.post("/import", response_model=PurchaseOrderImportResponseSchema)
+async def import_purchase_orders(
+    file: UploadFile = File(..., description="UTF-8 CSV, one row per line item"),
+    created_by: Optional[str] = Form(None),
+    purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
+):
+    """Import purchase orders from a CSV file.
+
+    Required columns: order_reference, vendor_id, order_date,
+    inventory_item_master_id, warehouse_id, quantity and unit_price; optional:
+    expected_delivery_date, status, invoice_number, notes, serial_number,
+    discount and tax_amount. The rows of an order must be consecutive. The
+    file is read as a stream; rejected rows are listed in ``errors``. If the
+    file turns out to be unreadable part way, the report of what was imported
+    up to that point is returned with ``read_error`` set.
+    """
+    rows = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"))
+    try:
+        result = await purchase_order_service.import_purchase_orders(rows, created_by)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return PurchaseOrderImportResponseSchema.model_validate(result)
+
+
+@router.post("/last-prices", response_model=List[LastPurchasePriceSchema])
+async def get_last_purchase_prices(
+    lookup: LastPurchasePriceQuerySchema,
+    purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
+):
+    """Last unit price, discount and tax paid per item and vendor, for pre-filling a new order.
+
+    Items that were never ordered (from the vendor) are left out.
+    """
+    try:
+        prices = await purchase_order_service.get_last_purchase_prices(
+            lookup.inventory_item_master_ids, lookup.vendor_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return [LastPurchasePriceSchema.model_validate(price) for price in prices]
+
+
 @router.get("/{purchase_order_id}", response_model=PurchaseOrderDetailResponseSchema)
 async def get_purchase_order(
     purchase_order_id: UUID,
+    request: Request,
+    response: Response,
     purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
 ):
     """Get a purchase order by ID with details."""
+    last_modified = await purchase_order_service.get_purchase_order_version(purchase_order_id)
+    if last_modified is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Purchase order with ID {purchase_order_id} not found")
+    not_modified = check_not_modified(request, response, build_etag(purchase_order_id, last_modified), last_modified)
+    if not_modified:
+        return not_modified
+
     try:
         details = await purchase_order_service.get_purchase_order_details(purchase_order_id)
-        purchase_order = details["purchase_order"]
-        line_items = details["line_items"]
-        
-        # Get vendor name
-        vendor_service = purchase_order_service.vendor_repository
-        vendor = await vendor_service.find_by_id(purchase_order.vendor_id)
-        vendor_name = vendor.name if vendor else None
-        
-        return PurchaseOrderDetailResponseSchema(
-            id=purchase_order.id,
-            order_number=purchase_order.order_number,
-            vendor_id=purchase_order.vendor_id,
-            vendor_name=vendor_name,
-            order_date=purchase_order.order_date,
-            expected_delivery_date=purchase_order.expected_delivery_date,
-            status=purchase_order.status.value,
-            total_amount=purchase_order.total_amount,
-            total_tax_amount=purchase_order.total_tax_amount,
-            total_discount=purchase_order.total_discount,
-            grand_total=purchase_order.grand_total,
-            reference_number=purchase_order.reference_number,
-            invoice_number=purchase_order.invoice_number,
-            notes=purchase_order.notes,
-            created_at=purchase_order.created_at,
-            updated_at=purchase_order.updated_at,
-            created_by=purchase_order.created_by,
-            is_active=purchase_order.is_active,
-            line_items=[
-                {
-                    "id": item.id,
-                    "purchase_order_id": item.purchase_order_id,
-                    "inventory_item_master_id": item.inventory_item_master_id,
-                    "warehouse_id": item.warehouse_id,
-                    "quantity": item.quantity,
-                    "unit_price": item.unit_price,
-                    "serial_number": item.serial_number,
-                    "discount": item.discount,
-                    "tax_amount": item.tax_amount,
-                    "received_quantity": item.received_quantity,
-                    "reference_number": item.reference_number,
-                    "warranty_period_type": item.warranty_period_type,
-                    "warranty_period": item.warranty_period,
-                    "rental_rate": item.rental_rate,
-                    "replacement_cost": item.replacement_cost,
-                    "late_fee_rate": item.late_fee_rate,
-                    "sell_tax_rate": item.sell_tax_rate,
-                    "rent_tax_rate": item.rent_tax_rate,
-                    "rentable": item.rentable,
-                    "sellable": item.sellable,
-                    "selling_price": item.selling_price,
-                    "amount": item.amount,
-                    "total_price": item.total_price,
-                    "is_fully_received": item.is_fully_received(),
-                    "remaining_quantity": item.get_remaining_quantity(),
-                    "created_at": item.created_at,
-                    "updated_at": item.updated_at,
-                    "created_by": item.created_by,
-                    "is_active": item.is_active,
-                }
-                for item in line_items
-            ],
-            total_items=details["total_items"],
-            items_received=details["items_received"],
-            items_pending=details["items_pending"],
-        )
+        return purchase_order_details_to_response_schema(details)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -217,6 +280,7 @@ async def update_purchase_order(
 
 
 @router.post("/{purchase_order_id}/receive", response_model=PurchaseOrderResponseSchema)
+@idempotent()
 async def receive_purchase_order_items(
     purchase_order_id: UUID,
     receive_data: PurchaseOrderReceiveSchema,
@@ -274,28 +338,51 @@ async def cancel_purchase_order(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to cancel purchase order")
 
 
-@router.get("/", response_model=List[PurchaseOrderResponseSchema])
+@router.get("/")
 async def list_purchase_orders(
+    request: Request,
+    response: Response,
     query_params: PurchaseOrderListQuerySchema = Depends(),
     purchase_order_service: PurchaseOrderService = Depends(get_purchase_order_service),
 ):
-    """List purchase orders with optional filters."""
+    """List purchase orders matching all of the given filters, one page at a time."""
+    version, last_modified = await purchase_order_service.get_purchase_orders_version()
+    not_modified = check_not_modified(
+        request, response, build_collection_etag(request, version, last_modified), last_modified
+    )
+    if not_modified:
+        return not_modified
+
+    # Convert string status to domain enum if provided
+    order_status = DomainPurchaseOrderStatus(query_params.status.value) if query_params.status else None
     try:
-        # Convert string status to domain enum if provided
-        status = DomainPurchaseOrderStatus(query_params.status.value) if query_params.status else None
-        
-        purchase_orders = await purchase_order_service.list_purchase_orders(
-            skip=query_params.skip,
-            limit=query_params.limit,
+        result = await purchase_order_service.list_purchase_orders(
+            page_size=query_params.page_size,
+            cursor=query_params.cursor,
+            page=query_params.page,
             vendor_id=query_params.vendor_id,
-            status=status,
+            status=order_status,
             start_date=query_params.start_date,
             end_date=query_params.end_date,
+            ordering=query_params.ordering,
         )
-        return [purchase_order_to_response_schema(po) for po in purchase_orders]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list purchase orders")
 
+    return paginated_response(
+        "/api/v1/purchase-orders/",
+        result,
+        [purchase_order_to_response_schema(po) for po in result.items],
+        page_size=query_params.page_size,
+        vendor_id=query_params.vendor_id,
+        status=query_params.status.value if query_params.status else None,
+        start_date=query_params.start_date,
+        end_date=query_params.end_date,
+        ordering=query_params.ordering,
+    )
+
 
 @router.post("/search", response_model=List[PurchaseOrderResponseSchema])
 async def search_purchase_orders(
@@ -1,12 +1,16 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ....core.config.database import get_db_session
+from ....infrastructure.cache.stats_snapshots import stats_snapshots
+from ....infrastructure.database.models import UnitOfMeasurementModel
 from ....infrastructure.repositories.unit_of_measurement_repository_impl import UnitOfMeasurementRepositoryImpl
 from ....application.services.unit_of_measurement_service import UnitOfMeasurementService
 from ....application.use_cases.unit_of_measurement_use_cases import UnitOfMeasurementUseCases
+from ..utils.pagination import paginated_response
 from ..schemas.unit_of_measurement_schemas import (
     UnitOfMeasurement,
     UnitOfMeasurementCreate,
@@ -42,20 +46,25 @@ async def create_unit_of_measurement(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def compute_unit_statistics(db: Session) -> dict:
+    stats = asyncio.run(get_unit_use_cases(db).get_unit_of_measurement_stats())
+    return {
+        "total_units": stats["total"],
+        "active_units": stats["active"],
+        "inactive_units": stats["total"] - stats["active"]
+    }
+
+
+stats_snapshots.register("units_of_measurement", compute_unit_statistics, tables=[UnitOfMeasurementModel.__tablename__])
+
+
 @router.get("/statistics")
 async def get_unit_statistics(
-    use_cases: UnitOfMeasurementUseCases = Depends(get_unit_use_cases),
+    fresh: bool = Query(False, description="Recompute instead of serving the latest snapshot"),
 ):
     """Get unit of measurement statistics"""
-    total_units = await use_cases.count_units_of_measurement()
-    active_units = await use_cases.count_units_of_measurement(is_active=True)
-    inactive_units = total_units - active_units
-    
-    return {
-        "total_units": total_units,
-        "active_units": active_units,
-        "inactive_units": inactive_units
-    }
+    snapshot = await stats_snapshots.get("units_of_measurement", fresh=fresh)
+    return snapshot.as_response()
 
 
 @router.get("/{unit_id}", response_model=UnitOfMeasurementResponse)
@@ -72,35 +81,36 @@ async def get_unit_of_measurement(
 
 @router.get("/")
 async def list_units_of_measurement(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     page_size: int = Query(20, ge=1, le=1000, description="Number of records per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next/previous link"),
     is_active: bool = Query(True, description="Whether to return only active records"),
+    search: Optional[str] = Query(None, description="Search term for name or abbreviation"),
+    ordering: str = Query("name", description="Ordering field"),
     use_cases: UnitOfMeasurementUseCases = Depends(get_unit_use_cases),
 ):
     """List all units of measurement with pagination"""
-    skip = (page - 1) * page_size
-    units = await use_cases.list_units_of_measurement(
-        skip=skip,
-        limit=page_size,
-        is_active=is_active
+    try:
+        result = await use_cases.list_units_of_measurement_page(
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            is_active=is_active,
+            search=search,
+            ordering=ordering,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return paginated_response(
+        "/api/v1/units/",
+        result,
+        [UnitOfMeasurementResponse.from_orm(unit).dict() for unit in result.items],
+        page_size=page_size,
+        is_active=is_active,
+        search=search,
+        ordering=ordering,
     )
-    
-    # Get total count for pagination
-    total_count = await use_cases.count_units_of_measurement(is_active=is_active)
-    
-    # Calculate pagination info
-    has_next = skip + page_size < total_count
-    has_previous = skip > 0
-    
-    next_url = f"/api/v1/units/?page={page + 1}&page_size={page_size}&is_active={is_active}" if has_next else None
-    previous_url = f"/api/v1/units/?page={page - 1}&page_size={page_size}&is_active={is_active}" if has_previous else None
-    
-    return {
-        "count": total_count,
-        "next": next_url,
-        "previous": previous_url,
-        "results": [UnitOfMeasurementResponse.from_orm(unit).dict() for unit in units]
-    }
 
 
 @router.get("/search/", response_model=List[UnitOfMeasurementResponse])
@@ -4,8 +4,13 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from ....application.services.duplicate_detection_service import DuplicateDetectionService
 from ....application.services.vendor_service import VendorService
 from ....core.config.database import get_db_session
+from ....domain.entities.contact_number import ContactNumber
+from ....domain.services.duplicate_matching import PossibleDuplicateError
+from ....infrastructure.repositories.contact_number_repository_impl import SQLAlchemyContactNumberRepository
+from ....infrastructure.repositories.duplicate_candidate_repository_impl import SQLAlchemyDuplicateCandidateRepository
 from ....infrastructure.repositories.vendor_repository_impl import SQLAlchemyVendorRepository
 from ..schemas.vendor_schemas import (
     VendorCreateSchema,
@@ -14,16 +19,37 @@ from ..schemas.vendor_schemas import (
     VendorsListResponseSchema,
     VendorSearchSchema,
 )
+from ..schemas.contact_number_schemas import ContactNumberResponseSchema
+from ..schemas.duplicate_schemas import DuplicateClusterSchema, DuplicateMatchSchema
+from ..schemas.facet_schemas import CityFacetSchema
+from ..utils.duplicates import duplicate_cluster_to_schema, duplicate_match_to_schema, possible_duplicate_exception
 
 router = APIRouter(prefix="/vendors", tags=["vendors"])
 
 
 def get_vendor_service(db: Session = Depends(get_db_session)) -> VendorService:
     vendor_repository = SQLAlchemyVendorRepository(db)
-    return VendorService(vendor_repository)
+    contact_number_repository = SQLAlchemyContactNumberRepository(db)
+    duplicate_detector = DuplicateDetectionService(SQLAlchemyDuplicateCandidateRepository(db), "Vendor")
+    return VendorService(vendor_repository, contact_number_repository, duplicate_detector)
+
+
+def vendor_to_response_schema(vendor, contacts: Optional[List[ContactNumber]] = None) -> VendorResponseSchema:
+    contact_numbers = None
+    if contacts is not None:
+        contact_numbers = [
+            ContactNumberResponseSchema(
+                id=contact.id,
+                number=contact.phone_number.number,
+                entity_type=contact.entity_type,
+                entity_id=contact.entity_id,
+                created_at=contact.created_at,
+                updated_at=contact.updated_at,
+                created_by=contact.created_by,
+                is_active=contact.is_active,
+            ) for contact in contacts
+        ]
 
-
-def vendor_to_response_schema(vendor) -> VendorResponseSchema:
     return VendorResponseSchema(
         id=vendor.id,
         name=vendor.name,
@@ -31,6 +57,7 @@ def vendor_to_response_schema(vendor) -> VendorResponseSchema:
         address=vendor.address,
         remarks=vendor.remarks,
         city=vendor.city,
+        contact_numbers=contact_numbers,
         created_at=vendor.created_at,
         updated_at=vendor.updated_at,
         created_by=vendor.created_by,
@@ -38,6 +65,12 @@ def vendor_to_response_schema(vendor) -> VendorResponseSchema:
     )
 
 
+async def vendors_to_response_schemas(vendors, vendor_service: VendorService) -> List[VendorResponseSchema]:
+    """Build responses for a page of vendors, loading all their contact numbers in one query."""
+    contacts_by_vendor = await vendor_service.get_contact_numbers_for_vendors([vendor.id for vendor in vendors])
+    return [vendor_to_response_schema(vendor, contacts_by_vendor.get(vendor.id, [])) for vendor in vendors]
+
+
 @router.post("/", response_model=VendorResponseSchema, status_code=201)
 async def create_vendor(
     vendor_data: VendorCreateSchema,
@@ -50,14 +83,51 @@ async def create_vendor(
             address=vendor_data.address,
             remarks=vendor_data.remarks,
             city=vendor_data.city,
-            created_by=vendor_data.created_by
+            created_by=vendor_data.created_by,
+            contact_numbers=[contact.number for contact in vendor_data.contact_numbers or []],
+            allow_duplicates=vendor_data.allow_duplicates,
         )
         
-        return vendor_to_response_schema(vendor)
+        return vendor_to_response_schema(vendor, await vendor_service.get_vendor_contact_numbers(vendor.id))
+    except PossibleDuplicateError as e:
+        raise possible_duplicate_exception(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/duplicates/check", response_model=List[DuplicateMatchSchema])
+async def check_vendor_duplicates(
+    name: str = Query(..., min_length=1, description="Vendor name"),
+    email: Optional[str] = Query(None, description="Vendor email"),
+    phone: Optional[List[str]] = Query(None, description="Contact numbers"),
+    exclude_id: Optional[UUID] = Query(None, description="Vendor to leave out, when editing"),
+    vendor_service: VendorService = Depends(get_vendor_service),
+):
+    """Existing vendors that look like the one described, best match first."""
+    matches = await vendor_service.find_duplicate_vendors(name, email, phone, exclude_id)
+    return [duplicate_match_to_schema(match) for match in matches]
+
+
+@router.get("/duplicates/", response_model=List[DuplicateClusterSchema])
+async def list_vendor_duplicate_clusters(
+    vendor_service: VendorService = Depends(get_vendor_service),
+):
+    """Groups of existing vendors that look like duplicates of each other."""
+    clusters = await vendor_service.find_duplicate_vendor_clusters()
+    return [duplicate_cluster_to_schema(cluster) for cluster in clusters]
+
+
+@router.get("/facets/cities", response_model=List[CityFacetSchema])
+async def get_vendor_city_facets(
+    limit: int = Query(10, ge=1, le=100, description="Number of cities to return"),
+    prefix: Optional[str] = Query(None, description="Only cities starting with this text"),
+    vendor_service: VendorService = Depends(get_vendor_service),
+):
+    """Cities with the most active vendors, with counts, for building filters."""
+    facets = await vendor_service.get_vendor_city_facets(limit, prefix)
+    return [CityFacetSchema(city_key=facet.city_key, city=facet.city, count=facet.count) for facet in facets]
+
+
 @router.get("/{vendor_id}", response_model=VendorResponseSchema)
 async def get_vendor(
     vendor_id: UUID,
@@ -67,7 +137,7 @@ async def get_vendor(
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     
-    return vendor_to_response_schema(vendor)
+    return vendor_to_response_schema(vendor, await vendor_service.get_vendor_contact_numbers(vendor.id))
 
 
 @router.put("/{vendor_id}", response_model=VendorResponseSchema)
@@ -84,10 +154,14 @@ async def update_vendor(
             address=vendor_data.address,
             remarks=vendor_data.remarks,
             city=vendor_data.city,
-            is_active=vendor_data.is_active
+            is_active=vendor_data.is_active,
+            contact_numbers=(
+                [contact.number for contact in vendor_data.contact_numbers]
+                if vendor_data.contact_numbers is not None else None
+            ),
         )
         
-        return vendor_to_response_schema(vendor)
+        return vendor_to_response_schema(vendor, await vendor_service.get_vendor_contact_numbers(vendor.id))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -110,7 +184,7 @@ async def list_vendors(
 ):
     vendors = await vendor_service.list_vendors(skip=skip, limit=limit)
     
-    vendor_responses = [vendor_to_response_schema(vendor) for vendor in vendors]
+    vendor_responses = await vendors_to_response_schemas(vendors, vendor_service)
     
     return VendorsListResponseSchema(
         vendors=vendor_responses,
@@ -128,7 +202,7 @@ async def search_vendors(
     vendor_service: VendorService = Depends(get_vendor_service),
 ):
     vendors = await vendor_service.search_vendors(query, search_fields, limit)
-    return [vendor_to_response_schema(vendor) for vendor in vendors]
+    return await vendors_to_response_schemas(vendors, vendor_service)
 
 
 @router.get("/by-email/{email}", response_model=VendorResponseSchema)
@@ -140,14 +214,15 @@ async def get_vendor_by_email(
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     
-    return vendor_to_response_schema(vendor)
+    return vendor_to_response_schema(vendor, await vendor_service.get_vendor_contact_numbers(vendor.id))
 
 
 @router.get("/by-city/{city}", response_model=List[VendorResponseSchema])
 async def get_vendors_by_city(
     city: str,
     limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of results"),
+    prefix: bool = Query(False, description="Match cities starting with the given text"),
     vendor_service: VendorService = Depends(get_vendor_service),
 ):
-    vendors = await vendor_service.get_vendors_by_city(city, limit)
-    return [vendor_to_response_schema(vendor) for vendor in vendors]
\ No newline at end of file
+    vendors = await vendor_service.get_vendors_by_city(city, limit, prefix)
+    return await vendors_to_response_schemas(vendors, vendor_service)
\ No newline at end of file
@@ -1,12 +1,17 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from ....core.config.database import get_db_session
+from ....infrastructure.cache.stats_snapshots import stats_snapshots
+from ....infrastructure.database.models import WarehouseModel
 from ....infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
 from ....application.services.warehouse_service import WarehouseService
 from ....application.use_cases.warehouse_use_cases import WarehouseUseCases
+from ..utils.conditional_requests import build_etag, build_collection_etag, check_not_modified
+from ..utils.pagination import paginated_response
 from ..schemas.warehouse_schemas import (
     Warehouse,
     WarehouseCreate,
@@ -44,9 +49,18 @@ async def create_warehouse(
 @router.get("/{warehouse_id}", response_model=WarehouseResponse)
 async def get_warehouse(
     warehouse_id: UUID,
+    request: Request,
+    response: Response,
     use_cases: WarehouseUseCases = Depends(get_warehouse_use_cases),
 ):
     """Get warehouse by ID"""
+    last_modified = await use_cases.get_warehouse_version(warehouse_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Warehouse not found")
+    not_modified = check_not_modified(request, response, build_etag(warehouse_id, last_modified), last_modified)
+    if not_modified:
+        return not_modified
+
     warehouse = await use_cases.get_warehouse(warehouse_id)
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
@@ -55,52 +69,45 @@ async def get_warehouse(
 
 @router.get("/")
 async def list_warehouses(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     page_size: int = Query(20, ge=1, le=1000, description="Number of records per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next/previous link"),
     is_active: bool = Query(True, description="Whether to return only active records"),
     search: str = Query(None, description="Search term for name or label"),
     ordering: str = Query("-created_at", description="Ordering field"),
     use_cases: WarehouseUseCases = Depends(get_warehouse_use_cases),
 ):
     """List all warehouses with pagination"""
-    skip = (page - 1) * page_size
-    
-    # If search is provided, use search functionality
-    if search:
-        warehouses = await use_cases.search_warehouses(search, skip, page_size)
-    else:
-        warehouses = await use_cases.list_warehouses(skip, page_size, active_only=is_active)
-    
-    # For now, return a simple count (we'll add a proper count method later)
-    total_count = len(warehouses)
-    
-    # Sort results based on ordering parameter
-    if ordering == "name":
-        warehouses.sort(key=lambda x: x.name)
-    elif ordering == "-name":
-        warehouses.sort(key=lambda x: x.name, reverse=True)
-    elif ordering == "label":
-        warehouses.sort(key=lambda x: x.label)
-    elif ordering == "-label":
-        warehouses.sort(key=lambda x: x.label, reverse=True)
-    elif ordering == "created_at":
-        warehouses.sort(key=lambda x: x.created_at)
-    elif ordering == "-created_at":
-        warehouses.sort(key=lambda x: x.created_at, reverse=True)
-    
-    # Calculate pagination info
-    has_next = len(warehouses) == page_size  # Simple heuristic
-    has_previous = skip > 0
-    
-    next_url = f"/api/v1/warehouses/?page={page + 1}&page_size={page_size}&is_active={is_active}" if has_next else None
-    previous_url = f"/api/v1/warehouses/?page={page - 1}&page_size={page_size}&is_active={is_active}" if has_previous else None
-    
-    return {
-        "count": total_count,
-        "next": next_url,
-        "previous": previous_url,
-        "results": [WarehouseResponse.from_orm(w).dict() for w in warehouses]
-    }
+    version, last_modified = await use_cases.get_warehouses_version()
+    not_modified = check_not_modified(
+        request, response, build_collection_etag(request, version, last_modified), last_modified
+    )
+    if not_modified:
+        return not_modified
+
+    try:
+        result = await use_cases.list_warehouses_page(
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            active_only=is_active,
+            search=search,
+            ordering=ordering,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return paginated_response(
+        "/api/v1/warehouses/",
+        result,
+        [WarehouseResponse.from_orm(w).dict() for w in result.items],
+        page_size=page_size,
+        is_active=is_active,
+        search=search,
+        ordering=ordering,
+    )
 
 
 @router.get("/search/", response_model=List[WarehouseResponse])
@@ -170,27 +177,25 @@ async def activate_warehouse(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+def compute_warehouse_stats(db: Session) -> dict:
+    stats = asyncio.run(get_warehouse_use_cases(db).get_warehouse_stats(recent_days=30))
+    return {
+        "total_warehouses": stats["total"],
+        "warehouses_with_remarks": stats["with_remarks"],
+        "recent_warehouses_30_days": stats["recent"],
+    }
+
+
+stats_snapshots.register("warehouses", compute_warehouse_stats, tables=[WarehouseModel.__tablename__])
+
+
 @router.get("/stats/overview")
 async def get_warehouse_stats(
-    use_cases: WarehouseUseCases = Depends(get_warehouse_use_cases),
+    fresh: bool = Query(False, description="Recompute instead of serving the latest snapshot"),
 ):
     """Get warehouse statistics for overview"""
     try:
-        # Get all active warehouses to calculate stats
-        all_warehouses = await use_cases.list_warehouses(skip=0, limit=10000, active_only=True)
-        
-        total_warehouses = len(all_warehouses)
-        warehouses_with_remarks = len([w for w in all_warehouses if w.remarks and w.remarks.strip()])
-        
-        # Calculate recent warehouses (30 days) - using timezone-aware datetime
-        from datetime import datetime, timedelta, timezone
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        recent_warehouses_30_days = len([w for w in all_warehouses if w.created_at >= thirty_days_ago])
-        
-        return {
-            "total_warehouses": total_warehouses,
-            "warehouses_with_remarks": warehouses_with_remarks,
-            "recent_warehouses_30_days": recent_warehouses_30_days,
-        }
+        snapshot = await stats_snapshots.get("warehouses", fresh=fresh)
+        return snapshot.as_response()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating stats: {str(e)}")
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from .endpoints.customers import router as customers_router
 from .endpoints.vendors import router as vendors_router
+from .endpoints.contact_numbers import router as contact_numbers_router
 from .endpoints.item_categories import router as item_categories_router
 from .endpoints.inventory_item_masters import router as inventory_item_masters_router
 from .endpoints.purchase_orders import router as purchase_orders_router
@@ -13,6 +14,7 @@ api_router = APIRouter(prefix="/api/v1")
 
 api_router.include_router(customers_router)
 api_router.include_router(vendors_router)
+api_router.include_router(contact_numbers_router)
 api_router.include_router(item_categories_router)
 api_router.include_router(inventory_item_masters_router)
 api_router.include_router(purchase_orders_router)
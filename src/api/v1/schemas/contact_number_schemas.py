@@ -51,7 +51,7 @@ class ContactNumberCreateSchema(CreateBaseSchema):
         if not v or not v.strip():
             raise ValueError('Entity type cannot be empty')
         
-        allowed_types = ["Customer", "User", "Supplier", "Property", "Unit"]
+        allowed_types = ["Customer", "Vendor", "User", "Supplier", "Property", "Unit"]
         if v not in allowed_types:
             raise ValueError(f'Invalid entity type. Must be one of: {", ".join(allowed_types)}')
         
@@ -90,7 +90,7 @@ class ContactNumberUpdateSchema(UpdateBaseSchema):
         if not v or not v.strip():
             raise ValueError('Entity type cannot be empty')
         
-        allowed_types = ["Customer", "User", "Supplier", "Property", "Unit"]
+        allowed_types = ["Customer", "Vendor", "User", "Supplier", "Property", "Unit"]
         if v not in allowed_types:
             raise ValueError(f'Invalid entity type. Must be one of: {", ".join(allowed_types)}')
         
@@ -128,4 +128,11 @@ class ContactNumberBulkCreateSchema(BaseModel):
 
 class ContactNumberSearchSchema(BaseModel):
     query: str = Field(..., min_length=1, description="Search query")
-    limit: int = Field(10, ge=1, le=100, description="Maximum number of results")
\ No newline at end of file
+    limit: int = Field(10, ge=1, le=100, description="Maximum number of results")
+
+class ContactNumberOwnerSchema(BaseModel):
+    contact: ContactNumberResponseSchema
+    owner_type: str
+    owner_id: UUID
+    owner_name: Optional[str] = None
+    owner_email: Optional[str] = None
@@ -53,6 +53,7 @@ class CustomerCreateSchema(CreateBaseSchema):
     
     # Contact numbers
     contact_numbers: Optional[List[ContactNumberCreateSchema]] = Field(None, description="List of contact numbers")
+    allow_duplicates: bool = Field(False, description="Create even if similar customers already exist")
     
     # Backward compatibility
     address_vo: Optional[AddressSchema] = Field(None, description="Structured address (backward compatibility)")
@@ -0,0 +1,17 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class DuplicateMatchSchema(BaseModel):
+    id: UUID
+    name: str
+    email: Optional[str] = None
+    score: Optional[float] = Field(None, description="Similarity to the record checked, from 0 to 1")
+    reasons: List[str] = Field(default_factory=list, description="What matched: name, phone, email_domain, email")
+
+
+class DuplicateClusterSchema(BaseModel):
+    size: int
+    members: List[DuplicateMatchSchema]
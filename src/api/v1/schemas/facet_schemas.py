@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class CityFacetSchema(BaseModel):
+    city_key: str = Field(..., description="Normalized city, usable as an exact-match filter")
+    city: str
+    count: int
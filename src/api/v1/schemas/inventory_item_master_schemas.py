@@ -171,4 +171,38 @@ class InventoryItemMasterStatsSchema(BaseModel):
     individual_items: int = Field(description="Number of individual tracking items")
     consumable_items: int = Field(description="Number of consumable items")
     non_consumable_items: int = Field(description="Number of non-consumable items")
-    total_inventory_instances: int = Field(description="Total inventory instances across all locations")
\ No newline at end of file
+    total_inventory_instances: int = Field(description="Total inventory instances across all locations")
+    computed_at: Optional[datetime] = Field(None, description="When these figures were computed")
+
+
+class StockBalanceSchema(BaseModel):
+    warehouse_id: UUID
+    status: str
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class StockOnHandSchema(BaseModel):
+    inventory_item_master_id: UUID
+    total_quantity: int = Field(description="Sum of the listed balances")
+    balances: List[StockBalanceSchema]
+
+
+class StockLevelSchema(BaseModel):
+    inventory_item_master_id: UUID
+    warehouse_id: UUID
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class StockAsOfSchema(BaseModel):
+    as_of: datetime
+    snapshot_taken_at: Optional[datetime] = Field(None, description="Snapshot the levels were rebuilt from")
+    levels: List[StockLevelSchema]
+
+    class Config:
+        from_attributes = True
@@ -157,4 +157,20 @@ class ItemSubCategoriesListResponseSchema(BaseModel):
 
 
 class ItemCategoryWithSubcategoriesResponseSchema(ItemCategoryResponseSchema):
-    subcategories: List[ItemSubCategoryResponseSchema] = []
\ No newline at end of file
+    subcategories: List[ItemSubCategoryResponseSchema] = []
+
+
+class ItemSubCategoryTreeNodeSchema(ItemSubCategoryResponseSchema):
+    item_count: int = 0
+
+
+class ItemCategoryTreeNodeSchema(ItemCategoryResponseSchema):
+    item_count: int = 0
+    subcategories: List[ItemSubCategoryTreeNodeSchema] = []
+
+
+class ItemCategoryTreeResponseSchema(BaseModel):
+    categories: List[ItemCategoryTreeNodeSchema]
+    total: int
+    skip: int
+    limit: int
@@ -143,12 +143,14 @@ class PurchaseOrderDetailResponseSchema(PurchaseOrderResponseSchema):
 
 
 class PurchaseOrderListQuerySchema(BaseModel):
-    skip: int = Field(default=0, ge=0, description="Number of records to skip")
-    limit: int = Field(default=100, ge=1, le=1000, description="Number of records to return")
+    page: int = Field(default=1, ge=1, description="Page number (ignored when a cursor is given)")
+    page_size: int = Field(default=20, ge=1, le=1000, description="Number of records per page")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous next/previous link")
     vendor_id: Optional[UUID] = Field(None, description="Filter by vendor ID")
     status: Optional[PurchaseOrderStatus] = Field(None, description="Filter by status")
     start_date: Optional[date] = Field(None, description="Filter by start date")
     end_date: Optional[date] = Field(None, description="Filter by end date")
+    ordering: str = Field(default="-order_date", description="Ordering field")
 
     @field_validator("end_date")
     @classmethod
@@ -180,4 +182,58 @@ class PurchaseOrderSummaryResponseSchema(BaseModel):
     is_editable: bool
     is_receivable: bool
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class VendorMonthlyRollupSchema(BaseModel):
+    vendor_id: UUID
+    month: date = Field(..., description="First day of the order month")
+    order_count: int
+    cancelled_order_count: int
+    spend: Decimal = Field(..., description="Grand total of the orders that were not cancelled")
+    tax_amount: Decimal
+    discount_amount: Decimal
+    received_order_count: int
+    average_delivery_delay_days: Optional[float] = Field(
+        None, description="Mean days received after the expected delivery date; negative means early"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LastPurchasePriceQuerySchema(BaseModel):
+    inventory_item_master_ids: List[UUID] = Field(
+        ..., min_length=1, max_length=1000, description="Items to look up"
+    )
+    vendor_id: Optional[UUID] = Field(None, description="Only prices paid to this vendor")
+
+
+class LastPurchasePriceSchema(BaseModel):
+    inventory_item_master_id: UUID
+    vendor_id: UUID
+    purchase_order_id: UUID = Field(..., description="The order the price was last paid on")
+    line_item_id: UUID
+    order_date: date
+    quantity: int
+    unit_price: Decimal
+    discount: Decimal
+    tax_amount: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportRowErrorSchema(BaseModel):
+    row: int = Field(..., description="CSV line number; the header is row 1")
+    order_reference: Optional[str]
+    message: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PurchaseOrderImportResponseSchema(BaseModel):
+    orders_imported: int
+    line_items_imported: int
+    orders_skipped: int
+    errors: List[ImportRowErrorSchema] = Field(default_factory=list)
+    read_error: Optional[str] = Field(None, description="Why reading the file stopped early, if it did")
+
+    model_config = ConfigDict(from_attributes=True)
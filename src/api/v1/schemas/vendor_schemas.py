@@ -5,6 +5,7 @@ import re
 from pydantic import BaseModel, Field, field_validator
 
 from .base_schemas import CreateBaseSchema, UpdateBaseSchema, TimeStampedSchema
+from .contact_number_schemas import ContactNumberResponseSchema, PhoneNumberSchema
 
 
 class VendorCreateSchema(CreateBaseSchema):
@@ -13,6 +14,8 @@ class VendorCreateSchema(CreateBaseSchema):
     address: Optional[str] = Field(None, description="Vendor address")
     remarks: Optional[str] = Field(None, max_length=255, description="Additional remarks")
     city: Optional[str] = Field(None, max_length=255, description="Vendor city")
+    contact_numbers: Optional[List[PhoneNumberSchema]] = Field(None, description="List of contact numbers")
+    allow_duplicates: bool = Field(False, description="Create even if similar vendors already exist")
 
     @field_validator("email")
     @classmethod
@@ -41,6 +44,7 @@ class VendorUpdateSchema(UpdateBaseSchema):
     address: Optional[str] = Field(None, description="Vendor address")
     remarks: Optional[str] = Field(None, max_length=255, description="Additional remarks")
     city: Optional[str] = Field(None, max_length=255, description="Vendor city")
+    contact_numbers: Optional[List[PhoneNumberSchema]] = Field(None, description="List of contact numbers (replaces all existing)")
 
     @field_validator("email")
     @classmethod
@@ -69,6 +73,7 @@ class VendorResponseSchema(TimeStampedSchema):
     address: Optional[str] = None
     remarks: Optional[str] = None
     city: Optional[str] = None
+    contact_numbers: Optional[List[ContactNumberResponseSchema]] = None
 
 
 class VendorsListResponseSchema(BaseModel):
@@ -0,0 +1,98 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+Endpoints look up a cheap version marker for the resource (``updated_at`` for
+a single entity, row count plus latest ``updated_at`` or a maintained counter
+from ``collection_versions`` for a collection), derive
+the validators from it and answer ``If-None-Match`` / ``If-Modified-Since``
+with 304 before loading and serialising the full payload.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def build_etag(*parts: Any) -> str:
+    """Build a strong ETag from the given version parts."""
+    seed = "|".join(_normalize_part(part) for part in parts)
+    return '"%s"' % hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+
+def build_collection_etag(request: Request, count: int, last_modified: Optional[datetime]) -> str:
+    """Build an ETag for a list endpoint; the query string is part of the version."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return build_etag(request.url.path, query, count, last_modified)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 7232, section 6)
+        candidates = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+        return "*" in candidates or _strip_weak(etag) in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates only carry whole seconds
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """Attach ETag and Last-Modified headers to an outgoing response."""
+    response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime],
+) -> Optional[Response]:
+    """
+    Return a 304 response when the client's copy is current.
+
+    Otherwise the validators are set on ``response`` and None is returned so
+    the endpoint can go on to build the full payload.
+    """
+    if is_not_modified(request, etag, last_modified):
+        not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        set_validators(not_modified, etag, last_modified)
+        return not_modified
+    set_validators(response, etag, last_modified)
+    return None
+
+
+def format_http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Entities stamp naive UTC datetimes before they are persisted
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _normalize_part(part: Any) -> str:
+    if isinstance(part, datetime):
+        return _as_utc(part).isoformat()
+    return "" if part is None else str(part)
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
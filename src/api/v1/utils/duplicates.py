@@ -0,0 +1,39 @@
+"""Response helpers for the customer and vendor duplicate detection endpoints."""
+
+from typing import List
+
+from fastapi import HTTPException, status
+
+from ....domain.services.duplicate_matching import DuplicateCandidate, MatchRecord, PossibleDuplicateError
+from ..schemas.duplicate_schemas import DuplicateClusterSchema, DuplicateMatchSchema
+
+
+def duplicate_match_to_schema(match: DuplicateCandidate) -> DuplicateMatchSchema:
+    return DuplicateMatchSchema(
+        id=match.record.entity_id,
+        name=match.record.name,
+        email=match.record.email,
+        score=match.score,
+        reasons=list(match.reasons),
+    )
+
+
+def duplicate_cluster_to_schema(cluster: List[MatchRecord]) -> DuplicateClusterSchema:
+    return DuplicateClusterSchema(
+        size=len(cluster),
+        members=[
+            DuplicateMatchSchema(id=record.entity_id, name=record.name, email=record.email)
+            for record in cluster
+        ],
+    )
+
+
+def possible_duplicate_exception(error: PossibleDuplicateError) -> HTTPException:
+    """409 listing the existing records; resend with ``allow_duplicates`` to create anyway."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": str(error),
+            "matches": [duplicate_match_to_schema(match).model_dump(mode="json") for match in error.matches],
+        },
+    )
@@ -0,0 +1,166 @@
+"""
+``Idempotency-Key`` support for write endpoints.
+
+``@idempotent()`` goes below ``@router.post``::
+
+    @router.post("/", status_code=201)
+    @idempotent(status_code=201)
+    async def create_order(...):
+
+Requests without the header run as usual. The first request with a key runs
+the endpoint and stores its response, including 4xx errors; a retry with the
+same key and request gets the stored response back, marked with
+``Idempotent-Replayed: true``, without running the endpoint again. A retry
+that arrives while the first request is still running waits for it. Reusing a
+key for a different request is rejected with 422, and waiting longer than
+``wait_seconds`` with 409. Server errors release the key so the request can
+be retried. While the endpoint runs its lease is renewed every third of the
+lease, so a slow request keeps its key and only the key of a request whose
+worker died is freed once the lease runs out. The store is a blocking
+database client, so it is called from the threadpool.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from ....core.config.settings import get_settings
+from ....infrastructure.database.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyStore,
+    StoredResponse,
+    idempotency_store,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+_FIRST_POLL_SECONDS = 0.05
+_MAX_POLL_SECONDS = 1.0
+_REQUEST_PARAM = "_idempotency_request"
+_SCOPE_HEADERS = ("authorization", "cookie")
+
+
+def request_fingerprint(request: Request, body: bytes) -> str:
+    """Hash everything that makes two requests "the same" for a key."""
+    digest = hashlib.sha256()
+    for part in (request.method, request.url.path, request.url.query,
+                 *(request.headers.get(name, "") for name in _SCOPE_HEADERS)):
+        digest.update(part.encode())
+        digest.update(b"\n")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def _claim(
+    store: IdempotencyStore, scope: str, key: str, fingerprint: str, wait_seconds: float
+) -> Optional[StoredResponse]:
+    deadline = time.monotonic() + wait_seconds
+    poll = _FIRST_POLL_SECONDS
+    while True:
+        try:
+            return await run_in_threadpool(store.begin, scope, key, fingerprint)
+        except IdempotencyKeyMismatch as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        except IdempotencyKeyInProgress:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                )
+            await asyncio.sleep(min(poll, remaining))
+            poll = min(poll * 2, _MAX_POLL_SECONDS)
+
+
+async def _keep_claim(store: IdempotencyStore, scope: str, key: str) -> None:
+    while True:
+        await asyncio.sleep(store.lease_seconds / 3)
+        try:
+            await run_in_threadpool(store.renew, scope, key)
+        except Exception:
+            # Try again on the next beat; the lease still has two thirds left
+            logger.exception("Renewing the lease of Idempotency-Key %r failed", key)
+
+
+def idempotent(
+    status_code: int = status.HTTP_200_OK,
+    store: Optional[IdempotencyStore] = None,
+    wait_seconds: Optional[float] = None,
+):
+    """Opt a write endpoint into ``Idempotency-Key`` handling.
+
+    ``status_code`` must match the route's success status code.
+    """
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (name for name, parameter in signature.parameters.items() if parameter.annotation is Request), None
+        )
+
+        async def call(*args, **kwargs):
+            if inspect.iscoroutinefunction(endpoint):
+                return await endpoint(*args, **kwargs)
+            return await run_in_threadpool(endpoint, *args, **kwargs)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None:
+                return await call(*args, **kwargs)
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters",
+                )
+
+            keys = store or idempotency_store
+            scope = f"{request.method} {request.url.path}"
+            fingerprint = request_fingerprint(request, await request.body())
+            wait = get_settings().idempotency_wait_seconds if wait_seconds is None else wait_seconds
+            stored = await _claim(keys, scope, key, fingerprint, wait)
+            if stored is not None:
+                return JSONResponse(stored.body, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"})
+
+            heartbeat = asyncio.create_task(_keep_claim(keys, scope, key))
+            try:
+                try:
+                    value = await call(*args, **kwargs)
+                finally:
+                    heartbeat.cancel()
+            except HTTPException as e:
+                if e.status_code < 500:
+                    await run_in_threadpool(
+                        keys.complete, scope, key, e.status_code, {"detail": jsonable_encoder(e.detail)}
+                    )
+                else:
+                    await run_in_threadpool(keys.release, scope, key)
+                raise
+            except BaseException:
+                # Also runs on cancellation; shielded so a second cancel cannot skip it
+                await asyncio.shield(run_in_threadpool(keys.release, scope, key))
+                raise
+            await run_in_threadpool(keys.complete, scope, key, status_code, jsonable_encoder(value))
+            return value
+
+        if request_param is None:
+            parameters = [p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD]
+            extra = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            wrapper.__signature__ = signature.replace(parameters=parameters + [extra])
+        return wrapper
+
+    return decorator
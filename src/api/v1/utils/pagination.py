@@ -0,0 +1,24 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+from ....domain.value_objects.page import Page
+
+
+def _page_link(base_url: str, cursor: Optional[str], params: Dict[str, Any]) -> Optional[str]:
+    if cursor is None:
+        return None
+    query = {"cursor": cursor, **{key: value for key, value in params.items() if value is not None}}
+    return f"{base_url}?{urlencode(query)}"
+
+
+def paginated_response(base_url: str, page: Page, results: List[Any], **params: Any) -> Dict[str, Any]:
+    """Build the ``count/next/previous/results`` body for a cursor page.
+
+    ``params`` are the listing filters that must be carried over to the links.
+    """
+    return {
+        "count": page.total,
+        "next": _page_link(base_url, page.next_cursor, params),
+        "previous": _page_link(base_url, page.previous_cursor, params),
+        "results": results,
+    }
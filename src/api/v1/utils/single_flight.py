@@ -0,0 +1,149 @@
+"""
+Request coalescing for expensive GET endpoints.
+
+``@single_flight()`` collapses concurrent identical requests (same path, query
+string, conditional headers and credentials) into one execution of the
+endpoint; every waiter receives the same result, including any headers the
+endpoint set on its injected ``Response``. A ``Response`` the endpoint returns
+(such as a 304) is kept as its status, body and headers, and every waiter gets
+a new one built from them. The shared execution runs with the first caller's
+dependencies and is cancelled if that caller goes away, after which a waiting
+caller runs the endpoint with its own. Nothing is kept once the execution
+finishes, so a later request always runs the endpoint again.
+
+The decorator goes below ``@router.get``::
+
+    @router.get("/search/")
+    @single_flight()
+    async def search(...):
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+_REQUEST_PARAM = "_single_flight_request"
+_KEY_HEADERS = ("if-none-match", "if-modified-since")
+_SCOPE_HEADERS = ("authorization", "cookie")
+
+
+class _StoredResponse:
+    __slots__ = ("status_code", "body", "raw_headers")
+
+    def __init__(self, response: Response) -> None:
+        self.status_code = response.status_code
+        self.body = response.body
+        self.raw_headers = list(response.raw_headers)
+
+    def build(self) -> Response:
+        response = Response(content=self.body, status_code=self.status_code)
+        response.raw_headers = list(self.raw_headers)
+        return response
+
+
+class _Result:
+    __slots__ = ("value", "headers")
+
+    def __init__(self, value: Any, headers: List[Tuple[str, str]]) -> None:
+        # Response objects are tied to one caller, so only their parts are shared
+        self.value = _StoredResponse(value) if isinstance(value, Response) else value
+        self.headers = headers
+
+    def value_for_caller(self) -> Any:
+        return self.value.build() if isinstance(self.value, _StoredResponse) else self.value
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Task[_Result]"] = {}
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[_Result]]) -> _Result:
+        while True:
+            task = self._in_flight.get(key)
+            if task is None:
+                # The computation uses the first caller's request-scoped
+                # dependencies (its database session), so it is awaited
+                # directly and is cancelled together with that caller
+                task = asyncio.ensure_future(compute())
+                self._in_flight[key] = task
+                task.add_done_callback(functools.partial(self._finish, key))
+                return await task
+            # Waiting this way does not cancel the shared computation when this caller goes away
+            await asyncio.wait({task})
+            if not task.cancelled():
+                return task.result()
+            # The first caller went away; start over with this caller's own dependencies
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[_Result]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+
+single_flight_group = SingleFlight()
+
+
+def request_key(request: Request) -> Tuple[Hashable, ...]:
+    """Identify a request by route, parameters, validators and credentials."""
+    scope = hashlib.sha256(
+        "\n".join(request.headers.get(name, "") for name in _SCOPE_HEADERS).encode()
+    ).hexdigest()
+    return (
+        request.method,
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        tuple(request.headers.get(name) for name in _KEY_HEADERS),
+        scope,
+    )
+
+
+def _find_param(signature: inspect.Signature, annotation: type) -> Optional[str]:
+    for name, parameter in signature.parameters.items():
+        if parameter.annotation is annotation:
+            return name
+    return None
+
+
+def single_flight(group: Optional[SingleFlight] = None):
+    """Opt a GET endpoint into request coalescing."""
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(endpoint)
+        request_param = _find_param(signature, Request)
+        response_param = _find_param(signature, Response)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            flights = group or single_flight_group
+            request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+
+            async def compute() -> _Result:
+                if inspect.iscoroutinefunction(endpoint):
+                    value = await endpoint(*args, **kwargs)
+                else:
+                    value = await run_in_threadpool(endpoint, *args, **kwargs)
+                headers = list(kwargs[response_param].headers.items()) if response_param else []
+                return _Result(value, headers)
+
+            result = await flights.do(request_key(request), compute)
+            if response_param:
+                response: Response = kwargs[response_param]
+                for name, value in result.headers:
+                    if name.lower() not in response.headers:
+                        response.headers[name] = value
+            return result.value_for_caller()
+
+        parameters = [p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD]
+        if request_param is None:
+            extra = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            parameters.append(extra)
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
@@ -3,12 +3,14 @@ from uuid import UUID
 
 from ...domain.entities.contact_number import ContactNumber
 from ...domain.repositories.contact_number_repository import ContactNumberRepository
+from ...domain.value_objects.contact_owner import ContactNumberOwner
 from ..use_cases.contact_number_use_cases import (
     CreateContactNumberUseCase,
     GetContactNumberUseCase,
     GetContactNumberByNumberUseCase,
     GetEntityContactNumbersUseCase,
     SearchContactNumbersUseCase,
+    LookupContactNumberOwnersUseCase,
     UpdateContactNumberUseCase,
     DeleteContactNumberUseCase,
     ListContactNumbersUseCase,
@@ -25,6 +27,7 @@ class ContactNumberService:
         self.get_contact_by_number_use_case = GetContactNumberByNumberUseCase(contact_repository)
         self.get_entity_contacts_use_case = GetEntityContactNumbersUseCase(contact_repository)
         self.search_contacts_use_case = SearchContactNumbersUseCase(contact_repository)
+        self.lookup_owners_use_case = LookupContactNumberOwnersUseCase(contact_repository)
         self.update_contact_use_case = UpdateContactNumberUseCase(contact_repository)
         self.delete_contact_use_case = DeleteContactNumberUseCase(contact_repository)
         self.list_contacts_use_case = ListContactNumbersUseCase(contact_repository)
@@ -52,6 +55,9 @@ class ContactNumberService:
     async def search_contact_numbers(self, query: str, limit: int = 10) -> List[ContactNumber]:
         return await self.search_contacts_use_case.execute(query, limit)
 
+    async def lookup_number_owners(self, number: str, limit: int = 10) -> List[ContactNumberOwner]:
+        return await self.lookup_owners_use_case.execute(number, limit)
+
     async def update_contact_number(
         self, 
         contact_id: UUID, 
@@ -1,12 +1,15 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities.customer import Customer
 from ...domain.entities.contact_number import ContactNumber
 from ...domain.repositories.customer_repository import CustomerRepository
 from ...domain.repositories.contact_number_repository import ContactNumberRepository
+from ...domain.services.duplicate_matching import DuplicateCandidate, MatchRecord
+from ...domain.value_objects.city import CityFacet
 from ...domain.value_objects.address import Address
-from ...domain.value_objects.phone_number import PhoneNumber
+from ...domain.value_objects.phone_number import PhoneNumber, valid_phone_numbers
+from .duplicate_detection_service import DuplicateDetectionService
 from ..use_cases.customer_use_cases import (
     CreateCustomerUseCase,
     GetCustomerUseCase,
@@ -16,14 +19,21 @@ from ..use_cases.customer_use_cases import (
     SearchCustomersUseCase,
     GetCustomerByEmailUseCase,
     GetCustomersByCityUseCase,
+    GetCustomerCityFacetsUseCase,
 )
 
 
 class CustomerService:
-    def __init__(self, customer_repository: CustomerRepository, contact_number_repository: ContactNumberRepository) -> None:
+    def __init__(
+        self,
+        customer_repository: CustomerRepository,
+        contact_number_repository: ContactNumberRepository,
+        duplicate_detector: Optional[DuplicateDetectionService] = None,
+    ) -> None:
         self.customer_repository = customer_repository
         self.contact_number_repository = contact_number_repository
-        self.create_customer_use_case = CreateCustomerUseCase(customer_repository)
+        self.duplicate_detector = duplicate_detector
+        self.create_customer_use_case = CreateCustomerUseCase(customer_repository, duplicate_detector)
         self.get_customer_use_case = GetCustomerUseCase(customer_repository)
         self.update_customer_use_case = UpdateCustomerUseCase(customer_repository)
         self.delete_customer_use_case = DeleteCustomerUseCase(customer_repository)
@@ -31,6 +41,7 @@ class CustomerService:
         self.search_customers_use_case = SearchCustomersUseCase(customer_repository)
         self.get_customer_by_email_use_case = GetCustomerByEmailUseCase(customer_repository)
         self.get_customers_by_city_use_case = GetCustomersByCityUseCase(customer_repository)
+        self.get_customer_city_facets_use_case = GetCustomerCityFacetsUseCase(customer_repository)
 
     async def create_customer(
         self,
@@ -41,11 +52,13 @@ class CustomerService:
         city: Optional[str] = None,
         address_vo: Optional[Address] = None,  # Backward compatibility
         contact_numbers: Optional[List[str]] = None,
-        created_by: Optional[str] = None
+        created_by: Optional[str] = None,
+        allow_duplicates: bool = False,
     ) -> Customer:
         # Create customer first
         customer = await self.create_customer_use_case.execute(
-            name, email, address, remarks, city, address_vo, created_by
+            name, email, address, remarks, city, address_vo, created_by,
+            phone_numbers=contact_numbers, allow_duplicates=allow_duplicates,
         )
         
         # Add contact numbers if provided
@@ -60,8 +73,13 @@ class CustomerService:
     async def get_customer_by_email(self, email: str) -> Optional[Customer]:
         return await self.get_customer_by_email_use_case.execute(email)
 
-    async def get_customers_by_city(self, city: str, limit: Optional[int] = None) -> List[Customer]:
-        return await self.get_customers_by_city_use_case.execute(city, limit)
+    async def get_customers_by_city(
+        self, city: str, limit: Optional[int] = None, prefix: bool = False
+    ) -> List[Customer]:
+        return await self.get_customers_by_city_use_case.execute(city, limit, prefix)
+
+    async def get_customer_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        return await self.get_customer_city_facets_use_case.execute(limit, prefix)
 
     async def update_customer(
         self,
@@ -95,10 +113,32 @@ class CustomerService:
     async def search_customers(self, query: str, search_fields: List[str] = None, limit: int = 10) -> List[Customer]:
         return await self.search_customers_use_case.execute(query, search_fields, limit)
 
+    async def find_duplicate_customers(
+        self,
+        name: str,
+        email: Optional[str] = None,
+        phone_numbers: Optional[List[str]] = None,
+        exclude_id: Optional[UUID] = None,
+    ) -> List[DuplicateCandidate]:
+        """Existing customers that look like the one described."""
+        if self.duplicate_detector is None:
+            return []
+        return await self.duplicate_detector.find_matches(name, email, phone_numbers, exclude_id)
+
+    async def find_duplicate_customer_clusters(self) -> List[List[MatchRecord]]:
+        """All groups of existing customers that look like duplicates of each other."""
+        if self.duplicate_detector is None:
+            return []
+        return await self.duplicate_detector.find_clusters()
+
     async def get_customer_contact_numbers(self, customer_id: UUID) -> List[ContactNumber]:
         """Get all contact numbers for a customer."""
         return await self.contact_number_repository.find_by_entity("Customer", customer_id)
 
+    async def get_contact_numbers_for_customers(self, customer_ids: List[UUID]) -> Dict[UUID, List[ContactNumber]]:
+        """Get the contact numbers of several customers, keyed by customer id."""
+        return await self.contact_number_repository.find_by_entities("Customer", customer_ids)
+
     async def add_contact_numbers(self, customer_id: UUID, contact_numbers: List[str], replace_all: bool = False) -> List[ContactNumber]:
         """Add contact numbers to a customer."""
         if replace_all:
@@ -134,10 +174,7 @@ class CustomerService:
 
     async def _replace_contact_numbers(self, customer_id: UUID, contact_numbers: List[str]) -> List[ContactNumber]:
         """Helper to replace all contact numbers for a customer."""
-        # First delete all existing contact numbers
-        existing_contacts = await self.contact_number_repository.find_by_entity("Customer", customer_id)
-        for contact in existing_contacts:
-            await self.contact_number_repository.delete(contact.id)
-        
-        # Then add new contact numbers
-        return await self._add_contact_numbers(customer_id, contact_numbers)
\ No newline at end of file
+        # Invalid phone numbers are skipped, as when adding
+        return await self.contact_number_repository.replace_for_entity(
+            "Customer", customer_id, valid_phone_numbers(contact_numbers)
+        )
\ No newline at end of file
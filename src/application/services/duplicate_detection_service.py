@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Set
+from uuid import UUID, uuid4
+
+from ...domain.repositories.duplicate_candidate_repository import DuplicateCandidateRepository
+from ...domain.services.duplicate_matching import (
+    DEFAULT_THRESHOLD,
+    DuplicateCandidate,
+    MatchRecord,
+    blocking_keys,
+    phone_suffix,
+    rank_candidates,
+    score,
+)
+
+
+class DuplicateDetectionService:
+    def __init__(
+        self,
+        candidate_repository: DuplicateCandidateRepository,
+        entity_type: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        candidate_limit: int = 50,
+        max_block_size: int = 500,
+        batch_size: int = 1000,
+    ) -> None:
+        self.candidate_repository = candidate_repository
+        self.entity_type = entity_type
+        self.threshold = threshold
+        self.candidate_limit = candidate_limit
+        self.max_block_size = max_block_size
+        self.batch_size = batch_size
+
+    async def find_matches(
+        self,
+        name: str,
+        email: Optional[str] = None,
+        phone_numbers: Optional[List[str]] = None,
+        exclude_id: Optional[UUID] = None,
+    ) -> List[DuplicateCandidate]:
+        """Existing records that are likely the same as the one described, best match first."""
+        suffixes = {suffix for suffix in map(phone_suffix, phone_numbers or []) if suffix}
+        candidates = await self.candidate_repository.find_candidates(
+            self.entity_type, blocking_keys(name, email), suffixes, exclude_id, self.candidate_limit,
+            self.max_block_size,
+        )
+        record = MatchRecord(entity_id=exclude_id or uuid4(), name=name, email=email, phone_suffixes=frozenset(suffixes))
+        return rank_candidates(record, candidates, self.threshold)
+
+    async def find_clusters(self) -> List[List[MatchRecord]]:
+        """Every group of existing records that are likely duplicates of each other, largest first."""
+        blocks = await self.candidate_repository.find_blocks(self.entity_type, self.max_block_size)
+        entity_ids = sorted({entity_id for block in blocks for entity_id in block}, key=str)
+        records: Dict[UUID, MatchRecord] = {}
+        for start in range(0, len(entity_ids), self.batch_size):
+            batch = entity_ids[start:start + self.batch_size]
+            for record in await self.candidate_repository.load_records(self.entity_type, batch):
+                records[record.entity_id] = record
+
+        parents: Dict[UUID, UUID] = {}
+
+        def find(entity_id: UUID) -> UUID:
+            parents.setdefault(entity_id, entity_id)
+            while parents[entity_id] != entity_id:
+                parents[entity_id] = parents[parents[entity_id]]
+                entity_id = parents[entity_id]
+            return entity_id
+
+        compared: Set[tuple] = set()
+        for block in blocks:
+            members = [records[entity_id] for entity_id in block if entity_id in records]
+            for index, first in enumerate(members):
+                for second in members[index + 1:]:
+                    pair = (first.entity_id, second.entity_id)
+                    if pair in compared or find(first.entity_id) == find(second.entity_id):
+                        continue
+                    compared.add(pair)
+                    if score(first, second).score >= self.threshold:
+                        parents[find(first.entity_id)] = find(second.entity_id)
+
+        clusters: Dict[UUID, List[MatchRecord]] = {}
+        for entity_id in parents:
+            clusters.setdefault(find(entity_id), []).append(records[entity_id])
+        return sorted(
+            (sorted(cluster, key=lambda record: record.name) for cluster in clusters.values() if len(cluster) > 1),
+            key=len,
+            reverse=True,
+        )
@@ -1,9 +1,12 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 
 from ...domain.entities.inventory_item_master import InventoryItemMaster
 from ...domain.repositories.inventory_item_master_repository import InventoryItemMasterRepository
+from ...domain.repositories.stock_balance_repository import StockBalanceRepository
+from ...domain.value_objects.stock_balance import StockAsOf, StockBalance
 from ..use_cases.inventory_item_master_use_cases import (
     CreateInventoryItemMasterUseCase,
     GetInventoryItemMasterUseCase,
@@ -17,12 +20,19 @@ from ..use_cases.inventory_item_master_use_cases import (
     SearchInventoryItemMastersUseCase,
     UpdateInventoryItemMasterQuantityUseCase,
     UpdateInventoryItemMasterDimensionsUseCase,
+    GetStockBalancesUseCase,
+    GetStockAsOfUseCase,
 )
 
 
 class InventoryItemMasterService:
-    def __init__(self, repository: InventoryItemMasterRepository) -> None:
+    def __init__(
+        self,
+        repository: InventoryItemMasterRepository,
+        stock_balance_repository: Optional[StockBalanceRepository] = None,
+    ) -> None:
         self.repository = repository
+        self.stock_balance_repository = stock_balance_repository
         self.create_use_case = CreateInventoryItemMasterUseCase(repository)
         self.get_use_case = GetInventoryItemMasterUseCase(repository)
         self.get_by_sku_use_case = GetInventoryItemMasterBySkuUseCase(repository)
@@ -35,6 +45,8 @@ class InventoryItemMasterService:
         self.search_use_case = SearchInventoryItemMastersUseCase(repository)
         self.update_quantity_use_case = UpdateInventoryItemMasterQuantityUseCase(repository)
         self.update_dimensions_use_case = UpdateInventoryItemMasterDimensionsUseCase(repository)
+        self.get_stock_balances_use_case = GetStockBalancesUseCase(stock_balance_repository)
+        self.get_stock_as_of_use_case = GetStockAsOfUseCase(stock_balance_repository)
 
     async def create_inventory_item_master(
         self,
@@ -83,6 +95,10 @@ class InventoryItemMasterService:
     async def get_inventory_item_master(self, inventory_item_id: UUID) -> Optional[InventoryItemMaster]:
         return await self.get_use_case.execute(inventory_item_id)
 
+    async def get_inventory_item_master_version(self, inventory_item_id: UUID) -> Optional[datetime]:
+        """Get the last modification time of an inventory item master without loading it"""
+        return await self.repository.get_version(inventory_item_id)
+
     async def get_inventory_item_master_by_sku(self, sku: str) -> Optional[InventoryItemMaster]:
         return await self.get_by_sku_use_case.execute(sku)
 
@@ -185,4 +201,22 @@ class InventoryItemMasterService:
 
     async def get_stats(self) -> dict:
         """Get statistics for inventory item masters"""
-        return await self.repository.get_stats()
\ No newline at end of file
+        return await self.repository.get_stats()
+
+    async def get_stock_balances(
+        self,
+        inventory_item_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> List[StockBalance]:
+        """Get the stock on hand of an item per warehouse and status"""
+        return await self.get_stock_balances_use_case.execute(inventory_item_id, warehouse_id, status)
+
+    async def get_stock_as_of(
+        self,
+        as_of: datetime,
+        inventory_item_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+    ) -> StockAsOf:
+        """Get the stock on hand per item and warehouse at a past moment"""
+        return await self.get_stock_as_of_use_case.execute(as_of, inventory_item_id, warehouse_id)
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from ...domain.entities.item_category import ItemCategory, ItemSubCategory
 from ...domain.repositories.item_category_repository import ItemCategoryRepository, ItemSubCategoryRepository
+from ...domain.value_objects.category_tree import CategoryTreeNode
 from ..use_cases.item_category_use_cases import (
     CreateItemCategoryUseCase,
     GetItemCategoryUseCase,
@@ -11,6 +12,8 @@ from ..use_cases.item_category_use_cases import (
     UpdateItemCategoryUseCase,
     DeleteItemCategoryUseCase,
     ListItemCategoriesUseCase,
+    GetItemCategoryTreeUseCase,
+    CountItemCategoriesUseCase,
     SearchItemCategoriesUseCase,
     CreateItemSubCategoryUseCase,
     GetItemSubCategoryUseCase,
@@ -33,6 +36,8 @@ class ItemCategoryService:
         self.update_category_use_case = UpdateItemCategoryUseCase(category_repository)
         self.delete_category_use_case = DeleteItemCategoryUseCase(category_repository)
         self.list_categories_use_case = ListItemCategoriesUseCase(category_repository)
+        self.get_category_tree_use_case = GetItemCategoryTreeUseCase(category_repository)
+        self.count_categories_use_case = CountItemCategoriesUseCase(category_repository)
         self.search_categories_use_case = SearchItemCategoriesUseCase(category_repository)
         # Subcategory use cases - Note: Using same repository for both subcategory and category operations
         self.create_subcategory_use_case = CreateItemSubCategoryUseCase(category_repository, category_repository)
@@ -74,6 +79,14 @@ class ItemCategoryService:
     async def list_categories(self, skip: int = 0, limit: int = 100) -> List[ItemCategory]:
         return await self.list_categories_use_case.execute(skip, limit)
 
+    async def get_category_tree(
+        self, skip: int = 0, limit: Optional[int] = None, active_only: bool = False
+    ) -> List[CategoryTreeNode]:
+        return await self.get_category_tree_use_case.execute(skip, limit, active_only)
+
+    async def count_categories(self, active_only: bool = False) -> int:
+        return await self.count_categories_use_case.execute(active_only)
+
     async def search_categories(self, query: str, search_fields: Optional[List[str]] = None, limit: int = 10) -> List[ItemCategory]:
         # Note: search_fields parameter is ignored as the underlying use case doesn't support field-specific search
         return await self.search_categories_use_case.execute(query, limit)
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities.item_packaging import ItemPackaging
+from ...domain.value_objects.page import Page
 from ...domain.repositories.item_packaging_repository import ItemPackagingRepository
 
 
@@ -42,6 +44,17 @@ class ItemPackagingService:
     ) -> List[ItemPackaging]:
         return await self.item_packaging_repository.get_all(skip, limit, active_only)
 
+    async def get_item_packagings_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[ItemPackaging]:
+        return await self.item_packaging_repository.get_page(page_size, cursor, page, active_only, search, ordering)
+
     async def update_item_packaging(
         self,
         item_packaging_id: UUID,
@@ -93,3 +106,7 @@ class ItemPackagingService:
         self, name: str, skip: int = 0, limit: int = 100
     ) -> List[ItemPackaging]:
         return await self.item_packaging_repository.search_by_name(name, skip, limit)
+
+    async def get_item_packaging_stats(self, recent_days: int = 30, top_units: int = 5) -> Dict[str, Any]:
+        recent_since = datetime.now(timezone.utc) - timedelta(days=recent_days)
+        return await self.item_packaging_repository.get_stats(recent_since, top_units)
@@ -1,6 +1,6 @@
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
 from sqlalchemy.orm import Session
 
@@ -9,6 +9,13 @@ from ...domain.repositories.purchase_order_repository import PurchaseOrderReposi
 from ...domain.repositories.purchase_order_line_item_repository import PurchaseOrderLineItemRepository
 from ...domain.repositories.vendor_repository import VendorRepository
 from ...domain.repositories.inventory_item_master_repository import InventoryItemMasterRepository
+from ...domain.repositories.warehouse_repository import WarehouseRepository
+from ...domain.repositories.vendor_rollup_repository import VendorRollupRepository
+from ...domain.value_objects.last_purchase_price import LastPurchasePrice
+from ...domain.value_objects.page import Page
+from ...domain.value_objects.purchase_order_details import PurchaseOrderDetails
+from ...domain.value_objects.purchase_order_import import PurchaseOrderImportResult
+from ...domain.value_objects.vendor_rollup import VendorMonthlyRollup
 from ..use_cases.purchase_order_use_cases import (
     CreatePurchaseOrderUseCase,
     UpdatePurchaseOrderUseCase,
@@ -18,6 +25,9 @@ from ..use_cases.purchase_order_use_cases import (
     GetPurchaseOrderDetailsUseCase,
     ListPurchaseOrdersUseCase,
     SearchPurchaseOrdersUseCase,
+    GetVendorMonthlyRollupsUseCase,
+    GetLastPurchasePricesUseCase,
+    ImportPurchaseOrdersUseCase,
 )
 
 
@@ -29,11 +39,15 @@ class PurchaseOrderService:
         vendor_repository: VendorRepository,
         inventory_repository: InventoryItemMasterRepository,
         session: Session,
+        warehouse_repository: Optional[WarehouseRepository] = None,
+        vendor_rollup_repository: Optional[VendorRollupRepository] = None,
     ) -> None:
         self.purchase_order_repository = purchase_order_repository
         self.line_item_repository = line_item_repository
         self.vendor_repository = vendor_repository
         self.inventory_repository = inventory_repository
+        self.warehouse_repository = warehouse_repository
+        self.vendor_rollup_repository = vendor_rollup_repository
         self.session = session
         
         # Initialize use cases
@@ -42,6 +56,7 @@ class PurchaseOrderService:
             line_item_repository,
             vendor_repository,
             inventory_repository,
+            warehouse_repository,
         )
         self.update_purchase_order_use_case = UpdatePurchaseOrderUseCase(
             purchase_order_repository,
@@ -59,8 +74,7 @@ class PurchaseOrderService:
             purchase_order_repository
         )
         self.get_purchase_order_details_use_case = GetPurchaseOrderDetailsUseCase(
-            purchase_order_repository,
-            line_item_repository,
+            purchase_order_repository
         )
         self.list_purchase_orders_use_case = ListPurchaseOrdersUseCase(
             purchase_order_repository
@@ -68,6 +82,18 @@ class PurchaseOrderService:
         self.search_purchase_orders_use_case = SearchPurchaseOrdersUseCase(
             purchase_order_repository
         )
+        self.get_vendor_monthly_rollups_use_case = GetVendorMonthlyRollupsUseCase(
+            vendor_rollup_repository
+        )
+        self.get_last_purchase_prices_use_case = GetLastPurchasePricesUseCase(
+            line_item_repository
+        )
+        self.import_purchase_orders_use_case = ImportPurchaseOrdersUseCase(
+            purchase_order_repository,
+            vendor_repository,
+            inventory_repository,
+            warehouse_repository,
+        )
 
     async def create_purchase_order(
         self,
@@ -132,27 +158,39 @@ class PurchaseOrderService:
         """Get a purchase order by ID."""
         return await self.get_purchase_order_use_case.execute(purchase_order_id)
 
-    async def get_purchase_order_details(self, purchase_order_id: UUID) -> Dict[str, Any]:
+    async def get_purchase_order_version(self, purchase_order_id: UUID) -> Optional[datetime]:
+        """Get the version marker of a purchase order without loading it."""
+        return await self.purchase_order_repository.get_version(purchase_order_id)
+
+    async def get_purchase_orders_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the version marker of the purchase order collection."""
+        return await self.purchase_order_repository.get_collection_version()
+
+    async def get_purchase_order_details(self, purchase_order_id: UUID) -> PurchaseOrderDetails:
         """Get detailed information about a purchase order including line items."""
         return await self.get_purchase_order_details_use_case.execute(purchase_order_id)
 
     async def list_purchase_orders(
         self,
-        skip: int = 0,
-        limit: int = 100,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
         vendor_id: Optional[UUID] = None,
         status: Optional[PurchaseOrderStatus] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> List[PurchaseOrder]:
-        """List purchase orders with optional filters."""
+        ordering: Optional[str] = None,
+    ) -> Page[PurchaseOrder]:
+        """List one page of purchase orders matching all of the given filters."""
         return await self.list_purchase_orders_use_case.execute(
-            skip=skip,
-            limit=limit,
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
             vendor_id=vendor_id,
             status=status,
             start_date=start_date,
             end_date=end_date,
+            ordering=ordering,
         )
 
     async def search_purchase_orders(
@@ -202,7 +240,7 @@ class PurchaseOrderService:
     async def get_purchase_order_summary(self, purchase_order_id: UUID) -> Dict[str, Any]:
         """Get a summary of a purchase order."""
         details = await self.get_purchase_order_details(purchase_order_id)
-        purchase_order = details["purchase_order"]
+        purchase_order = details.purchase_order
         
         return {
             "order_number": purchase_order.order_number,
@@ -215,9 +253,34 @@ class PurchaseOrderService:
                 else None
             ),
             "grand_total": str(purchase_order.grand_total),
-            "total_items": details["total_items"],
-            "items_received": details["items_received"],
-            "items_pending": details["items_pending"],
+            "total_items": details.total_items,
+            "items_received": details.items_received,
+            "items_pending": details.items_pending,
             "is_editable": purchase_order.is_editable(),
             "is_receivable": purchase_order.is_receivable(),
-        }
\ No newline at end of file
+        }
+
+    async def get_vendor_monthly_rollups(
+        self,
+        vendor_id: Optional[UUID] = None,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> List[VendorMonthlyRollup]:
+        """Get purchasing spend and delivery lag per vendor and month."""
+        return await self.get_vendor_monthly_rollups_use_case.execute(vendor_id, start_month, end_month)
+
+    async def get_last_purchase_prices(
+        self,
+        inventory_item_master_ids: List[UUID],
+        vendor_id: Optional[UUID] = None,
+    ) -> List[LastPurchasePrice]:
+        """Get the last price paid per item and vendor, for pre-filling a new order."""
+        return await self.get_last_purchase_prices_use_case.execute(inventory_item_master_ids, vendor_id)
+
+    async def import_purchase_orders(
+        self,
+        rows: Iterable[Dict[str, Optional[str]]],
+        created_by: Optional[str] = None,
+    ) -> PurchaseOrderImportResult:
+        """Bulk create purchase orders from CSV rows, reporting the rows that were rejected."""
+        return await self.import_purchase_orders_use_case.execute(rows, created_by)
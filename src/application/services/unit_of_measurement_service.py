@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities.unit_of_measurement import UnitOfMeasurement
+from ...domain.value_objects.page import Page
 from ...domain.repositories.unit_of_measurement_repository import UnitOfMeasurementRepository
 
 
@@ -48,6 +49,17 @@ class UnitOfMeasurementService:
     ) -> List[UnitOfMeasurement]:
         return await self.unit_repository.get_all(skip, limit, active_only)
 
+    async def get_units_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[UnitOfMeasurement]:
+        return await self.unit_repository.get_page(page_size, cursor, page, active_only, search, ordering)
+
     async def update_unit_of_measurement(
         self,
         unit_id: UUID,
@@ -103,3 +115,6 @@ class UnitOfMeasurementService:
 
     async def count_units(self, active_only: bool = False) -> int:
         return await self.unit_repository.count(active_only)
+
+    async def get_unit_stats(self) -> Dict[str, int]:
+        return await self.unit_repository.get_stats()
@@ -1,13 +1,20 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from ...domain.entities.contact_number import ContactNumber
 from ...domain.entities.vendor import Vendor
+from ...domain.repositories.contact_number_repository import ContactNumberRepository
 from ...domain.repositories.vendor_repository import VendorRepository
+from ...domain.services.duplicate_matching import DuplicateCandidate, MatchRecord
+from ...domain.value_objects.city import CityFacet
+from ...domain.value_objects.phone_number import valid_phone_numbers
+from .duplicate_detection_service import DuplicateDetectionService
 from ..use_cases.vendor_use_cases import (
     CreateVendorUseCase,
     GetVendorUseCase,
     GetVendorByEmailUseCase,
     GetVendorsByCityUseCase,
+    GetVendorCityFacetsUseCase,
     UpdateVendorUseCase,
     DeleteVendorUseCase,
     ListVendorsUseCase,
@@ -16,12 +23,20 @@ from ..use_cases.vendor_use_cases import (
 
 
 class VendorService:
-    def __init__(self, vendor_repository: VendorRepository) -> None:
+    def __init__(
+        self,
+        vendor_repository: VendorRepository,
+        contact_number_repository: Optional[ContactNumberRepository] = None,
+        duplicate_detector: Optional[DuplicateDetectionService] = None,
+    ) -> None:
         self.vendor_repository = vendor_repository
-        self.create_vendor_use_case = CreateVendorUseCase(vendor_repository)
+        self.contact_number_repository = contact_number_repository
+        self.duplicate_detector = duplicate_detector
+        self.create_vendor_use_case = CreateVendorUseCase(vendor_repository, duplicate_detector)
         self.get_vendor_use_case = GetVendorUseCase(vendor_repository)
         self.get_vendor_by_email_use_case = GetVendorByEmailUseCase(vendor_repository)
         self.get_vendors_by_city_use_case = GetVendorsByCityUseCase(vendor_repository)
+        self.get_vendor_city_facets_use_case = GetVendorCityFacetsUseCase(vendor_repository)
         self.update_vendor_use_case = UpdateVendorUseCase(vendor_repository)
         self.delete_vendor_use_case = DeleteVendorUseCase(vendor_repository)
         self.list_vendors_use_case = ListVendorsUseCase(vendor_repository)
@@ -35,10 +50,16 @@ class VendorService:
         remarks: Optional[str] = None,
         city: Optional[str] = None,
         created_by: Optional[str] = None,
+        contact_numbers: Optional[List[str]] = None,
+        allow_duplicates: bool = False,
     ) -> Vendor:
-        return await self.create_vendor_use_case.execute(
-            name, email, address, remarks, city, created_by
+        vendor = await self.create_vendor_use_case.execute(
+            name, email, address, remarks, city, created_by,
+            phone_numbers=contact_numbers, allow_duplicates=allow_duplicates,
         )
+        if contact_numbers:
+            await self.replace_vendor_contact_numbers(vendor.id, contact_numbers)
+        return vendor
 
     async def get_vendor(self, vendor_id: UUID) -> Optional[Vendor]:
         return await self.get_vendor_use_case.execute(vendor_id)
@@ -46,8 +67,13 @@ class VendorService:
     async def get_vendor_by_email(self, email: str) -> Optional[Vendor]:
         return await self.get_vendor_by_email_use_case.execute(email)
 
-    async def get_vendors_by_city(self, city: str, limit: Optional[int] = None) -> List[Vendor]:
-        return await self.get_vendors_by_city_use_case.execute(city, limit)
+    async def get_vendors_by_city(
+        self, city: str, limit: Optional[int] = None, prefix: bool = False
+    ) -> List[Vendor]:
+        return await self.get_vendors_by_city_use_case.execute(city, limit, prefix)
+
+    async def get_vendor_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        return await self.get_vendor_city_facets_use_case.execute(limit, prefix)
 
     async def update_vendor(
         self,
@@ -58,10 +84,15 @@ class VendorService:
         remarks: Optional[str] = None,
         city: Optional[str] = None,
         is_active: Optional[bool] = None,
+        contact_numbers: Optional[List[str]] = None,
     ) -> Vendor:
-        return await self.update_vendor_use_case.execute(
+        vendor = await self.update_vendor_use_case.execute(
             vendor_id, name, email, address, remarks, city, is_active
         )
+        # Update contact numbers if provided (replace all existing)
+        if contact_numbers is not None:
+            await self.replace_vendor_contact_numbers(vendor_id, contact_numbers)
+        return vendor
 
     async def delete_vendor(self, vendor_id: UUID) -> bool:
         return await self.delete_vendor_use_case.execute(vendor_id)
@@ -70,4 +101,42 @@ class VendorService:
         return await self.list_vendors_use_case.execute(skip, limit)
 
     async def search_vendors(self, query: str, search_fields: List[str] = None, limit: int = 10) -> List[Vendor]:
-        return await self.search_vendors_use_case.execute(query, search_fields, limit)
\ No newline at end of file
+        return await self.search_vendors_use_case.execute(query, search_fields, limit)
+
+    async def find_duplicate_vendors(
+        self,
+        name: str,
+        email: Optional[str] = None,
+        phone_numbers: Optional[List[str]] = None,
+        exclude_id: Optional[UUID] = None,
+    ) -> List[DuplicateCandidate]:
+        """Existing vendors that look like the one described."""
+        if self.duplicate_detector is None:
+            return []
+        return await self.duplicate_detector.find_matches(name, email, phone_numbers, exclude_id)
+
+    async def find_duplicate_vendor_clusters(self) -> List[List[MatchRecord]]:
+        """All groups of existing vendors that look like duplicates of each other."""
+        if self.duplicate_detector is None:
+            return []
+        return await self.duplicate_detector.find_clusters()
+
+    async def get_vendor_contact_numbers(self, vendor_id: UUID) -> List[ContactNumber]:
+        """Get all contact numbers for a vendor."""
+        if self.contact_number_repository is None:
+            return []
+        return await self.contact_number_repository.find_by_entity("Vendor", vendor_id)
+
+    async def get_contact_numbers_for_vendors(self, vendor_ids: List[UUID]) -> Dict[UUID, List[ContactNumber]]:
+        """Get the contact numbers of several vendors, keyed by vendor id."""
+        if self.contact_number_repository is None:
+            return {vendor_id: [] for vendor_id in vendor_ids}
+        return await self.contact_number_repository.find_by_entities("Vendor", vendor_ids)
+
+    async def replace_vendor_contact_numbers(self, vendor_id: UUID, contact_numbers: List[str]) -> List[ContactNumber]:
+        """Replace all contact numbers for a vendor, skipping invalid ones."""
+        if self.contact_number_repository is None:
+            raise ValueError("Contact numbers are not available for vendors")
+        return await self.contact_number_repository.replace_for_entity(
+            "Vendor", vendor_id, valid_phone_numbers(contact_numbers)
+        )
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from ...domain.entities.warehouse import Warehouse
+from ...domain.value_objects.page import Page
 from ...domain.repositories.warehouse_repository import WarehouseRepository
 
 
@@ -35,11 +37,28 @@ class WarehouseService:
     async def get_warehouse_by_label(self, label: str) -> Optional[Warehouse]:
         return await self.warehouse_repository.get_by_label(label)
 
+    async def get_warehouse_version(self, warehouse_id: UUID) -> Optional[datetime]:
+        return await self.warehouse_repository.get_version(warehouse_id)
+
+    async def get_warehouses_version(self) -> Tuple[int, Optional[datetime]]:
+        return await self.warehouse_repository.get_collection_version()
+
     async def get_all_warehouses(
         self, skip: int = 0, limit: int = 100, active_only: bool = True
     ) -> List[Warehouse]:
         return await self.warehouse_repository.get_all(skip, limit, active_only)
 
+    async def get_warehouses_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[Warehouse]:
+        return await self.warehouse_repository.get_page(page_size, cursor, page, active_only, search, ordering)
+
     async def update_warehouse(
         self,
         warehouse_id: UUID,
@@ -88,3 +107,7 @@ class WarehouseService:
         self, name: str, skip: int = 0, limit: int = 100
     ) -> List[Warehouse]:
         return await self.warehouse_repository.search_by_name(name, skip, limit)
+
+    async def get_warehouse_stats(self, recent_days: int = 30) -> Dict[str, int]:
+        recent_since = datetime.now(timezone.utc) - timedelta(days=recent_days)
+        return await self.warehouse_repository.get_stats(recent_since)
@@ -1,8 +1,10 @@
+import re
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
 from ...domain.entities.contact_number import ContactNumber
 from ...domain.repositories.contact_number_repository import ContactNumberRepository
+from ...domain.value_objects.contact_owner import ContactNumberOwner
 from ...domain.value_objects.phone_number import PhoneNumber
 
 
@@ -65,6 +67,19 @@ class SearchContactNumbersUseCase:
         return await self.contact_repository.search_by_number(query, limit)
 
 
+class LookupContactNumberOwnersUseCase:
+    MIN_DIGITS = 4
+
+    def __init__(self, contact_repository: ContactNumberRepository) -> None:
+        self.contact_repository = contact_repository
+
+    async def execute(self, number: str, limit: int = 10) -> List[ContactNumberOwner]:
+        # Very short suffixes would match a large part of the table
+        if len(re.sub(r"\D", "", number)) < self.MIN_DIGITS:
+            raise ValueError(f"Phone number lookup needs at least {self.MIN_DIGITS} digits")
+        return await self.contact_repository.find_owners_by_number(number, limit)
+
+
 class UpdateContactNumberUseCase:
     def __init__(self, contact_repository: ContactNumberRepository) -> None:
         self.contact_repository = contact_repository
@@ -3,12 +3,20 @@ from uuid import UUID
 
 from ...domain.entities.customer import Customer
 from ...domain.repositories.customer_repository import CustomerRepository
+from ...domain.services.duplicate_matching import PossibleDuplicateError
 from ...domain.value_objects.address import Address
+from ...domain.value_objects.city import CityFacet
+from ..services.duplicate_detection_service import DuplicateDetectionService
 
 
 class CreateCustomerUseCase:
-    def __init__(self, customer_repository: CustomerRepository) -> None:
+    def __init__(
+        self,
+        customer_repository: CustomerRepository,
+        duplicate_detector: Optional[DuplicateDetectionService] = None,
+    ) -> None:
         self.customer_repository = customer_repository
+        self.duplicate_detector = duplicate_detector
 
     async def execute(
         self, 
@@ -18,12 +26,20 @@ class CreateCustomerUseCase:
         remarks: Optional[str] = None,
         city: Optional[str] = None,
         address_vo: Optional[Address] = None,  # Backward compatibility
-        created_by: Optional[str] = None
+        created_by: Optional[str] = None,
+        phone_numbers: Optional[List[str]] = None,
+        allow_duplicates: bool = False,
     ) -> Customer:
         # Check for duplicate email if provided
         if email and hasattr(self.customer_repository, 'exists_by_email'):
             if await self.customer_repository.exists_by_email(email):
                 raise ValueError(f"Customer with email {email} already exists")
+
+        # Check for customers that look like the same person or business
+        if self.duplicate_detector and not allow_duplicates:
+            matches = await self.duplicate_detector.find_matches(name, email, phone_numbers)
+            if matches:
+                raise PossibleDuplicateError("Customer", matches)
         
         customer = Customer(
             name=name, 
@@ -132,7 +148,19 @@ class GetCustomersByCityUseCase:
     def __init__(self, customer_repository: CustomerRepository) -> None:
         self.customer_repository = customer_repository
 
-    async def execute(self, city: str, limit: Optional[int] = None) -> List[Customer]:
+    async def execute(self, city: str, limit: Optional[int] = None, prefix: bool = False) -> List[Customer]:
+        if prefix:
+            return await self.customer_repository.find_by_city_prefix(city, limit)
         if hasattr(self.customer_repository, 'find_by_city'):
             return await self.customer_repository.find_by_city(city, limit)
-        return []
\ No newline at end of file
+        return []
+
+
+class GetCustomerCityFacetsUseCase:
+    def __init__(self, customer_repository: CustomerRepository) -> None:
+        self.customer_repository = customer_repository
+
+    async def execute(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        if limit < 1:
+            raise ValueError("Facet limit must be at least 1")
+        return await self.customer_repository.get_city_facets(limit, prefix)
@@ -1,9 +1,14 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 
 from ...domain.entities.inventory_item_master import InventoryItemMaster
 from ...domain.repositories.inventory_item_master_repository import InventoryItemMasterRepository
+from ...domain.repositories.stock_balance_repository import StockBalanceRepository
+from ...domain.value_objects.stock_balance import StockAsOf, StockBalance
+
+STOCK_STATUSES = ("AVAILABLE", "RENTED", "SOLD", "MAINTENANCE", "RETIRED", "LOST")
 
 
 class CreateInventoryItemMasterUseCase:
@@ -235,4 +240,38 @@ class UpdateInventoryItemMasterDimensionsUseCase:
             raise ValueError(f"Inventory item with id {inventory_item_id} not found")
         
         inventory_item.update_dimensions(weight, length, width, height)
-        return await self.repository.update(inventory_item)
\ No newline at end of file
+        return await self.repository.update(inventory_item)
+
+
+class GetStockBalancesUseCase:
+    def __init__(self, stock_balance_repository: StockBalanceRepository) -> None:
+        self.stock_balance_repository = stock_balance_repository
+
+    async def execute(
+        self,
+        inventory_item_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> List[StockBalance]:
+        if status is not None:
+            status = status.upper()
+            if status not in STOCK_STATUSES:
+                raise ValueError(f"Invalid stock status: {status}. Allowed: {', '.join(STOCK_STATUSES)}")
+        return await self.stock_balance_repository.find_balances(inventory_item_id, warehouse_id, status)
+
+
+class GetStockAsOfUseCase:
+    def __init__(self, stock_balance_repository: StockBalanceRepository) -> None:
+        self.stock_balance_repository = stock_balance_repository
+
+    async def execute(
+        self,
+        as_of: datetime,
+        inventory_item_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+    ) -> StockAsOf:
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=timezone.utc)
+        if as_of > datetime.now(timezone.utc):
+            raise ValueError("As-of time cannot be in the future")
+        return await self.stock_balance_repository.find_levels_as_of(as_of, inventory_item_id, warehouse_id)
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from ...domain.entities.item_category import ItemCategory, ItemSubCategory
 from ...domain.repositories.item_category_repository import ItemCategoryRepository, ItemSubCategoryRepository
+from ...domain.value_objects.category_tree import CategoryTreeNode
 
 
 class CreateItemCategoryUseCase:
@@ -115,6 +116,24 @@ class ListItemCategoriesUseCase:
         return await self.category_repository.find_all(skip, limit)
 
 
+class GetItemCategoryTreeUseCase:
+    def __init__(self, category_repository: ItemCategoryRepository) -> None:
+        self.category_repository = category_repository
+
+    async def execute(
+        self, skip: int = 0, limit: Optional[int] = None, active_only: bool = False
+    ) -> List[CategoryTreeNode]:
+        return await self.category_repository.find_category_tree(skip, limit, active_only)
+
+
+class CountItemCategoriesUseCase:
+    def __init__(self, category_repository: ItemCategoryRepository) -> None:
+        self.category_repository = category_repository
+
+    async def execute(self, active_only: bool = False) -> int:
+        return await self.category_repository.count_categories(active_only)
+
+
 class SearchItemCategoriesUseCase:
     def __init__(self, category_repository: ItemCategoryRepository) -> None:
         self.category_repository = category_repository
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities.item_packaging import ItemPackaging
+from ...domain.value_objects.page import Page
 from ..services.item_packaging_service import ItemPackagingService
 
 
@@ -40,6 +41,20 @@ class ItemPackagingUseCases:
         """List all item packagings with pagination"""
         return await self.item_packaging_service.get_all_item_packagings(skip, limit, active_only)
 
+    async def list_item_packagings_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[ItemPackaging]:
+        """List one ordered page of item packagings"""
+        return await self.item_packaging_service.get_item_packagings_page(
+            page_size, cursor, page, active_only, search, ordering
+        )
+
     async def update_item_packaging(
         self,
         item_packaging_id: UUID,
@@ -70,3 +85,7 @@ class ItemPackagingUseCases:
     ) -> List[ItemPackaging]:
         """Search item packagings by name"""
         return await self.item_packaging_service.search_item_packagings_by_name(name, skip, limit)
+
+    async def get_item_packaging_stats(self, recent_days: int = 30, top_units: int = 5) -> Dict[str, Any]:
+        """Get aggregate item packaging counts for the overview"""
+        return await self.item_packaging_service.get_item_packaging_stats(recent_days, top_units)
@@ -1,7 +1,9 @@
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+import csv
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
+from uuid import UUID, uuid4
 from datetime import date
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 from ...domain.entities.purchase_order import PurchaseOrder, PurchaseOrderStatus
 from ...domain.entities.purchase_order_line_item import PurchaseOrderLineItem
@@ -9,10 +11,20 @@ from ...domain.repositories.purchase_order_repository import PurchaseOrderReposi
 from ...domain.repositories.purchase_order_line_item_repository import PurchaseOrderLineItemRepository
 from ...domain.repositories.vendor_repository import VendorRepository
 from ...domain.repositories.inventory_item_master_repository import InventoryItemMasterRepository
-from ...infrastructure.database.models import InventoryItemStockMovementModel, MovementType, LineItemModel
+from ...domain.repositories.warehouse_repository import WarehouseRepository
+from ...domain.repositories.vendor_rollup_repository import VendorRollupRepository
+from ...domain.value_objects.last_purchase_price import LastPurchasePrice
+from ...domain.value_objects.page import Page
+from ...domain.value_objects.purchase_order_details import PurchaseOrderDetails
+from ...domain.value_objects.purchase_order_import import ImportRowError, PurchaseOrderImportResult
+from ...domain.value_objects.vendor_rollup import VendorMonthlyRollup
 from sqlalchemy.orm import Session
 
 
+def _format_ids(ids) -> str:
+    return ", ".join(sorted(str(id_) for id_ in ids))
+
+
 class CreatePurchaseOrderUseCase:
     def __init__(
         self,
@@ -20,11 +32,13 @@ class CreatePurchaseOrderUseCase:
         line_item_repository: PurchaseOrderLineItemRepository,
         vendor_repository: VendorRepository,
         inventory_repository: InventoryItemMasterRepository,
+        warehouse_repository: Optional[WarehouseRepository] = None,
     ) -> None:
         self.purchase_order_repository = purchase_order_repository
         self.line_item_repository = line_item_repository
         self.vendor_repository = vendor_repository
         self.inventory_repository = inventory_repository
+        self.warehouse_repository = warehouse_repository
 
     async def execute(
         self,
@@ -42,6 +56,18 @@ class CreatePurchaseOrderUseCase:
         if not vendor:
             raise ValueError(f"Vendor with ID {vendor_id} not found")
 
+        # Validate every referenced inventory item and warehouse with one query each
+        item_ids = {item_data["inventory_item_master_id"] for item_data in items}
+        missing_items = item_ids - await self.inventory_repository.find_existing_ids(item_ids)
+        if missing_items:
+            raise ValueError(f"Inventory items not found: {_format_ids(missing_items)}")
+
+        if self.warehouse_repository is not None:
+            warehouse_ids = {item_data["warehouse_id"] for item_data in items}
+            missing_warehouses = warehouse_ids - await self.warehouse_repository.find_existing_ids(warehouse_ids)
+            if missing_warehouses:
+                raise ValueError(f"Warehouses not found: {_format_ids(missing_warehouses)}")
+
         # Generate order number
         order_number = await self.purchase_order_repository.get_next_order_number()
 
@@ -57,25 +83,15 @@ class CreatePurchaseOrderUseCase:
             created_by=created_by,
         )
 
-        # Save purchase order
-        saved_order = await self.purchase_order_repository.save(purchase_order)
-
-        # Process line items
+        # Build line items and totals in one pass
+        line_items = []
         total_amount = Decimal("0.00")
         total_tax = Decimal("0.00")
         total_discount = Decimal("0.00")
         
         for item_data in items:
-            # Validate inventory item and warehouse
-            inventory_item = await self.inventory_repository.find_by_id(item_data["inventory_item_master_id"])
-            if not inventory_item:
-                raise ValueError(f"Inventory item with ID {item_data['inventory_item_master_id']} not found")
-            
-            # Note: Warehouse validation could be added here if we have a sync warehouse repository
-
-            # Create line item
             line_item = PurchaseOrderLineItem(
-                purchase_order_id=saved_order.id,
+                purchase_order_id=purchase_order.id,
                 inventory_item_master_id=item_data["inventory_item_master_id"],
                 warehouse_id=item_data["warehouse_id"],
                 quantity=item_data["quantity"],
@@ -96,18 +112,16 @@ class CreatePurchaseOrderUseCase:
                 selling_price=Decimal(str(item_data.get("selling_price", 0))),
                 created_by=created_by,
             )
+            line_items.append(line_item)
 
-            # Save line item
-            await self.line_item_repository.save(line_item)
-
-            # Update totals
             total_amount += line_item.amount
             total_tax += line_item.tax_amount
             total_discount += line_item.discount
 
-        # Update purchase order totals
-        saved_order.update_totals(total_amount, total_tax, total_discount)
-        return await self.purchase_order_repository.update(saved_order)
+        purchase_order.update_totals(total_amount, total_tax, total_discount)
+
+        # Order, line items and totals are written and committed together
+        return await self.purchase_order_repository.save_with_line_items(purchase_order, line_items)
 
 
 class UpdatePurchaseOrderUseCase:
@@ -163,7 +177,7 @@ class ReceivePurchaseOrderUseCase:
         self,
         purchase_order_repository: PurchaseOrderRepository,
         line_item_repository: PurchaseOrderLineItemRepository,
-        session: Session,  # Need direct session access for stock movements
+        session: Optional[Session] = None,
     ) -> None:
         self.purchase_order_repository = purchase_order_repository
         self.line_item_repository = line_item_repository
@@ -174,93 +188,20 @@ class ReceivePurchaseOrderUseCase:
         purchase_order_id: UUID,
         received_items: List[Dict[str, Any]],  # [{"line_item_id": UUID, "quantity": int}]
     ) -> PurchaseOrder:
-        # Get purchase order
-        purchase_order = await self.purchase_order_repository.find_by_id(purchase_order_id)
-        if not purchase_order:
-            raise ValueError(f"Purchase order with ID {purchase_order_id} not found")
-
-        # Check if receivable
-        if not purchase_order.is_receivable():
-            raise ValueError(f"Purchase order with status {purchase_order.status.value} cannot receive items")
-
-        # Process each received item
-        all_fully_received = True
-        any_received = False
+        if not received_items:
+            raise ValueError("No items to receive")
 
+        # Several entries for the same line are received together
+        quantities: Dict[UUID, int] = {}
         for item_data in received_items:
-            line_item = await self.line_item_repository.find_by_id(item_data["line_item_id"])
-            if not line_item:
-                raise ValueError(f"Line item with ID {item_data['line_item_id']} not found")
-            
-            if line_item.purchase_order_id != purchase_order_id:
-                raise ValueError(f"Line item {item_data['line_item_id']} does not belong to this purchase order")
-
-            # Record receipt
-            line_item.receive_items(item_data["quantity"])
-            await self.line_item_repository.update(line_item)
-
-            # Create or update inventory line item
-            line_item_model = self.session.query(LineItemModel).filter(
-                LineItemModel.inventory_item_master_id == line_item.inventory_item_master_id,
-                LineItemModel.warehouse_id == line_item.warehouse_id,
-                LineItemModel.serial_number == line_item.serial_number
-            ).first()
-
-            if not line_item_model:
-                # Create new line item
-                line_item_model = LineItemModel(
-                    inventory_item_master_id=line_item.inventory_item_master_id,
-                    warehouse_id=line_item.warehouse_id,
-                    serial_number=line_item.serial_number,
-                    quantity=0,
-                    rental_rate=float(line_item.rental_rate),
-                    replacement_cost=float(line_item.replacement_cost),
-                    late_fee_rate=float(line_item.late_fee_rate),
-                    sell_tax_rate=line_item.sell_tax_rate,
-                    rent_tax_rate=line_item.rent_tax_rate,
-                    rentable=line_item.rentable,
-                    sellable=line_item.sellable,
-                    selling_price=float(line_item.selling_price),
-                    warranty_period_type=line_item.warranty_period_type.value if line_item.warranty_period_type else None,
-                    warranty_period=line_item.warranty_period,
-                )
-                self.session.add(line_item_model)
-                self.session.flush()
-
-            # Update quantity
-            quantity_before = line_item_model.quantity
-            line_item_model.quantity += item_data["quantity"]
-            quantity_after = line_item_model.quantity
-
-            # Create stock movement record
-            movement = InventoryItemStockMovementModel(
-                inventory_item_id=line_item_model.id,
-                movement_type=MovementType.PURCHASE,
-                inventory_transaction_id=purchase_order.order_number,
-                quantity=item_data["quantity"],
-                quantity_on_hand_before=quantity_before,
-                quantity_on_hand_after=quantity_after,
-                warehouse_to_id=line_item.warehouse_id,
-                notes=f"Purchase order receipt: {purchase_order.order_number}"
-            )
-            self.session.add(movement)
-
-            # Check if fully received
-            if not line_item.is_fully_received():
-                all_fully_received = False
-            
-            any_received = True
-
-        # Update purchase order status
-        if all_fully_received:
-            purchase_order.mark_as_received()
-        elif any_received:
-            purchase_order.mark_as_partially_received()
-
-        # Commit all changes
-        self.session.commit()
+            if item_data["quantity"] <= 0:
+                raise ValueError("Received quantity must be positive")
+            line_item_id = item_data["line_item_id"]
+            quantities[line_item_id] = quantities.get(line_item_id, 0) + item_data["quantity"]
 
-        return await self.purchase_order_repository.update(purchase_order)
+        # Lines, stock rows, movements and the status are written in one
+        # locked transaction by the repository
+        return await self.purchase_order_repository.receive_items(purchase_order_id, quantities)
 
 
 class CancelPurchaseOrderUseCase:
@@ -285,28 +226,14 @@ class GetPurchaseOrderUseCase:
 
 
 class GetPurchaseOrderDetailsUseCase:
-    def __init__(
-        self,
-        purchase_order_repository: PurchaseOrderRepository,
-        line_item_repository: PurchaseOrderLineItemRepository,
-    ) -> None:
+    def __init__(self, purchase_order_repository: PurchaseOrderRepository) -> None:
         self.purchase_order_repository = purchase_order_repository
-        self.line_item_repository = line_item_repository
 
-    async def execute(self, purchase_order_id: UUID) -> Dict[str, Any]:
-        purchase_order = await self.purchase_order_repository.find_by_id(purchase_order_id)
-        if not purchase_order:
+    async def execute(self, purchase_order_id: UUID) -> PurchaseOrderDetails:
+        details = await self.purchase_order_repository.find_details(purchase_order_id)
+        if not details:
             raise ValueError(f"Purchase order with ID {purchase_order_id} not found")
-
-        line_items = await self.line_item_repository.find_by_purchase_order(purchase_order_id)
-
-        return {
-            "purchase_order": purchase_order,
-            "line_items": line_items,
-            "total_items": len(line_items),
-            "items_received": sum(1 for item in line_items if item.is_fully_received()),
-            "items_pending": sum(1 for item in line_items if not item.is_fully_received()),
-        }
+        return details
 
 
 class ListPurchaseOrdersUseCase:
@@ -315,21 +242,27 @@ class ListPurchaseOrdersUseCase:
 
     async def execute(
         self,
-        skip: int = 0,
-        limit: int = 100,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
         vendor_id: Optional[UUID] = None,
         status: Optional[PurchaseOrderStatus] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> List[PurchaseOrder]:
-        if vendor_id:
-            return await self.purchase_order_repository.find_by_vendor(vendor_id, skip, limit)
-        elif status:
-            return await self.purchase_order_repository.find_by_status(status, skip, limit)
-        elif start_date and end_date:
-            return await self.purchase_order_repository.find_by_date_range(start_date, end_date, skip, limit)
-        else:
-            return await self.purchase_order_repository.find_all(skip, limit)
+        ordering: Optional[str] = None,
+    ) -> Page[PurchaseOrder]:
+        if start_date and end_date and end_date < start_date:
+            raise ValueError("End date cannot be before start date")
+        return await self.purchase_order_repository.get_page(
+            page_size=page_size,
+            cursor=cursor,
+            page=page,
+            vendor_id=vendor_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            ordering=ordering,
+        )
 
 
 class SearchPurchaseOrdersUseCase:
@@ -342,4 +275,299 @@ class SearchPurchaseOrdersUseCase:
         search_fields: Optional[List[str]] = None,
         limit: int = 10,
     ) -> List[PurchaseOrder]:
-        return await self.purchase_order_repository.search_purchase_orders(query, search_fields, limit)
\ No newline at end of file
+        return await self.purchase_order_repository.search_purchase_orders(query, search_fields, limit)
+
+
+class GetVendorMonthlyRollupsUseCase:
+    def __init__(self, vendor_rollup_repository: VendorRollupRepository) -> None:
+        self.vendor_rollup_repository = vendor_rollup_repository
+
+    async def execute(
+        self,
+        vendor_id: Optional[UUID] = None,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> List[VendorMonthlyRollup]:
+        if start_month and end_month and end_month < start_month:
+            raise ValueError("End month cannot be before start month")
+        return await self.vendor_rollup_repository.find_monthly(vendor_id, start_month, end_month)
+
+
+class GetLastPurchasePricesUseCase:
+    def __init__(self, line_item_repository: PurchaseOrderLineItemRepository) -> None:
+        self.line_item_repository = line_item_repository
+
+    async def execute(
+        self,
+        inventory_item_master_ids: List[UUID],
+        vendor_id: Optional[UUID] = None,
+    ) -> List[LastPurchasePrice]:
+        if not inventory_item_master_ids:
+            raise ValueError("At least one inventory item is required")
+        return await self.line_item_repository.find_last_prices(inventory_item_master_ids, vendor_id)
+
+
+IMPORT_REQUIRED_COLUMNS = (
+    "order_reference",
+    "vendor_id",
+    "order_date",
+    "inventory_item_master_id",
+    "warehouse_id",
+    "quantity",
+    "unit_price",
+)
+_IMPORT_STATUSES = (
+    PurchaseOrderStatus.DRAFT,
+    PurchaseOrderStatus.ORDERED,
+    PurchaseOrderStatus.RECEIVED,
+    PurchaseOrderStatus.CANCELLED,
+)
+
+
+def _cell(row: Dict[str, Optional[str]], column: str) -> Optional[str]:
+    value = (row.get(column) or "").strip()
+    return value or None
+
+
+def _parse(row: Dict[str, Optional[str]], column: str, parser, required: bool = False):
+    value = _cell(row, column)
+    if value is None:
+        if required:
+            raise ValueError(f"{column} is required")
+        return None
+    try:
+        return parser(value)
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"{column} is not valid: {value!r}")
+
+
+def _parse_status(value: str) -> PurchaseOrderStatus:
+    status = PurchaseOrderStatus(value.upper())
+    if status not in _IMPORT_STATUSES:
+        raise ValueError(value)
+    return status
+
+
+@dataclass
+class _ImportedOrder:
+    """The consecutive CSV rows of one order, parsed as they stream in."""
+
+    reference: str
+    first_row: int
+    purchase_order_id: UUID = field(default_factory=uuid4)
+    vendor_id: Optional[UUID] = None
+    order_date: Optional[date] = None
+    expected_delivery_date: Optional[date] = None
+    status: PurchaseOrderStatus = PurchaseOrderStatus.DRAFT
+    invoice_number: Optional[str] = None
+    notes: Optional[str] = None
+    line_items: List[Tuple[int, PurchaseOrderLineItem]] = field(default_factory=list)
+    errors: List[ImportRowError] = field(default_factory=list)
+
+    def error(self, row_number: int, message: str) -> None:
+        self.errors.append(ImportRowError(row_number, self.reference, message))
+
+
+class ImportPurchaseOrdersUseCase:
+    """Create purchase orders from CSV rows, a batch of orders at a time.
+
+    Consecutive rows with the same ``order_reference`` (the legacy order
+    number, stored as the reference number) make up one order; its order
+    columns are read from its first row. Each batch checks vendors, items,
+    warehouses and previously imported references with one query each, takes
+    its order numbers in one go and is written in one transaction. An order
+    with any invalid row is skipped and its rows are reported, so an import
+    can be fixed and run again. Received orders get fully received lines but
+    no stock movements or received date. If the file cannot be read further,
+    the orders read completely before that point are still imported and the
+    order being read is skipped.
+    """
+
+    def __init__(
+        self,
+        purchase_order_repository: PurchaseOrderRepository,
+        vendor_repository: VendorRepository,
+        inventory_repository: InventoryItemMasterRepository,
+        warehouse_repository: WarehouseRepository,
+        batch_size: int = 500,
+    ) -> None:
+        self.purchase_order_repository = purchase_order_repository
+        self.vendor_repository = vendor_repository
+        self.inventory_repository = inventory_repository
+        self.warehouse_repository = warehouse_repository
+        self.batch_size = batch_size
+
+    async def execute(
+        self, rows: Iterable[Dict[str, Optional[str]]], created_by: Optional[str] = None
+    ) -> PurchaseOrderImportResult:
+        result = PurchaseOrderImportResult()
+        batch: List[_ImportedOrder] = []
+        finished: Set[str] = set()
+        current: Optional[_ImportedOrder] = None
+
+        rows = iter(rows)
+        row_number = 1
+        while True:
+            try:
+                row = next(rows, None)
+            except (csv.Error, UnicodeDecodeError) as e:
+                result.read_error = f"The file could not be read after row {row_number}: {e}"
+                if current is not None:
+                    # Its remaining rows were never read
+                    current.error(current.first_row, "Order was cut short by the read error")
+                    result.errors.extend(sorted(current.errors, key=lambda error: error.row))
+                    result.orders_skipped += 1
+                    current = None
+                break
+            if row is None:
+                break
+            row_number += 1
+            if row_number == 2:
+                missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in row]
+                if missing:
+                    raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+            reference = _cell(row, "order_reference")
+            if reference is None:
+                result.errors.append(ImportRowError(row_number, None, "order_reference is required"))
+                continue
+            if current is None or reference != current.reference:
+                if current is not None:
+                    finished.add(current.reference)
+                    batch.append(current)
+                    if len(batch) >= self.batch_size:
+                        await self._import_batch(batch, result, created_by)
+                        batch = []
+                current = self._start_order(reference, row_number, row)
+                if reference in finished:
+                    current.error(row_number, "Rows of an order must be consecutive")
+            self._add_line_item(current, row_number, row, created_by)
+
+        if current is not None:
+            batch.append(current)
+        if batch:
+            await self._import_batch(batch, result, created_by)
+        return result
+
+    @staticmethod
+    def _start_order(reference: str, row_number: int, row: Dict[str, Optional[str]]) -> _ImportedOrder:
+        order = _ImportedOrder(reference=reference, first_row=row_number)
+        order.invoice_number = _cell(row, "invoice_number")
+        order.notes = _cell(row, "notes")
+        try:
+            order.vendor_id = _parse(row, "vendor_id", UUID, required=True)
+            order.order_date = _parse(row, "order_date", date.fromisoformat, required=True)
+            order.expected_delivery_date = _parse(row, "expected_delivery_date", date.fromisoformat)
+            order.status = _parse(row, "status", _parse_status) or PurchaseOrderStatus.DRAFT
+        except ValueError as e:
+            order.error(row_number, str(e))
+        return order
+
+    @staticmethod
+    def _add_line_item(
+        order: _ImportedOrder, row_number: int, row: Dict[str, Optional[str]], created_by: Optional[str]
+    ) -> None:
+        try:
+            if row_number != order.first_row:
+                for column, expected in (("vendor_id", order.vendor_id), ("order_date", order.order_date)):
+                    value = _cell(row, column)
+                    # A value the first row failed on is already reported there
+                    if expected is not None and value is not None and value != str(expected):
+                        raise ValueError(f"{column} differs from the first row of the order")
+            quantity = _parse(row, "quantity", int, required=True)
+            line_item = PurchaseOrderLineItem(
+                purchase_order_id=order.purchase_order_id,
+                inventory_item_master_id=_parse(row, "inventory_item_master_id", UUID, required=True),
+                warehouse_id=_parse(row, "warehouse_id", UUID, required=True),
+                quantity=quantity,
+                unit_price=_parse(row, "unit_price", Decimal, required=True),
+                serial_number=_cell(row, "serial_number"),
+                discount=_parse(row, "discount", Decimal) or Decimal("0.00"),
+                tax_amount=_parse(row, "tax_amount", Decimal) or Decimal("0.00"),
+                received_quantity=quantity if order.status == PurchaseOrderStatus.RECEIVED else 0,
+                created_by=created_by,
+            )
+        except ValueError as e:
+            order.error(row_number, str(e))
+            return
+        order.line_items.append((row_number, line_item))
+
+    async def _import_batch(
+        self, batch: List[_ImportedOrder], result: PurchaseOrderImportResult, created_by: Optional[str]
+    ) -> None:
+        vendor_ids = await self.vendor_repository.find_existing_ids(
+            order.vendor_id for order in batch if order.vendor_id
+        )
+        item_ids = await self.inventory_repository.find_existing_ids(
+            line_item.inventory_item_master_id for order in batch for _, line_item in order.line_items
+        )
+        warehouse_ids = await self.warehouse_repository.find_existing_ids(
+            line_item.warehouse_id for order in batch for _, line_item in order.line_items
+        )
+        imported = await self.purchase_order_repository.find_existing_reference_numbers(
+            order.reference for order in batch
+        )
+
+        orders = []
+        for order in batch:
+            if order.reference in imported:
+                order.error(order.first_row, "Order was already imported")
+            if order.vendor_id and order.vendor_id not in vendor_ids:
+                order.error(order.first_row, f"Vendor with ID {order.vendor_id} not found")
+            for row_number, line_item in order.line_items:
+                if line_item.inventory_item_master_id not in item_ids:
+                    order.error(row_number, f"Inventory item with ID {line_item.inventory_item_master_id} not found")
+                if line_item.warehouse_id not in warehouse_ids:
+                    order.error(row_number, f"Warehouse with ID {line_item.warehouse_id} not found")
+            if order.errors:
+                result.errors.extend(sorted(order.errors, key=lambda error: error.row))
+                result.orders_skipped += 1
+            else:
+                orders.append(order)
+        if not orders:
+            return
+
+        order_numbers = await self.purchase_order_repository.allocate_order_numbers(len(orders))
+        purchase_orders = []
+        for order, order_number in zip(orders, order_numbers):
+            line_items = [line_item for _, line_item in order.line_items]
+            purchase_order = PurchaseOrder(
+                order_number=order_number,
+                vendor_id=order.vendor_id,
+                order_date=order.order_date,
+                expected_delivery_date=order.expected_delivery_date,
+                status=order.status,
+                reference_number=order.reference,
+                invoice_number=order.invoice_number,
+                notes=order.notes,
+                purchase_order_id=order.purchase_order_id,
+                created_by=created_by,
+            )
+            try:
+                purchase_order.update_totals(
+                    sum((line_item.amount for line_item in line_items), Decimal("0.00")),
+                    sum((line_item.tax_amount for line_item in line_items), Decimal("0.00")),
+                    sum((line_item.discount for line_item in line_items), Decimal("0.00")),
+                )
+            except ValueError as e:
+                result.errors.append(ImportRowError(order.first_row, order.reference, str(e)))
+                result.orders_skipped += 1
+                continue
+            purchase_orders.append((order, purchase_order, line_items))
+        if not purchase_orders:
+            return
+
+        try:
+            await self.purchase_order_repository.import_orders(
+                [(purchase_order, line_items) for _, purchase_order, line_items in purchase_orders]
+            )
+        except Exception as e:
+            reason = getattr(e, "orig", None) or e
+            result.errors.extend(
+                ImportRowError(order.first_row, order.reference, f"Order could not be saved: {reason}")
+                for order, _, _ in purchase_orders
+            )
+            result.orders_skipped += len(purchase_orders)
+            return
+        result.orders_imported += len(purchase_orders)
+        result.line_items_imported += sum(len(line_items) for _, _, line_items in purchase_orders)
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities.unit_of_measurement import UnitOfMeasurement
+from ...domain.value_objects.page import Page
 from ..services.unit_of_measurement_service import UnitOfMeasurementService
 
 
@@ -42,6 +43,18 @@ class UnitOfMeasurementUseCases:
         """List all units of measurement with pagination"""
         return await self.unit_service.get_all_units(skip, limit, is_active)
 
+    async def list_units_of_measurement_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        is_active: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[UnitOfMeasurement]:
+        """List one ordered page of units of measurement"""
+        return await self.unit_service.get_units_page(page_size, cursor, page, is_active, search, ordering)
+
     async def update_unit_of_measurement(
         self,
         unit_id: UUID,
@@ -77,3 +90,7 @@ class UnitOfMeasurementUseCases:
         # If is_active is None, count all units (active_only=False)
         active_only = is_active if is_active is not None else False
         return await self.unit_service.count_units(active_only)
+
+    async def get_unit_of_measurement_stats(self) -> Dict[str, int]:
+        """Get aggregate unit of measurement counts"""
+        return await self.unit_service.get_unit_stats()
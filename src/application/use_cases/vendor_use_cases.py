@@ -3,11 +3,19 @@ from uuid import UUID
 
 from ...domain.entities.vendor import Vendor
 from ...domain.repositories.vendor_repository import VendorRepository
+from ...domain.services.duplicate_matching import PossibleDuplicateError
+from ...domain.value_objects.city import CityFacet
+from ..services.duplicate_detection_service import DuplicateDetectionService
 
 
 class CreateVendorUseCase:
-    def __init__(self, vendor_repository: VendorRepository) -> None:
+    def __init__(
+        self,
+        vendor_repository: VendorRepository,
+        duplicate_detector: Optional[DuplicateDetectionService] = None,
+    ) -> None:
         self.vendor_repository = vendor_repository
+        self.duplicate_detector = duplicate_detector
 
     async def execute(
         self,
@@ -17,11 +25,19 @@ class CreateVendorUseCase:
         remarks: Optional[str] = None,
         city: Optional[str] = None,
         created_by: Optional[str] = None,
+        phone_numbers: Optional[List[str]] = None,
+        allow_duplicates: bool = False,
     ) -> Vendor:
         # Check if email is already in use
         if email and await self.vendor_repository.exists_by_email(email):
             raise ValueError(f"Vendor with email '{email}' already exists")
 
+        # Check for vendors that look like the same business
+        if self.duplicate_detector and not allow_duplicates:
+            matches = await self.duplicate_detector.find_matches(name, email, phone_numbers)
+            if matches:
+                raise PossibleDuplicateError("Vendor", matches)
+
         vendor = Vendor(
             name=name,
             email=email,
@@ -54,10 +70,22 @@ class GetVendorsByCityUseCase:
     def __init__(self, vendor_repository: VendorRepository) -> None:
         self.vendor_repository = vendor_repository
 
-    async def execute(self, city: str, limit: Optional[int] = None) -> List[Vendor]:
+    async def execute(self, city: str, limit: Optional[int] = None, prefix: bool = False) -> List[Vendor]:
+        if prefix:
+            return await self.vendor_repository.find_by_city_prefix(city, limit)
         return await self.vendor_repository.find_by_city(city, limit)
 
 
+class GetVendorCityFacetsUseCase:
+    def __init__(self, vendor_repository: VendorRepository) -> None:
+        self.vendor_repository = vendor_repository
+
+    async def execute(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        if limit < 1:
+            raise ValueError("Facet limit must be at least 1")
+        return await self.vendor_repository.get_city_facets(limit, prefix)
+
+
 class UpdateVendorUseCase:
     def __init__(self, vendor_repository: VendorRepository) -> None:
         self.vendor_repository = vendor_repository
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from ...domain.entities.warehouse import Warehouse
+from ...domain.value_objects.page import Page
 from ..services.warehouse_service import WarehouseService
 
 
@@ -32,12 +34,32 @@ class WarehouseUseCases:
         """Get warehouse by label"""
         return await self.warehouse_service.get_warehouse_by_label(label)
 
+    async def get_warehouse_version(self, warehouse_id: UUID) -> Optional[datetime]:
+        """Get the last modification time of a warehouse"""
+        return await self.warehouse_service.get_warehouse_version(warehouse_id)
+
+    async def get_warehouses_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the version marker of the warehouse collection"""
+        return await self.warehouse_service.get_warehouses_version()
+
     async def list_warehouses(
         self, skip: int = 0, limit: int = 100, active_only: bool = True
     ) -> List[Warehouse]:
         """List all warehouses with pagination"""
         return await self.warehouse_service.get_all_warehouses(skip, limit, active_only)
 
+    async def list_warehouses_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[Warehouse]:
+        """List one ordered page of warehouses"""
+        return await self.warehouse_service.get_warehouses_page(page_size, cursor, page, active_only, search, ordering)
+
     async def update_warehouse(
         self,
         warehouse_id: UUID,
@@ -66,3 +88,7 @@ class WarehouseUseCases:
     ) -> List[Warehouse]:
         """Search warehouses by name"""
         return await self.warehouse_service.search_warehouses_by_name(name, skip, limit)
+
+    async def get_warehouse_stats(self, recent_days: int = 30) -> Dict[str, int]:
+        """Get aggregate warehouse counts for the overview"""
+        return await self.warehouse_service.get_warehouse_stats(recent_days)
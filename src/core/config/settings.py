@@ -17,6 +17,23 @@ class Settings(BaseSettings):
     cors_allow_methods: list[str] = ["*"]
     cors_allow_headers: list[str] = ["*"]
 
+    lookup_cache_ttl_seconds: int = 300
+    reference_cache_ttl_seconds: int = 300
+    reference_cache_max_entries: int = 2048
+
+    stats_snapshot_refresh_seconds: int = 60
+    stats_snapshot_poll_seconds: float = 2.0
+
+    idempotency_key_ttl_seconds: int = 86400
+    idempotency_wait_seconds: float = 10.0
+    # How long an unfinished request holds its key before another may take it over
+    idempotency_lease_seconds: float = 60.0
+
+    movement_partition_check_seconds: int = 3600
+    # Longer than any write transaction: a movement is stamped with its
+    # transaction's start time, so a snapshot only covers movements this old
+    stock_snapshot_safety_lag_seconds: int = 3600
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -56,7 +56,7 @@ class ContactNumber(BaseEntity):
             raise ValueError("Entity type cannot be empty")
         
         # Validate entity type format (should be a valid model name)
-        allowed_entity_types = ["Customer", "User", "Supplier", "Property", "Unit"]
+        allowed_entity_types = ["Customer", "Vendor", "User", "Supplier", "Property", "Unit"]
         if entity_type not in allowed_entity_types:
             raise ValueError(f"Invalid entity type: {entity_type}")
         
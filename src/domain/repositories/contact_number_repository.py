@@ -3,6 +3,8 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 
 from ..entities.contact_number import ContactNumber
+from ..value_objects.contact_owner import ContactNumberOwner
+from ..value_objects.phone_number import PhoneNumber
 
 
 class ContactNumberRepository(ABC):
@@ -22,10 +24,18 @@ class ContactNumberRepository(ABC):
     async def find_by_entity(self, entity_type: str, entity_id: UUID) -> List[ContactNumber]:
         pass
 
+    @abstractmethod
+    async def find_by_entities(self, entity_type: str, entity_ids: List[UUID]) -> Dict[UUID, List[ContactNumber]]:
+        pass
+
     @abstractmethod
     async def search_by_number(self, query: str, limit: int = 10) -> List[ContactNumber]:
         pass
 
+    @abstractmethod
+    async def find_owners_by_number(self, query: str, limit: int = 10) -> List[ContactNumberOwner]:
+        pass
+
     @abstractmethod
     async def exists_for_entity(self, entity_type: str, entity_id: UUID, number: str) -> bool:
         pass
@@ -50,6 +60,12 @@ class ContactNumberRepository(ABC):
     async def get_entity_contact_summary(self, entity_type: str, entity_id: UUID) -> Dict[str, Any]:
         pass
 
+    @abstractmethod
+    async def replace_for_entity(
+        self, entity_type: str, entity_id: UUID, phone_numbers: List[PhoneNumber]
+    ) -> List[ContactNumber]:
+        pass
+
     @abstractmethod
     async def bulk_create(self, contact_numbers: List[ContactNumber]) -> List[ContactNumber]:
         pass
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from ..entities.customer import Customer
+from ..value_objects.city import CityFacet
 
 
 class CustomerRepository(ABC):
@@ -18,6 +19,18 @@ class CustomerRepository(ABC):
     async def find_by_name(self, name: str) -> List[Customer]:
         pass
 
+    @abstractmethod
+    async def find_by_city(self, city: str, limit: Optional[int] = None) -> List[Customer]:
+        pass
+
+    @abstractmethod
+    async def find_by_city_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Customer]:
+        pass
+
+    @abstractmethod
+    async def get_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        pass
+
     @abstractmethod
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[Customer]:
         pass
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set
+from uuid import UUID
+
+from ..services.duplicate_matching import MatchRecord
+
+
+class DuplicateCandidateRepository(ABC):
+    @abstractmethod
+    async def find_candidates(
+        self,
+        entity_type: str,
+        keys: Set[str],
+        phone_suffixes: Set[str],
+        exclude_id: Optional[UUID] = None,
+        limit: int = 50,
+        max_block_size: int = 500,
+    ) -> List[MatchRecord]:
+        pass
+
+    @abstractmethod
+    async def find_blocks(self, entity_type: str, max_block_size: int = 500) -> List[List[UUID]]:
+        pass
+
+    @abstractmethod
+    async def load_records(self, entity_type: str, entity_ids: List[UUID]) -> List[MatchRecord]:
+        pass
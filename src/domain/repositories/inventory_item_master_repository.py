@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
 from uuid import UUID
 
 from ..entities.inventory_item_master import InventoryItemMaster
@@ -68,4 +69,12 @@ class InventoryItemMasterRepository(ABC):
     
     @abstractmethod
     async def update_quantity(self, inventory_item_id: UUID, new_quantity: int) -> bool:
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def get_version(self, inventory_item_id: UUID) -> Optional[datetime]:
+        pass
+    
+    @abstractmethod
+    async def find_existing_ids(self, inventory_item_ids: Iterable[UUID]) -> Set[UUID]:
+        pass
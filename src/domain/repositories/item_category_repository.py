@@ -3,6 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from ..entities.item_category import ItemCategory, ItemSubCategory
+from ..value_objects.category_tree import CategoryTreeNode
 
 
 class ItemCategoryRepository(ABC):
@@ -36,6 +37,18 @@ class ItemCategoryRepository(ABC):
         """Find all categories with pagination."""
         pass
 
+    @abstractmethod
+    async def find_category_tree(
+        self, skip: int = 0, limit: Optional[int] = None, active_only: bool = False
+    ) -> List[CategoryTreeNode]:
+        """Find categories ordered by name with their subcategories and active item counts."""
+        pass
+
+    @abstractmethod
+    async def count_categories(self, active_only: bool = False) -> int:
+        """Count categories, optionally only the active ones."""
+        pass
+
     @abstractmethod
     async def update(self, category: ItemCategory) -> ItemCategory:
         """Update an existing category."""
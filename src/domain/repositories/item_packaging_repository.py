@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from ..entities.item_packaging import ItemPackaging
+from ..value_objects.page import Page
 
 
 class ItemPackagingRepository(ABC):
@@ -26,6 +28,19 @@ class ItemPackagingRepository(ABC):
         """Get all item packagings with pagination"""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[ItemPackaging]:
+        """Get one ordered page of item packagings with the total count and neighbouring cursors"""
+        pass
+
     @abstractmethod
     async def update(self, item_packaging: ItemPackaging) -> ItemPackaging:
         """Update an existing item packaging"""
@@ -40,3 +55,8 @@ class ItemPackagingRepository(ABC):
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[ItemPackaging]:
         """Search item packagings by name"""
         pass
+
+    @abstractmethod
+    async def get_stats(self, recent_since: datetime, top_units: int = 5) -> Dict[str, Any]:
+        """Count active item packagings and their most used units"""
+        pass
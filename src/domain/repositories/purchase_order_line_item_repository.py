@@ -3,6 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from ..entities.purchase_order_line_item import PurchaseOrderLineItem
+from ..value_objects.last_purchase_price import LastPurchasePrice
 
 
 class PurchaseOrderLineItemRepository(ABC):
@@ -89,4 +90,11 @@ class PurchaseOrderLineItemRepository(ABC):
     @abstractmethod
     async def sum_total_by_purchase_order(self, purchase_order_id: UUID) -> dict:
         """Calculate sum of amounts, tax, and discount for a purchase order."""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def find_last_prices(
+        self, inventory_item_master_ids: List[UUID], vendor_id: Optional[UUID] = None
+    ) -> List[LastPurchasePrice]:
+        """Find the last price paid for each of the given items, per vendor or for one vendor."""
+        pass
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
 from ..entities.purchase_order import PurchaseOrder, PurchaseOrderStatus
+from ..entities.purchase_order_line_item import PurchaseOrderLineItem
+from ..value_objects.page import Page
+from ..value_objects.purchase_order_details import PurchaseOrderDetails
 
 
 class PurchaseOrderRepository(ABC):
@@ -12,11 +15,35 @@ class PurchaseOrderRepository(ABC):
         """Save a purchase order entity to the database."""
         pass
 
+    @abstractmethod
+    async def save_with_line_items(
+        self, purchase_order: PurchaseOrder, line_items: List[PurchaseOrderLineItem]
+    ) -> PurchaseOrder:
+        """Insert a new purchase order and all its line items in one transaction."""
+        pass
+
+    @abstractmethod
+    async def import_orders(
+        self, orders: List[Tuple[PurchaseOrder, List[PurchaseOrderLineItem]]]
+    ) -> None:
+        """Bulk insert new purchase orders with their line items in one transaction."""
+        pass
+
+    @abstractmethod
+    async def receive_items(self, purchase_order_id: UUID, quantities: Dict[UUID, int]) -> PurchaseOrder:
+        """Record received quantities per line item ID, add them to stock and update the status in one transaction."""
+        pass
+
     @abstractmethod
     async def find_by_id(self, purchase_order_id: UUID) -> Optional[PurchaseOrder]:
         """Find a purchase order by its ID."""
         pass
 
+    @abstractmethod
+    async def find_details(self, purchase_order_id: UUID) -> Optional[PurchaseOrderDetails]:
+        """Find a purchase order together with its vendor name and line items."""
+        pass
+
     @abstractmethod
     async def find_by_order_number(self, order_number: str) -> Optional[PurchaseOrder]:
         """Find a purchase order by its order number."""
@@ -52,6 +79,21 @@ class PurchaseOrderRepository(ABC):
         """Search purchase orders across multiple fields."""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        vendor_id: Optional[UUID] = None,
+        status: Optional[PurchaseOrderStatus] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[PurchaseOrder]:
+        """Get one page of purchase orders matching all of the given filters."""
+        pass
+
     @abstractmethod
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[PurchaseOrder]:
         """Find all purchase orders with pagination."""
@@ -85,4 +127,24 @@ class PurchaseOrderRepository(ABC):
     @abstractmethod
     async def get_next_order_number(self) -> str:
         """Generate the next purchase order number."""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def allocate_order_numbers(self, count: int) -> List[str]:
+        """Generate ``count`` consecutive purchase order numbers."""
+        pass
+
+    @abstractmethod
+    async def find_existing_reference_numbers(self, reference_numbers: Iterable[str]) -> Set[str]:
+        """Return which of the given reference numbers are already used by an order."""
+        pass
+
+    @abstractmethod
+    async def get_version(self, purchase_order_id: UUID) -> Optional[datetime]:
+        """Get the latest modification time of a purchase order, its line items and vendor."""
+        pass
+
+    @abstractmethod
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the version counter of the purchase order list and when it last changed."""
+        pass
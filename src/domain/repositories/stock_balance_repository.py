@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from ..value_objects.stock_balance import StockAsOf, StockBalance
+
+
+class StockBalanceRepository(ABC):
+    @abstractmethod
+    async def find_balances(
+        self,
+        inventory_item_master_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> List[StockBalance]:
+        """Find the non-zero stock balances of an item, by warehouse and status."""
+        pass
+
+    @abstractmethod
+    async def find_levels_as_of(
+        self,
+        as_of: datetime,
+        inventory_item_master_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+    ) -> StockAsOf:
+        """Find the non-zero stock levels per item and warehouse at a past moment."""
+        pass
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ..entities.unit_of_measurement import UnitOfMeasurement
+from ..value_objects.page import Page
 
 
 class UnitOfMeasurementRepository(ABC):
@@ -31,6 +32,19 @@ class UnitOfMeasurementRepository(ABC):
         """Get all units of measurement with pagination"""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[UnitOfMeasurement]:
+        """Get one ordered page of units of measurement with the total count and neighbouring cursors"""
+        pass
+
     @abstractmethod
     async def update(self, unit_of_measurement: UnitOfMeasurement) -> UnitOfMeasurement:
         """Update an existing unit of measurement"""
@@ -50,3 +64,8 @@ class UnitOfMeasurementRepository(ABC):
     async def count(self, active_only: bool = False) -> int:
         """Count units of measurement"""
         pass
+
+    @abstractmethod
+    async def get_stats(self) -> Dict[str, int]:
+        """Count all and active units of measurement"""
+        pass
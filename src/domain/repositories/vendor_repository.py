@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from uuid import UUID
 
 from ..entities.vendor import Vendor
+from ..value_objects.city import CityFacet
 
 
 class VendorRepository(ABC):
@@ -16,6 +17,11 @@ class VendorRepository(ABC):
         """Find a vendor by its ID."""
         pass
 
+    @abstractmethod
+    async def find_existing_ids(self, vendor_ids: Iterable[UUID]) -> Set[UUID]:
+        """Return which of the given vendor IDs exist."""
+        pass
+
     @abstractmethod
     async def find_by_name(self, name: str) -> List[Vendor]:
         """Find vendors by name (case-insensitive partial match)."""
@@ -28,7 +34,17 @@ class VendorRepository(ABC):
 
     @abstractmethod
     async def find_by_city(self, city: str, limit: Optional[int] = None) -> List[Vendor]:
-        """Find vendors by city (case-insensitive partial match)."""
+        """Find active vendors in a city (case- and whitespace-insensitive exact match)."""
+        pass
+
+    @abstractmethod
+    async def find_by_city_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Vendor]:
+        """Find active vendors whose city starts with the given prefix."""
+        pass
+
+    @abstractmethod
+    async def get_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        """Count active vendors per city, largest first."""
         pass
 
     @abstractmethod
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from ..value_objects.vendor_rollup import VendorMonthlyRollup
+
+
+class VendorRollupRepository(ABC):
+    @abstractmethod
+    async def find_monthly(
+        self,
+        vendor_id: Optional[UUID] = None,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> List[VendorMonthlyRollup]:
+        """Find the monthly purchasing rollups, oldest month first."""
+        pass
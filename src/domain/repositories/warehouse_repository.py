@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
 from ..entities.warehouse import Warehouse
+from ..value_objects.page import Page
 
 
 class WarehouseRepository(ABC):
@@ -16,6 +18,11 @@ class WarehouseRepository(ABC):
         """Get warehouse by ID"""
         pass
 
+    @abstractmethod
+    async def find_existing_ids(self, warehouse_ids: Iterable[UUID]) -> Set[UUID]:
+        """Return which of the given warehouse IDs exist"""
+        pass
+
     @abstractmethod
     async def get_by_label(self, label: str) -> Optional[Warehouse]:
         """Get warehouse by label"""
@@ -26,6 +33,19 @@ class WarehouseRepository(ABC):
         """Get all warehouses with pagination"""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[Warehouse]:
+        """Get one ordered page of warehouses with the total count and neighbouring cursors"""
+        pass
+
     @abstractmethod
     async def update(self, warehouse: Warehouse) -> Warehouse:
         """Update an existing warehouse"""
@@ -40,3 +60,18 @@ class WarehouseRepository(ABC):
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[Warehouse]:
         """Search warehouses by name"""
         pass
+
+    @abstractmethod
+    async def get_version(self, warehouse_id: UUID) -> Optional[datetime]:
+        """Get the last modification time of a warehouse without loading it"""
+        pass
+
+    @abstractmethod
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the version counter of the warehouse list and when it last changed"""
+        pass
+
+    @abstractmethod
+    async def get_stats(self, recent_since: datetime) -> Dict[str, int]:
+        """Count active warehouses in total, with remarks and created since ``recent_since``"""
+        pass
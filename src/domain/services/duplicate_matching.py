@@ -0,0 +1,136 @@
+"""
+Rules for spotting likely duplicate customers and vendors.
+
+Candidates are found through blocking keys, cheap exact-match keys that
+records which might be duplicates are likely to share:
+- each normalized name token
+- the email address
+- the email domain, when it is not a free-mail provider
+
+A phone-number suffix is a further blocking key, read from the contact number
+index. The candidates found this way are then scored with a string-similarity
+metric on their names. A shared phone number or email raises the score.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+PHONE_SUFFIX_DIGITS = 7
+DEFAULT_THRESHOLD = 0.85
+
+# Words that carry no identity: legal forms and fillers
+_IGNORED_TOKENS = frozenset({
+    "the", "and", "of", "inc", "incorporated", "llc", "ltd", "limited", "co", "corp",
+    "corporation", "company", "pvt", "plc", "gmbh", "mr", "mrs", "ms", "dr",
+})
+_FREE_EMAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com",
+    "icloud.com", "me.com", "aol.com", "protonmail.com", "mail.com", "gmx.com", "yandex.com",
+})
+
+
+@dataclass(frozen=True)
+class MatchRecord:
+    """What the matcher knows about an existing customer or vendor."""
+
+    entity_id: UUID
+    name: str
+    email: Optional[str] = None
+    phone_suffixes: FrozenSet[str] = field(default_factory=frozenset)
+
+
+@dataclass(frozen=True)
+class DuplicateCandidate:
+    record: MatchRecord
+    score: float
+    reasons: Tuple[str, ...] = ()
+
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Lowercase, accent-free name tokens without legal forms, in sorted order."""
+    if not name:
+        return []
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    tokens = re.split(r"[^a-z0-9]+", ascii_name.lower())
+    return sorted(token for token in tokens if len(token) > 1 and token not in _IGNORED_TOKENS)
+
+
+def email_domain(email: Optional[str]) -> Optional[str]:
+    if not email or "@" not in email:
+        return None
+    return email.rsplit("@", 1)[1].strip().lower() or None
+
+
+def phone_suffix(number: str) -> Optional[str]:
+    """The last digits of a number, reversed as in ``contact_numbers.reversed_digits``."""
+    digits = re.sub(r"\D", "", number)
+    if len(digits) < PHONE_SUFFIX_DIGITS:
+        return None
+    return digits[::-1][:PHONE_SUFFIX_DIGITS]
+
+
+def blocking_keys(name: Optional[str], email: Optional[str]) -> Set[str]:
+    keys = {f"n:{token}" for token in name_tokens(name) if len(token) > 2}
+    if email:
+        keys.add(f"m:{email.strip().lower()}")
+        domain = email_domain(email)
+        if domain and domain not in _FREE_EMAIL_DOMAINS:
+            keys.add(f"d:{domain}")
+    return keys
+
+
+def name_similarity(first: str, second: str) -> float:
+    """Similarity of two names in [0, 1], insensitive to word order and legal forms."""
+    first_tokens, second_tokens = name_tokens(first), name_tokens(second)
+    if not first_tokens or not second_tokens:
+        return 0.0
+    # Each word is compared with its closest counterpart in the other name, in
+    # both directions, so word order and single-word typos cost little
+    ratio = (_closest_token_ratio(first_tokens, second_tokens) + _closest_token_ratio(second_tokens, first_tokens)) / 2
+    # One name being the other plus extra words ("Acme Tools" / "Acme Tools Rental")
+    # is a strong hint, a single shared word alone only with other evidence
+    shorter, longer = sorted((set(first_tokens), set(second_tokens)), key=len)
+    if shorter <= longer:
+        ratio = max(ratio, 0.9 if len(shorter) > 1 else 0.8)
+    return ratio
+
+
+def _closest_token_ratio(tokens: List[str], others: List[str]) -> float:
+    return sum(max(SequenceMatcher(None, token, other).ratio() for other in others) for token in tokens) / len(tokens)
+
+
+def score(record: MatchRecord, other: MatchRecord) -> DuplicateCandidate:
+    value = name_similarity(record.name, other.name)
+    reasons = ["name"] if value >= 0.5 else []
+    if record.phone_suffixes & other.phone_suffixes:
+        value += (1 - value) * 0.5
+        reasons.append("phone")
+    domain = email_domain(record.email)
+    if domain and domain not in _FREE_EMAIL_DOMAINS and domain == email_domain(other.email):
+        value += (1 - value) * 0.25
+        reasons.append("email_domain")
+    if record.email and other.email and record.email.lower() == other.email.lower():
+        value = 1.0
+        reasons.append("email")
+    return DuplicateCandidate(record=other, score=round(value, 4), reasons=tuple(reasons))
+
+
+def rank_candidates(
+    record: MatchRecord, candidates: Iterable[MatchRecord], threshold: float = DEFAULT_THRESHOLD
+) -> List[DuplicateCandidate]:
+    scored = (score(record, candidate) for candidate in candidates if candidate.entity_id != record.entity_id)
+    return sorted((match for match in scored if match.score >= threshold), key=lambda match: -match.score)
+
+
+class PossibleDuplicateError(ValueError):
+    """Raised when a new record closely matches existing ones."""
+
+    def __init__(self, entity_type: str, matches: List[DuplicateCandidate]) -> None:
+        names = ", ".join(f"{match.record.name} ({match.record.entity_id})" for match in matches[:3])
+        super().__init__(f"{entity_type} may already exist: {names}")
+        self.entity_type = entity_type
+        self.matches = matches
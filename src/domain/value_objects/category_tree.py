@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from ..entities.item_category import ItemCategory, ItemSubCategory
+
+
+@dataclass(frozen=True)
+class SubCategoryTreeNode:
+    subcategory: ItemSubCategory
+    item_count: int = 0
+
+
+@dataclass(frozen=True)
+class CategoryTreeNode:
+    """A category with its subcategories and their active inventory item counts."""
+
+    category: ItemCategory
+    subcategories: List[SubCategoryTreeNode] = field(default_factory=list)
+
+    @property
+    def item_count(self) -> int:
+        return sum(node.item_count for node in self.subcategories)
+
+    @property
+    def active_subcategory_count(self) -> int:
+        return len([node for node in self.subcategories if node.subcategory.is_active])
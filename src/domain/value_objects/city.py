@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+def city_key(city: Optional[str]) -> Optional[str]:
+    """Lower-case a city name and collapse its whitespace, for grouping and lookups.
+
+    The ``city_key`` columns and their migration backfill use the same rules.
+    """
+    if not city:
+        return None
+    key = " ".join(city.split()).lower()
+    return key or None
+
+
+@dataclass(frozen=True)
+class CityFacet:
+    """A city and the number of active customers or vendors in it."""
+
+    city_key: str
+    city: str
+    count: int
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from ..entities.contact_number import ContactNumber
+
+
+@dataclass(frozen=True)
+class ContactNumberOwner:
+    """A contact number together with the customer or vendor it belongs to."""
+
+    contact: ContactNumber
+    owner_name: Optional[str] = None
+    owner_email: Optional[str] = None
+
+    @property
+    def owner_type(self) -> str:
+        return self.contact.entity_type
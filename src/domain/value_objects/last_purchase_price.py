@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class LastPurchasePrice:
+    """What was last paid for an item to one vendor, taken from its latest purchase order."""
+
+    inventory_item_master_id: UUID
+    vendor_id: UUID
+    purchase_order_id: UUID
+    line_item_id: UUID
+    order_date: date
+    quantity: int
+    unit_price: Decimal
+    discount: Decimal = Decimal("0.00")
+    tax_amount: Decimal = Decimal("0.00")
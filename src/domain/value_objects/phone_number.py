@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from typing import Iterable, List
 
 
 @dataclass(frozen=True)
@@ -50,5 +51,20 @@ class PhoneNumber:
             return f"+{self.number}"
         return self.number
     
+    def reversed_digits(self) -> str:
+        """Return the digits of the international format in reverse order (for suffix lookups)"""
+        return re.sub(r'\D', '', self.international_format())[::-1]
+    
     def __str__(self) -> str:
-        return self.number
\ No newline at end of file
+        return self.number
+
+
+def valid_phone_numbers(numbers: Iterable[str]) -> List[PhoneNumber]:
+    """Parse ``numbers``, skipping the ones that are not valid phone numbers."""
+    phone_numbers = []
+    for number in numbers:
+        try:
+            phone_numbers.append(PhoneNumber(number))
+        except ValueError:
+            continue
+    return phone_numbers
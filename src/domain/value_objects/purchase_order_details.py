@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from ..entities.purchase_order import PurchaseOrder
+from ..entities.purchase_order_line_item import PurchaseOrderLineItem
+
+
+@dataclass(frozen=True)
+class PurchaseOrderDetails:
+    """A purchase order with its vendor's name and all of its line items."""
+
+    purchase_order: PurchaseOrder
+    vendor_name: Optional[str] = None
+    line_items: List[PurchaseOrderLineItem] = field(default_factory=list)
+
+    @property
+    def total_items(self) -> int:
+        return len(self.line_items)
+
+    @property
+    def items_received(self) -> int:
+        return sum(1 for item in self.line_items if item.is_fully_received())
+
+    @property
+    def items_pending(self) -> int:
+        return self.total_items - self.items_received
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    """Why a CSV row kept its order from being imported; ``row`` counts the header as row 1."""
+
+    row: int
+    order_reference: Optional[str]
+    message: str
+
+
+@dataclass
+class PurchaseOrderImportResult:
+    """What a purchase order import created and every row it rejected."""
+
+    orders_imported: int = 0
+    line_items_imported: int = 0
+    orders_skipped: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+    # Set when the file stopped being readable part way; the rows before it were still imported
+    read_error: Optional[str] = None
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class StockBalance:
+    """Quantity of an item held in one warehouse with one line item status."""
+
+    inventory_item_master_id: UUID
+    warehouse_id: UUID
+    status: str
+    quantity: int
+
+
+@dataclass(frozen=True)
+class StockLevel:
+    """Quantity of an item held in one warehouse, whatever its status."""
+
+    inventory_item_master_id: UUID
+    warehouse_id: UUID
+    quantity: int
+
+
+@dataclass(frozen=True)
+class StockAsOf:
+    """Stock levels at a past moment and the snapshot they were rebuilt from, if any."""
+
+    as_of: datetime
+    snapshot_taken_at: Optional[datetime]
+    levels: List[StockLevel]
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class VendorMonthlyRollup:
+    """Purchasing totals of one vendor for the orders dated in one month."""
+
+    vendor_id: UUID
+    month: date
+    order_count: int = 0
+    cancelled_order_count: int = 0
+    spend: Decimal = Decimal("0.00")
+    tax_amount: Decimal = Decimal("0.00")
+    discount_amount: Decimal = Decimal("0.00")
+    received_order_count: int = 0
+    lead_time_order_count: int = 0
+    total_delivery_delay_days: int = 0
+
+    @property
+    def average_delivery_delay_days(self) -> Optional[float]:
+        """Mean days between expected and actual delivery; negative means early."""
+        if not self.lead_time_order_count:
+            return None
+        return self.total_delivery_delay_days / self.lead_time_order_count
@@ -0,0 +1,141 @@
+"""
+Process-local id -> name maps for the reference tables that inventory
+responses denormalise (item categories, subcategories, units of measurement
+and packaging).
+
+Each map is loaded with one narrow ``SELECT id, name`` the first time it is
+needed and dropped whenever the owning repository writes to the table. The
+TTL bounds how long writes made by other processes can go unnoticed, and an
+id missing from a map triggers a single reload of that map.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...core.config.settings import get_settings
+from ..database.models import (
+    ItemCategoryModel,
+    ItemSubCategoryModel,
+    UnitOfMeasurementModel,
+    ItemPackagingModel,
+)
+
+
+def _load_category_names(session: Session) -> Dict[UUID, str]:
+    rows = session.execute(select(ItemCategoryModel.id, ItemCategoryModel.name))
+    return {row.id: row.name for row in rows}
+
+
+def _load_subcategories(session: Session) -> Dict[UUID, Tuple[str, UUID]]:
+    rows = session.execute(
+        select(ItemSubCategoryModel.id, ItemSubCategoryModel.name, ItemSubCategoryModel.item_category_id)
+    )
+    return {row.id: (row.name, row.item_category_id) for row in rows}
+
+
+def _load_unit_of_measurement_names(session: Session) -> Dict[UUID, str]:
+    rows = session.execute(select(UnitOfMeasurementModel.id, UnitOfMeasurementModel.name))
+    return {row.id: row.name for row in rows}
+
+
+def _load_packaging_labels(session: Session) -> Dict[UUID, str]:
+    rows = session.execute(select(ItemPackagingModel.id, ItemPackagingModel.label))
+    return {row.id: row.label for row in rows}
+
+
+_LOADERS: Dict[str, Callable[[Session], Dict[UUID, Any]]] = {
+    ItemCategoryModel.__tablename__: _load_category_names,
+    ItemSubCategoryModel.__tablename__: _load_subcategories,
+    UnitOfMeasurementModel.__tablename__: _load_unit_of_measurement_names,
+    ItemPackagingModel.__tablename__: _load_packaging_labels,
+}
+
+
+class InventoryLookupNames:
+    """Read-only view over the lookup maps used to build one response."""
+
+    def __init__(
+        self,
+        category_names: Dict[UUID, str],
+        subcategories: Dict[UUID, Tuple[str, UUID]],
+        unit_of_measurement_names: Dict[UUID, str],
+        packaging_labels: Dict[UUID, str],
+    ) -> None:
+        self._category_names = category_names
+        self._subcategories = subcategories
+        self._unit_of_measurement_names = unit_of_measurement_names
+        self._packaging_labels = packaging_labels
+
+    def for_item(
+        self,
+        item_sub_category_id: Optional[UUID],
+        unit_of_measurement_id: Optional[UUID],
+        packaging_id: Optional[UUID],
+    ) -> Dict[str, Optional[str]]:
+        subcategory = self._subcategories.get(item_sub_category_id)
+        return {
+            "item_category_name": self._category_names.get(subcategory[1]) if subcategory else None,
+            "item_sub_category_name": subcategory[0] if subcategory else None,
+            "unit_of_measurement_name": self._unit_of_measurement_names.get(unit_of_measurement_id),
+            "packaging_name": self._packaging_labels.get(packaging_id),
+        }
+
+
+class LookupNameCache:
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._maps: Dict[str, Tuple[float, Dict[UUID, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def get_map(self, session: Session, table: str, required_ids: Iterable[UUID] = ()) -> Dict[UUID, Any]:
+        """Return the id -> name map for ``table``, reloading it if stale or missing ids."""
+        with self._lock:
+            cached = self._maps.get(table)
+            version = self._versions.get(table, 0)
+        if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+            mapping = cached[1]
+            if all(entity_id in mapping for entity_id in required_ids if entity_id is not None):
+                return mapping
+
+        mapping = _LOADERS[table](session)
+        with self._lock:
+            # Skip storing a map that raced with a write; the next read reloads it
+            if self._versions.get(table, 0) == version:
+                self._maps[table] = (time.monotonic(), mapping)
+        return mapping
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Drop the map for ``table`` (or every map) after a write."""
+        with self._lock:
+            tables = [table] if table else list(_LOADERS)
+            for name in tables:
+                self._maps.pop(name, None)
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def inventory_names(self, session: Session, items: Iterable[Any]) -> InventoryLookupNames:
+        """Resolve the lookup maps needed to name every item in ``items``."""
+        items = list(items)
+        subcategories = self.get_map(
+            session, ItemSubCategoryModel.__tablename__, {item.item_sub_category_id for item in items}
+        )
+        category_ids = {subcategories[item.item_sub_category_id][1]
+                        for item in items if item.item_sub_category_id in subcategories}
+        return InventoryLookupNames(
+            category_names=self.get_map(session, ItemCategoryModel.__tablename__, category_ids),
+            subcategories=subcategories,
+            unit_of_measurement_names=self.get_map(
+                session, UnitOfMeasurementModel.__tablename__, {item.unit_of_measurement_id for item in items}
+            ),
+            packaging_labels=self.get_map(
+                session, ItemPackagingModel.__tablename__, {item.packaging_id for item in items}
+            ),
+        )
+
+
+lookup_name_cache = LookupNameCache(ttl_seconds=get_settings().lookup_cache_ttl_seconds)
@@ -0,0 +1,121 @@
+"""
+Process-local cache for small, read-mostly reference tables (units of
+measurement, packaging, warehouses, item categories and subcategories) and
+for the customer and vendor city facets.
+
+Entries are grouped by namespace (the table name). Every write through the
+owning repository bumps the namespace version and drops its entries; a load
+that started before the bump is not stored, so a slow reader can never put a
+pre-write row back into the cache. Entries also expire after a TTL, which
+bounds staleness for writes made by other processes, and the cache evicts
+least-recently-used entries beyond ``max_entries``.
+
+Cached values are copied on the way in and out because domain entities are
+mutated in place by the services before being written back.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ...core.config.settings import get_settings
+
+_MISSING = object()
+
+
+class ReferenceDataCache:
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        )
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions[namespace]
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """Return a copy of the cached value, or ``_MISSING``."""
+        entry_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[entry_key]
+                self._counters[namespace]["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(entry_key)
+            self._counters[namespace]["hits"] += 1
+            value = entry[1]
+        return copy.copy(value)
+
+    def put(self, namespace: str, key: Hashable, value: Any, version: int) -> None:
+        """Store ``value`` unless the namespace was invalidated after ``version`` was read."""
+        entry_key = (namespace, key)
+        value = copy.copy(value)
+        with self._lock:
+            if self._versions[namespace] != version:
+                return
+            self._entries[entry_key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                (evicted_namespace, _), _ = self._entries.popitem(last=False)
+                self._counters[evicted_namespace]["evictions"] += 1
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Return the cached value for ``key`` or load it; ``None`` results are not cached."""
+        value = self.get(namespace, key)
+        if value is not _MISSING:
+            return value
+        version = self.version(namespace)
+        value = loader()
+        if value is not None:
+            self.put(namespace, key, value, version)
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] += 1
+            self._counters[namespace]["invalidations"] += 1
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in list(self._versions):
+                self._versions[namespace] += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes: Dict[str, int] = defaultdict(int)
+            for namespace, _ in self._entries:
+                sizes[namespace] += 1
+            namespaces = {
+                namespace: {**counters, "size": sizes.get(namespace, 0), "version": self._versions[namespace]}
+                for namespace, counters in self._counters.items()
+            }
+            hits = sum(counters["hits"] for counters in self._counters.values())
+            misses = sum(counters["misses"] for counters in self._counters.values())
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "namespaces": namespaces,
+            }
+
+
+_settings = get_settings()
+reference_data_cache = ReferenceDataCache(
+    max_entries=_settings.reference_cache_max_entries,
+    ttl_seconds=_settings.reference_cache_ttl_seconds,
+)
@@ -0,0 +1,179 @@
+"""
+In-memory snapshots of the dashboard ``/stats`` aggregates.
+
+Each snapshot is registered with the tables it is computed from. A background
+task refreshes a snapshot when one of those tables was written to by a
+committed session in this process (the dirty flag) or when it is older than
+the refresh interval, which also picks up writes made by other processes.
+Endpoints serve the stored snapshot together with its ``computed_at`` time and
+only compute inline for the very first request or when asked for ``fresh``
+data. Computing runs blocking queries on its own session, so it happens in a
+worker thread and never on the event loop.
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ...core.config.database import get_database_manager
+from ...core.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_CHANGED_TABLES_KEY = "stats_snapshot_changed_tables"
+
+StatsComputer = Callable[[Session], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    data: Dict[str, Any]
+    computed_at: datetime
+
+    def as_response(self) -> Dict[str, Any]:
+        return {**self.data, "computed_at": self.computed_at}
+
+
+@dataclass
+class _Registration:
+    compute: StatsComputer
+    tables: Set[str]
+
+
+class StatsSnapshotService:
+    def __init__(
+        self,
+        refresh_interval_seconds: float = 60.0,
+        poll_interval_seconds: float = 2.0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.session_factory = session_factory
+        self._registrations: Dict[str, _Registration] = {}
+        self._snapshots: Dict[str, StatsSnapshot] = {}
+        self._dirty: Set[str] = set()
+        # Dirty flags are raised from request threads, refreshes run on the loop
+        self._dirty_lock = threading.Lock()
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, compute: StatsComputer, tables: Iterable[str]) -> None:
+        self._registrations[name] = _Registration(compute, set(tables))
+
+    def mark_tables_dirty(self, tables: Iterable[str]) -> None:
+        tables = set(tables)
+        with self._dirty_lock:
+            for name, registration in self._registrations.items():
+                if registration.tables & tables:
+                    self._dirty.add(name)
+
+    def is_dirty(self, name: str) -> bool:
+        with self._dirty_lock:
+            return name in self._dirty
+
+    async def get(self, name: str, fresh: bool = False) -> StatsSnapshot:
+        """Return the stored snapshot, computing it first if missing or ``fresh`` is set."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None or fresh:
+            snapshot = await self.refresh(name)
+        return snapshot
+
+    async def refresh(self, name: str) -> StatsSnapshot:
+        registration = self._registrations[name]
+        lock = self._refresh_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Clear the flag before computing so a write during the refresh
+            # schedules another one
+            with self._dirty_lock:
+                self._dirty.discard(name)
+            data = await asyncio.to_thread(self._compute, registration)
+            snapshot = StatsSnapshot(data=data, computed_at=datetime.now(timezone.utc))
+            self._snapshots[name] = snapshot
+            return snapshot
+
+    def _compute(self, registration: _Registration) -> Dict[str, Any]:
+        session = self._session_factory()()
+        try:
+            return registration.compute(session)
+        finally:
+            session.close()
+
+    async def refresh_due(self) -> None:
+        """Refresh every snapshot that is dirty or older than the refresh interval."""
+        now = datetime.now(timezone.utc)
+        for name in list(self._registrations):
+            snapshot = self._snapshots.get(name)
+            stale = snapshot is None or (now - snapshot.computed_at).total_seconds() >= self.refresh_interval_seconds
+            if stale or self.is_dirty(name):
+                try:
+                    await self.refresh(name)
+                except Exception:
+                    logger.exception("Refreshing stats snapshot %s failed", name)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_due()
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    def _session_factory(self) -> Callable[[], Session]:
+        if self.session_factory is None:
+            self.session_factory = get_database_manager().SessionLocal
+        return self.session_factory
+
+
+_settings = get_settings()
+stats_snapshots = StatsSnapshotService(
+    refresh_interval_seconds=_settings.stats_snapshot_refresh_seconds,
+    poll_interval_seconds=_settings.stats_snapshot_poll_seconds,
+)
+
+
+def _pending_tables(session: Session) -> Set[str]:
+    return session.info.setdefault(_CHANGED_TABLES_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    tables = _pending_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            tables.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_statement_tables(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _pending_tables(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed_tables_dirty(session: Session) -> None:
+    tables = session.info.pop(_CHANGED_TABLES_KEY, None)
+    if tables:
+        stats_snapshots.mark_tables_dirty(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_tables(session: Session) -> None:
+    session.info.pop(_CHANGED_TABLES_KEY, None)
@@ -0,0 +1,9 @@
+# Register the session listeners that maintain denormalised counters and keys
+from . import dedupe_keys  # noqa: F401
+from . import line_item_counter  # noqa: F401
+from . import vendor_rollups  # noqa: F401
+from . import last_prices  # noqa: F401
+from . import stock_balances  # noqa: F401
+from . import collection_versions  # noqa: F401
+# Creates the first monthly partitions whenever the stock movements table is created
+from . import movement_partitions  # noqa: F401
@@ -1,9 +1,25 @@
-from sqlalchemy import create_engine
+import weakref
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 Base = declarative_base()
 
+# Whether each table asked about exists, per engine. Missing tables are
+# remembered too: a deployment migrates before it restarts, so until then
+# every flush would otherwise inspect the schema again
+_known_tables: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def table_exists(connection: Connection, table_name: str) -> bool:
+    """Whether ``table_name`` exists, for listeners of tables a deployment may not have migrated yet."""
+    known = _known_tables.setdefault(connection.engine, {})
+    if table_name not in known:
+        known[table_name] = inspect(connection).has_table(table_name)
+    return known[table_name]
+
 
 class DatabaseManager:
     def __init__(self, database_url: str) -> None:
@@ -12,6 +28,7 @@ class DatabaseManager:
 
     def create_tables(self) -> None:
         Base.metadata.create_all(bind=self.engine)
+        _known_tables.pop(self.engine, None)
 
     def get_session(self):
         session = self.SessionLocal()
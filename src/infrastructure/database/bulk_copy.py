@@ -0,0 +1,54 @@
+"""
+Bulk inserts with PostgreSQL ``COPY``.
+
+``copy_rows`` streams rows to ``COPY ... FROM STDIN`` on the connection's own
+DBAPI cursor, so the rows are part of the connection's transaction. Other
+dialects (sqlite in the tests) get one executemany ``INSERT``. Like any
+Core/bulk write it bypasses the ORM flush listeners; callers keep the
+denormalised tables in step themselves.
+"""
+
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, List
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection
+
+
+def _csv_field(value) -> str:
+    # COPY reads an unquoted empty field as NULL and a quoted one as text
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_rows(connection: Connection, table: Table, rows: List[Dict]) -> None:
+    """Insert ``rows`` (dicts with the same keys) into ``table``."""
+    if not rows:
+        return
+    if connection.dialect.name != "postgresql":
+        connection.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_csv_field(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    preparer = connection.dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+        preparer.format_table(table), ", ".join(preparer.quote(column) for column in columns)
+    )
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
@@ -0,0 +1,128 @@
+"""
+Version counters of collections that list endpoints answer conditionally.
+
+``collection_versions`` holds one row per collection whose ``version`` goes
+up, and ``updated_at`` moves to the current time, on every change to a table
+its responses are built from. Flushes that insert, update or delete a row of
+a source table note the affected collections on the session, and once the
+session commits they are bumped in a short transaction of their own, so the
+counter row is locked for one ``UPDATE`` instead of until the writer's commit
+and concurrent writers (bulk receipts included) do not queue up behind it.
+Bumping after the commit also means a client can never be handed the new
+version together with the old data; at worst a version is bumped and the
+same data fetched once more. Set-based statements that bypass the ORM call
+``mark_collections_changed`` on their session. Reading a version is a primary
+key lookup, whatever the size of the source tables, and a delete followed by
+an insert still changes it.
+
+The ``inventory_items`` list is built from the item masters (whose
+``line_items_count`` changes are marked by the line item counter) and the
+category, subcategory, unit of measurement and packaging names; the
+``purchase_orders`` and ``warehouses`` lists only from their own tables.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple, Type
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .base import table_exists
+from .models import (
+    CollectionVersionModel,
+    InventoryItemMasterModel,
+    ItemCategoryModel,
+    ItemPackagingModel,
+    ItemSubCategoryModel,
+    PurchaseOrderModel,
+    UnitOfMeasurementModel,
+    WarehouseModel,
+)
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_ITEMS = "inventory_items"
+PURCHASE_ORDERS = "purchase_orders"
+WAREHOUSES = "warehouses"
+
+# Source model -> collections built from its table
+COLLECTION_SOURCES: Dict[Type, Tuple[str, ...]] = {
+    InventoryItemMasterModel: (INVENTORY_ITEMS,),
+    ItemCategoryModel: (INVENTORY_ITEMS,),
+    ItemSubCategoryModel: (INVENTORY_ITEMS,),
+    UnitOfMeasurementModel: (INVENTORY_ITEMS,),
+    ItemPackagingModel: (INVENTORY_ITEMS,),
+    PurchaseOrderModel: (PURCHASE_ORDERS,),
+    WarehouseModel: (WAREHOUSES,),
+}
+
+_PENDING_BUMPS_KEY = "collection_version_bumps"
+
+
+def bump_collection_versions(connection: Connection, names: Iterable[str]) -> None:
+    """Atomically increment the versions of the given collections."""
+    names = sorted(set(names))
+    if not names or not table_exists(connection, CollectionVersionModel.__tablename__):
+        return
+    for name in names:
+        bumped = connection.execute(
+            update(CollectionVersionModel)
+            .where(CollectionVersionModel.name == name)
+            .values(version=CollectionVersionModel.version + 1, updated_at=func.now())
+        )
+        if bumped.rowcount == 0:
+            # The migration seeds the known collections; this covers new ones
+            connection.execute(insert(CollectionVersionModel).values(name=name, version=1, updated_at=func.now()))
+
+
+def mark_collections_changed(session: Session, names: Iterable[str]) -> None:
+    """Bump the versions of the given collections once ``session`` commits."""
+    session.info.setdefault(_PENDING_BUMPS_KEY, set()).update(names)
+
+
+def collection_version(session: Session, name: str) -> Tuple[int, Optional[datetime]]:
+    """Return the version of a collection and when it last changed (``(0, None)`` if it never has)."""
+    row = session.execute(
+        select(CollectionVersionModel.version, CollectionVersionModel.updated_at).where(
+            CollectionVersionModel.name == name
+        )
+    ).first()
+    if row is None:
+        return 0, None
+    return row[0], row[1]
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_collection_bumps(session: Session, flush_context, instances) -> None:
+    names: Set[str] = set()
+    for obj in session.new:
+        names.update(COLLECTION_SOURCES.get(type(obj), ()))
+    for obj in session.deleted:
+        names.update(COLLECTION_SOURCES.get(type(obj), ()))
+    for obj in session.dirty:
+        sources = COLLECTION_SOURCES.get(type(obj))
+        if sources and session.is_modified(obj):
+            names.update(sources)
+    if names:
+        mark_collections_changed(session, names)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_collection_bumps(session: Session) -> None:
+    names = session.info.pop(_PENDING_BUMPS_KEY, None)
+    if not names:
+        return
+    bind = session.get_bind()
+    try:
+        with getattr(bind, "engine", bind).begin() as connection:
+            bump_collection_versions(connection, names)
+    except Exception:
+        # The change itself is committed; the next bump invalidates cached lists
+        logger.exception("Bumping collection versions %s failed", ", ".join(sorted(names)))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_collection_bumps(session: Session) -> None:
+    session.info.pop(_PENDING_BUMPS_KEY, None)
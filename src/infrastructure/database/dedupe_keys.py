@@ -0,0 +1,96 @@
+"""
+Keeps ``dedupe_keys`` in step with the names and emails of customers and vendors.
+
+Every ORM flush that inserts, deletes or renames a ``CustomerModel`` or
+``VendorModel`` (or changes its email) rewrites that record's blocking keys on
+the flushing connection, so the keys commit or roll back together with the
+record. Flushes without customers or vendors are left alone, and so are all
+flushes while the table has not been migrated yet. Rows written without the
+ORM are picked up by
+
+    python -m src.infrastructure.database.maintenance rebuild-dedupe-keys
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import delete, event, inspect, insert, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ...domain.services.duplicate_matching import blocking_keys
+from .base import table_exists
+from .models import CustomerModel, DedupeKeyModel, VendorModel
+
+DEDUPE_ENTITY_MODELS: Dict[str, Type] = {"Customer": CustomerModel, "Vendor": VendorModel}
+_ENTITY_TYPES = {model: entity_type for entity_type, model in DEDUPE_ENTITY_MODELS.items()}
+
+# (entity_type, entity_id, name, email); name and email are None for deleted rows
+KeySource = Tuple[str, UUID, Optional[str], Optional[str]]
+
+
+def write_dedupe_keys(connection: Connection, sources: Iterable[KeySource], replace: bool = True) -> None:
+    """Write the blocking keys of the given records, replacing their current ones."""
+    sources = list(sources)
+    if not sources:
+        return
+    if replace:
+        connection.execute(
+            delete(DedupeKeyModel).where(
+                tuple_(DedupeKeyModel.entity_type, DedupeKeyModel.entity_id).in_(
+                    [(entity_type, entity_id) for entity_type, entity_id, _, _ in sources]
+                )
+            )
+        )
+    rows = [
+        {"entity_type": entity_type, "entity_id": entity_id, "key": key[:300]}
+        for entity_type, entity_id, name, email in sources
+        for key in blocking_keys(name, email)
+    ]
+    if rows:
+        connection.execute(insert(DedupeKeyModel), rows)
+
+
+def _changed(obj, *attributes: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _write_flushed_dedupe_keys(session: Session, flush_context) -> None:
+    sources: List[KeySource] = []
+    for obj in session.new:
+        entity_type = _ENTITY_TYPES.get(type(obj))
+        if entity_type:
+            sources.append((entity_type, obj.id, obj.name, obj.email))
+    for obj in session.dirty:
+        entity_type = _ENTITY_TYPES.get(type(obj))
+        if entity_type and _changed(obj, "name", "email"):
+            sources.append((entity_type, obj.id, obj.name, obj.email))
+    for obj in session.deleted:
+        entity_type = _ENTITY_TYPES.get(type(obj))
+        if entity_type:
+            sources.append((entity_type, obj.id, None, None))
+    if not sources:
+        return
+    connection = session.connection()
+    if table_exists(connection, DedupeKeyModel.__tablename__):
+        write_dedupe_keys(connection, sources)
+
+
+def rebuild_dedupe_keys(session: Session, batch_size: int = 1000) -> int:
+    """Recompute every blocking key from the customer and vendor tables; returns the records indexed."""
+    connection = session.connection()
+    connection.execute(delete(DedupeKeyModel))
+    indexed = 0
+    for entity_type, model in DEDUPE_ENTITY_MODELS.items():
+        rows = connection.execute(
+            select(model.id, model.name, model.email).execution_options(yield_per=batch_size)
+        )
+        for batch in rows.partitions():
+            write_dedupe_keys(
+                connection, [(entity_type, row.id, row.name, row.email) for row in batch], replace=False
+            )
+            indexed += len(batch)
+    session.commit()
+    return indexed
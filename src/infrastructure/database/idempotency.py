@@ -0,0 +1,159 @@
+"""
+Storage for ``Idempotency-Key`` requests.
+
+The first request with a key claims it by inserting a row holding the request
+fingerprint; the primary key on ``(scope, key)`` makes the claim atomic across
+processes. Once the request finishes its response is stored on the row, and a
+retry with the same key and fingerprint gets that response back instead of
+running again. A request that fails without a response releases its claim so
+the client can retry it.
+
+An unfinished claim only holds the key for ``lease_seconds``; its owner
+``renew``s the lease while the request runs, so only the key of a worker that
+died mid-request can be taken over by a retry. The stored response is kept
+for ``ttl_seconds``.
+
+Claims are committed on their own short-lived sessions, independent of the
+request's session and its transaction.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ...core.config.database import get_database_manager
+from ...core.config.settings import get_settings
+from .models import IdempotencyKeyModel
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """The key was already used for a different request."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key has not finished yet."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        lease_seconds: float = 60,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.session_factory = session_factory
+
+    def begin(self, scope: str, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Claim ``key``, or return the response already stored for it.
+
+        ``None`` means the caller now owns the key and must ``complete`` or
+        ``release`` it.
+        """
+        session = self._session_factory()()
+        try:
+            now = datetime.now(timezone.utc)
+            # An expired claim or response no longer counts; the insert below replaces it
+            session.execute(delete(IdempotencyKeyModel).where(
+                IdempotencyKeyModel.scope == scope,
+                IdempotencyKeyModel.key == key,
+                IdempotencyKeyModel.expires_at <= now,
+            ))
+            session.add(IdempotencyKeyModel(
+                scope=scope,
+                key=key,
+                request_fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=self.lease_seconds),
+            ))
+            try:
+                session.commit()
+                return None
+            except IntegrityError:
+                session.rollback()
+
+            existing = session.get(IdempotencyKeyModel, (scope, key))
+            if existing is None:
+                # Released by its owner in the meantime
+                return self.begin(scope, key, fingerprint)
+            if existing.request_fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used for a different request")
+            if existing.status_code is None:
+                raise IdempotencyKeyInProgress()
+            return StoredResponse(existing.status_code, existing.response_body)
+        finally:
+            session.close()
+
+    def complete(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        # Only unfinished claims: a request outliving its lease must not
+        # overwrite the response of the request that took its key over
+        self._execute(
+            update(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.scope == scope,
+                IdempotencyKeyModel.key == key,
+                IdempotencyKeyModel.status_code.is_(None),
+            )
+            .values(
+                status_code=status_code,
+                response_body=body,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+            )
+        )
+
+    def renew(self, scope: str, key: str) -> bool:
+        """Extend the lease of an unfinished claim; ``False`` if there is none."""
+        return self._execute(
+            update(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.scope == scope,
+                IdempotencyKeyModel.key == key,
+                IdempotencyKeyModel.status_code.is_(None),
+            )
+            .values(expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds))
+        ) > 0
+
+    def release(self, scope: str, key: str) -> None:
+        self._execute(
+            delete(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.scope == scope,
+                IdempotencyKeyModel.key == key,
+                IdempotencyKeyModel.status_code.is_(None),
+            )
+        )
+
+    def purge_expired(self) -> int:
+        return self._execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at <= datetime.now(timezone.utc))
+        )
+
+    def _execute(self, stmt) -> int:
+        session = self._session_factory()()
+        try:
+            result = session.execute(stmt)
+            session.commit()
+            return result.rowcount
+        finally:
+            session.close()
+
+    def _session_factory(self) -> Callable[[], Session]:
+        if self.session_factory is None:
+            self.session_factory = get_database_manager().SessionLocal
+        return self.session_factory
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=get_settings().idempotency_key_ttl_seconds,
+    lease_seconds=get_settings().idempotency_lease_seconds,
+)
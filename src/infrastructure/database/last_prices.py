@@ -0,0 +1,242 @@
+"""
+Keeps ``last_purchase_prices`` in step with purchase order line items.
+
+For every item and vendor the table holds the line of the latest active,
+non-cancelled purchase order: the one with the latest ``order_date``, then
+the latest creation time. Creating an order with ``save_with_line_items``
+bypasses the ORM for its lines and calls ``record_last_prices``, one upsert
+that only replaces older prices. Any other ORM flush that cancels,
+deactivates, re-dates or deletes an order, moves it to another vendor, or
+changes a line's item or price recomputes just the affected item and vendor
+pairs on the flushing connection, so the prices commit or roll back together
+with the orders.
+
+``python -m src.infrastructure.database.maintenance rebuild-last-purchase-prices``
+recomputes the whole table.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, insert, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import (
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    PurchaseOrderStatus,
+)
+
+_PENDING_KEYS_KEY = "last_purchase_price_keys"
+_ORDER_ATTRIBUTES = ("vendor_id", "order_date", "is_active")
+_LINE_ATTRIBUTES = (
+    "purchase_order_id",
+    "inventory_item_master_id",
+    "quantity",
+    "unit_price",
+    "discount",
+    "tax_amount",
+    "is_active",
+)
+_PRICE_COLUMNS = ("quantity", "unit_price", "discount", "tax_amount")
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# Two bound parameters per key keeps each refresh well below driver limits
+_KEYS_PER_STATEMENT = 1000
+
+PriceKey = Tuple[UUID, UUID]
+
+
+def _cancelled(status) -> bool:
+    return getattr(status, "value", status) == PurchaseOrderStatus.CANCELLED.value
+
+
+def record_last_prices(
+    connection: Connection,
+    purchase_order_id: UUID,
+    vendor_id: UUID,
+    order_date: date,
+    ordered_at: datetime,
+    line_rows: List[Dict],
+) -> None:
+    """Upsert the lines of a newly inserted, active order unless a later order is already recorded.
+
+    ``line_rows`` are the column values the lines were inserted with.
+    """
+    latest: Dict[UUID, Dict] = {}
+    for row in line_rows:
+        if row.get("is_active") is False:
+            continue
+        current = latest.get(row["inventory_item_master_id"])
+        # Same tie-break as the recompute: the latest line, then the highest id
+        if current is None or (row["created_at"], str(row["id"])) > (current["created_at"], str(current["id"])):
+            latest[row["inventory_item_master_id"]] = row
+    if not latest:
+        return
+
+    rows = [
+        {
+            "inventory_item_master_id": item_id,
+            "vendor_id": vendor_id,
+            "purchase_order_id": purchase_order_id,
+            "line_item_id": row["id"],
+            "order_date": order_date,
+            "ordered_at": ordered_at,
+            **{column: row[column] for column in _PRICE_COLUMNS},
+        }
+        for item_id, row in latest.items()
+    ]
+    table = LastPurchasePriceModel.__table__
+    upsert = _UPSERTS[connection.dialect.name](table)
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[table.c.inventory_item_master_id, table.c.vendor_id],
+            set_={
+                column: upsert.excluded[column]
+                for column in ("purchase_order_id", "line_item_id", "order_date", "ordered_at", *_PRICE_COLUMNS)
+            },
+            where=tuple_(table.c.order_date, table.c.ordered_at)
+            <= tuple_(upsert.excluded.order_date, upsert.excluded.ordered_at),
+        ),
+        rows,
+    )
+
+
+def _latest_lines(keys: Optional[List[PriceKey]] = None):
+    """``SELECT`` of the latest line per item and vendor, for all pairs or only ``keys``."""
+    line, order = PurchaseOrderLineItemModel, PurchaseOrderModel
+    rank = func.row_number().over(
+        partition_by=(line.inventory_item_master_id, order.vendor_id),
+        order_by=(order.order_date.desc(), order.created_at.desc(), line.created_at.desc(), line.id.desc()),
+    )
+    ranked = (
+        select(
+            line.inventory_item_master_id,
+            order.vendor_id,
+            order.id.label("purchase_order_id"),
+            line.id.label("line_item_id"),
+            order.order_date,
+            order.created_at.label("ordered_at"),
+            *(getattr(line, column) for column in _PRICE_COLUMNS),
+            rank.label("rank"),
+        )
+        .join(order, order.id == line.purchase_order_id)
+        .where(order.is_active.is_(True), line.is_active.is_(True), order.status != PurchaseOrderStatus.CANCELLED)
+    )
+    if keys is not None:
+        ranked = ranked.where(tuple_(line.inventory_item_master_id, order.vendor_id).in_(keys))
+    ranked = ranked.subquery()
+    columns = [column.name for column in LastPurchasePriceModel.__table__.columns]
+    return columns, select(*(ranked.c[column] for column in columns)).where(ranked.c.rank == 1)
+
+
+def refresh_last_prices(connection: Connection, keys: Iterable[PriceKey]) -> None:
+    """Recompute the prices of the given item and vendor pairs from the line items."""
+    keys = sorted({key for key in keys if all(key)}, key=lambda key: (str(key[0]), str(key[1])))
+    table = LastPurchasePriceModel.__table__
+    for start in range(0, len(keys), _KEYS_PER_STATEMENT):
+        chunk = keys[start:start + _KEYS_PER_STATEMENT]
+        connection.execute(
+            delete(table).where(tuple_(table.c.inventory_item_master_id, table.c.vendor_id).in_(chunk))
+        )
+        columns, latest = _latest_lines(chunk)
+        connection.execute(insert(table).from_select(columns, latest))
+
+
+def _previous(obj, attribute: str):
+    history = inspect(obj).attrs[attribute].history
+    return history.deleted[0] if history.deleted else getattr(obj, attribute)
+
+
+def _changed(obj, attributes: Tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+def _order_changed(order: PurchaseOrderModel) -> bool:
+    # Other status changes keep the order's lines priced
+    return _changed(order, _ORDER_ATTRIBUTES) or _cancelled(order.status) != _cancelled(_previous(order, "status"))
+
+
+@event.listens_for(PurchaseOrderModel.vendor_id, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.status, "set", active_history=True)
+@event.listens_for(PurchaseOrderLineItemModel.purchase_order_id, "set", active_history=True)
+@event.listens_for(PurchaseOrderLineItemModel.inventory_item_master_id, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    # Makes the ORM load the committed value before an assignment, so the
+    # pair the row used to price can be refreshed as well
+    pass
+
+
+def _affected_keys(session: Session) -> Set[PriceKey]:
+    order_vendors: Dict[UUID, Set[UUID]] = {}
+    for obj in session.dirty | session.deleted:
+        if isinstance(obj, PurchaseOrderModel) and (obj in session.deleted or _order_changed(obj)):
+            order_vendors[obj.id] = {obj.vendor_id, _previous(obj, "vendor_id")}
+
+    line_orders: Set[Tuple[UUID, UUID]] = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, PurchaseOrderLineItemModel) and (
+            obj in session.new or obj in session.deleted or _changed(obj, _LINE_ATTRIBUTES)
+        ):
+            line_orders.add((obj.inventory_item_master_id, obj.purchase_order_id))
+            line_orders.add((_previous(obj, "inventory_item_master_id"), _previous(obj, "purchase_order_id")))
+
+    keys: Set[PriceKey] = set()
+    if order_vendors:
+        line = PurchaseOrderLineItemModel
+        items = session.execute(
+            select(line.purchase_order_id, line.inventory_item_master_id)
+            .where(line.purchase_order_id.in_(order_vendors))
+            .distinct()
+        )
+        for order_id, item_id in items:
+            keys.update((item_id, vendor_id) for vendor_id in order_vendors[order_id])
+
+    if line_orders:
+        vendors = {
+            obj.id: obj.vendor_id
+            for obj in session.identity_map.values() if isinstance(obj, PurchaseOrderModel)
+        }
+        vendors.update((obj.id, obj.vendor_id) for obj in session.new if isinstance(obj, PurchaseOrderModel))
+        missing = {order_id for _, order_id in line_orders if order_id and order_id not in vendors}
+        if missing:
+            vendors.update(session.execute(
+                select(PurchaseOrderModel.id, PurchaseOrderModel.vendor_id)
+                .where(PurchaseOrderModel.id.in_(missing))
+            ).all())
+        keys.update((item_id, vendors.get(order_id)) for item_id, order_id in line_orders)
+    return keys
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_last_price_keys(session: Session, flush_context, instances) -> None:
+    with session.no_autoflush:
+        keys = _affected_keys(session)
+    if keys:
+        session.info.setdefault(_PENDING_KEYS_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_last_prices(session: Session, flush_context) -> None:
+    keys = session.info.pop(_PENDING_KEYS_KEY, None)
+    if keys:
+        refresh_last_prices(session.connection(), keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_last_price_keys(session: Session) -> None:
+    session.info.pop(_PENDING_KEYS_KEY, None)
+
+
+def rebuild_last_prices(session: Session) -> int:
+    """Recompute every last purchase price from the line items; returns the number of rows."""
+    session.execute(delete(LastPurchasePriceModel))
+    columns, latest = _latest_lines()
+    session.execute(insert(LastPurchasePriceModel).from_select(columns, latest))
+    count = session.scalar(select(func.count()).select_from(LastPurchasePriceModel))
+    session.commit()
+    return count
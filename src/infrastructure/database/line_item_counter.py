@@ -0,0 +1,155 @@
+"""
+Keeps ``inventory_item_masters.line_items_count`` in step with the number of
+active line items of each master.
+
+Every ORM flush that inserts, deletes, activates or deactivates a
+``LineItemModel`` (or moves one to another master) adjusts the counters of
+the affected masters with an atomic ``UPDATE`` on the flushing connection, so
+the counter commits or rolls back together with the line items themselves.
+Set-based statements that bypass the ORM must call
+``apply_line_items_count_deltas`` in the same transaction, and mark the
+``inventory_items`` collection changed as the flush does.
+
+``python -m src.infrastructure.database.maintenance check-line-item-counts``
+compares the stored counters with the line items table.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .collection_versions import INVENTORY_ITEMS, mark_collections_changed
+from .models import InventoryItemMasterModel, LineItemModel
+
+_PENDING_DELTAS_KEY = "line_items_count_deltas"
+
+
+def apply_line_items_count_deltas(connection: Connection, deltas: Dict[UUID, int]) -> None:
+    """Atomically add ``deltas`` to the counters of the given masters."""
+    deltas = {master_id: delta for master_id, delta in deltas.items() if master_id and delta}
+    if not deltas:
+        return
+    adjustment = case(
+        {master_id: delta for master_id, delta in deltas.items()},
+        value=InventoryItemMasterModel.id,
+        else_=0,
+    )
+    connection.execute(
+        update(InventoryItemMasterModel)
+        .where(InventoryItemMasterModel.id.in_(list(deltas)))
+        .values(line_items_count=InventoryItemMasterModel.line_items_count + adjustment)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _previous_value(line_item: LineItemModel, attribute: str):
+    history = inspect(line_item).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(line_item, attribute)
+
+
+def _counts(is_active: Optional[bool]) -> bool:
+    # is_active is only filled in by its column default at insert time
+    return is_active is not False
+
+
+@event.listens_for(LineItemModel.is_active, "set", active_history=True)
+@event.listens_for(LineItemModel.inventory_item_master_id, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    # Registering with active_history makes the ORM load the committed value
+    # before an assignment, so flush-time history knows what is being replaced
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_line_item_deltas(session: Session, flush_context, instances) -> None:
+    deltas: Dict[UUID, int] = defaultdict(int)
+
+    for obj in session.new:
+        if isinstance(obj, LineItemModel) and _counts(obj.is_active):
+            master_id = obj.inventory_item_master_id
+            if master_id is None and obj.inventory_item_master is not None:
+                master_id = obj.inventory_item_master.id
+            deltas[master_id] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, LineItemModel) and _counts(_previous_value(obj, "is_active")):
+            deltas[_previous_value(obj, "inventory_item_master_id")] -= 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, LineItemModel) or not session.is_modified(obj):
+            continue
+        was_counted = _counts(_previous_value(obj, "is_active"))
+        is_counted = _counts(obj.is_active)
+        previous_master = _previous_value(obj, "inventory_item_master_id")
+        if was_counted:
+            deltas[previous_master] -= 1
+        if is_counted:
+            deltas[obj.inventory_item_master_id] += 1
+
+    if any(deltas.values()):
+        pending = session.info.setdefault(_PENDING_DELTAS_KEY, defaultdict(int))
+        for master_id, delta in deltas.items():
+            pending[master_id] += delta
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_line_item_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_PENDING_DELTAS_KEY, None)
+    if not deltas:
+        return
+    apply_line_items_count_deltas(session.connection(), deltas)
+    mark_collections_changed(session, [INVENTORY_ITEMS])
+    # Loaded masters must not keep serving the pre-flush counter
+    for master_id in deltas:
+        master = session.identity_map.get(inspect(InventoryItemMasterModel).identity_key_from_primary_key((master_id,)))
+        if master is not None:
+            session.expire(master, ["line_items_count"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_line_item_deltas(session: Session) -> None:
+    session.info.pop(_PENDING_DELTAS_KEY, None)
+
+
+def _actual_counts_subquery():
+    return (
+        select(
+            LineItemModel.inventory_item_master_id.label("inventory_item_master_id"),
+            func.count(LineItemModel.id).label("actual"),
+        )
+        .where(LineItemModel.is_active == True)
+        .group_by(LineItemModel.inventory_item_master_id)
+        .subquery()
+    )
+
+
+def find_line_items_count_mismatches(session: Session) -> List[Tuple[UUID, int, int]]:
+    """Return ``(master_id, stored, actual)`` for every master whose counter has drifted."""
+    actual_counts = _actual_counts_subquery()
+    actual = func.coalesce(actual_counts.c.actual, 0)
+    rows = session.execute(
+        select(InventoryItemMasterModel.id, InventoryItemMasterModel.line_items_count, actual)
+        .outerjoin(actual_counts, actual_counts.c.inventory_item_master_id == InventoryItemMasterModel.id)
+        .where(InventoryItemMasterModel.line_items_count != actual)
+    )
+    return [(row[0], row[1], row[2]) for row in rows]
+
+
+def rebuild_line_items_counts(session: Session) -> int:
+    """Recompute drifted counters from the line items table; returns how many were fixed."""
+    mismatches = find_line_items_count_mismatches(session)
+    apply_line_items_count_deltas(
+        session.connection(),
+        {master_id: actual - stored for master_id, stored, actual in mismatches},
+    )
+    if mismatches:
+        mark_collections_changed(session, [INVENTORY_ITEMS])
+    session.commit()
+    return len(mismatches)
+
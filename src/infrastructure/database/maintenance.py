@@ -0,0 +1,183 @@
+"""
+Database maintenance commands.
+
+Usage:
+    python -m src.infrastructure.database.maintenance check-line-item-counts [--fix]
+    python -m src.infrastructure.database.maintenance rebuild-dedupe-keys
+    python -m src.infrastructure.database.maintenance find-duplicates {Customer,Vendor}
+    python -m src.infrastructure.database.maintenance purge-idempotency-keys
+    python -m src.infrastructure.database.maintenance rebuild-vendor-rollups
+    python -m src.infrastructure.database.maintenance rebuild-last-purchase-prices
+    python -m src.infrastructure.database.maintenance check-stock-balances [--fix]
+    python -m src.infrastructure.database.maintenance take-stock-snapshot [--at ISO_DATETIME]
+    python -m src.infrastructure.database.maintenance create-movement-partitions [--months-ahead N]
+    python -m src.infrastructure.database.maintenance detach-movement-partitions --before YYYY-MM [--drop]
+"""
+
+import asyncio
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from ...application.services.duplicate_detection_service import DuplicateDetectionService
+from ...core.config.database import get_database_manager
+from ..repositories.duplicate_candidate_repository_impl import SQLAlchemyDuplicateCandidateRepository
+from .dedupe_keys import DEDUPE_ENTITY_MODELS, rebuild_dedupe_keys
+from .idempotency import idempotency_store
+from .last_prices import rebuild_last_prices
+from .line_item_counter import find_line_items_count_mismatches, rebuild_line_items_counts
+from .movement_partitions import MONTHS_AHEAD, detach_movement_partitions, ensure_movement_partitions
+from .stock_balances import find_stock_balance_mismatches, rebuild_stock_balances
+from .stock_history import take_stock_snapshot
+from .vendor_rollups import rebuild_vendor_rollups
+
+
+def check_line_item_counts(session: Session, fix: bool = False) -> int:
+    mismatches = find_line_items_count_mismatches(session)
+    for master_id, stored, actual in mismatches:
+        print(f"{master_id}: stored={stored} actual={actual}")
+    if mismatches and fix:
+        print(f"Fixed {rebuild_line_items_counts(session)} line item counter(s)")
+        return 0
+    print(f"{len(mismatches)} mismatched line item counter(s)")
+    return 1 if mismatches else 0
+
+
+def check_stock_balances(session: Session, fix: bool = False) -> int:
+    mismatches = find_stock_balance_mismatches(session)
+    for (master_id, warehouse_id, status), stored, actual in mismatches:
+        print(f"{master_id} {warehouse_id} {status}: stored={stored} actual={actual}")
+    if mismatches and fix:
+        print(f"Fixed {rebuild_stock_balances(session)} stock balance(s)")
+        return 0
+    print(f"{len(mismatches)} mismatched stock balance(s)")
+    return 1 if mismatches else 0
+
+
+def find_duplicates(session: Session, entity_type: str) -> int:
+    detector = DuplicateDetectionService(SQLAlchemyDuplicateCandidateRepository(session), entity_type)
+    clusters = asyncio.run(detector.find_clusters())
+    for cluster in clusters:
+        print(" | ".join(f"{record.entity_id} {record.name}" for record in cluster))
+    print(f"{len(clusters)} duplicate {entity_type.lower()} cluster(s)")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Database maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check_counts = commands.add_parser(
+        "check-line-item-counts",
+        help="Compare inventory_item_masters.line_items_count with the line items table",
+    )
+    check_counts.add_argument("--fix", action="store_true", help="Rewrite drifted counters")
+
+    commands.add_parser(
+        "rebuild-dedupe-keys",
+        help="Recompute the duplicate detection keys of all customers and vendors",
+    )
+    duplicates = commands.add_parser(
+        "find-duplicates",
+        help="List groups of customers or vendors that look like duplicates",
+    )
+    duplicates.add_argument("entity_type", choices=sorted(DEDUPE_ENTITY_MODELS))
+    commands.add_parser(
+        "purge-idempotency-keys",
+        help="Delete expired Idempotency-Key records and their stored responses",
+    )
+    commands.add_parser(
+        "rebuild-vendor-rollups",
+        help="Recompute the per vendor and month purchasing rollups from the purchase orders",
+    )
+    commands.add_parser(
+        "rebuild-last-purchase-prices",
+        help="Recompute the last price paid per item and vendor from the purchase order lines",
+    )
+    check_balances = commands.add_parser(
+        "check-stock-balances",
+        help="Compare stock_balances with the quantities in the line items table",
+    )
+    check_balances.add_argument("--fix", action="store_true", help="Correct drifted balances")
+    snapshot = commands.add_parser(
+        "take-stock-snapshot",
+        help="Store the stock levels per item and warehouse for point-in-time queries; run daily",
+    )
+    snapshot.add_argument(
+        "--at", type=datetime.fromisoformat, default=None,
+        help="Snapshot time (default: the last midnight, UTC, at least the safety lag ago)",
+    )
+    create_partitions = commands.add_parser(
+        "create-movement-partitions",
+        help="Create the monthly stock movement partitions for this month and the next ones",
+    )
+    create_partitions.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    detach_partitions = commands.add_parser(
+        "detach-movement-partitions",
+        help="Detach the stock movement partitions of the months before --before",
+    )
+    detach_partitions.add_argument(
+        "--before", required=True, type=lambda value: datetime.strptime(value, "%Y-%m").date(),
+        help="First month to keep, as YYYY-MM",
+    )
+    detach_partitions.add_argument("--drop", action="store_true", help="Drop the detached partitions as well")
+
+    args = parser.parse_args(argv)
+    session = get_database_manager().SessionLocal()
+    try:
+        if args.command == "check-line-item-counts":
+            return check_line_item_counts(session, fix=args.fix)
+        if args.command == "rebuild-dedupe-keys":
+            print(f"Indexed {rebuild_dedupe_keys(session)} customer(s) and vendor(s)")
+            return 0
+        if args.command == "find-duplicates":
+            return find_duplicates(session, args.entity_type)
+        if args.command == "purge-idempotency-keys":
+            print(f"Purged {idempotency_store.purge_expired()} expired idempotency key(s)")
+            return 0
+        if args.command == "rebuild-vendor-rollups":
+            print(f"Rebuilt {rebuild_vendor_rollups(session)} vendor rollup row(s)")
+            return 0
+        if args.command == "rebuild-last-purchase-prices":
+            print(f"Rebuilt {rebuild_last_prices(session)} last purchase price(s)")
+            return 0
+        if args.command == "check-stock-balances":
+            return check_stock_balances(session, fix=args.fix)
+        if args.command == "take-stock-snapshot":
+            try:
+                taken = take_stock_snapshot(session, args.at)
+            except ValueError as e:
+                print(e)
+                return 1
+            if taken is None:
+                print("A later stock snapshot already exists")
+            else:
+                print(f"Snapshot {taken[0].isoformat()} holds {taken[1]} stock level(s)")
+            return 0
+        if args.command == "create-movement-partitions":
+            created = ensure_movement_partitions(session.connection(), args.months_ahead)
+            session.commit()
+            print(f"Created {len(created)} stock movement partition(s)")
+            return 0
+        if args.command == "detach-movement-partitions":
+            try:
+                detached = detach_movement_partitions(session.connection(), args.before, drop=args.drop)
+            except ValueError as e:
+                print(e)
+                return 1
+            session.commit()
+            for name in detached:
+                print(name)
+            print(f"{'Dropped' if args.drop else 'Detached'} {len(detached)} stock movement partition(s)")
+            return 0
+    finally:
+        session.close()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Text, Index, ForeignKey, UniqueConstraint, Integer, Boolean, Enum, DECIMAL, CheckConstraint, Date
+from sqlalchemy import Column, String, Text, Index, ForeignKey, UniqueConstraint, Integer, BigInteger, Boolean, Enum, DECIMAL, CheckConstraint, Date, DateTime, JSON, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
+import uuid
 
+from .base import Base
 from .base_model import TimeStampedModel
 
 
@@ -12,10 +14,19 @@ class ContactNumberModel(TimeStampedModel):
     number = Column(String(20), nullable=False, index=True)
     entity_type = Column(String(50), nullable=True, index=True)
     entity_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    # Canonical international form and its digits reversed, so that a
+    # "last N digits" lookup is a prefix match on an index
+    normalized_number = Column(String(20), nullable=True, index=True)
+    reversed_digits = Column(String(20), nullable=True)
 
     __table_args__ = (
         Index('ix_contact_numbers_entity', 'entity_type', 'entity_id'),
         Index('ix_contact_numbers_unique', 'entity_type', 'entity_id', 'number', unique=True),
+        Index(
+            'ix_contact_numbers_reversed_digits',
+            'reversed_digits',
+            postgresql_ops={'reversed_digits': 'varchar_pattern_ops'},
+        ),
     )
 
 
@@ -27,6 +38,8 @@ class CustomerModel(TimeStampedModel):
     address = Column(Text, nullable=True)
     remarks = Column(String(255), nullable=True)
     city = Column(String(255), nullable=True, index=True)
+    # Lower-cased, whitespace-collapsed city for equality/prefix filters and facets
+    city_key = Column(String(255), nullable=True)
     
     # Keep backward compatibility with old address fields
     street = Column(String(500), nullable=True)
@@ -34,6 +47,10 @@ class CustomerModel(TimeStampedModel):
     zip_code = Column(String(20), nullable=True)
     country = Column(String(100), nullable=True, default="USA")
 
+    __table_args__ = (
+        Index('ix_customers_city_key', 'city_key', postgresql_ops={'city_key': 'varchar_pattern_ops'}),
+    )
+
 
 class VendorModel(TimeStampedModel):
     __tablename__ = "vendors"
@@ -43,6 +60,44 @@ class VendorModel(TimeStampedModel):
     address = Column(Text, nullable=True)
     remarks = Column(String(255), nullable=True)
     city = Column(String(255), nullable=True, index=True)
+    # Lower-cased, whitespace-collapsed city for equality/prefix filters and facets
+    city_key = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index('ix_vendors_city_key', 'city_key', postgresql_ops={'city_key': 'varchar_pattern_ops'}),
+    )
+
+
+class DedupeKeyModel(Base):
+    """Blocking keys for duplicate detection, kept in step by ``dedupe_keys``."""
+    __tablename__ = "dedupe_keys"
+
+    # Primary key order (entity_type, key, entity_id) serves the candidate lookups
+    entity_type = Column(String(50), primary_key=True)
+    key = Column(String(300), primary_key=True)
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_dedupe_keys_entity', 'entity_type', 'entity_id'),
+    )
+
+
+class IdempotencyKeyModel(Base):
+    """Idempotency-Key claims and stored responses, managed by ``idempotency``."""
+    __tablename__ = "idempotency_keys"
+
+    scope = Column(String(255), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_fingerprint = Column(String(64), nullable=False)
+    # Both stay NULL while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
 
 
 class ItemPackagingModel(TimeStampedModel):
@@ -55,6 +110,11 @@ class ItemPackagingModel(TimeStampedModel):
 
     __table_args__ = (
         Index('packaging_label_idx', 'label'),
+        # Seek pagination keys: (sort column, id)
+        Index('packaging_name_id_idx', 'name', 'id'),
+        Index('packaging_label_id_idx', 'label', 'id'),
+        Index('packaging_unit_id_idx', 'unit', 'id'),
+        Index('packaging_created_at_id_idx', 'created_at', 'id'),
     )
 
 
@@ -67,6 +127,10 @@ class UnitOfMeasurementModel(TimeStampedModel):
 
     __table_args__ = (
         Index('uom_abbreviation_idx', 'abbreviation'),
+        # Seek pagination keys: (sort column, id)
+        Index('uom_name_id_idx', 'name', 'id'),
+        Index('uom_abbreviation_id_idx', 'abbreviation', 'id'),
+        Index('uom_created_at_id_idx', 'created_at', 'id'),
     )
 
 
@@ -79,6 +143,10 @@ class WarehouseModel(TimeStampedModel):
 
     __table_args__ = (
         Index('warehouse_label_idx', 'label'),
+        # Seek pagination keys: (sort column, id)
+        Index('warehouse_name_id_idx', 'name', 'id'),
+        Index('warehouse_label_id_idx', 'label', 'id'),
+        Index('warehouse_created_at_id_idx', 'created_at', 'id'),
     )
 
 
@@ -181,6 +249,8 @@ class InventoryItemMasterModel(TimeStampedModel):
     height = Column(DECIMAL(10, 2), nullable=True)
     renting_period = Column(Integer, default=1, nullable=False)
     quantity = Column(Integer, default=0, nullable=False)
+    # Number of active line items, maintained by database.line_item_counter
+    line_items_count = Column(Integer, default=0, nullable=False)
 
     # Relationships
     subcategory = relationship("ItemSubCategoryModel", backref="inventory_items")
@@ -197,6 +267,7 @@ class InventoryItemMasterModel(TimeStampedModel):
         Index('ix_inventory_item_masters_tracking_type', 'tracking_type'),
         Index('ix_inventory_item_masters_is_consumable', 'is_consumable'),
         Index('ix_inventory_item_masters_quantity', 'quantity'),
+        Index('ix_inventory_item_masters_subcategory_active', 'item_sub_category_id', 'is_active'),
     )
 
 
@@ -228,13 +299,20 @@ class LineItemModel(TimeStampedModel):
         CheckConstraint('quantity >= 0', name='check_non_negative_quantity'),
         UniqueConstraint('serial_number', name='unique_serial_number'),
         Index('ix_line_items_status', 'status'),
+        # Stock lookups when receiving and moving goods
+        Index('ix_line_items_item_warehouse', 'inventory_item_master_id', 'warehouse_id'),
         Index('ix_line_items_rentable_sellable', 'rentable', 'sellable'),
     )
 
 
 class InventoryItemStockMovementModel(TimeStampedModel):
+    """Append-only stock journal, range partitioned by month on PostgreSQL, see ``movement_partitions``."""
     __tablename__ = "inventory_item_stock_movements"
 
+    # A partitioned table's primary key has to include the partition key;
+    # rows are still identified by id alone
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     inventory_item_id = Column(UUID(as_uuid=True), ForeignKey("line_items.id"), nullable=False)
     movement_type = Column(Enum(MovementType), nullable=False)
     inventory_transaction_id = Column(String(255), nullable=False, index=True)
@@ -252,8 +330,40 @@ class InventoryItemStockMovementModel(TimeStampedModel):
 
     __table_args__ = (
         Index('ix_inventory_movements_type', 'movement_type'),
-        Index('ix_inventory_movements_created_at', 'created_at'),
+        # Rows arrive in created_at order, so a BRIN index serves time ranges at a fraction of a B-tree's size
+        Index('ix_inventory_movements_created_at', 'created_at', postgresql_using='brin'),
+        Index('ix_inventory_movements_inventory_item_id', 'inventory_item_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
+    __mapper_args__ = {'primary_key': [id]}
+
+
+class StockBalanceModel(Base):
+    """Stock on hand per item, warehouse and status, kept in step by ``stock_balances``."""
+    __tablename__ = "stock_balances"
+
+    inventory_item_master_id = Column(UUID(as_uuid=True), primary_key=True)
+    warehouse_id = Column(UUID(as_uuid=True), primary_key=True)
+    status = Column(Enum(InventoryItemStatus), primary_key=True)
+    # Sum of the quantities of the active line_items rows with this key
+    quantity = Column(Integer, default=0, nullable=False)
+
+
+class StockSnapshotModel(Base):
+    """A point in time whose stock levels are kept in ``stock_snapshot_levels``, see ``stock_history``."""
+    __tablename__ = "stock_snapshots"
+
+    taken_at = Column(DateTime(timezone=True), primary_key=True)
+
+
+class StockSnapshotLevelModel(Base):
+    """Stock on hand per item and warehouse as of a snapshot."""
+    __tablename__ = "stock_snapshot_levels"
+
+    taken_at = Column(DateTime(timezone=True), ForeignKey("stock_snapshots.taken_at", ondelete="CASCADE"), primary_key=True)
+    inventory_item_master_id = Column(UUID(as_uuid=True), primary_key=True)
+    warehouse_id = Column(UUID(as_uuid=True), primary_key=True)
+    quantity = Column(Integer, nullable=False)
 
 
 class PurchaseOrderStatus(str, enum.Enum):
@@ -271,6 +381,8 @@ class PurchaseOrderModel(TimeStampedModel):
     vendor_id = Column(UUID(as_uuid=True), ForeignKey("vendors.id"), nullable=False)
     order_date = Column(Date, nullable=False)
     expected_delivery_date = Column(Date, nullable=True)
+    # Set when the last line is received; feeds the vendor lead-time rollups
+    received_date = Column(Date, nullable=True)
     status = Column(Enum(PurchaseOrderStatus), default=PurchaseOrderStatus.DRAFT, nullable=False)
     total_amount = Column(DECIMAL(12, 2), default=0.0, nullable=False)
     total_tax_amount = Column(DECIMAL(12, 2), default=0.0, nullable=False)
@@ -289,9 +401,34 @@ class PurchaseOrderModel(TimeStampedModel):
         CheckConstraint('total_tax_amount >= 0', name='check_positive_total_tax'),
         CheckConstraint('total_discount >= 0', name='check_positive_total_discount'),
         CheckConstraint('grand_total >= 0', name='check_positive_grand_total'),
-        Index('ix_purchase_orders_status', 'status'),
-        Index('ix_purchase_orders_order_date', 'order_date'),
-        Index('ix_purchase_orders_vendor', 'vendor_id'),
+        # Listing filters are equality on vendor/status plus an order_date
+        # range, paged on (order_date, id)
+        Index('ix_purchase_orders_vendor_status_date', 'vendor_id', 'status', 'order_date', 'id'),
+        Index('ix_purchase_orders_status_date', 'status', 'order_date', 'id'),
+        Index('ix_purchase_orders_order_date', 'order_date', 'id'),
+    )
+
+
+class VendorMonthlyRollupModel(Base):
+    """Purchasing totals per vendor and order month, kept in step by ``vendor_rollups``."""
+    __tablename__ = "vendor_monthly_rollups"
+
+    vendor_id = Column(UUID(as_uuid=True), primary_key=True)
+    # First day of the month of the orders' order_date
+    month = Column(Date, primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    cancelled_order_count = Column(Integer, default=0, nullable=False)
+    # Spend, tax and discount leave out cancelled orders
+    spend = Column(DECIMAL(14, 2), default=0, nullable=False)
+    tax_amount = Column(DECIMAL(14, 2), default=0, nullable=False)
+    discount_amount = Column(DECIMAL(14, 2), default=0, nullable=False)
+    received_order_count = Column(Integer, default=0, nullable=False)
+    # Received orders that had an expected delivery date, and their summed lag
+    lead_time_order_count = Column(Integer, default=0, nullable=False)
+    total_delivery_delay_days = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index('ix_vendor_monthly_rollups_month', 'month'),
     )
 
 
@@ -335,4 +472,29 @@ class PurchaseOrderLineItemModel(TimeStampedModel):
         Index('ix_purchase_order_line_items_serial', 'serial_number'),
         Index('ix_purchase_order_line_items_inventory', 'inventory_item_master_id'),
         Index('ix_purchase_order_line_items_warehouse', 'warehouse_id'),
-    )
\ No newline at end of file
+    )
+
+class LastPurchasePriceModel(Base):
+    """The most recent price paid per item and vendor, kept in step by ``last_prices``."""
+    __tablename__ = "last_purchase_prices"
+
+    inventory_item_master_id = Column(UUID(as_uuid=True), primary_key=True)
+    vendor_id = Column(UUID(as_uuid=True), primary_key=True)
+    purchase_order_id = Column(UUID(as_uuid=True), nullable=False)
+    line_item_id = Column(UUID(as_uuid=True), nullable=False)
+    # The latest order wins: by order_date, then by when the order was created
+    order_date = Column(Date, nullable=False)
+    ordered_at = Column(DateTime(timezone=True), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(DECIMAL(12, 2), nullable=False)
+    discount = Column(DECIMAL(12, 2), default=0, nullable=False)
+    tax_amount = Column(DECIMAL(12, 2), default=0, nullable=False)
+
+
+class CollectionVersionModel(Base):
+    """A counter per cached collection, bumped by ``collection_versions`` whenever a source table changes."""
+    __tablename__ = "collection_versions"
+
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,124 @@
+"""
+Monthly partitions of ``inventory_item_stock_movements``.
+
+On PostgreSQL the table is range partitioned by ``created_at``, one partition
+per calendar month (UTC) named ``inventory_item_stock_movements_pYYYYMM``.
+Indexes declared on the parent, among them the BRIN index on ``created_at``
+and the B-tree on ``inventory_item_id``, are created on every partition, and
+inserts and queries go through the parent, so the rest of the code does not
+see the partitions.
+
+``ensure_movement_partitions`` creates the partitions for the current month
+and a few ahead. It runs when the table is created, from a background task of
+the API every ``movement_partition_check_seconds`` (see
+``partition_maintenance``), and with
+``python -m src.infrastructure.database.maintenance create-movement-partitions``
+for deployments that do not run the API. Old months are removed with
+``detach-movement-partitions --before YYYY-MM [--drop]``; detaching only
+changes the catalogue, unlike deleting rows, and leaves nothing to vacuum.
+Months newer than the oldest stock snapshot are refused, as point-in-time
+stock queries replay their movements. On other dialects (sqlite in the tests)
+the table is a plain table and creating or detaching does nothing.
+"""
+
+from datetime import date, datetime, time, timezone
+from typing import List, Optional
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import Connection
+
+from .models import InventoryItemStockMovementModel, StockSnapshotModel
+
+PARENT = InventoryItemStockMovementModel.__tablename__
+MONTHS_AHEAD = 3
+_PREFIX = PARENT + "_p"
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))"),
+        {"parent": PARENT},
+    )
+
+
+def list_movement_partitions(connection: Connection) -> List[str]:
+    """Names of the partitions currently attached to the parent, oldest month first."""
+    if not is_partitioned(connection):
+        return []
+    return list(connection.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent) ORDER BY c.relname"
+        ),
+        {"parent": PARENT},
+    ))
+
+
+def ensure_movement_partitions(
+    connection: Connection, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None
+) -> List[str]:
+    """Create the missing partitions from this month to ``months_ahead`` months ahead; returns their names."""
+    if not is_partitioned(connection):
+        return []
+    existing = set(list_movement_partitions(connection))
+    preparer = connection.dialect.identifier_preparer
+    month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    created = []
+    for _ in range(months_ahead + 1):
+        name = partition_name(month)
+        if name not in existing:
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {preparer.quote(name)} PARTITION OF {preparer.quote(PARENT)} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{next_month(month).isoformat()} 00:00:00+00')"
+            ))
+            created.append(name)
+        month = next_month(month)
+    return created
+
+
+def detach_movement_partitions(connection: Connection, before: date, drop: bool = False) -> List[str]:
+    """Detach (and optionally drop) the partitions of the months before ``before``; returns their names.
+
+    Raises ``ValueError`` if movements after the oldest stock snapshot would go.
+    """
+    month = before.replace(day=1)
+    oldest_snapshot = connection.scalar(select(func.min(StockSnapshotModel.taken_at)))
+    if oldest_snapshot is None:
+        raise ValueError("There is no stock snapshot yet; point-in-time stock queries need every movement")
+    if oldest_snapshot.tzinfo is None:
+        oldest_snapshot = oldest_snapshot.replace(tzinfo=timezone.utc)
+    if datetime.combine(month, time.min, tzinfo=timezone.utc) > oldest_snapshot:
+        raise ValueError(
+            f"Point-in-time stock queries replay the movements since the oldest stock snapshot "
+            f"({oldest_snapshot.isoformat()}); detach only months before {oldest_snapshot:%Y-%m}"
+        )
+
+    cutoff = partition_name(month)
+    preparer = connection.dialect.identifier_preparer
+    detached = []
+    for name in list_movement_partitions(connection):
+        # Zero padded YYYYMM suffixes sort like the months they hold
+        if not name.startswith(_PREFIX) or name >= cutoff:
+            continue
+        connection.execute(text(f"ALTER TABLE {preparer.quote(PARENT)} DETACH PARTITION {preparer.quote(name)}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {preparer.quote(name)}"))
+        detached.append(name)
+    return detached
+
+
+@event.listens_for(InventoryItemStockMovementModel.__table__, "after_create")
+def _create_initial_partitions(target, connection, **kw) -> None:
+    # metadata.create_all only creates the parent, which accepts no rows by itself
+    ensure_movement_partitions(connection)
+
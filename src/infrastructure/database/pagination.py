@@ -0,0 +1,149 @@
+"""
+Ordered, seek-based pagination for repository listings.
+
+Ordering happens in SQL on a whitelisted column with the primary key as tie
+breaker, so every row has exactly one position regardless of page size.
+Pages after the first are addressed by an opaque cursor holding the
+``(sort value, id)`` of the row at the page boundary; the next page is read
+with ``WHERE (column, id) > (value, id)`` (or ``<`` for descending order),
+which the ``(column, id)`` indexes serve without scanning skipped rows.
+Plain ``page`` numbers are still accepted for the first request and fall back
+to ``OFFSET``.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from ...domain.value_objects.page import Page
+
+NEXT = "next"
+PREVIOUS = "previous"
+
+
+@dataclass(frozen=True)
+class CursorPosition:
+    ordering: str
+    value: Any
+    id: UUID
+    direction: str
+
+
+def encode_cursor(ordering: str, value: Any, entity_id: UUID, direction: str) -> str:
+    payload = {
+        "o": ordering,
+        "v": value.isoformat() if isinstance(value, date) else value,
+        "i": str(entity_id),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorPosition:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        position = CursorPosition(
+            ordering=payload["o"],
+            value=payload["v"],
+            id=UUID(payload["i"]),
+            direction=payload["d"],
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if position.direction not in (NEXT, PREVIOUS):
+        raise ValueError("Invalid pagination cursor")
+    return position
+
+
+class SeekPaginator:
+    def __init__(self, model, sortable: Dict[str, Any], default_ordering: str) -> None:
+        self.model = model
+        self.sortable = sortable
+        self.default_ordering = default_ordering
+
+    def resolve_ordering(self, ordering: Optional[str]) -> str:
+        """Return ``ordering`` if it names a sortable field, otherwise the default."""
+        if ordering and ordering.lstrip("-") in self.sortable:
+            return ordering
+        return self.default_ordering
+
+    def count(self, session: Session, stmt: Select) -> int:
+        return session.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar_one()
+
+    def paginate(
+        self,
+        session: Session,
+        stmt: Select,
+        ordering: Optional[str],
+        page_size: int,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        total: Optional[int] = None,
+    ) -> Page:
+        """Run ``stmt`` (a filtered ``select(model)``) for one page."""
+        ordering = self.resolve_ordering(ordering)
+        column, descending = self._sort_column(ordering)
+        id_column = self.model.id
+        filtered = stmt
+
+        position = decode_cursor(cursor) if cursor else None
+        if position and position.ordering != ordering:
+            raise ValueError("Pagination cursor does not match the requested ordering")
+        backwards = position is not None and position.direction == PREVIOUS
+        offset = 0 if position else (page - 1) * page_size
+
+        descending_scan = descending != backwards
+        if position:
+            boundary = tuple_(
+                literal(self._parse_value(column, position.value), column.type),
+                literal(position.id, id_column.type),
+            )
+            key = tuple_(column, id_column)
+            stmt = stmt.where(key < boundary if descending_scan else key > boundary)
+        if descending_scan:
+            stmt = stmt.order_by(column.desc(), id_column.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), id_column.asc())
+
+        rows = list(session.execute(stmt.offset(offset).limit(page_size + 1)).scalars().all())
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None or offset > 0
+
+        if total is None:
+            total = self.count(session, filtered)
+        return Page(
+            items=rows,
+            total=total,
+            next_cursor=self._cursor_for(ordering, rows[-1], NEXT) if has_next and rows else None,
+            previous_cursor=self._cursor_for(ordering, rows[0], PREVIOUS) if has_previous and rows else None,
+        )
+
+    def _sort_column(self, ordering: str) -> Tuple[Any, bool]:
+        return self.sortable[ordering.lstrip("-")], ordering.startswith("-")
+
+    def _cursor_for(self, ordering: str, row: Any, direction: str) -> str:
+        column, _ = self._sort_column(ordering)
+        return encode_cursor(ordering, getattr(row, column.key), row.id, direction)
+
+    @staticmethod
+    def _parse_value(column, value: Any) -> Any:
+        if isinstance(value, str) and column.type.python_type in (datetime, date):
+            try:
+                return column.type.python_type.fromisoformat(value)
+            except ValueError:
+                raise ValueError("Invalid pagination cursor")
+        return value
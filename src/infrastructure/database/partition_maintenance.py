@@ -0,0 +1,56 @@
+"""
+Keeps the upcoming stock movement partitions created while the API runs.
+
+``ensure_movement_partitions`` only creates a few months ahead, so a process
+running for longer than that would otherwise start failing every movement
+insert. The check is a catalogue lookup and usually creates nothing.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from ...core.config.database import get_database_manager
+from ...core.config.settings import get_settings
+from .movement_partitions import ensure_movement_partitions
+
+logger = logging.getLogger(__name__)
+
+
+class MovementPartitionMaintainer:
+    """Background task that keeps the upcoming partitions created while the API runs."""
+
+    def __init__(self, interval_seconds: float = 3600) -> None:
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @staticmethod
+    def ensure() -> List[str]:
+        with get_database_manager().engine.begin() as connection:
+            return ensure_movement_partitions(connection)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                created = await asyncio.to_thread(self.ensure)
+                if created:
+                    logger.info("Created stock movement partitions %s", ", ".join(created))
+            except Exception:
+                logger.exception("Creating stock movement partitions failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+movement_partition_maintainer = MovementPartitionMaintainer(get_settings().movement_partition_check_seconds)
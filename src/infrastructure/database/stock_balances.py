@@ -0,0 +1,162 @@
+"""
+Keeps ``stock_balances`` in step with ``line_items``.
+
+Every active stock row adds its quantity to the balance of its item,
+warehouse and status. Each ORM flush that inserts, changes or deletes a
+``LineItemModel`` adds the difference between the row's contribution before
+and after the flush with one upsert on the flushing connection, so the
+balances commit or roll back together with the stock rows and their
+movements. Set-based statements that bypass the ORM must call
+``apply_stock_balance_deltas`` in the same transaction.
+
+``python -m src.infrastructure.database.maintenance check-stock-balances``
+compares the balances with the line items table; ``--fix`` corrects them.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import InventoryItemStatus, LineItemModel, StockBalanceModel
+
+_PENDING_DELTAS_KEY = "stock_balance_deltas"
+_TRACKED_ATTRIBUTES = ("inventory_item_master_id", "warehouse_id", "status", "quantity", "is_active")
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+BalanceKey = Tuple[UUID, UUID, str]
+
+
+def status_name(status) -> str:
+    return getattr(status, "value", status)
+
+
+def apply_stock_balance_deltas(connection: Connection, deltas: Dict[BalanceKey, int]) -> None:
+    """Atomically add ``deltas`` to the balances, creating missing rows."""
+    rows = [
+        {"inventory_item_master_id": item_id, "warehouse_id": warehouse_id, "status": status, "quantity": delta}
+        for (item_id, warehouse_id, status), delta in deltas.items()
+        if delta and item_id and warehouse_id
+    ]
+    if not rows:
+        return
+    table = StockBalanceModel.__table__
+    upsert = _UPSERTS[connection.dialect.name](table)
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[table.c.inventory_item_master_id, table.c.warehouse_id, table.c.status],
+            set_={"quantity": table.c.quantity + upsert.excluded.quantity},
+        ),
+        rows,
+    )
+
+
+def _contribution(line_item: LineItemModel, previous: bool) -> Optional[Tuple[BalanceKey, int]]:
+    values = {}
+    for attribute in _TRACKED_ATTRIBUTES:
+        value = getattr(line_item, attribute)
+        if previous:
+            history = inspect(line_item).attrs[attribute].history
+            if history.deleted:
+                value = history.deleted[0]
+        values[attribute] = value
+    # status, quantity and is_active are only filled in by column defaults at insert time
+    if values["is_active"] is False:
+        return None
+    status = status_name(values["status"] or InventoryItemStatus.AVAILABLE)
+    quantity = 1 if values["quantity"] is None else values["quantity"]
+    return (values["inventory_item_master_id"], values["warehouse_id"], status), quantity
+
+
+@event.listens_for(LineItemModel.inventory_item_master_id, "set", active_history=True)
+@event.listens_for(LineItemModel.warehouse_id, "set", active_history=True)
+@event.listens_for(LineItemModel.is_active, "set", active_history=True)
+@event.listens_for(LineItemModel.status, "set", active_history=True)
+@event.listens_for(LineItemModel.quantity, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    # Makes the ORM load the committed value before an assignment, so
+    # flush-time history knows which balance the row counted towards
+    pass
+
+
+def _add(deltas: Dict[BalanceKey, int], contribution: Optional[Tuple[BalanceKey, int]], sign: int) -> None:
+    if contribution is not None:
+        deltas[contribution[0]] += sign * contribution[1]
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_stock_balance_deltas(session: Session, flush_context, instances) -> None:
+    deltas: Dict[BalanceKey, int] = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, LineItemModel):
+            _add(deltas, _contribution(obj, previous=False), 1)
+    for obj in session.deleted:
+        if isinstance(obj, LineItemModel):
+            _add(deltas, _contribution(obj, previous=True), -1)
+    for obj in session.dirty:
+        if isinstance(obj, LineItemModel) and session.is_modified(obj):
+            _add(deltas, _contribution(obj, previous=True), -1)
+            _add(deltas, _contribution(obj, previous=False), 1)
+
+    if any(deltas.values()):
+        pending = session.info.setdefault(_PENDING_DELTAS_KEY, defaultdict(int))
+        for key, delta in deltas.items():
+            pending[key] += delta
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_stock_balance_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_PENDING_DELTAS_KEY, None)
+    if deltas:
+        apply_stock_balance_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stock_balance_deltas(session: Session) -> None:
+    session.info.pop(_PENDING_DELTAS_KEY, None)
+
+
+def find_stock_balance_mismatches(session: Session) -> List[Tuple[BalanceKey, int, int]]:
+    """Return ``(key, stored, actual)`` for every balance that differs from the line items."""
+    stored = {
+        (item_id, warehouse_id, status_name(status)): quantity
+        for item_id, warehouse_id, status, quantity in session.execute(select(
+            StockBalanceModel.inventory_item_master_id,
+            StockBalanceModel.warehouse_id,
+            StockBalanceModel.status,
+            StockBalanceModel.quantity,
+        ))
+    }
+    actual = {
+        (item_id, warehouse_id, status_name(status)): quantity
+        for item_id, warehouse_id, status, quantity in session.execute(
+            select(
+                LineItemModel.inventory_item_master_id,
+                LineItemModel.warehouse_id,
+                LineItemModel.status,
+                func.sum(LineItemModel.quantity),
+            )
+            .where(LineItemModel.is_active == True)
+            .group_by(LineItemModel.inventory_item_master_id, LineItemModel.warehouse_id, LineItemModel.status)
+        )
+    }
+    return [
+        (key, stored.get(key, 0), actual.get(key, 0))
+        for key in sorted(stored.keys() | actual.keys(), key=lambda key: (str(key[0]), str(key[1]), key[2]))
+        if stored.get(key, 0) != actual.get(key, 0)
+    ]
+
+
+def rebuild_stock_balances(session: Session) -> int:
+    """Correct drifted balances from the line items table; returns how many were fixed."""
+    mismatches = find_stock_balance_mismatches(session)
+    apply_stock_balance_deltas(
+        session.connection(),
+        {key: actual - stored for key, stored, actual in mismatches},
+    )
+    session.commit()
+    return len(mismatches)
@@ -0,0 +1,184 @@
+"""
+Point-in-time stock levels from snapshots and the movement journal.
+
+``stock_snapshot_levels`` holds the stock on hand per item and warehouse at
+every ``stock_snapshots.taken_at``. The stock as of any moment is the nearest
+snapshot at or before it plus ``quantity_on_hand_after -
+quantity_on_hand_before`` of each movement recorded after the snapshot and up
+to that moment, summed in one set-based statement. Its cost follows the
+movements since the snapshot, not the length of the history. Before the first
+snapshot only the movements are known.
+
+``python -m src.infrastructure.database.maintenance take-stock-snapshot``,
+run daily, rolls the latest snapshot forward to midnight (UTC) with the same
+replay, so consecutive snapshots agree with the journal. The first snapshot is
+seeded from the current ``stock_balances`` minus the movements since it was
+taken, read in one statement.
+
+A movement's ``created_at`` is the start time of its transaction, which may
+commit well after that. A snapshot is never replayed past, so it is only ever
+taken at least ``stock_snapshot_safety_lag_seconds`` (longer than any write
+transaction) before the database's current time: by then every movement
+stamped up to ``taken_at`` has committed, and later ones are replayed on top.
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, func, insert, literal, select, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ...core.config.settings import get_settings
+from .models import (
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    StockBalanceModel,
+    StockSnapshotLevelModel,
+    StockSnapshotModel,
+)
+
+_LEVEL_COLUMNS = ("inventory_item_master_id", "warehouse_id", "quantity")
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # sqlite hands back naive datetimes; everything here is stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def latest_snapshot_at(session: Session, at: Optional[datetime] = None) -> Optional[datetime]:
+    """When the latest snapshot at or before ``at`` (or the latest of all) was taken."""
+    stmt = select(func.max(StockSnapshotModel.taken_at))
+    if at is not None:
+        stmt = stmt.where(StockSnapshotModel.taken_at <= at)
+    return as_utc(session.scalar(stmt))
+
+
+def _movement_deltas(
+    inventory_item_master_id: Optional[UUID] = None,
+    warehouse_id: Optional[UUID] = None,
+    sign: int = 1,
+):
+    """``SELECT`` of each movement's change to its item and warehouse (negated for ``sign=-1``)."""
+    movement, line = InventoryItemStockMovementModel, LineItemModel
+    movement_warehouse = func.coalesce(movement.warehouse_to_id, movement.warehouse_from_id, line.warehouse_id)
+    deltas = (
+        select(
+            line.inventory_item_master_id,
+            movement_warehouse.label("warehouse_id"),
+            (sign * (movement.quantity_on_hand_after - movement.quantity_on_hand_before)).label("quantity"),
+        )
+        .join(line, line.id == movement.inventory_item_id)
+    )
+    if inventory_item_master_id is not None:
+        deltas = deltas.where(line.inventory_item_master_id == inventory_item_master_id)
+    if warehouse_id is not None:
+        deltas = deltas.where(movement_warehouse == warehouse_id)
+    return deltas
+
+
+def _summed(*parts):
+    combined = union_all(*parts).subquery()
+    total = func.sum(combined.c.quantity)
+    return (
+        select(combined.c.inventory_item_master_id, combined.c.warehouse_id, total.label("quantity"))
+        .group_by(combined.c.inventory_item_master_id, combined.c.warehouse_id)
+        .having(total != 0)
+    )
+
+
+def _levels_as_of(
+    snapshot_at: Optional[datetime],
+    as_of: datetime,
+    inventory_item_master_id: Optional[UUID] = None,
+    warehouse_id: Optional[UUID] = None,
+):
+    """``SELECT`` of the non-zero levels per item and warehouse: the snapshot plus the replayed movements."""
+    movement = InventoryItemStockMovementModel
+    replay = _movement_deltas(inventory_item_master_id, warehouse_id).where(movement.created_at <= as_of)
+
+    if snapshot_at is None:
+        parts = [replay]
+    else:
+        levels = StockSnapshotLevelModel
+        base = select(levels.inventory_item_master_id, levels.warehouse_id, levels.quantity).where(
+            levels.taken_at == snapshot_at
+        )
+        if inventory_item_master_id is not None:
+            base = base.where(levels.inventory_item_master_id == inventory_item_master_id)
+        if warehouse_id is not None:
+            base = base.where(levels.warehouse_id == warehouse_id)
+        parts = [base, replay.where(movement.created_at > snapshot_at)]
+    return _summed(*parts)
+
+
+def stock_as_of(
+    session: Session,
+    as_of: datetime,
+    inventory_item_master_id: Optional[UUID] = None,
+    warehouse_id: Optional[UUID] = None,
+) -> Tuple[Optional[datetime], List[Row]]:
+    """Return the snapshot used and ``(inventory_item_master_id, warehouse_id, quantity)`` rows as of ``as_of``."""
+    snapshot_at = latest_snapshot_at(session, as_of)
+    stmt = _levels_as_of(snapshot_at, as_of, inventory_item_master_id, warehouse_id).subquery()
+    rows = session.execute(
+        select(stmt).order_by(stmt.c.inventory_item_master_id, stmt.c.warehouse_id)
+    ).all()
+    return snapshot_at, rows
+
+
+def take_stock_snapshot(
+    session: Session,
+    taken_at: Optional[datetime] = None,
+    safety_lag_seconds: Optional[float] = None,
+) -> Optional[Tuple[datetime, int]]:
+    """Store the levels as of ``taken_at`` (default: the last midnight, UTC, at least the safety lag ago).
+
+    Returns when the snapshot was taken and how many levels it holds, or
+    ``None`` if a snapshot at or after ``taken_at`` already exists. Raises
+    ``ValueError`` for a ``taken_at`` within the safety lag.
+    """
+    if safety_lag_seconds is None:
+        safety_lag_seconds = get_settings().stock_snapshot_safety_lag_seconds
+    watermark = as_utc(session.scalar(select(func.now()))) - timedelta(seconds=safety_lag_seconds)
+    latest = latest_snapshot_at(session)
+    if latest is None:
+        # Nothing to roll forward from, so start from the current balances and
+        # take back out what moved since the watermark, in one statement so
+        # both see the same committed data; movements still being written
+        # are stamped after the watermark and replayed on top later
+        taken_at = watermark
+        balance = StockBalanceModel
+        levels = _summed(
+            select(balance.inventory_item_master_id, balance.warehouse_id, balance.quantity),
+            _movement_deltas(sign=-1).where(InventoryItemStockMovementModel.created_at > taken_at),
+        )
+    else:
+        if taken_at is None:
+            taken_at = datetime.combine(watermark.date(), time.min, tzinfo=timezone.utc)
+        taken_at = as_utc(taken_at)
+        if taken_at > watermark:
+            raise ValueError(
+                f"A stock snapshot must be at least {safety_lag_seconds:g} seconds old, "
+                "so that every movement up to it has committed"
+            )
+        if taken_at <= latest:
+            return None
+        levels = _levels_as_of(latest, taken_at)
+
+    levels = levels.subquery()
+    session.execute(insert(StockSnapshotModel).values(taken_at=taken_at))
+    session.execute(
+        insert(StockSnapshotLevelModel).from_select(
+            ["taken_at", *_LEVEL_COLUMNS],
+            select(literal(taken_at, DateTime(timezone=True)), *(levels.c[column] for column in _LEVEL_COLUMNS)),
+        )
+    )
+    count = session.scalar(
+        select(func.count()).select_from(StockSnapshotLevelModel).where(StockSnapshotLevelModel.taken_at == taken_at)
+    )
+    session.commit()
+    return taken_at, count
@@ -0,0 +1,205 @@
+"""
+Set-based booking of incoming stock onto ``line_items``.
+
+``receive_stock`` handles a whole batch of receipts with a fixed number of
+statements, whatever the batch size:
+
+1. on PostgreSQL, a transaction-level advisory lock per stock key (item,
+   warehouse, serial number), taken in sorted order, so two transactions
+   cannot both create the same missing stock row;
+2. ``SELECT ... FOR UPDATE`` of the existing stock rows, in id order;
+3. one bulk ``INSERT`` of the stock rows that do not exist yet;
+4. one ``UPDATE ... SET quantity = quantity + CASE ...`` for the existing
+   rows, returning the new quantities;
+5. one bulk ``INSERT`` of the stock movements, one per receipt.
+
+These statements bypass the ORM flush, so the masters' ``line_items_count``
+and the ``stock_balances`` are adjusted through
+``apply_line_items_count_deltas`` and ``apply_stock_balance_deltas``, and
+new stock rows mark the ``inventory_items`` list changed. The caller owns the
+transaction and commits it.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, insert, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from .collection_versions import INVENTORY_ITEMS, mark_collections_changed
+from .line_item_counter import apply_line_items_count_deltas
+from .models import InventoryItemStatus, InventoryItemStockMovementModel, LineItemModel, MovementType
+from .stock_balances import BalanceKey, apply_stock_balance_deltas, status_name
+
+StockKey = Tuple[UUID, UUID, Optional[str]]
+
+
+@dataclass(frozen=True)
+class StockReceipt:
+    inventory_item_master_id: UUID
+    warehouse_id: UUID
+    serial_number: Optional[str]
+    quantity: int
+    # Column values for the stock row, used only if it has to be created
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> StockKey:
+        return (self.inventory_item_master_id, self.warehouse_id, self.serial_number)
+
+
+@dataclass(frozen=True)
+class StockMovementResult:
+    stock_id: UUID
+    quantity_before: int
+    quantity_after: int
+
+
+def _key_order(key: StockKey) -> Tuple[str, str, str]:
+    return (str(key[0]), str(key[1]), key[2] or "")
+
+
+def _lock_keys(session: Session, keys: List[StockKey]) -> None:
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    # unnest() walks the sorted array in order, so every transaction takes
+    # its advisory locks in the same order
+    labels = sorted(":".join(_key_order(key)) for key in keys)
+    session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtextextended(label, 0)) FROM unnest(CAST(:labels AS text[])) AS label"),
+        {"labels": labels},
+    )
+
+
+def _find_stock_rows(session: Session, keys: List[StockKey]) -> Dict[StockKey, UUID]:
+    conditions = [
+        and_(
+            LineItemModel.inventory_item_master_id == item_id,
+            LineItemModel.warehouse_id == warehouse_id,
+            LineItemModel.serial_number == serial_number if serial_number is not None
+            else LineItemModel.serial_number.is_(None),
+        )
+        for item_id, warehouse_id, serial_number in keys
+    ]
+    rows = session.execute(
+        select(
+            LineItemModel.id,
+            LineItemModel.inventory_item_master_id,
+            LineItemModel.warehouse_id,
+            LineItemModel.serial_number,
+        )
+        .where(or_(*conditions))
+        .order_by(LineItemModel.id)
+        .with_for_update()
+    )
+    stock_ids: Dict[StockKey, UUID] = {}
+    for stock_id, item_id, warehouse_id, serial_number in rows:
+        # Where several rows match, receipts always book onto the lowest id
+        stock_ids.setdefault((item_id, warehouse_id, serial_number), stock_id)
+    return stock_ids
+
+
+def receive_stock(
+    session: Session,
+    receipts: List[StockReceipt],
+    movement_type: MovementType,
+    transaction_id: str,
+    notes: Optional[str] = None,
+) -> List[StockMovementResult]:
+    """Add ``receipts`` to stock and record their movements; results are in receipt order."""
+    if not receipts:
+        return []
+    for receipt in receipts:
+        if receipt.quantity <= 0:
+            raise ValueError("Received quantity must be positive")
+
+    totals: Dict[StockKey, int] = defaultdict(int)
+    first_receipt: Dict[StockKey, StockReceipt] = {}
+    for receipt in receipts:
+        totals[receipt.key] += receipt.quantity
+        first_receipt.setdefault(receipt.key, receipt)
+    keys = sorted(totals, key=_key_order)
+
+    _lock_keys(session, keys)
+    stock_ids = _find_stock_rows(session, keys)
+
+    quantities_after: Dict[StockKey, int] = {}
+    balance_deltas: Dict[BalanceKey, int] = defaultdict(int)
+    new_rows = []
+    for key in keys:
+        if key in stock_ids:
+            continue
+        stock_ids[key] = uuid.uuid4()
+        quantities_after[key] = totals[key]
+        new_rows.append({
+            **first_receipt[key].defaults,
+            "id": stock_ids[key],
+            "inventory_item_master_id": key[0],
+            "warehouse_id": key[1],
+            "serial_number": key[2],
+            "quantity": totals[key],
+            "is_active": True,
+        })
+    if new_rows:
+        session.execute(insert(LineItemModel), new_rows)
+        created: Dict[UUID, int] = defaultdict(int)
+        for row in new_rows:
+            created[row["inventory_item_master_id"]] += 1
+            status = status_name(row.get("status") or InventoryItemStatus.AVAILABLE)
+            balance_deltas[(row["inventory_item_master_id"], row["warehouse_id"], status)] += row["quantity"]
+        apply_line_items_count_deltas(session.connection(), created)
+        mark_collections_changed(session, [INVENTORY_ITEMS])
+
+    existing = {stock_ids[key]: key for key in keys if key not in quantities_after}
+    if existing:
+        increment = case(
+            {stock_id: totals[key] for stock_id, key in existing.items()},
+            value=LineItemModel.id,
+            else_=0,
+        )
+        updated = session.execute(
+            update(LineItemModel)
+            .where(LineItemModel.id.in_(list(existing)))
+            .values(quantity=LineItemModel.quantity + increment)
+            .returning(LineItemModel.id, LineItemModel.quantity, LineItemModel.status, LineItemModel.is_active)
+            .execution_options(synchronize_session=False)
+        )
+        for stock_id, quantity, status, is_active in updated:
+            key = existing[stock_id]
+            quantities_after[key] = quantity
+            if is_active:
+                balance_deltas[(key[0], key[1], status_name(status))] += totals[key]
+    apply_stock_balance_deltas(session.connection(), balance_deltas)
+
+    # Walk each stock row's total back to its starting quantity, then replay
+    # the receipts in order so every movement has its own before/after
+    running = {key: quantities_after[key] - totals[key] for key in keys}
+    results = []
+    movements = []
+    for receipt in receipts:
+        before = running[receipt.key]
+        after = before + receipt.quantity
+        running[receipt.key] = after
+        stock_id = stock_ids[receipt.key]
+        results.append(StockMovementResult(stock_id, before, after))
+        movements.append({
+            "inventory_item_id": stock_id,
+            "movement_type": movement_type,
+            "inventory_transaction_id": transaction_id,
+            "quantity": receipt.quantity,
+            "quantity_on_hand_before": before,
+            "quantity_on_hand_after": after,
+            "warehouse_to_id": receipt.warehouse_id,
+            "notes": notes,
+        })
+    session.execute(insert(InventoryItemStockMovementModel), movements)
+
+    # Stock rows already in the session would otherwise keep their old quantity
+    for stock_id in existing:
+        loaded = session.identity_map.get(session.identity_key(LineItemModel, stock_id))
+        if loaded is not None:
+            session.expire(loaded, ["quantity", "updated_at"])
+    return results
@@ -0,0 +1,208 @@
+"""
+Keeps ``vendor_monthly_rollups`` in step with ``purchase_orders``.
+
+Every active purchase order contributes to the row of its vendor and order
+month: one order, its totals unless it is cancelled, and its delivery lag
+once it is received. Each ORM flush that inserts, changes or deletes a
+``PurchaseOrderModel`` adds the difference between the order's contribution
+before and after the flush with one upsert on the flushing connection, so the
+rollups commit or roll back together with the order. This covers order
+creation, receiving and cancelling, and also edits that move an order to
+another vendor or month.
+
+``python -m src.infrastructure.database.maintenance rebuild-vendor-rollups``
+recomputes every rollup from the purchase orders.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import PurchaseOrderModel, VendorMonthlyRollupModel
+
+_PENDING_DELTAS_KEY = "vendor_rollup_deltas"
+_TRACKED_ATTRIBUTES = (
+    "vendor_id",
+    "order_date",
+    "expected_delivery_date",
+    "received_date",
+    "status",
+    "grand_total",
+    "total_tax_amount",
+    "total_discount",
+    "is_active",
+)
+_COUNTERS = (
+    "order_count",
+    "cancelled_order_count",
+    "spend",
+    "tax_amount",
+    "discount_amount",
+    "received_order_count",
+    "lead_time_order_count",
+    "total_delivery_delay_days",
+)
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+RollupKey = Tuple[UUID, date]
+RollupDeltas = Dict[RollupKey, Dict[str, object]]
+
+
+@dataclass(frozen=True)
+class OrderFacts:
+    vendor_id: UUID
+    order_date: date
+    expected_delivery_date: Optional[date]
+    received_date: Optional[date]
+    status: str
+    grand_total: Decimal
+    total_tax_amount: Decimal
+    total_discount: Decimal
+    is_active: bool
+
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _status_name(status) -> str:
+    return getattr(status, "value", status)
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _contribution(facts: Optional[OrderFacts]) -> Dict[str, object]:
+    # is_active and the totals are only filled in by column defaults at insert time
+    if facts is None or facts.is_active is False or facts.vendor_id is None or facts.order_date is None:
+        return {}
+    status = _status_name(facts.status)
+    cancelled = status == "CANCELLED"
+    received = status == "RECEIVED"
+    lead_time = received and facts.received_date is not None and facts.expected_delivery_date is not None
+    return {
+        "order_count": 1,
+        "cancelled_order_count": 1 if cancelled else 0,
+        "spend": Decimal("0") if cancelled else _money(facts.grand_total),
+        "tax_amount": Decimal("0") if cancelled else _money(facts.total_tax_amount),
+        "discount_amount": Decimal("0") if cancelled else _money(facts.total_discount),
+        "received_order_count": 1 if received else 0,
+        "lead_time_order_count": 1 if lead_time else 0,
+        "total_delivery_delay_days": (facts.received_date - facts.expected_delivery_date).days if lead_time else 0,
+    }
+
+
+def add_order_deltas(deltas: RollupDeltas, before: Optional[OrderFacts], after: Optional[OrderFacts]) -> None:
+    """Add the change from ``before`` to ``after`` (either may be missing) to ``deltas``."""
+    for facts, sign in ((before, -1), (after, 1)):
+        contribution = _contribution(facts)
+        if not contribution:
+            continue
+        row = deltas.setdefault((facts.vendor_id, month_of(facts.order_date)), defaultdict(int))
+        for counter, value in contribution.items():
+            row[counter] += sign * value
+
+
+def apply_vendor_rollup_deltas(connection: Connection, deltas: RollupDeltas) -> None:
+    """Atomically add ``deltas`` to the rollup rows, creating missing rows."""
+    rows = [
+        {"vendor_id": vendor_id, "month": month, **{counter: values.get(counter, 0) for counter in _COUNTERS}}
+        for (vendor_id, month), values in deltas.items()
+        if any(values.values())
+    ]
+    if not rows:
+        return
+    upsert = _UPSERTS[connection.dialect.name](VendorMonthlyRollupModel.__table__)
+    table = VendorMonthlyRollupModel.__table__
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[table.c.vendor_id, table.c.month],
+            set_={counter: table.c[counter] + upsert.excluded[counter] for counter in _COUNTERS},
+        ),
+        rows,
+    )
+
+
+def _facts(order: PurchaseOrderModel, previous: bool) -> OrderFacts:
+    values = {}
+    for attribute in _TRACKED_ATTRIBUTES:
+        value = getattr(order, attribute)
+        if previous:
+            history = inspect(order).attrs[attribute].history
+            if history.deleted:
+                value = history.deleted[0]
+            elif history.added:
+                # A change from NULL records no deleted value
+                value = None
+        values[attribute] = value
+    return OrderFacts(**values)
+
+
+@event.listens_for(PurchaseOrderModel.status, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.vendor_id, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.order_date, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.is_active, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.grand_total, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.total_tax_amount, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.total_discount, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.expected_delivery_date, "set", active_history=True)
+@event.listens_for(PurchaseOrderModel.received_date, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    # Makes the ORM load the committed value before an assignment, so
+    # flush-time history knows what the order contributed before
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_vendor_rollup_deltas(session: Session, flush_context, instances) -> None:
+    deltas: RollupDeltas = {}
+    for obj in session.new:
+        if isinstance(obj, PurchaseOrderModel):
+            add_order_deltas(deltas, None, _facts(obj, previous=False))
+    for obj in session.deleted:
+        if isinstance(obj, PurchaseOrderModel):
+            add_order_deltas(deltas, _facts(obj, previous=True), None)
+    for obj in session.dirty:
+        if isinstance(obj, PurchaseOrderModel) and session.is_modified(obj):
+            add_order_deltas(deltas, _facts(obj, previous=True), _facts(obj, previous=False))
+
+    if deltas:
+        pending = session.info.setdefault(_PENDING_DELTAS_KEY, {})
+        for key, values in deltas.items():
+            row = pending.setdefault(key, defaultdict(int))
+            for counter, value in values.items():
+                row[counter] += value
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_vendor_rollup_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_PENDING_DELTAS_KEY, None)
+    if deltas:
+        apply_vendor_rollup_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_vendor_rollup_deltas(session: Session) -> None:
+    session.info.pop(_PENDING_DELTAS_KEY, None)
+
+
+def rebuild_vendor_rollups(session: Session) -> int:
+    """Recompute every rollup from the purchase orders; returns the number of rollup rows."""
+    deltas: RollupDeltas = {}
+    columns = [getattr(PurchaseOrderModel, attribute) for attribute in _TRACKED_ATTRIBUTES]
+    for row in session.execute(select(*columns).execution_options(yield_per=1000)):
+        add_order_deltas(deltas, None, OrderFacts(**row._mapping))
+
+    session.execute(delete(VendorMonthlyRollupModel))
+    apply_vendor_rollup_deltas(session.connection(), deltas)
+    session.commit()
+    return sum(1 for values in deltas.values() if any(values.values()))
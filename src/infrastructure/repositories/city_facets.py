@@ -0,0 +1,54 @@
+"""
+City filtering and facet counts shared by the customer and vendor repositories.
+
+Both tables carry a ``city_key`` column (see ``domain.value_objects.city``)
+with a ``varchar_pattern_ops`` index, which serves equality as well as
+``LIKE 'prefix%'`` lookups. Facets are one grouped query over the active rows
+and the unfiltered ones are kept in ``reference_data_cache`` under the
+table's namespace, which the repositories invalidate on every write. Facets
+narrowed by a typed prefix are not cached, since arbitrary prefixes would
+crowd the reference rows out of the shared cache.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ...domain.value_objects.city import CityFacet, city_key
+from ..cache.reference_data_cache import reference_data_cache
+
+
+def city_key_filter(model, city: str, prefix: bool = False):
+    """Match ``city`` exactly, or as a prefix, on the model's ``city_key``; ``None`` for a blank city."""
+    key = city_key(city)
+    if key is None:
+        return None
+    if not prefix:
+        return model.city_key == key
+    # The pattern is built here, as a constant prefix, so the planner can use the index
+    escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return model.city_key.like(escaped + "%", escape="\\")
+
+
+def load_city_facets(session: Session, model, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+    """Return the ``limit`` cities with the most active rows, optionally only those starting with ``prefix``."""
+
+    def load() -> List[CityFacet]:
+        count = func.count(model.id)
+        stmt = (
+            select(model.city_key, func.min(model.city), count)
+            .where(model.is_active == True, model.city_key.isnot(None))
+            .group_by(model.city_key)
+            .order_by(count.desc(), model.city_key)
+            .limit(limit)
+        )
+        if prefix:
+            condition = city_key_filter(model, prefix, prefix=True)
+            if condition is not None:
+                stmt = stmt.where(condition)
+        return [CityFacet(city_key=key, city=city, count=total) for key, city, total in session.execute(stmt)]
+
+    if city_key(prefix) is not None:
+        return load()
+    return reference_data_cache.get_or_load(model.__tablename__, ("city_facets", limit), load)
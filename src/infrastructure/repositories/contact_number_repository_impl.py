@@ -1,15 +1,35 @@
+import re
 from typing import List, Optional, Dict, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, any_, bindparam, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID, insert as pg_insert
 
 from ...domain.entities.contact_number import ContactNumber
 from ...domain.repositories.contact_number_repository import ContactNumberRepository
+from ...domain.value_objects.contact_owner import ContactNumberOwner
 from ...domain.value_objects.phone_number import PhoneNumber
-from ..database.models import ContactNumberModel
+from ..database.models import ContactNumberModel, CustomerModel, VendorModel
+
+
+def _number_columns(phone_number: PhoneNumber) -> Dict[str, str]:
+    return {
+        "number": phone_number.number,
+        "normalized_number": phone_number.international_format(),
+        "reversed_digits": phone_number.reversed_digits(),
+    }
+
+
+def _suffix_filter(query: str):
+    """Match numbers ending with the digits of ``query`` through the reversed-digits index."""
+    digits = re.sub(r"\D", "", query)
+    if not digits:
+        return None
+    # The pattern is built here, as a constant prefix, so the planner can use the index
+    return ContactNumberModel.reversed_digits.like(digits[::-1] + "%")
 
 
 class SQLAlchemyContactNumberRepository(ContactNumberRepository):
@@ -19,7 +39,7 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
     async def save(self, contact_number: ContactNumber) -> ContactNumber:
         contact_model = ContactNumberModel(
             id=contact_number.id,
-            number=contact_number.phone_number.number,
+            **_number_columns(contact_number.phone_number),
             entity_type=contact_number.entity_type,
             entity_id=contact_number.entity_id,
             created_at=contact_number.created_at,
@@ -41,9 +61,14 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
         return None
 
     async def find_by_number(self, number: str) -> Optional[ContactNumber]:
+        # Any spelling of the same number finds it through its canonical form
+        try:
+            normalized = PhoneNumber(number).international_format()
+        except ValueError:
+            return None
         contact_model = self.session.query(ContactNumberModel).filter(
             and_(
-                ContactNumberModel.number == number,
+                ContactNumberModel.normalized_number == normalized,
                 ContactNumberModel.is_active == True
             )
         ).first()
@@ -61,15 +86,74 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
         ).order_by(ContactNumberModel.created_at).all()
         return [self._model_to_entity(model) for model in contact_models]
 
+    async def find_by_entities(self, entity_type: str, entity_ids: List[UUID]) -> Dict[UUID, List[ContactNumber]]:
+        """Load the active contact numbers of many entities in one query."""
+        entity_ids = list(dict.fromkeys(entity_ids))
+        contacts: Dict[UUID, List[ContactNumber]] = {entity_id: [] for entity_id in entity_ids}
+        if not entity_ids:
+            return contacts
+
+        # A single array parameter keeps the statement text the same for any page size
+        ids_param = bindparam("entity_ids", entity_ids, type_=ARRAY(PGUUID(as_uuid=True)))
+        contact_models = self.session.execute(
+            select(ContactNumberModel)
+            .where(
+                ContactNumberModel.entity_type == entity_type,
+                ContactNumberModel.entity_id == any_(ids_param),
+                ContactNumberModel.is_active == True,
+            )
+            .order_by(ContactNumberModel.entity_id, ContactNumberModel.created_at)
+        ).scalars().all()
+        for model in contact_models:
+            contacts[model.entity_id].append(self._model_to_entity(model))
+        return contacts
+
     async def search_by_number(self, query: str, limit: int = 10) -> List[ContactNumber]:
+        """Find active numbers ending with the digits of ``query`` (caller-ID style)."""
+        suffix = _suffix_filter(query)
+        if suffix is None:
+            return []
         contact_models = self.session.query(ContactNumberModel).filter(
-            and_(
-                ContactNumberModel.number.ilike(f"%{query}%"),
-                ContactNumberModel.is_active == True
-            )
-        ).limit(limit).order_by(ContactNumberModel.created_at.desc()).all()
+            and_(suffix, ContactNumberModel.is_active == True)
+        ).order_by(ContactNumberModel.created_at.desc()).limit(limit).all()
         return [self._model_to_entity(model) for model in contact_models]
 
+    async def find_owners_by_number(self, query: str, limit: int = 10) -> List[ContactNumberOwner]:
+        """Resolve a full or partial number to the customers and vendors it belongs to, in one query."""
+        suffix = _suffix_filter(query)
+        if suffix is None:
+            return []
+        rows = self.session.execute(
+            select(
+                ContactNumberModel,
+                func.coalesce(CustomerModel.name, VendorModel.name).label("owner_name"),
+                func.coalesce(CustomerModel.email, VendorModel.email).label("owner_email"),
+            )
+            .outerjoin(CustomerModel, and_(
+                ContactNumberModel.entity_type == "Customer",
+                CustomerModel.id == ContactNumberModel.entity_id,
+            ))
+            .outerjoin(VendorModel, and_(
+                ContactNumberModel.entity_type == "Vendor",
+                VendorModel.id == ContactNumberModel.entity_id,
+            ))
+            .where(
+                suffix,
+                ContactNumberModel.is_active == True,
+                ContactNumberModel.entity_type.in_(["Customer", "Vendor"]),
+            )
+            .order_by(ContactNumberModel.created_at.desc())
+            .limit(limit)
+        ).all()
+        return [
+            ContactNumberOwner(
+                contact=self._model_to_entity(row.ContactNumberModel),
+                owner_name=row.owner_name,
+                owner_email=row.owner_email,
+            )
+            for row in rows
+        ]
+
     async def exists_for_entity(self, entity_type: str, entity_id: UUID, number: str) -> bool:
         existing = self.session.query(ContactNumberModel).filter(
             and_(
@@ -94,7 +178,8 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
         if not contact_model:
             raise ValueError(f"Contact number with id {contact_number.id} not found")
         
-        contact_model.number = contact_number.phone_number.number
+        for column, value in _number_columns(contact_number.phone_number).items():
+            setattr(contact_model, column, value)
         contact_model.entity_type = contact_number.entity_type
         contact_model.entity_id = contact_number.entity_id
         contact_model.updated_at = contact_number.updated_at
@@ -138,6 +223,68 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
             ]
         }
 
+    async def replace_for_entity(
+        self, entity_type: str, entity_id: UUID, phone_numbers: List[PhoneNumber]
+    ) -> List[ContactNumber]:
+        """Make ``phone_numbers`` the entity's active contact numbers.
+
+        The difference with the current numbers is applied in one transaction:
+        a single soft-delete for the numbers that went away and a single
+        multi-row insert for the new ones. Numbers that were soft-deleted
+        before are reactivated by the insert, since the unique index also
+        covers inactive rows.
+        """
+        wanted_numbers = {phone_number.number: phone_number for phone_number in phone_numbers}
+        wanted = list(wanted_numbers)
+        existing = {
+            model.number: model
+            for model in self.session.execute(
+                select(ContactNumberModel).where(
+                    ContactNumberModel.entity_type == entity_type,
+                    ContactNumberModel.entity_id == entity_id,
+                    ContactNumberModel.is_active == True,
+                )
+            ).scalars()
+        }
+        removed_ids = [model.id for number, model in existing.items() if number not in wanted]
+        added = [number for number in wanted if number not in existing]
+
+        try:
+            if removed_ids:
+                self.session.execute(
+                    update(ContactNumberModel)
+                    .where(ContactNumberModel.id.in_(removed_ids))
+                    .values(is_active=False, updated_at=func.now()),
+                    execution_options={"synchronize_session": False},
+                )
+            if added:
+                insert_stmt = pg_insert(ContactNumberModel).values([
+                    {
+                        "id": uuid4(),
+                        **_number_columns(wanted_numbers[number]),
+                        "entity_type": entity_type,
+                        "entity_id": entity_id,
+                        "is_active": True,
+                    }
+                    for number in added
+                ])
+                inserted = self.session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        index_elements=["entity_type", "entity_id", "number"],
+                        set_={"is_active": True, "updated_at": func.now()},
+                    ).returning(ContactNumberModel),
+                    execution_options={"populate_existing": True},
+                ).scalars().all()
+                existing.update((model.number, model) for model in inserted)
+            # Map before committing, which would expire every loaded row
+            contacts = [self._model_to_entity(existing[number]) for number in wanted]
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return contacts
+
     async def bulk_create(self, contact_numbers: List[ContactNumber]) -> List[ContactNumber]:
         created_contacts = []
         
@@ -150,7 +297,7 @@ class SQLAlchemyContactNumberRepository(ContactNumberRepository):
             ):
                 contact_model = ContactNumberModel(
                     id=contact_number.id,
-                    number=contact_number.phone_number.number,
+                    **_number_columns(contact_number.phone_number),
                     entity_type=contact_number.entity_type,
                     entity_id=contact_number.entity_id,
                     created_at=contact_number.created_at,
@@ -8,7 +8,10 @@ from sqlalchemy.orm import Session
 from ...domain.entities.customer import Customer
 from ...domain.repositories.customer_repository import CustomerRepository
 from ...domain.value_objects.address import Address
+from ...domain.value_objects.city import CityFacet, city_key
+from ..cache.reference_data_cache import reference_data_cache
 from ..database.models import CustomerModel
+from .city_facets import city_key_filter, load_city_facets
 
 
 class SQLAlchemyCustomerRepository(CustomerRepository):
@@ -23,6 +26,7 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
             address=customer.address,
             remarks=customer.remarks,
             city=customer.city,
+            city_key=city_key(customer.city),
             # Backward compatibility with address_vo
             street=customer.address_vo.street if customer.address_vo else None,
             state=customer.address_vo.state if customer.address_vo else None,
@@ -35,6 +39,7 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         )
         self.session.add(customer_model)
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(customer_model)
         return self._model_to_entity(customer_model)
 
@@ -62,6 +67,7 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         customer_model.address = customer.address
         customer_model.remarks = customer.remarks
         customer_model.city = customer.city
+        customer_model.city_key = city_key(customer.city)
         
         # Backward compatibility with address_vo
         if customer.address_vo:
@@ -74,6 +80,7 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         customer_model.is_active = customer.is_active
         
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(customer_model)
         return self._model_to_entity(customer_model)
 
@@ -82,6 +89,7 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         if customer_model:
             self.session.delete(customer_model)
             self.session.commit()
+            self._invalidate_caches()
             return True
         return False
 
@@ -124,16 +132,14 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         
         return [self._model_to_entity(model) for model in customer_models]
 
-    async def find_by_city(self, city: str, limit: int = None) -> List[Customer]:
-        query = self.session.query(CustomerModel).filter(
-            CustomerModel.city.ilike(f"%{city}%")
-        ).filter(CustomerModel.is_active == True).order_by(CustomerModel.name)
-        
-        if limit:
-            query = query.limit(limit)
-            
-        customer_models = query.all()
-        return [self._model_to_entity(model) for model in customer_models]
+    async def find_by_city(self, city: str, limit: Optional[int] = None) -> List[Customer]:
+        return self._find_by_city_key(city_key_filter(CustomerModel, city), limit)
+
+    async def find_by_city_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Customer]:
+        return self._find_by_city_key(city_key_filter(CustomerModel, prefix, prefix=True), limit)
+
+    async def get_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        return load_city_facets(self.session, CustomerModel, limit, prefix)
 
     async def exists_by_email(self, email: str, exclude_id: Optional[UUID] = None) -> bool:
         if not email:
@@ -149,6 +155,22 @@ class SQLAlchemyCustomerRepository(CustomerRepository):
         existing = query.first()
         return existing is not None
 
+    def _find_by_city_key(self, condition, limit: Optional[int]) -> List[Customer]:
+        if condition is None:
+            return []
+        query = self.session.query(CustomerModel).filter(
+            condition
+        ).filter(CustomerModel.is_active == True).order_by(CustomerModel.name)
+        
+        if limit:
+            query = query.limit(limit)
+            
+        customer_models = query.all()
+        return [self._model_to_entity(model) for model in customer_models]
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(CustomerModel.__tablename__)
+
     def _model_to_entity(self, model: CustomerModel) -> Customer:
         # Create address value object for backward compatibility
         address_vo = None
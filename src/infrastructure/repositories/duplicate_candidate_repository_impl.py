@@ -0,0 +1,153 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import and_, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from ...domain.repositories.duplicate_candidate_repository import DuplicateCandidateRepository
+from ...domain.services.duplicate_matching import PHONE_SUFFIX_DIGITS, MatchRecord
+from ..database.dedupe_keys import DEDUPE_ENTITY_MODELS
+from ..database.models import ContactNumberModel, DedupeKeyModel
+
+
+def _phone_suffix_column():
+    return func.substr(ContactNumberModel.reversed_digits, 1, PHONE_SUFFIX_DIGITS)
+
+
+def _uncommon_keys(entity_type: str, keys: Set[str], max_block_size: int):
+    """``SELECT`` of the ``keys`` shared by at most ``max_block_size`` records.
+
+    Each key is counted on its own, and only up to one past the cap, so a
+    very common key costs no more than a rare one.
+    """
+    def capped_count(key: str):
+        sharing = (
+            select(DedupeKeyModel.entity_id)
+            .where(DedupeKeyModel.entity_type == entity_type, DedupeKeyModel.key == key)
+            .limit(max_block_size + 1)
+            .subquery()
+        )
+        return select(func.count()).select_from(sharing).scalar_subquery()
+
+    return union_all(*[select(literal(key)).where(capped_count(key) <= max_block_size) for key in sorted(keys)])
+
+
+class SQLAlchemyDuplicateCandidateRepository(DuplicateCandidateRepository):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    async def find_candidates(
+        self,
+        entity_type: str,
+        keys: Set[str],
+        phone_suffixes: Set[str],
+        exclude_id: Optional[UUID] = None,
+        limit: int = 50,
+        max_block_size: int = 500,
+    ) -> List[MatchRecord]:
+        """Active records sharing a blocking key or phone suffix, most shared keys first, in one query.
+
+        As in ``find_blocks``, keys shared by more than ``max_block_size``
+        records are too common to say anything and are skipped.
+        """
+        model = DEDUPE_ENTITY_MODELS[entity_type]
+        sources = []
+        if keys:
+            sources.append(
+                select(DedupeKeyModel.entity_id.label("entity_id"), literal(0).label("phone"))
+                .where(
+                    DedupeKeyModel.entity_type == entity_type,
+                    DedupeKeyModel.key.in_(_uncommon_keys(entity_type, keys, max_block_size)),
+                )
+            )
+        if phone_suffixes:
+            sources.append(
+                select(ContactNumberModel.entity_id.label("entity_id"), literal(1).label("phone"))
+                .where(
+                    ContactNumberModel.entity_type == entity_type,
+                    ContactNumberModel.is_active == True,
+                    or_(*[ContactNumberModel.reversed_digits.like(suffix + "%") for suffix in sorted(phone_suffixes)]),
+                )
+            )
+        if not sources:
+            return []
+
+        hits = union_all(*sources).subquery() if len(sources) > 1 else sources[0].subquery()
+        conditions = [model.is_active == True]
+        if exclude_id is not None:
+            conditions.append(model.id != exclude_id)
+        rows = self.session.execute(
+            select(model.id, model.name, model.email, func.max(hits.c.phone).label("phone"))
+            .join(hits, hits.c.entity_id == model.id)
+            .where(and_(*conditions))
+            .group_by(model.id, model.name, model.email)
+            .order_by(func.count().desc(), model.id)
+            .limit(limit)
+        ).all()
+        return [
+            MatchRecord(
+                entity_id=row.id,
+                name=row.name,
+                email=row.email,
+                phone_suffixes=frozenset(phone_suffixes) if row.phone else frozenset(),
+            )
+            for row in rows
+        ]
+
+    async def find_blocks(self, entity_type: str, max_block_size: int = 500) -> List[List[UUID]]:
+        """Groups of records sharing a blocking key or phone suffix.
+
+        Keys shared by more than ``max_block_size`` records are too common to
+        say anything and are skipped.
+        """
+        blocks: Dict[str, Set[UUID]] = defaultdict(set)
+
+        shared_keys = (
+            select(DedupeKeyModel.key)
+            .where(DedupeKeyModel.entity_type == entity_type)
+            .group_by(DedupeKeyModel.key)
+            .having(func.count().between(2, max_block_size))
+        )
+        for key, entity_id in self.session.execute(
+            select(DedupeKeyModel.key, DedupeKeyModel.entity_id)
+            .where(DedupeKeyModel.entity_type == entity_type, DedupeKeyModel.key.in_(shared_keys))
+        ):
+            blocks[key].add(entity_id)
+
+        suffix = _phone_suffix_column()
+        phone_filter = and_(ContactNumberModel.entity_type == entity_type, ContactNumberModel.is_active == True)
+        shared_suffixes = (
+            select(suffix)
+            .where(phone_filter)
+            .group_by(suffix)
+            .having(func.count(ContactNumberModel.entity_id.distinct()).between(2, max_block_size))
+        )
+        for phone, entity_id in self.session.execute(
+            select(suffix, ContactNumberModel.entity_id).where(phone_filter, suffix.in_(shared_suffixes))
+        ):
+            blocks[f"p:{phone}"].add(entity_id)
+
+        return [sorted(block, key=str) for block in blocks.values() if len(block) > 1]
+
+    async def load_records(self, entity_type: str, entity_ids: List[UUID]) -> List[MatchRecord]:
+        if not entity_ids:
+            return []
+        model = DEDUPE_ENTITY_MODELS[entity_type]
+        phones: Dict[UUID, Set[str]] = defaultdict(set)
+        for entity_id, phone in self.session.execute(
+            select(ContactNumberModel.entity_id, _phone_suffix_column()).where(
+                ContactNumberModel.entity_type == entity_type,
+                ContactNumberModel.entity_id.in_(entity_ids),
+                ContactNumberModel.is_active == True,
+            )
+        ):
+            if phone and len(phone) == PHONE_SUFFIX_DIGITS:
+                phones[entity_id].add(phone)
+        rows = self.session.execute(
+            select(model.id, model.name, model.email).where(model.id.in_(entity_ids), model.is_active == True)
+        )
+        return [
+            MatchRecord(entity_id=row.id, name=row.name, email=row.email, phone_suffixes=frozenset(phones[row.id]))
+            for row in rows
+        ]
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
 from uuid import UUID
 from decimal import Decimal
 
@@ -7,7 +8,7 @@ from sqlalchemy import func, or_, select
 
 from ...domain.entities.inventory_item_master import InventoryItemMaster
 from ...domain.repositories.inventory_item_master_repository import InventoryItemMasterRepository
-from ..database.models import InventoryItemMasterModel, TrackingType, LineItemModel
+from ..database.models import InventoryItemMasterModel, TrackingType
 
 
 class SQLAlchemyInventoryItemMasterRepository(InventoryItemMasterRepository):
@@ -53,6 +54,14 @@ class SQLAlchemyInventoryItemMasterRepository(InventoryItemMasterRepository):
             return self._model_to_entity(inventory_model)
         return None
 
+    async def find_existing_ids(self, inventory_item_ids: Iterable[UUID]) -> Set[UUID]:
+        ids = set(inventory_item_ids)
+        if not ids:
+            return set()
+        return set(self.session.execute(
+            select(InventoryItemMasterModel.id).where(InventoryItemMasterModel.id.in_(ids))
+        ).scalars())
+
     async def find_by_sku(self, sku: str) -> Optional[InventoryItemMaster]:
         # Normalize SKU for case-insensitive search
         normalized_sku = sku.strip().upper()
@@ -207,13 +216,17 @@ class SQLAlchemyInventoryItemMasterRepository(InventoryItemMasterRepository):
             return True
         return False
 
+    async def get_version(self, inventory_item_id: UUID) -> Optional[datetime]:
+        return self.session.query(InventoryItemMasterModel.updated_at).filter(
+            InventoryItemMasterModel.id == inventory_item_id
+        ).scalar()
+
     async def get_line_items_count(self, item_id: UUID) -> int:
         """Get the count of line items associated with an inventory item master"""
-        count = self.session.query(LineItemModel).filter(
-            LineItemModel.inventory_item_master_id == item_id,
-            LineItemModel.is_active == True
-        ).count()
-        return count
+        count = self.session.query(InventoryItemMasterModel.line_items_count).filter(
+            InventoryItemMasterModel.id == item_id
+        ).scalar()
+        return count or 0
 
     async def can_delete(self, item_id: UUID) -> bool:
         """Check if an inventory item master can be deleted (no associated line items)"""
@@ -1,13 +1,17 @@
 from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import Session, joinedload
 
 from ...domain.entities.item_category import ItemCategory, ItemSubCategory
 from ...domain.repositories.item_category_repository import ItemCategoryRepository, ItemSubCategoryRepository
-from ..database.models import ItemCategoryModel, ItemSubCategoryModel
+from ...domain.value_objects.category_tree import CategoryTreeNode, SubCategoryTreeNode
+from ..database.models import ItemCategoryModel, ItemSubCategoryModel, InventoryItemMasterModel
+from ..cache.lookup_name_cache import lookup_name_cache
+from ..cache.reference_data_cache import reference_data_cache
 
 
 class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
@@ -27,30 +31,25 @@ class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
         )
         self.session.add(category_model)
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(category_model)
         return self._model_to_entity(category_model)
 
     async def find_by_id(self, category_id: UUID) -> Optional[ItemCategory]:
-        category_model = self.session.query(ItemCategoryModel).filter(ItemCategoryModel.id == category_id).first()
-        if category_model:
-            return self._model_to_entity(category_model)
-        return None
+        query = self.session.query(ItemCategoryModel).filter(ItemCategoryModel.id == category_id)
+        return self._cached_lookup(("id", category_id), query)
 
     async def find_by_name(self, name: str) -> Optional[ItemCategory]:
-        category_model = self.session.query(ItemCategoryModel).filter(
+        query = self.session.query(ItemCategoryModel).filter(
             ItemCategoryModel.name == name
-        ).first()
-        if category_model:
-            return self._model_to_entity(category_model)
-        return None
+        )
+        return self._cached_lookup(("name", name), query)
 
     async def find_by_abbreviation(self, abbreviation: str) -> Optional[ItemCategory]:
-        category_model = self.session.query(ItemCategoryModel).filter(
+        query = self.session.query(ItemCategoryModel).filter(
             ItemCategoryModel.abbreviation == abbreviation.upper()
-        ).first()
-        if category_model:
-            return self._model_to_entity(category_model)
-        return None
+        )
+        return self._cached_lookup(("abbreviation", abbreviation.upper()), query)
 
     async def search_categories(self, query: str, limit: int = 10) -> List[ItemCategory]:
         category_models = self.session.query(ItemCategoryModel).filter(
@@ -64,6 +63,64 @@ class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
         category_models = self.session.query(ItemCategoryModel).offset(skip).limit(limit).all()
         return [self._model_to_entity(model) for model in category_models]
 
+    async def find_category_tree(
+        self, skip: int = 0, limit: Optional[int] = None, active_only: bool = False
+    ) -> List[CategoryTreeNode]:
+        # One statement: the page of categories, outer joined to their
+        # subcategories, with the count of active items of each subcategory
+        category_page = self.session.query(ItemCategoryModel.id)
+        if active_only:
+            category_page = category_page.filter(ItemCategoryModel.is_active == True)
+        category_page = category_page.order_by(ItemCategoryModel.name).offset(skip)
+        if limit is not None:
+            category_page = category_page.limit(limit)
+        category_page = category_page.subquery()
+
+        # Counted per subcategory row of the page, off the (item_sub_category_id,
+        # is_active) index, rather than grouping the whole inventory table
+        active_items = (
+            select(func.count(InventoryItemMasterModel.id))
+            .where(
+                InventoryItemMasterModel.item_sub_category_id == ItemSubCategoryModel.id,
+                InventoryItemMasterModel.is_active == True,
+            )
+            .correlate(ItemSubCategoryModel)
+            .scalar_subquery()
+        )
+
+        subcategory_join = ItemSubCategoryModel.item_category_id == ItemCategoryModel.id
+        if active_only:
+            subcategory_join = and_(subcategory_join, ItemSubCategoryModel.is_active == True)
+
+        rows = (
+            self.session.query(
+                ItemCategoryModel,
+                ItemSubCategoryModel,
+                active_items,
+            )
+            .join(category_page, category_page.c.id == ItemCategoryModel.id)
+            .outerjoin(ItemSubCategoryModel, subcategory_join)
+            .order_by(ItemCategoryModel.name, ItemSubCategoryModel.name)
+            .all()
+        )
+
+        nodes = {}
+        for category_model, subcategory_model, item_count in rows:
+            node = nodes.get(category_model.id)
+            if node is None:
+                node = nodes[category_model.id] = CategoryTreeNode(self._model_to_entity(category_model))
+            if subcategory_model is not None:
+                node.subcategories.append(SubCategoryTreeNode(
+                    SQLAlchemyItemSubCategoryRepository.model_to_entity(subcategory_model), item_count
+                ))
+        return list(nodes.values())
+
+    async def count_categories(self, active_only: bool = False) -> int:
+        query = self.session.query(func.count(ItemCategoryModel.id))
+        if active_only:
+            query = query.filter(ItemCategoryModel.is_active == True)
+        return query.scalar() or 0
+
     async def update(self, category: ItemCategory) -> ItemCategory:
         category_model = self.session.query(ItemCategoryModel).filter(ItemCategoryModel.id == category.id).first()
         if not category_model:
@@ -76,6 +133,7 @@ class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
         category_model.is_active = category.is_active
         
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(category_model)
         return self._model_to_entity(category_model)
 
@@ -85,6 +143,7 @@ class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
             # This will also delete subcategories due to cascade
             self.session.delete(category_model)
             self.session.commit()
+            self._invalidate_caches(include_subcategories=True)
             return True
         return False
 
@@ -113,6 +172,21 @@ class SQLAlchemyItemCategoryRepository(ItemCategoryRepository):
         existing = query.first()
         return existing is not None
 
+    def _cached_lookup(self, key: tuple, query) -> Optional[ItemCategory]:
+        def load() -> Optional[ItemCategory]:
+            category_model = query.first()
+            return self._model_to_entity(category_model) if category_model else None
+
+        return reference_data_cache.get_or_load(ItemCategoryModel.__tablename__, key, load)
+
+    def _invalidate_caches(self, include_subcategories: bool = False) -> None:
+        tables = [ItemCategoryModel.__tablename__]
+        if include_subcategories:
+            tables.append(ItemSubCategoryModel.__tablename__)
+        for table in tables:
+            reference_data_cache.invalidate(table)
+            lookup_name_cache.invalidate(table)
+
     def _model_to_entity(self, model: ItemCategoryModel) -> ItemCategory:
         return ItemCategory(
             category_id=model.id,
@@ -144,40 +218,35 @@ class SQLAlchemyItemSubCategoryRepository(ItemSubCategoryRepository):
         )
         self.session.add(subcategory_model)
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(subcategory_model)
-        return self._model_to_entity(subcategory_model)
+        return self.model_to_entity(subcategory_model)
 
     async def find_by_id(self, subcategory_id: UUID) -> Optional[ItemSubCategory]:
-        subcategory_model = self.session.query(ItemSubCategoryModel).filter(
+        query = self.session.query(ItemSubCategoryModel).filter(
             ItemSubCategoryModel.id == subcategory_id
-        ).first()
-        if subcategory_model:
-            return self._model_to_entity(subcategory_model)
-        return None
+        )
+        return self._cached_lookup(("id", subcategory_id), query)
 
     async def find_by_name_and_category(self, name: str, category_id: UUID) -> Optional[ItemSubCategory]:
-        subcategory_model = self.session.query(ItemSubCategoryModel).filter(
+        query = self.session.query(ItemSubCategoryModel).filter(
             ItemSubCategoryModel.name == name,
             ItemSubCategoryModel.item_category_id == category_id
-        ).first()
-        if subcategory_model:
-            return self._model_to_entity(subcategory_model)
-        return None
+        )
+        return self._cached_lookup(("name", category_id, name), query)
 
     async def find_by_abbreviation(self, abbreviation: str) -> Optional[ItemSubCategory]:
-        subcategory_model = self.session.query(ItemSubCategoryModel).filter(
+        query = self.session.query(ItemSubCategoryModel).filter(
             ItemSubCategoryModel.abbreviation == abbreviation.upper()
-        ).first()
-        if subcategory_model:
-            return self._model_to_entity(subcategory_model)
-        return None
+        )
+        return self._cached_lookup(("abbreviation", abbreviation.upper()), query)
 
     async def find_by_category(self, category_id: UUID, skip: int = 0, limit: int = 100) -> List[ItemSubCategory]:
         subcategory_models = self.session.query(ItemSubCategoryModel).filter(
             ItemSubCategoryModel.item_category_id == category_id
         ).filter(ItemSubCategoryModel.is_active == True).order_by(ItemSubCategoryModel.name).offset(skip).limit(limit).all()
         
-        return [self._model_to_entity(model) for model in subcategory_models]
+        return [self.model_to_entity(model) for model in subcategory_models]
 
     async def search_subcategories(self, query: str, category_id: Optional[UUID] = None, limit: int = 10) -> List[ItemSubCategory]:
         query_filter = (
@@ -193,11 +262,11 @@ class SQLAlchemyItemSubCategoryRepository(ItemSubCategoryRepository):
             base_query = base_query.filter(ItemSubCategoryModel.item_category_id == category_id)
         
         subcategory_models = base_query.order_by(ItemSubCategoryModel.name).limit(limit).all()
-        return [self._model_to_entity(model) for model in subcategory_models]
+        return [self.model_to_entity(model) for model in subcategory_models]
 
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[ItemSubCategory]:
         subcategory_models = self.session.query(ItemSubCategoryModel).offset(skip).limit(limit).all()
-        return [self._model_to_entity(model) for model in subcategory_models]
+        return [self.model_to_entity(model) for model in subcategory_models]
 
     async def update(self, subcategory: ItemSubCategory) -> ItemSubCategory:
         subcategory_model = self.session.query(ItemSubCategoryModel).filter(
@@ -214,8 +283,9 @@ class SQLAlchemyItemSubCategoryRepository(ItemSubCategoryRepository):
         subcategory_model.is_active = subcategory.is_active
         
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(subcategory_model)
-        return self._model_to_entity(subcategory_model)
+        return self.model_to_entity(subcategory_model)
 
     async def delete(self, subcategory_id: UUID) -> bool:
         subcategory_model = self.session.query(ItemSubCategoryModel).filter(
@@ -224,6 +294,7 @@ class SQLAlchemyItemSubCategoryRepository(ItemSubCategoryRepository):
         if subcategory_model:
             self.session.delete(subcategory_model)
             self.session.commit()
+            self._invalidate_caches()
             return True
         return False
 
@@ -255,7 +326,19 @@ class SQLAlchemyItemSubCategoryRepository(ItemSubCategoryRepository):
         existing = query.first()
         return existing is not None
 
-    def _model_to_entity(self, model: ItemSubCategoryModel) -> ItemSubCategory:
+    def _cached_lookup(self, key: tuple, query) -> Optional[ItemSubCategory]:
+        def load() -> Optional[ItemSubCategory]:
+            subcategory_model = query.first()
+            return self.model_to_entity(subcategory_model) if subcategory_model else None
+
+        return reference_data_cache.get_or_load(ItemSubCategoryModel.__tablename__, key, load)
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(ItemSubCategoryModel.__tablename__)
+        lookup_name_cache.invalidate(ItemSubCategoryModel.__tablename__)
+
+    @staticmethod
+    def model_to_entity(model: ItemSubCategoryModel) -> ItemSubCategory:
         return ItemSubCategory(
             subcategory_id=model.id,
             name=model.name,
@@ -1,11 +1,28 @@
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func
 
 from ...domain.entities.item_packaging import ItemPackaging
 from ...domain.repositories.item_packaging_repository import ItemPackagingRepository
+from ...domain.value_objects.page import Page
 from ..database.models import ItemPackagingModel
+from ..database.pagination import SeekPaginator
+from ..cache.lookup_name_cache import lookup_name_cache
+from ..cache.reference_data_cache import reference_data_cache
+
+_paginator = SeekPaginator(
+    ItemPackagingModel,
+    sortable={
+        "name": ItemPackagingModel.name,
+        "label": ItemPackagingModel.label,
+        "unit": ItemPackagingModel.unit,
+        "created_at": ItemPackagingModel.created_at,
+    },
+    default_ordering="-created_at",
+)
 
 
 class ItemPackagingRepositoryImpl(ItemPackagingRepository):
@@ -26,20 +43,17 @@ class ItemPackagingRepositoryImpl(ItemPackagingRepository):
         )
         self.db_session.add(db_item_packaging)
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_item_packaging)
         return self._model_to_entity(db_item_packaging)
 
     async def get_by_id(self, item_packaging_id: UUID) -> Optional[ItemPackaging]:
         stmt = select(ItemPackagingModel).where(ItemPackagingModel.id == item_packaging_id)
-        result = self.db_session.execute(stmt)
-        db_item_packaging = result.scalar_one_or_none()
-        return self._model_to_entity(db_item_packaging) if db_item_packaging else None
+        return self._cached_lookup(("id", item_packaging_id), stmt)
 
     async def get_by_label(self, label: str) -> Optional[ItemPackaging]:
         stmt = select(ItemPackagingModel).where(ItemPackagingModel.label == label.upper())
-        result = self.db_session.execute(stmt)
-        db_item_packaging = result.scalar_one_or_none()
-        return self._model_to_entity(db_item_packaging) if db_item_packaging else None
+        return self._cached_lookup(("label", label.upper()), stmt)
 
     async def get_all(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[ItemPackaging]:
         stmt = select(ItemPackagingModel)
@@ -51,6 +65,35 @@ class ItemPackagingRepositoryImpl(ItemPackagingRepository):
         db_item_packagings = result.scalars().all()
         return [self._model_to_entity(db_item_packaging) for db_item_packaging in db_item_packagings]
 
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[ItemPackaging]:
+        stmt = select(ItemPackagingModel)
+        if active_only:
+            stmt = stmt.where(ItemPackagingModel.is_active == True)
+        if search:
+            stmt = stmt.where(or_(
+                ItemPackagingModel.name.ilike(f"%{search}%"),
+                ItemPackagingModel.label.ilike(f"%{search}%"),
+            ))
+
+        # Only unfiltered totals are cached; free-text searches would crowd out the reference rows
+        total = None if search else reference_data_cache.get_or_load(
+            ItemPackagingModel.__tablename__,
+            ("count", active_only),
+            lambda: _paginator.count(self.db_session, stmt),
+        )
+        result = _paginator.paginate(self.db_session, stmt, ordering, page_size, cursor, page, total)
+        return replace(
+            result, items=[self._model_to_entity(db_item_packaging) for db_item_packaging in result.items]
+        )
+
     async def update(self, item_packaging: ItemPackaging) -> ItemPackaging:
         stmt = select(ItemPackagingModel).where(ItemPackagingModel.id == item_packaging.id)
         result = self.db_session.execute(stmt)
@@ -67,6 +110,7 @@ class ItemPackagingRepositoryImpl(ItemPackagingRepository):
         db_item_packaging.is_active = item_packaging.is_active
 
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_item_packaging)
         return self._model_to_entity(db_item_packaging)
 
@@ -80,6 +124,7 @@ class ItemPackagingRepositoryImpl(ItemPackagingRepository):
 
         db_item_packaging.is_active = False
         self.db_session.commit()
+        self._invalidate_caches()
         return True
 
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[ItemPackaging]:
@@ -94,6 +139,48 @@ class ItemPackagingRepositoryImpl(ItemPackagingRepository):
         db_item_packagings = result.scalars().all()
         return [self._model_to_entity(db_item_packaging) for db_item_packaging in db_item_packagings]
 
+    async def get_stats(self, recent_since: datetime, top_units: int = 5) -> Dict[str, Any]:
+        # One row per unit; the window sums carry the table-wide totals onto
+        # every row, so the top units and the totals come back together
+        unit_count = func.count(ItemPackagingModel.id)
+        stmt = (
+            select(
+                ItemPackagingModel.unit,
+                unit_count.label("unit_count"),
+                func.count().over().label("unique_units"),
+                func.sum(unit_count).over().label("total"),
+                func.sum(unit_count.filter(
+                    func.length(func.trim(ItemPackagingModel.remarks)) > 0
+                )).over().label("with_remarks"),
+                func.sum(unit_count.filter(ItemPackagingModel.created_at >= recent_since)).over().label("recent"),
+            )
+            .where(ItemPackagingModel.is_active == True)
+            .group_by(ItemPackagingModel.unit)
+            .order_by(unit_count.desc(), ItemPackagingModel.unit)
+            .limit(top_units)
+        )
+        rows = self.db_session.execute(stmt).all()
+        if not rows:
+            return {"total": 0, "with_remarks": 0, "recent": 0, "unique_units": 0, "top_units": []}
+        return {
+            "total": int(rows[0].total),
+            "with_remarks": int(rows[0].with_remarks),
+            "recent": int(rows[0].recent),
+            "unique_units": rows[0].unique_units,
+            "top_units": [(row.unit, row.unit_count) for row in rows],
+        }
+
+    def _cached_lookup(self, key: tuple, stmt) -> Optional[ItemPackaging]:
+        def load() -> Optional[ItemPackaging]:
+            db_item_packaging = self.db_session.execute(stmt).scalar_one_or_none()
+            return self._model_to_entity(db_item_packaging) if db_item_packaging else None
+
+        return reference_data_cache.get_or_load(ItemPackagingModel.__tablename__, key, load)
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(ItemPackagingModel.__tablename__)
+        lookup_name_cache.invalidate(ItemPackagingModel.__tablename__)
+
     def _model_to_entity(self, model: ItemPackagingModel) -> ItemPackaging:
         return ItemPackaging(
             name=model.name,
@@ -3,11 +3,78 @@ from uuid import UUID
 from decimal import Decimal
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 
 from ...domain.entities.purchase_order_line_item import PurchaseOrderLineItem, WarrantyPeriodType
 from ...domain.repositories.purchase_order_line_item_repository import PurchaseOrderLineItemRepository
-from ..database.models import PurchaseOrderLineItemModel, WarrantyPeriodType as WarrantyPeriodTypeDB
+from ...domain.value_objects.last_purchase_price import LastPurchasePrice
+from ..database.models import (
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    WarrantyPeriodType as WarrantyPeriodTypeDB,
+)
+
+
+def line_item_to_row(line_item: PurchaseOrderLineItem) -> Dict:
+    """Column values for inserting a line item with a Core/bulk ``insert``."""
+    return {
+        "id": line_item.id,
+        "purchase_order_id": line_item.purchase_order_id,
+        "inventory_item_master_id": line_item.inventory_item_master_id,
+        "warehouse_id": line_item.warehouse_id,
+        "quantity": line_item.quantity,
+        "unit_price": line_item.unit_price,
+        "serial_number": line_item.serial_number,
+        "discount": line_item.discount,
+        "tax_amount": line_item.tax_amount,
+        "received_quantity": line_item.received_quantity,
+        "reference_number": line_item.reference_number,
+        "warranty_period_type": line_item.warranty_period_type.value if line_item.warranty_period_type else None,
+        "warranty_period": line_item.warranty_period,
+        "rental_rate": line_item.rental_rate,
+        "replacement_cost": line_item.replacement_cost,
+        "late_fee_rate": line_item.late_fee_rate,
+        "sell_tax_rate": line_item.sell_tax_rate,
+        "rent_tax_rate": line_item.rent_tax_rate,
+        "rentable": line_item.rentable,
+        "sellable": line_item.sellable,
+        "selling_price": line_item.selling_price,
+        "created_at": line_item.created_at,
+        "updated_at": line_item.updated_at,
+        "created_by": line_item.created_by,
+        "is_active": line_item.is_active,
+    }
+
+
+def line_item_from_model(model: PurchaseOrderLineItemModel) -> PurchaseOrderLineItem:
+    """Convert a database model to a domain entity."""
+    return PurchaseOrderLineItem(
+        purchase_order_id=model.purchase_order_id,
+        inventory_item_master_id=model.inventory_item_master_id,
+        warehouse_id=model.warehouse_id,
+        quantity=model.quantity,
+        unit_price=Decimal(str(model.unit_price)),
+        serial_number=model.serial_number,
+        discount=Decimal(str(model.discount)),
+        tax_amount=Decimal(str(model.tax_amount)),
+        received_quantity=model.received_quantity,
+        reference_number=model.reference_number,
+        warranty_period_type=WarrantyPeriodType(model.warranty_period_type) if model.warranty_period_type else None,
+        warranty_period=model.warranty_period,
+        rental_rate=Decimal(str(model.rental_rate)),
+        replacement_cost=Decimal(str(model.replacement_cost)),
+        late_fee_rate=Decimal(str(model.late_fee_rate)),
+        sell_tax_rate=model.sell_tax_rate,
+        rent_tax_rate=model.rent_tax_rate,
+        rentable=model.rentable,
+        sellable=model.sellable,
+        selling_price=Decimal(str(model.selling_price)),
+        line_item_id=model.id,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+        created_by=model.created_by,
+        is_active=model.is_active,
+    )
 
 
 class SQLAlchemyPurchaseOrderLineItemRepository(PurchaseOrderLineItemRepository):
@@ -118,6 +185,33 @@ class SQLAlchemyPurchaseOrderLineItemRepository(PurchaseOrderLineItemRepository)
         
         return [self._model_to_entity(model) for model in line_models]
 
+    async def find_last_prices(
+        self, inventory_item_master_ids: List[UUID], vendor_id: Optional[UUID] = None
+    ) -> List[LastPurchasePrice]:
+        """Find the last price paid for each of the given items in one primary key lookup."""
+        if not inventory_item_master_ids:
+            return []
+        stmt = select(LastPurchasePriceModel).where(
+            LastPurchasePriceModel.inventory_item_master_id.in_(set(inventory_item_master_ids))
+        )
+        if vendor_id is not None:
+            stmt = stmt.where(LastPurchasePriceModel.vendor_id == vendor_id)
+        stmt = stmt.order_by(LastPurchasePriceModel.inventory_item_master_id, LastPurchasePriceModel.order_date.desc())
+        return [
+            LastPurchasePrice(
+                inventory_item_master_id=model.inventory_item_master_id,
+                vendor_id=model.vendor_id,
+                purchase_order_id=model.purchase_order_id,
+                line_item_id=model.line_item_id,
+                order_date=model.order_date,
+                quantity=model.quantity,
+                unit_price=Decimal(str(model.unit_price)),
+                discount=Decimal(str(model.discount)),
+                tax_amount=Decimal(str(model.tax_amount)),
+            )
+            for model in self.session.execute(stmt).scalars()
+        ]
+
     async def find_by_warehouse(self, warehouse_id: UUID) -> List[PurchaseOrderLineItem]:
         """Find all line items for a warehouse."""
         line_models = self.session.query(PurchaseOrderLineItemModel).filter(
@@ -234,30 +328,4 @@ class SQLAlchemyPurchaseOrderLineItemRepository(PurchaseOrderLineItemRepository)
 
     def _model_to_entity(self, model: PurchaseOrderLineItemModel) -> PurchaseOrderLineItem:
         """Convert a database model to a domain entity."""
-        return PurchaseOrderLineItem(
-            purchase_order_id=model.purchase_order_id,
-            inventory_item_master_id=model.inventory_item_master_id,
-            warehouse_id=model.warehouse_id,
-            quantity=model.quantity,
-            unit_price=Decimal(str(model.unit_price)),
-            serial_number=model.serial_number,
-            discount=Decimal(str(model.discount)),
-            tax_amount=Decimal(str(model.tax_amount)),
-            received_quantity=model.received_quantity,
-            reference_number=model.reference_number,
-            warranty_period_type=WarrantyPeriodType(model.warranty_period_type) if model.warranty_period_type else None,
-            warranty_period=model.warranty_period,
-            rental_rate=Decimal(str(model.rental_rate)),
-            replacement_cost=Decimal(str(model.replacement_cost)),
-            late_fee_rate=Decimal(str(model.late_fee_rate)),
-            sell_tax_rate=model.sell_tax_rate,
-            rent_tax_rate=model.rent_tax_rate,
-            rentable=model.rentable,
-            sellable=model.sellable,
-            selling_price=Decimal(str(model.selling_price)),
-            line_item_id=model.id,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-            created_by=model.created_by,
-            is_active=model.is_active,
-        )
\ No newline at end of file
+        return line_item_from_model(model)
@@ -1,14 +1,79 @@
-from typing import List, Optional
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
+from sqlalchemy import case, exists, func, and_, insert, select, text, update
 
 from ...domain.entities.purchase_order import PurchaseOrder, PurchaseOrderStatus
+from ...domain.entities.purchase_order_line_item import PurchaseOrderLineItem
 from ...domain.repositories.purchase_order_repository import PurchaseOrderRepository
-from ..database.models import PurchaseOrderModel, PurchaseOrderStatus as PurchaseOrderStatusDB
+from ...domain.value_objects.page import Page
+from ...domain.value_objects.purchase_order_details import PurchaseOrderDetails
+from ..database.models import (
+    PurchaseOrderModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderStatus as PurchaseOrderStatusDB,
+    VendorModel,
+)
+from ..database.bulk_copy import copy_rows
+from ..database.collection_versions import PURCHASE_ORDERS, collection_version, mark_collections_changed
+from ..database.last_prices import record_last_prices, refresh_last_prices
+from ..database.models import MovementType
+from ..database.pagination import SeekPaginator
+from ..database.stock_receipts import StockReceipt, receive_stock
+from ..database.vendor_rollups import OrderFacts, add_order_deltas, apply_vendor_rollup_deltas
+from .purchase_order_line_item_repository_impl import line_item_from_model, line_item_to_row
+
+_paginator = SeekPaginator(
+    PurchaseOrderModel,
+    sortable={"order_date": PurchaseOrderModel.order_date},
+    default_ordering="-order_date",
+)
+
+
+def purchase_order_to_row(purchase_order: PurchaseOrder) -> Dict:
+    """Column values for inserting a purchase order with a Core/bulk write."""
+    return {
+        "id": purchase_order.id,
+        "order_number": purchase_order.order_number,
+        "vendor_id": purchase_order.vendor_id,
+        "order_date": purchase_order.order_date,
+        "expected_delivery_date": purchase_order.expected_delivery_date,
+        "status": purchase_order.status.value,
+        "total_amount": purchase_order.total_amount,
+        "total_tax_amount": purchase_order.total_tax_amount,
+        "total_discount": purchase_order.total_discount,
+        "grand_total": purchase_order.grand_total,
+        "reference_number": purchase_order.reference_number,
+        "invoice_number": purchase_order.invoice_number,
+        "notes": purchase_order.notes,
+        "created_at": purchase_order.created_at,
+        "updated_at": purchase_order.updated_at,
+        "created_by": purchase_order.created_by,
+        "is_active": purchase_order.is_active,
+    }
+
+
+def _filtered_select(
+    vendor_id: Optional[UUID] = None,
+    status: Optional[PurchaseOrderStatus] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """``select(PurchaseOrderModel)`` narrowed by every filter that is set."""
+    stmt = select(PurchaseOrderModel)
+    if vendor_id is not None:
+        stmt = stmt.where(PurchaseOrderModel.vendor_id == vendor_id)
+    if status is not None:
+        stmt = stmt.where(PurchaseOrderModel.status == status.value)
+    if start_date is not None:
+        stmt = stmt.where(PurchaseOrderModel.order_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(PurchaseOrderModel.order_date <= end_date)
+    return stmt
 
 
 class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
@@ -68,6 +133,186 @@ class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
             self.session.refresh(po_model)
             return self._model_to_entity(po_model)
 
+    async def save_with_line_items(
+        self, purchase_order: PurchaseOrder, line_items: List[PurchaseOrderLineItem]
+    ) -> PurchaseOrder:
+        """Insert a new purchase order and all its line items in one transaction."""
+        po_model = PurchaseOrderModel(
+            id=purchase_order.id,
+            order_number=purchase_order.order_number,
+            vendor_id=purchase_order.vendor_id,
+            order_date=purchase_order.order_date,
+            expected_delivery_date=purchase_order.expected_delivery_date,
+            status=purchase_order.status.value,
+            total_amount=purchase_order.total_amount,
+            total_tax_amount=purchase_order.total_tax_amount,
+            total_discount=purchase_order.total_discount,
+            grand_total=purchase_order.grand_total,
+            reference_number=purchase_order.reference_number,
+            invoice_number=purchase_order.invoice_number,
+            notes=purchase_order.notes,
+            created_at=purchase_order.created_at,
+            updated_at=purchase_order.updated_at,
+            created_by=purchase_order.created_by,
+            is_active=purchase_order.is_active,
+        )
+        try:
+            self.session.add(po_model)
+            self.session.flush()
+            if line_items:
+                rows = [line_item_to_row(line_item) for line_item in line_items]
+                # One executemany, which the driver sends as multi-row INSERTs
+                self.session.execute(insert(PurchaseOrderLineItemModel), rows)
+                if purchase_order.is_active and purchase_order.status != PurchaseOrderStatus.CANCELLED:
+                    record_last_prices(
+                        self.session.connection(),
+                        purchase_order.id,
+                        purchase_order.vendor_id,
+                        purchase_order.order_date,
+                        po_model.created_at,
+                        rows,
+                    )
+            purchase_order = self._model_to_entity(po_model)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return purchase_order
+
+    async def import_orders(
+        self, orders: List[Tuple[PurchaseOrder, List[PurchaseOrderLineItem]]]
+    ) -> None:
+        """Bulk insert new purchase orders with their line items in one transaction.
+
+        Orders and lines are written with ``COPY``, which bypasses the flush
+        listeners, so the vendor rollups and last purchase prices are brought
+        up to date here in the same transaction, and the purchase order list
+        is marked changed.
+        """
+        if not orders:
+            return
+        rollup_deltas = {}
+        price_keys = set()
+        for purchase_order, line_items in orders:
+            add_order_deltas(rollup_deltas, None, OrderFacts(
+                vendor_id=purchase_order.vendor_id,
+                order_date=purchase_order.order_date,
+                expected_delivery_date=purchase_order.expected_delivery_date,
+                received_date=None,
+                status=purchase_order.status.value,
+                grand_total=purchase_order.grand_total,
+                total_tax_amount=purchase_order.total_tax_amount,
+                total_discount=purchase_order.total_discount,
+                is_active=purchase_order.is_active,
+            ))
+            price_keys.update(
+                (line_item.inventory_item_master_id, purchase_order.vendor_id) for line_item in line_items
+            )
+        try:
+            connection = self.session.connection()
+            copy_rows(connection, PurchaseOrderModel.__table__,
+                      [purchase_order_to_row(purchase_order) for purchase_order, _ in orders])
+            copy_rows(connection, PurchaseOrderLineItemModel.__table__,
+                      [line_item_to_row(line_item) for _, line_items in orders for line_item in line_items])
+            apply_vendor_rollup_deltas(connection, rollup_deltas)
+            refresh_last_prices(connection, price_keys)
+            mark_collections_changed(self.session, [PURCHASE_ORDERS])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    async def receive_items(self, purchase_order_id: UUID, quantities: Dict[UUID, int]) -> PurchaseOrder:
+        """Record received quantities per line item ID, add them to stock and update the status in one transaction.
+
+        The order row and then its affected lines (in id order) are locked
+        first, so concurrent receipts against the same order run one after
+        the other and always lock in the same order.
+        """
+        try:
+            po_model = self.session.query(PurchaseOrderModel).filter(
+                PurchaseOrderModel.id == purchase_order_id
+            ).with_for_update().first()
+            if not po_model:
+                raise ValueError(f"Purchase order with ID {purchase_order_id} not found")
+            purchase_order = self._model_to_entity(po_model)
+            if not purchase_order.is_receivable():
+                raise ValueError(f"Purchase order with status {purchase_order.status.value} cannot receive items")
+
+            line_models = self.session.query(PurchaseOrderLineItemModel).filter(
+                PurchaseOrderLineItemModel.id.in_(list(quantities))
+            ).order_by(PurchaseOrderLineItemModel.id).with_for_update().all()
+            found = {model.id: model for model in line_models}
+            for line_item_id in quantities:
+                model = found.get(line_item_id)
+                if model is None:
+                    raise ValueError(f"Line item with ID {line_item_id} not found")
+                if model.purchase_order_id != purchase_order_id:
+                    raise ValueError(f"Line item {line_item_id} does not belong to this purchase order")
+
+            receipts = []
+            for model in line_models:
+                line_item = line_item_from_model(model)
+                # Validates the quantity against what is still outstanding
+                line_item.receive_items(quantities[model.id])
+                receipts.append(StockReceipt(
+                    inventory_item_master_id=line_item.inventory_item_master_id,
+                    warehouse_id=line_item.warehouse_id,
+                    serial_number=line_item.serial_number,
+                    quantity=quantities[model.id],
+                    defaults={
+                        "rental_rate": line_item.rental_rate,
+                        "replacement_cost": line_item.replacement_cost,
+                        "late_fee_rate": line_item.late_fee_rate,
+                        "sell_tax_rate": line_item.sell_tax_rate,
+                        "rent_tax_rate": line_item.rent_tax_rate,
+                        "rentable": line_item.rentable,
+                        "sellable": line_item.sellable,
+                        "selling_price": line_item.selling_price,
+                        "warranty_period_type": line_item.warranty_period_type.value if line_item.warranty_period_type else None,
+                        "warranty_period": line_item.warranty_period,
+                    },
+                ))
+
+            received = case(quantities, value=PurchaseOrderLineItemModel.id, else_=0)
+            self.session.execute(
+                update(PurchaseOrderLineItemModel)
+                .where(PurchaseOrderLineItemModel.id.in_(list(quantities)))
+                .values(received_quantity=PurchaseOrderLineItemModel.received_quantity + received)
+                .execution_options(synchronize_session=False)
+            )
+            for model in line_models:
+                self.session.expire(model, ["received_quantity", "updated_at"])
+
+            receive_stock(
+                self.session,
+                receipts,
+                MovementType.PURCHASE,
+                purchase_order.order_number,
+                notes=f"Purchase order receipt: {purchase_order.order_number}",
+            )
+
+            outstanding = self.session.execute(select(exists().where(
+                PurchaseOrderLineItemModel.purchase_order_id == purchase_order_id,
+                PurchaseOrderLineItemModel.is_active == True,
+                PurchaseOrderLineItemModel.received_quantity < PurchaseOrderLineItemModel.quantity,
+            ))).scalar()
+            if not outstanding:
+                purchase_order.mark_as_received()
+                po_model.received_date = purchase_order.updated_at.date()
+            elif purchase_order.status != PurchaseOrderStatus.PARTIAL_RECEIVED:
+                purchase_order.mark_as_partially_received()
+
+            po_model.status = purchase_order.status.value
+            po_model.updated_at = purchase_order.updated_at
+            self.session.flush()
+            purchase_order = self._model_to_entity(po_model)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return purchase_order
+
     async def find_by_id(self, purchase_order_id: UUID) -> Optional[PurchaseOrder]:
         """Find a purchase order by its ID."""
         po_model = self.session.query(PurchaseOrderModel).options(
@@ -78,6 +323,24 @@ class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
             return self._model_to_entity(po_model)
         return None
 
+    async def find_details(self, purchase_order_id: UUID) -> Optional[PurchaseOrderDetails]:
+        """Load the order, its vendor name and its line items in a single query."""
+        row = self.session.execute(
+            select(PurchaseOrderModel, VendorModel.name)
+            .outerjoin(VendorModel, VendorModel.id == PurchaseOrderModel.vendor_id)
+            .options(joinedload(PurchaseOrderModel.line_items))
+            .where(PurchaseOrderModel.id == purchase_order_id)
+        ).unique().first()
+        if row is None:
+            return None
+
+        po_model, vendor_name = row
+        return PurchaseOrderDetails(
+            purchase_order=self._model_to_entity(po_model),
+            vendor_name=vendor_name,
+            line_items=[line_item_from_model(model) for model in po_model.line_items],
+        )
+
     async def find_by_order_number(self, order_number: str) -> Optional[PurchaseOrder]:
         """Find a purchase order by its order number."""
         po_model = self.session.query(PurchaseOrderModel).filter(
@@ -115,6 +378,22 @@ class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
         
         return [self._model_to_entity(model) for model in po_models]
 
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        vendor_id: Optional[UUID] = None,
+        status: Optional[PurchaseOrderStatus] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[PurchaseOrder]:
+        """One page of purchase orders matching all of the given filters."""
+        stmt = _filtered_select(vendor_id, status, start_date, end_date)
+        result = _paginator.paginate(self.session, stmt, ordering, page_size, cursor, page)
+        return replace(result, items=[self._model_to_entity(model) for model in result.items])
+
     async def find_by_reference_number(self, reference_number: str) -> List[PurchaseOrder]:
         """Find purchase orders by reference number."""
         po_models = self.session.query(PurchaseOrderModel).filter(
@@ -200,8 +479,7 @@ class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
         """Generate the next purchase order number."""
         # This is a simple implementation. In production, you might want to use
         # the IDManager entity or a more sophisticated sequence generator
-        from ...domain.entities.id_manager import IDManager
-        
+        self._lock_order_numbers()
         # Get the last order number
         last_po = self.session.query(PurchaseOrderModel).order_by(
             PurchaseOrderModel.order_number.desc()
@@ -219,6 +497,57 @@ class SQLAlchemyPurchaseOrderRepository(PurchaseOrderRepository):
         # Default to PUR-000001 if no previous orders or parsing fails
         return "PUR-000001"
 
+    async def allocate_order_numbers(self, count: int) -> List[str]:
+        """Generate ``count`` consecutive purchase order numbers with one query."""
+        first = int((await self.get_next_order_number()).split("-")[1])
+        return [f"PUR-{number:06d}" for number in range(first, first + count)]
+
+    def _lock_order_numbers(self) -> None:
+        # Held until the transaction that inserts the orders ends, so creates
+        # and imports running at the same time cannot read the same last number
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        self.session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:label, 0))"),
+            {"label": "purchase_orders.order_number"},
+        )
+
+    async def find_existing_reference_numbers(self, reference_numbers: Iterable[str]) -> Set[str]:
+        """Return which of the given reference numbers are already used by an order."""
+        references = set(reference_numbers)
+        if not references:
+            return set()
+        stmt = select(PurchaseOrderModel.reference_number).where(
+            PurchaseOrderModel.reference_number.in_(references)
+        ).distinct()
+        return set(self.session.execute(stmt).scalars())
+
+    async def get_version(self, purchase_order_id: UUID) -> Optional[datetime]:
+        """Get the latest modification time of a purchase order, its line items and vendor."""
+        line_items_modified = self.session.query(
+            func.max(PurchaseOrderLineItemModel.updated_at)
+        ).filter(
+            PurchaseOrderLineItemModel.purchase_order_id == purchase_order_id
+        ).scalar_subquery()
+
+        row = self.session.query(
+            PurchaseOrderModel.updated_at,
+            VendorModel.updated_at,
+            line_items_modified,
+        ).outerjoin(
+            VendorModel, VendorModel.id == PurchaseOrderModel.vendor_id
+        ).filter(
+            PurchaseOrderModel.id == purchase_order_id
+        ).first()
+
+        if not row:
+            return None
+        return max(value for value in row if value is not None)
+
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Get the version counter of the purchase order list and when it last changed."""
+        return collection_version(self.session, PURCHASE_ORDERS)
+
     def _model_to_entity(self, model: PurchaseOrderModel) -> PurchaseOrder:
         """Convert a database model to a domain entity."""
         return PurchaseOrder(
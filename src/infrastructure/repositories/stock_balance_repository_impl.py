@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...domain.repositories.stock_balance_repository import StockBalanceRepository
+from ...domain.value_objects.stock_balance import StockAsOf, StockBalance, StockLevel
+from ..database.models import StockBalanceModel
+from ..database.stock_balances import status_name
+from ..database.stock_history import stock_as_of
+
+
+class SQLAlchemyStockBalanceRepository(StockBalanceRepository):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    async def find_balances(
+        self,
+        inventory_item_master_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> List[StockBalance]:
+        """Read a primary key range of the balances; line items are never scanned."""
+        stmt = select(StockBalanceModel).where(
+            StockBalanceModel.inventory_item_master_id == inventory_item_master_id
+        )
+        if warehouse_id is not None:
+            stmt = stmt.where(StockBalanceModel.warehouse_id == warehouse_id)
+        if status is not None:
+            stmt = stmt.where(StockBalanceModel.status == status)
+        # Stock can all move away, leaving an all-zero row
+        stmt = stmt.where(StockBalanceModel.quantity != 0)
+        models = self.session.execute(
+            stmt.order_by(StockBalanceModel.warehouse_id, StockBalanceModel.status)
+        ).scalars()
+        return [
+            StockBalance(
+                inventory_item_master_id=model.inventory_item_master_id,
+                warehouse_id=model.warehouse_id,
+                status=status_name(model.status),
+                quantity=model.quantity,
+            )
+            for model in models
+        ]
+
+    async def find_levels_as_of(
+        self,
+        as_of: datetime,
+        inventory_item_master_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+    ) -> StockAsOf:
+        """Replay only the movements since the nearest snapshot before ``as_of``."""
+        snapshot_at, rows = stock_as_of(self.session, as_of, inventory_item_master_id, warehouse_id)
+        return StockAsOf(
+            as_of=as_of,
+            snapshot_taken_at=snapshot_at,
+            levels=[
+                StockLevel(inventory_item_master_id=item_id, warehouse_id=warehouse, quantity=quantity)
+                for item_id, warehouse, quantity in rows
+            ],
+        )
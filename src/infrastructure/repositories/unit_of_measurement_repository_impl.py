@@ -1,11 +1,26 @@
-from typing import List, Optional
+from dataclasses import replace
+from typing import Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_, or_, func
 
 from ...domain.entities.unit_of_measurement import UnitOfMeasurement
 from ...domain.repositories.unit_of_measurement_repository import UnitOfMeasurementRepository
+from ...domain.value_objects.page import Page
 from ..database.models import UnitOfMeasurementModel
+from ..database.pagination import SeekPaginator
+from ..cache.lookup_name_cache import lookup_name_cache
+from ..cache.reference_data_cache import reference_data_cache
+
+_paginator = SeekPaginator(
+    UnitOfMeasurementModel,
+    sortable={
+        "name": UnitOfMeasurementModel.name,
+        "abbreviation": UnitOfMeasurementModel.abbreviation,
+        "created_at": UnitOfMeasurementModel.created_at,
+    },
+    default_ordering="name",
+)
 
 
 class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
@@ -25,26 +40,21 @@ class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
         )
         self.db_session.add(db_unit)
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_unit)
         return self._model_to_entity(db_unit)
 
     async def get_by_id(self, unit_id: UUID) -> Optional[UnitOfMeasurement]:
         stmt = select(UnitOfMeasurementModel).where(UnitOfMeasurementModel.id == unit_id)
-        result = self.db_session.execute(stmt)
-        db_unit = result.scalar_one_or_none()
-        return self._model_to_entity(db_unit) if db_unit else None
+        return self._cached_lookup(("id", unit_id), stmt)
 
     async def get_by_name(self, name: str) -> Optional[UnitOfMeasurement]:
         stmt = select(UnitOfMeasurementModel).where(UnitOfMeasurementModel.name == name)
-        result = self.db_session.execute(stmt)
-        db_unit = result.scalar_one_or_none()
-        return self._model_to_entity(db_unit) if db_unit else None
+        return self._cached_lookup(("name", name), stmt)
 
     async def get_by_abbreviation(self, abbreviation: str) -> Optional[UnitOfMeasurement]:
         stmt = select(UnitOfMeasurementModel).where(UnitOfMeasurementModel.abbreviation == abbreviation)
-        result = self.db_session.execute(stmt)
-        db_unit = result.scalar_one_or_none()
-        return self._model_to_entity(db_unit) if db_unit else None
+        return self._cached_lookup(("abbreviation", abbreviation), stmt)
 
     async def get_all(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[UnitOfMeasurement]:
         stmt = select(UnitOfMeasurementModel)
@@ -56,6 +66,33 @@ class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
         db_units = result.scalars().all()
         return [self._model_to_entity(db_unit) for db_unit in db_units]
 
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[UnitOfMeasurement]:
+        stmt = select(UnitOfMeasurementModel)
+        if active_only:
+            stmt = stmt.where(UnitOfMeasurementModel.is_active == True)
+        if search:
+            stmt = stmt.where(or_(
+                UnitOfMeasurementModel.name.ilike(f"%{search}%"),
+                UnitOfMeasurementModel.abbreviation.ilike(f"%{search}%"),
+            ))
+
+        # Only unfiltered totals are cached; free-text searches would crowd out the reference rows
+        total = None if search else reference_data_cache.get_or_load(
+            UnitOfMeasurementModel.__tablename__,
+            ("count", active_only),
+            lambda: _paginator.count(self.db_session, stmt),
+        )
+        result = _paginator.paginate(self.db_session, stmt, ordering, page_size, cursor, page, total)
+        return replace(result, items=[self._model_to_entity(db_unit) for db_unit in result.items])
+
     async def update(self, unit_of_measurement: UnitOfMeasurement) -> UnitOfMeasurement:
         stmt = select(UnitOfMeasurementModel).where(UnitOfMeasurementModel.id == unit_of_measurement.id)
         result = self.db_session.execute(stmt)
@@ -71,6 +108,7 @@ class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
         db_unit.is_active = unit_of_measurement.is_active
 
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_unit)
         return self._model_to_entity(db_unit)
 
@@ -84,6 +122,7 @@ class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
 
         db_unit.is_active = False
         self.db_session.commit()
+        self._invalidate_caches()
         return True
 
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[UnitOfMeasurement]:
@@ -108,6 +147,24 @@ class UnitOfMeasurementRepositoryImpl(UnitOfMeasurementRepository):
         result = self.db_session.execute(stmt)
         return result.scalar() or 0
 
+    async def get_stats(self) -> Dict[str, int]:
+        stmt = select(
+            func.count(UnitOfMeasurementModel.id).label("total"),
+            func.count(UnitOfMeasurementModel.id).filter(UnitOfMeasurementModel.is_active == True).label("active"),
+        )
+        return dict(self.db_session.execute(stmt).one()._mapping)
+
+    def _cached_lookup(self, key: tuple, stmt) -> Optional[UnitOfMeasurement]:
+        def load() -> Optional[UnitOfMeasurement]:
+            db_unit = self.db_session.execute(stmt).scalar_one_or_none()
+            return self._model_to_entity(db_unit) if db_unit else None
+
+        return reference_data_cache.get_or_load(UnitOfMeasurementModel.__tablename__, key, load)
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(UnitOfMeasurementModel.__tablename__)
+        lookup_name_cache.invalidate(UnitOfMeasurementModel.__tablename__)
+
     def _model_to_entity(self, model: UnitOfMeasurementModel) -> UnitOfMeasurement:
         return UnitOfMeasurement(
             name=model.name,
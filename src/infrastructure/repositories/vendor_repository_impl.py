@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,7 +7,10 @@ from sqlalchemy.orm import Session
 
 from ...domain.entities.vendor import Vendor
 from ...domain.repositories.vendor_repository import VendorRepository
+from ...domain.value_objects.city import CityFacet, city_key
+from ..cache.reference_data_cache import reference_data_cache
 from ..database.models import VendorModel
+from .city_facets import city_key_filter, load_city_facets
 
 
 class SQLAlchemyVendorRepository(VendorRepository):
@@ -22,6 +25,7 @@ class SQLAlchemyVendorRepository(VendorRepository):
             address=vendor.address,
             remarks=vendor.remarks,
             city=vendor.city,
+            city_key=city_key(vendor.city),
             created_at=vendor.created_at,
             updated_at=vendor.updated_at,
             created_by=vendor.created_by,
@@ -29,6 +33,7 @@ class SQLAlchemyVendorRepository(VendorRepository):
         )
         self.session.add(vendor_model)
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(vendor_model)
         return self._model_to_entity(vendor_model)
 
@@ -38,6 +43,13 @@ class SQLAlchemyVendorRepository(VendorRepository):
             return self._model_to_entity(vendor_model)
         return None
 
+    async def find_existing_ids(self, vendor_ids: Iterable[UUID]) -> Set[UUID]:
+        ids = set(vendor_ids)
+        if not ids:
+            return set()
+        stmt = select(VendorModel.id).where(VendorModel.id.in_(ids))
+        return set(self.session.execute(stmt).scalars())
+
     async def find_by_name(self, name: str) -> List[Vendor]:
         vendor_models = self.session.query(VendorModel).filter(VendorModel.name.ilike(f"%{name}%")).all()
         return [self._model_to_entity(model) for model in vendor_models]
@@ -51,15 +63,13 @@ class SQLAlchemyVendorRepository(VendorRepository):
         return None
 
     async def find_by_city(self, city: str, limit: Optional[int] = None) -> List[Vendor]:
-        query = self.session.query(VendorModel).filter(
-            VendorModel.city.ilike(f"%{city}%")
-        ).filter(VendorModel.is_active == True).order_by(VendorModel.name)
-        
-        if limit:
-            query = query.limit(limit)
-            
-        vendor_models = query.all()
-        return [self._model_to_entity(model) for model in vendor_models]
+        return self._find_by_city_key(city_key_filter(VendorModel, city), limit)
+
+    async def find_by_city_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Vendor]:
+        return self._find_by_city_key(city_key_filter(VendorModel, prefix, prefix=True), limit)
+
+    async def get_city_facets(self, limit: int = 10, prefix: Optional[str] = None) -> List[CityFacet]:
+        return load_city_facets(self.session, VendorModel, limit, prefix)
 
     async def search_vendors(self, query: str, search_fields: List[str] = None, limit: int = 10) -> List[Vendor]:
         if search_fields is None:
@@ -103,10 +113,12 @@ class SQLAlchemyVendorRepository(VendorRepository):
         vendor_model.address = vendor.address
         vendor_model.remarks = vendor.remarks
         vendor_model.city = vendor.city
+        vendor_model.city_key = city_key(vendor.city)
         vendor_model.updated_at = vendor.updated_at
         vendor_model.is_active = vendor.is_active
         
         self.session.commit()
+        self._invalidate_caches()
         self.session.refresh(vendor_model)
         return self._model_to_entity(vendor_model)
 
@@ -126,6 +138,7 @@ class SQLAlchemyVendorRepository(VendorRepository):
         # Delete the vendor
         self.session.delete(vendor_model)
         self.session.commit()
+        self._invalidate_caches()
         return True
 
     async def exists(self, vendor_id: UUID) -> bool:
@@ -145,6 +158,22 @@ class SQLAlchemyVendorRepository(VendorRepository):
         existing = query.first()
         return existing is not None
 
+    def _find_by_city_key(self, condition, limit: Optional[int]) -> List[Vendor]:
+        if condition is None:
+            return []
+        query = self.session.query(VendorModel).filter(
+            condition
+        ).filter(VendorModel.is_active == True).order_by(VendorModel.name)
+        
+        if limit:
+            query = query.limit(limit)
+            
+        vendor_models = query.all()
+        return [self._model_to_entity(model) for model in vendor_models]
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(VendorModel.__tablename__)
+
     def _model_to_entity(self, model: VendorModel) -> Vendor:
         return Vendor(
             vendor_id=model.id,
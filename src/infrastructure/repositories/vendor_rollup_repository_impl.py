@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...domain.repositories.vendor_rollup_repository import VendorRollupRepository
+from ...domain.value_objects.vendor_rollup import VendorMonthlyRollup
+from ..database.models import VendorMonthlyRollupModel
+from ..database.vendor_rollups import month_of
+
+
+class SQLAlchemyVendorRollupRepository(VendorRollupRepository):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    async def find_monthly(
+        self,
+        vendor_id: Optional[UUID] = None,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> List[VendorMonthlyRollup]:
+        """Read the rollup rows only; purchase orders are never scanned."""
+        stmt = select(VendorMonthlyRollupModel)
+        if vendor_id is not None:
+            stmt = stmt.where(VendorMonthlyRollupModel.vendor_id == vendor_id)
+        if start_month is not None:
+            stmt = stmt.where(VendorMonthlyRollupModel.month >= month_of(start_month))
+        if end_month is not None:
+            stmt = stmt.where(VendorMonthlyRollupModel.month <= month_of(end_month))
+        # Orders can all be deleted or moved away, leaving an all-zero row
+        stmt = stmt.where(VendorMonthlyRollupModel.order_count > 0)
+        models = self.session.execute(
+            stmt.order_by(VendorMonthlyRollupModel.month, VendorMonthlyRollupModel.vendor_id)
+        ).scalars()
+        return [self._model_to_value(model) for model in models]
+
+    def _model_to_value(self, model: VendorMonthlyRollupModel) -> VendorMonthlyRollup:
+        return VendorMonthlyRollup(
+            vendor_id=model.vendor_id,
+            month=model.month,
+            order_count=model.order_count,
+            cancelled_order_count=model.cancelled_order_count,
+            spend=Decimal(str(model.spend)),
+            tax_amount=Decimal(str(model.tax_amount)),
+            discount_amount=Decimal(str(model.discount_amount)),
+            received_order_count=model.received_order_count,
+            lead_time_order_count=model.lead_time_order_count,
+            total_delivery_delay_days=model.total_delivery_delay_days,
+        )
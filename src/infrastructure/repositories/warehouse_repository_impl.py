@@ -1,11 +1,27 @@
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func
 
 from ...domain.entities.warehouse import Warehouse
 from ...domain.repositories.warehouse_repository import WarehouseRepository
+from ...domain.value_objects.page import Page
+from ..database.collection_versions import WAREHOUSES, collection_version
 from ..database.models import WarehouseModel
+from ..database.pagination import SeekPaginator
+from ..cache.reference_data_cache import reference_data_cache
+
+_paginator = SeekPaginator(
+    WarehouseModel,
+    sortable={
+        "name": WarehouseModel.name,
+        "label": WarehouseModel.label,
+        "created_at": WarehouseModel.created_at,
+    },
+    default_ordering="-created_at",
+)
 
 
 class WarehouseRepositoryImpl(WarehouseRepository):
@@ -25,20 +41,24 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         )
         self.db_session.add(db_warehouse)
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_warehouse)
         return self._model_to_entity(db_warehouse)
 
     async def get_by_id(self, warehouse_id: UUID) -> Optional[Warehouse]:
         stmt = select(WarehouseModel).where(WarehouseModel.id == warehouse_id)
-        result = self.db_session.execute(stmt)
-        db_warehouse = result.scalar_one_or_none()
-        return self._model_to_entity(db_warehouse) if db_warehouse else None
+        return self._cached_lookup(("id", warehouse_id), stmt)
+
+    async def find_existing_ids(self, warehouse_ids: Iterable[UUID]) -> Set[UUID]:
+        ids = set(warehouse_ids)
+        if not ids:
+            return set()
+        stmt = select(WarehouseModel.id).where(WarehouseModel.id.in_(ids))
+        return set(self.db_session.execute(stmt).scalars())
 
     async def get_by_label(self, label: str) -> Optional[Warehouse]:
         stmt = select(WarehouseModel).where(WarehouseModel.label == label.upper())
-        result = self.db_session.execute(stmt)
-        db_warehouse = result.scalar_one_or_none()
-        return self._model_to_entity(db_warehouse) if db_warehouse else None
+        return self._cached_lookup(("label", label.upper()), stmt)
 
     async def get_all(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[Warehouse]:
         stmt = select(WarehouseModel)
@@ -50,6 +70,33 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         db_warehouses = result.scalars().all()
         return [self._model_to_entity(db_warehouse) for db_warehouse in db_warehouses]
 
+    async def get_page(
+        self,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        active_only: bool = True,
+        search: Optional[str] = None,
+        ordering: Optional[str] = None,
+    ) -> Page[Warehouse]:
+        stmt = select(WarehouseModel)
+        if active_only:
+            stmt = stmt.where(WarehouseModel.is_active == True)
+        if search:
+            stmt = stmt.where(or_(
+                WarehouseModel.name.ilike(f"%{search}%"),
+                WarehouseModel.label.ilike(f"%{search}%"),
+            ))
+
+        # Only unfiltered totals are cached; free-text searches would crowd out the reference rows
+        total = None if search else reference_data_cache.get_or_load(
+            WarehouseModel.__tablename__,
+            ("count", active_only),
+            lambda: _paginator.count(self.db_session, stmt),
+        )
+        result = _paginator.paginate(self.db_session, stmt, ordering, page_size, cursor, page, total)
+        return replace(result, items=[self._model_to_entity(db_warehouse) for db_warehouse in result.items])
+
     async def update(self, warehouse: Warehouse) -> Warehouse:
         stmt = select(WarehouseModel).where(WarehouseModel.id == warehouse.id)
         result = self.db_session.execute(stmt)
@@ -65,6 +112,7 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         db_warehouse.is_active = warehouse.is_active
 
         self.db_session.commit()
+        self._invalidate_caches()
         self.db_session.refresh(db_warehouse)
         return self._model_to_entity(db_warehouse)
 
@@ -78,6 +126,7 @@ class WarehouseRepositoryImpl(WarehouseRepository):
 
         db_warehouse.is_active = False
         self.db_session.commit()
+        self._invalidate_caches()
         return True
 
     async def search_by_name(self, name: str, skip: int = 0, limit: int = 100) -> List[Warehouse]:
@@ -92,6 +141,33 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         db_warehouses = result.scalars().all()
         return [self._model_to_entity(db_warehouse) for db_warehouse in db_warehouses]
 
+    async def get_version(self, warehouse_id: UUID) -> Optional[datetime]:
+        stmt = select(WarehouseModel.updated_at).where(WarehouseModel.id == warehouse_id)
+        return self.db_session.execute(stmt).scalar_one_or_none()
+
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        return collection_version(self.db_session, WAREHOUSES)
+
+    async def get_stats(self, recent_since: datetime) -> Dict[str, int]:
+        stmt = select(
+            func.count(WarehouseModel.id).label("total"),
+            func.count(WarehouseModel.id).filter(
+                func.length(func.trim(WarehouseModel.remarks)) > 0
+            ).label("with_remarks"),
+            func.count(WarehouseModel.id).filter(WarehouseModel.created_at >= recent_since).label("recent"),
+        ).where(WarehouseModel.is_active == True)
+        return dict(self.db_session.execute(stmt).one()._mapping)
+
+    def _cached_lookup(self, key: tuple, stmt) -> Optional[Warehouse]:
+        def load() -> Optional[Warehouse]:
+            db_warehouse = self.db_session.execute(stmt).scalar_one_or_none()
+            return self._model_to_entity(db_warehouse) if db_warehouse else None
+
+        return reference_data_cache.get_or_load(WarehouseModel.__tablename__, key, load)
+
+    def _invalidate_caches(self) -> None:
+        reference_data_cache.invalidate(WarehouseModel.__tablename__)
+
     def _model_to_entity(self, model: WarehouseModel) -> Warehouse:
         return Warehouse(
             name=model.name,
@@ -4,6 +4,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from .api.v1.router import api_router
 from .core.config.database import get_database_manager
 from .core.config.settings import get_settings
+from .infrastructure.cache.reference_data_cache import reference_data_cache
+from .infrastructure.cache.stats_snapshots import stats_snapshots
+from .infrastructure.database.partition_maintenance import movement_partition_maintainer
 
 settings = get_settings()
 
@@ -31,6 +34,10 @@ api_prefix_router = APIRouter(prefix="/api")
 async def api_health_check():
     return {"status": "healthy", "service": settings.app_name, "path": "/api/health"}
 
+@api_prefix_router.get("/cache/stats")
+async def api_cache_stats():
+    return {"reference_data": reference_data_cache.stats()}
+
 app.include_router(api_prefix_router)
 
 
@@ -38,6 +45,14 @@ app.include_router(api_prefix_router)
 async def startup_event():
     db_manager = get_database_manager()
     db_manager.create_tables()
+    movement_partition_maintainer.start()
+    stats_snapshots.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stats_snapshots.stop()
+    await movement_partition_maintainer.stop()
 
 
 @app.get("/")
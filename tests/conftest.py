@@ -4,6 +4,13 @@ from uuid import uuid4, UUID
 from decimal import Decimal
 from datetime import datetime
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
 from src.domain.entities.customer import Customer
 from src.domain.entities.vendor import Vendor
 from src.domain.entities.warehouse import Warehouse
@@ -13,6 +20,62 @@ from src.domain.entities.contact_number import ContactNumber
 from src.domain.entities.item_category import ItemCategory, ItemSubCategory
 from src.domain.value_objects.address import Address
 from src.domain.value_objects.phone_number import PhoneNumber
+from src.infrastructure.database.base import Base
+
+
+@compiles(PostgresUUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+# In-memory sqlite fixtures; a test module lists the models it needs with
+#
+#     @pytest.fixture
+#     def tables():
+#         return [VendorModel, PurchaseOrderModel]
+@pytest.fixture
+def tables():
+    """Models (or tables) the ``engine`` fixture creates"""
+    return []
+
+
+@pytest.fixture
+def database_url():
+    """sqlite database of the ``engine`` fixture; a file gives every thread its own connection"""
+    return "sqlite://"
+
+
+@pytest.fixture
+def engine(tables, database_url):
+    """sqlite engine with ``tables`` created; in memory by default, shared by every thread"""
+    in_memory = {"poolclass": StaticPool} if database_url == "sqlite://" else {}
+    engine = create_engine(database_url, connect_args={"check_same_thread": False}, **in_memory)
+    wanted = {getattr(table, "__table__", table) for table in tables}
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table not in wanted:
+                continue
+            connection.execute(CreateTable(table))
+            # Some models declare an index on the column and again in
+            # __table_args__, which sqlite rejects as a duplicate name
+            created = set()
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in created:
+                    connection.execute(CreateIndex(index))
+                    created.add(index.name)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Session on the ``engine`` fixture; every executed statement is recorded in ``session.statements``"""
+    session = sessionmaker(bind=engine)()
+    session.statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: session.statements.append(statement))
+    yield session
+    session.close()
 
 
 @pytest.fixture
@@ -297,6 +360,8 @@ def mock_contact_repository():
     repo.save = AsyncMock()
     repo.find_by_id = AsyncMock()
     repo.find_by_entity = AsyncMock()
+    repo.find_by_entities = AsyncMock()
+    repo.replace_for_entity = AsyncMock()
     repo.delete = AsyncMock()
     return repo
 
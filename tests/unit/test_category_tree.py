@@ -0,0 +1,92 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    ItemCategoryModel,
+    ItemSubCategoryModel,
+    TrackingType,
+)
+from src.infrastructure.repositories.item_category_repository_impl import SQLAlchemyItemCategoryRepository
+
+
+@pytest.fixture
+def tables():
+    return [ItemCategoryModel, ItemSubCategoryModel, InventoryItemMasterModel]
+
+
+@pytest.fixture
+def catalogue(session):
+    tools = ItemCategoryModel(name="Tools", abbreviation="TOOLS")
+    lighting = ItemCategoryModel(name="Lighting", abbreviation="LIGHT")
+    archived = ItemCategoryModel(name="Archived", abbreviation="ARCH", is_active=False)
+    drills = ItemSubCategoryModel(name="Drills", abbreviation="DRILLS", item_category=tools)
+    saws = ItemSubCategoryModel(name="Saws", abbreviation="SAWSSS", item_category=tools)
+    old_saws = ItemSubCategoryModel(name="Old saws", abbreviation="OLDSAW", item_category=tools, is_active=False)
+    session.add_all([tools, lighting, archived, drills, saws, old_saws])
+    session.flush()
+    for index, (subcategory, is_active) in enumerate(
+        [(drills, True), (drills, True), (drills, False), (saws, True), (old_saws, True)]
+    ):
+        session.add(InventoryItemMasterModel(
+            name=f"item {index}",
+            sku=f"SKU{index}",
+            item_sub_category_id=subcategory.id,
+            unit_of_measurement_id=uuid4(),
+            tracking_type=TrackingType.BULK,
+            is_active=is_active,
+        ))
+    session.commit()
+
+
+def get_tree(session, **kwargs):
+    return asyncio.run(SQLAlchemyItemCategoryRepository(session).find_category_tree(**kwargs))
+
+
+class TestCategoryTree:
+    @pytest.mark.usefixtures("catalogue")
+    def test_builds_tree_with_active_item_counts(self, session):
+        tree = get_tree(session)
+
+        assert [node.category.name for node in tree] == ["Archived", "Lighting", "Tools"]
+        tools = tree[2]
+        assert [(child.subcategory.name, child.item_count) for child in tools.subcategories] == [
+            ("Drills", 2), ("Old saws", 1), ("Saws", 1),
+        ]
+        assert tools.item_count == 4
+        assert tools.active_subcategory_count == 2
+        assert tree[1].subcategories == []
+
+    @pytest.mark.usefixtures("catalogue")
+    def test_active_only_drops_inactive_categories_and_subcategories(self, session):
+        tree = get_tree(session, active_only=True)
+
+        assert [node.category.name for node in tree] == ["Lighting", "Tools"]
+        assert [child.subcategory.name for child in tree[1].subcategories] == ["Drills", "Saws"]
+        assert tree[1].item_count == 3
+
+    @pytest.mark.usefixtures("catalogue")
+    def test_pages_over_categories_not_rows(self, session):
+        tree = get_tree(session, skip=1, limit=2)
+
+        assert [node.category.name for node in tree] == ["Lighting", "Tools"]
+        assert len(tree[1].subcategories) == 3
+
+    @pytest.mark.usefixtures("catalogue")
+    def test_runs_a_single_statement(self, session):
+        session.statements.clear()
+
+        get_tree(session, limit=1)
+
+        assert len(session.statements) == 1
+        # Items are counted for the subcategories on the page, not grouped over the whole table
+        assert "GROUP BY" not in session.statements[0]
+
+    @pytest.mark.usefixtures("catalogue")
+    def test_counts_every_category_not_just_the_page(self, session):
+        repository = SQLAlchemyItemCategoryRepository(session)
+
+        assert asyncio.run(repository.count_categories()) == 3
+        assert asyncio.run(repository.count_categories(active_only=True)) == 2
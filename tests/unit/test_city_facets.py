@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.domain.entities.customer import Customer
+from src.domain.entities.vendor import Vendor
+from src.domain.value_objects.city import CityFacet, city_key
+from src.infrastructure.cache.reference_data_cache import reference_data_cache
+from src.infrastructure.database.models import CustomerModel, DedupeKeyModel, VendorModel
+from src.infrastructure.repositories.customer_repository_impl import SQLAlchemyCustomerRepository
+from src.infrastructure.repositories.vendor_repository_impl import SQLAlchemyVendorRepository
+
+
+@pytest.fixture
+def tables():
+    return [CustomerModel, VendorModel, DedupeKeyModel]
+
+
+@pytest.fixture(autouse=True)
+def clear_reference_data_cache():
+    reference_data_cache.clear()
+    yield
+    reference_data_cache.clear()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def customers(session):
+    repository = SQLAlchemyCustomerRepository(session)
+    for index, city in enumerate(["New York", " NEW york ", "Newark", "Boston", "Boston", "Boston", "new_town", None]):
+        run(repository.save(Customer(name=f"Customer {index}", city=city)))
+    run(repository.save(Customer(name="Gone", city="Newark", is_active=False)))
+    return repository
+
+
+class TestCityKey:
+    def test_lower_cases_and_collapses_whitespace(self):
+        assert city_key("  New   York ") == "new york"
+        assert city_key("   ") is None
+        assert city_key(None) is None
+
+
+class TestCityFilters:
+    def test_exact_match_ignores_case_and_spacing_but_not_substrings(self, customers):
+        found = run(customers.find_by_city("NEW YORK"))
+
+        assert [customer.name for customer in found] == ["Customer 0", "Customer 1"]
+        assert run(customers.find_by_city("york")) == []
+
+    def test_prefix_match_treats_wildcards_literally(self, customers):
+        assert [c.city for c in run(customers.find_by_city_prefix("new"))] == [
+            "New York", "New York", "Newark", "New_Town",
+        ]
+        assert [c.city for c in run(customers.find_by_city_prefix("new_"))] == ["New_Town"]
+        assert run(customers.find_by_city_prefix("%")) == []
+
+
+class TestCityFacets:
+    def test_counts_active_rows_per_city_in_one_query(self, customers, session):
+        session.statements.clear()
+
+        facets = run(customers.get_city_facets(limit=3))
+
+        assert facets == [
+            CityFacet(city_key="boston", city="Boston", count=3),
+            CityFacet(city_key="new york", city="New York", count=2),
+            CityFacet(city_key="new_town", city="New_Town", count=1),
+        ]
+        assert len(session.statements) == 1
+
+    def test_prefix_narrows_facets(self, customers):
+        facets = run(customers.get_city_facets(prefix="NEW"))
+
+        assert [(facet.city_key, facet.count) for facet in facets] == [("new york", 2), ("new_town", 1), ("newark", 1)]
+        # Typed prefixes are not kept in the shared cache
+        assert reference_data_cache.stats()["size"] == 0
+
+    def test_facets_are_cached_until_a_write(self, customers, session):
+        run(customers.get_city_facets())
+        session.statements.clear()
+
+        run(customers.get_city_facets())
+        assert session.statements == []
+
+        run(customers.save(Customer(name="Another", city="Newark")))
+        facets = run(customers.get_city_facets())
+        assert ("newark", 2) in [(facet.city_key, facet.count) for facet in facets]
+
+    def test_vendor_facets_are_cached_separately(self, customers, session):
+        vendors = SQLAlchemyVendorRepository(session)
+        run(vendors.save(Vendor(name="Acme", city="Boston ")))
+        run(customers.get_city_facets())
+
+        assert run(vendors.get_city_facets()) == [CityFacet(city_key="boston", city="Boston ", count=1)]
+        assert [vendor.name for vendor in run(vendors.find_by_city("boston"))] == ["Acme"]
@@ -0,0 +1,131 @@
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.database.collection_versions import (
+    INVENTORY_ITEMS,
+    WAREHOUSES,
+    collection_version,
+    mark_collections_changed,
+)
+from src.infrastructure.database.models import (
+    CollectionVersionModel,
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    PurchaseOrderLineItemModel,
+    StockBalanceModel,
+    TrackingType,
+    WarehouseModel,
+)
+
+SOURCE_TABLES = [
+    InventoryItemMasterModel,
+    LineItemModel,
+    InventoryItemStockMovementModel,
+    StockBalanceModel,
+    PurchaseOrderLineItemModel,
+    WarehouseModel,
+]
+
+
+@pytest.fixture
+def tables():
+    return SOURCE_TABLES + [CollectionVersionModel]
+
+
+def make_master(name):
+    return InventoryItemMasterModel(
+        name=name,
+        sku=name.upper(),
+        item_sub_category_id=uuid4(),
+        unit_of_measurement_id=uuid4(),
+        tracking_type=TrackingType.BULK,
+    )
+
+
+def version(session):
+    return collection_version(session, INVENTORY_ITEMS)[0]
+
+
+class TestCollectionVersions:
+    def test_master_changes_bump_the_version(self, session):
+        assert collection_version(session, INVENTORY_ITEMS) == (0, None)
+        master = make_master("drill")
+        session.add(master)
+        session.commit()
+        assert version(session) == 1
+
+        master.name = "hammer drill"
+        session.commit()
+        assert version(session) == 2
+
+        # Loading without changing anything is not a change
+        session.expire_all()
+        assert session.get(InventoryItemMasterModel, master.id).name == "hammer drill"
+        session.commit()
+        assert version(session) == 2
+
+    def test_delete_and_insert_still_change_the_version(self, session):
+        first = make_master("drill")
+        session.add(first)
+        session.commit()
+        before = version(session)
+
+        session.delete(first)
+        session.add(make_master("saw"))
+        session.commit()
+
+        # Same row count as before, but a different list
+        assert version(session) > before
+
+    def test_line_item_counts_bump_the_version(self, session):
+        master = make_master("drill")
+        session.add(master)
+        session.commit()
+        before = version(session)
+
+        session.add(LineItemModel(inventory_item_master_id=master.id, warehouse_id=uuid4(), quantity=1))
+        session.commit()
+        assert version(session) > before
+
+    def test_collections_are_versioned_separately(self, session):
+        warehouse = WarehouseModel(name="Main", label="MAIN")
+        session.add(warehouse)
+        session.commit()
+        warehouse.is_active = False
+        session.commit()
+
+        assert collection_version(session, WAREHOUSES)[0] == 2
+        assert version(session) == 0
+
+    def test_bumps_once_the_change_commits(self, session):
+        session.add(make_master("drill"))
+        session.flush()
+        # Writers do not hold the counter row while their transaction runs
+        assert version(session) == 0
+        session.commit()
+        assert version(session) == 1
+
+    def test_set_based_changes_are_marked_on_the_session(self, session):
+        mark_collections_changed(session, [INVENTORY_ITEMS])
+        session.commit()
+        assert version(session) == 1
+
+    def test_rolled_back_changes_do_not_bump(self, session):
+        session.add(make_master("drill"))
+        session.flush()
+        session.rollback()
+        assert version(session) == 0
+
+    @pytest.mark.parametrize("tables", [SOURCE_TABLES])
+    def test_flushes_work_without_the_table(self, session):
+        master = make_master("drill")
+        session.add(master)
+        session.commit()
+        session.add(LineItemModel(inventory_item_master_id=master.id, warehouse_id=uuid4(), quantity=1))
+        session.commit()
+        assert session.get(InventoryItemMasterModel, master.id).line_items_count == 1
+        # The missing table is looked up once, not on every commit
+        lookups = [s for s in session.statements if s == 'PRAGMA main.table_info("collection_versions")']
+        assert len(lookups) == 1
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import Request, Response
+
+from src.api.v1.utils.conditional_requests import (
+    build_etag,
+    build_collection_etag,
+    check_not_modified,
+    format_http_date,
+)
+
+
+def make_request(headers=None, path="/api/v1/warehouses/", query_string=b""):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query_string,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    return Request(scope)
+
+
+class TestConditionalRequests:
+    def test_etag_is_stable_and_changes_with_version(self):
+        entity_id = uuid4()
+        updated_at = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        assert build_etag(entity_id, updated_at) == build_etag(entity_id, updated_at)
+        assert build_etag(entity_id, updated_at) != build_etag(entity_id, updated_at + timedelta(microseconds=1))
+        # Naive timestamps are treated as UTC
+        assert build_etag(entity_id, updated_at) == build_etag(entity_id, updated_at.replace(tzinfo=None))
+
+    def test_collection_etag_depends_on_query(self):
+        updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        first_page = make_request(query_string=b"page=1")
+        second_page = make_request(query_string=b"page=2")
+
+        assert build_collection_etag(first_page, 10, updated_at) != build_collection_etag(second_page, 10, updated_at)
+        assert build_collection_etag(first_page, 10, updated_at) != build_collection_etag(first_page, 11, updated_at)
+
+    def test_matching_if_none_match_returns_304(self):
+        updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        etag = build_etag(uuid4(), updated_at)
+        request = make_request({"If-None-Match": f'"other", {etag}'})
+
+        result = check_not_modified(request, Response(), etag, updated_at)
+
+        assert result is not None
+        assert result.status_code == 304
+        assert result.headers["etag"] == etag
+        assert result.headers["last-modified"] == format_http_date(updated_at)
+
+    def test_stale_if_none_match_sets_validators(self):
+        updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        etag = build_etag(uuid4(), updated_at)
+        request = make_request({"If-None-Match": '"stale"'})
+        response = Response()
+
+        assert check_not_modified(request, response, etag, updated_at) is None
+        assert response.headers["etag"] == etag
+
+    def test_if_none_match_takes_precedence_over_if_modified_since(self):
+        updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        etag = build_etag(uuid4(), updated_at)
+        request = make_request({
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": format_http_date(updated_at + timedelta(days=1)),
+        })
+
+        assert check_not_modified(request, Response(), etag, updated_at) is None
+
+    def test_if_modified_since(self):
+        updated_at = datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+        etag = build_etag(uuid4(), updated_at)
+
+        current = make_request({"If-Modified-Since": format_http_date(updated_at)})
+        outdated = make_request({"If-Modified-Since": format_http_date(updated_at - timedelta(seconds=1))})
+        invalid = make_request({"If-Modified-Since": "not a date"})
+
+        assert check_not_modified(current, Response(), etag, updated_at).status_code == 304
+        assert check_not_modified(outdated, Response(), etag, updated_at) is None
+        assert check_not_modified(invalid, Response(), etag, updated_at) is None
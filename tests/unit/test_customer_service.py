@@ -6,6 +6,8 @@ from src.domain.entities.customer import Customer
 from src.domain.entities.contact_number import ContactNumber
 from src.domain.value_objects.phone_number import PhoneNumber
 from src.application.services.customer_service import CustomerService
+from src.infrastructure.database.models import ContactNumberModel, CustomerModel, VendorModel
+from src.infrastructure.repositories.contact_number_repository_impl import SQLAlchemyContactNumberRepository
 from src.application.use_cases.customer_use_cases import (
     CreateCustomerUseCase,
     GetCustomerUseCase,
@@ -102,6 +104,11 @@ class TestContactNumberEntity:
         assert contact.entity_type == "Customer"
         assert contact.entity_id == sample_customer.id
 
+    def test_reversed_digits_use_international_format(self):
+        """Test that reversed digits are derived from the canonical number"""
+        assert PhoneNumber("555-123-4567").reversed_digits() == "76543215551"
+        assert PhoneNumber("+15551234567").reversed_digits() == "76543215551"
+
     def test_invalid_phone_number(self, sample_customer):
         """Test that invalid phone number raises error"""
         with pytest.raises(ValueError, match="Invalid phone number format"):
@@ -249,6 +256,21 @@ class TestCustomerService:
         assert result == [sample_contact_number]
         mock_contact_repository.find_by_entity.assert_called_once_with("Customer", customer_id)
 
+    @pytest.mark.asyncio
+    async def test_get_contact_numbers_for_customers(self, mock_customer_repository, mock_contact_repository, sample_contact_number):
+        """Test loading contact numbers for a page of customers at once"""
+        customer_ids = [uuid4(), uuid4()]
+        mock_contact_repository.find_by_entities.return_value = {
+            customer_ids[0]: [sample_contact_number], customer_ids[1]: []
+        }
+        
+        service = CustomerService(mock_customer_repository, mock_contact_repository)
+        result = await service.get_contact_numbers_for_customers(customer_ids)
+        
+        assert result[customer_ids[0]] == [sample_contact_number]
+        mock_contact_repository.find_by_entities.assert_called_once_with("Customer", customer_ids)
+        mock_contact_repository.find_by_entity.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_add_contact_numbers(self, mock_customer_repository, mock_contact_repository, sample_contact_number):
         """Test adding contact numbers to customer"""
@@ -267,20 +289,20 @@ class TestCustomerService:
     async def test_replace_contact_numbers(self, mock_customer_repository, mock_contact_repository, sample_contact_number):
         """Test replacing all contact numbers for customer"""
         customer_id = uuid4()
-        contact_numbers = ["+1111111111"]
-        existing_contacts = [sample_contact_number]
+        contact_numbers = ["+1111111111", "not-a-number"]
         
-        mock_contact_repository.find_by_entity.return_value = existing_contacts
-        mock_contact_repository.delete.return_value = True
-        mock_contact_repository.save.return_value = sample_contact_number
+        mock_contact_repository.replace_for_entity.return_value = [sample_contact_number]
         
         service = CustomerService(mock_customer_repository, mock_contact_repository)
         result = await service.add_contact_numbers(customer_id, contact_numbers, replace_all=True)
         
-        # Should delete existing contact
-        mock_contact_repository.delete.assert_called_once()
-        # Should save new contact
-        mock_contact_repository.save.assert_called_once()
+        assert result == [sample_contact_number]
+        # Should apply the whole replacement at once, skipping invalid numbers
+        mock_contact_repository.replace_for_entity.assert_called_once_with(
+            "Customer", customer_id, [PhoneNumber("+1111111111")]
+        )
+        mock_contact_repository.delete.assert_not_called()
+        mock_contact_repository.save.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_remove_contact_number(self, mock_customer_repository, mock_contact_repository, sample_contact_number):
@@ -323,13 +345,10 @@ class TestCustomerService:
         """Test updating customer and replacing contact numbers"""
         customer_id = uuid4()
         new_contacts = ["+5555555555"]
-        existing_contacts = [sample_contact_number]
         
         mock_customer_repository.find_by_id.return_value = sample_customer
         mock_customer_repository.update.return_value = sample_customer
-        mock_contact_repository.find_by_entity.return_value = existing_contacts
-        mock_contact_repository.delete.return_value = True
-        mock_contact_repository.save.return_value = sample_contact_number
+        mock_contact_repository.replace_for_entity.return_value = [sample_contact_number]
         
         service = CustomerService(mock_customer_repository, mock_contact_repository)
         result = await service.update_customer(
@@ -341,5 +360,93 @@ class TestCustomerService:
         assert result == sample_customer
         mock_customer_repository.update.assert_called_once()
         # Should replace contacts
-        mock_contact_repository.delete.assert_called_once()
-        mock_contact_repository.save.assert_called_once()
\ No newline at end of file
+        mock_contact_repository.replace_for_entity.assert_called_once_with(
+            "Customer", customer_id, [PhoneNumber("+5555555555")]
+        )
+
+
+@pytest.mark.unit
+class TestContactNumberRepository:
+    """Test batched contact number loading"""
+
+    @pytest.mark.asyncio
+    async def test_find_by_entities_uses_one_any_query(self):
+        """Test that contact numbers for many entities are loaded with a single ANY(...) query"""
+        from sqlalchemy.dialects import postgresql
+        first, second, missing = uuid4(), uuid4(), uuid4()
+        models = [
+            ContactNumberModel(id=uuid4(), number="+1234567890", entity_type="Customer", entity_id=first, is_active=True),
+            ContactNumberModel(id=uuid4(), number="+1234567891", entity_type="Customer", entity_id=first, is_active=True),
+            ContactNumberModel(id=uuid4(), number="+1987654321", entity_type="Customer", entity_id=second, is_active=True),
+        ]
+        session = Mock()
+        session.execute.return_value.scalars.return_value.all.return_value = models
+
+        repository = SQLAlchemyContactNumberRepository(session)
+        result = await repository.find_by_entities("Customer", [first, second, first, missing])
+
+        session.execute.assert_called_once()
+        statement = session.execute.call_args.args[0]
+        compiled = statement.compile(dialect=postgresql.dialect())
+        assert "= ANY (%(entity_ids)s::UUID[])" in str(compiled)
+        assert compiled.params["entity_ids"] == [first, second, missing]
+        assert [contact.phone_number.number for contact in result[first]] == ["+1234567890", "+1234567891"]
+        assert len(result[second]) == 1
+        assert result[missing] == []
+
+    @pytest.mark.asyncio
+    async def test_find_by_entities_without_ids_skips_query(self):
+        """Test that an empty page does not hit the database"""
+        session = Mock()
+
+        result = await SQLAlchemyContactNumberRepository(session).find_by_entities("Customer", [])
+
+        assert result == {}
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tables", [[ContactNumberModel]])
+    async def test_replace_for_entity_applies_the_difference_in_few_statements(self, session):
+        """Test that replacing contact numbers soft-deletes and inserts in bulk"""
+        repository = SQLAlchemyContactNumberRepository(session)
+        customer_id = uuid4()
+        numbers = [f"+1{index:09d}" for index in range(10)]
+        await repository.replace_for_entity("Customer", customer_id, [PhoneNumber(n) for n in numbers])
+
+        session.statements.clear()
+        replacement = numbers[5:] + numbers[:1] + ["+1999999999"]
+        result = await repository.replace_for_entity("Customer", customer_id, [PhoneNumber(n) for n in replacement])
+
+        assert [contact.phone_number.number for contact in result] == replacement
+        # One select, one bulk soft-delete and one multi-row insert, however many numbers change
+        assert len(session.statements) == 3
+        # A previously removed number comes back by reactivating its row
+        await repository.replace_for_entity("Customer", customer_id, [PhoneNumber(numbers[2])])
+        assert [contact.phone_number.number for contact in await repository.find_by_entity("Customer", customer_id)] == [numbers[2]]
+        assert session.query(ContactNumberModel).count() == 11
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tables", [[ContactNumberModel, CustomerModel, VendorModel]])
+    async def test_find_owners_by_number_matches_last_digits(self, session):
+        """Test caller-ID style lookup of the customer or vendor owning a number"""
+        customer = CustomerModel(id=uuid4(), name="Jane Doe", email="jane@example.com")
+        vendor = VendorModel(id=uuid4(), name="Acme Supplies")
+        session.add_all([customer, vendor])
+        session.commit()
+        repository = SQLAlchemyContactNumberRepository(session)
+        await repository.replace_for_entity("Customer", customer.id, [PhoneNumber("555-123-4567")])
+        await repository.replace_for_entity("Vendor", vendor.id, [PhoneNumber("+15559994567")])
+
+        session.statements.clear()
+        owners = await repository.find_owners_by_number("123-4567")
+
+        assert len(session.statements) == 1
+        assert [(owner.owner_type, owner.owner_name, owner.owner_email) for owner in owners] == [
+            ("Customer", "Jane Doe", "jane@example.com")
+        ]
+        assert {owner.owner_name for owner in await repository.find_owners_by_number("4567")} == {
+            "Jane Doe", "Acme Supplies"
+        }
+        # The stored canonical form matches any spelling of the full number
+        assert (await repository.find_by_number("+1 (555) 123-4567")).entity_id == customer.id
+        assert await repository.search_by_number("no digits") == []
@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+
+from src.application.services.duplicate_detection_service import DuplicateDetectionService
+from src.application.use_cases.customer_use_cases import CreateCustomerUseCase
+from src.domain.services.duplicate_matching import (
+    MatchRecord,
+    PossibleDuplicateError,
+    blocking_keys,
+    name_similarity,
+    score,
+)
+from src.domain.value_objects.phone_number import PhoneNumber
+from src.infrastructure.database.dedupe_keys import rebuild_dedupe_keys
+from src.infrastructure.database.models import ContactNumberModel, CustomerModel, DedupeKeyModel, VendorModel
+from src.infrastructure.repositories.contact_number_repository_impl import SQLAlchemyContactNumberRepository
+from src.infrastructure.repositories.duplicate_candidate_repository_impl import SQLAlchemyDuplicateCandidateRepository
+
+
+@pytest.fixture
+def tables():
+    return [CustomerModel, VendorModel, ContactNumberModel, DedupeKeyModel]
+
+
+def add_customer(session, name, email=None, phone=None):
+    customer = CustomerModel(id=uuid4(), name=name, email=email)
+    session.add(customer)
+    session.commit()
+    if phone:
+        asyncio.run(SQLAlchemyContactNumberRepository(session).replace_for_entity(
+            "Customer", customer.id, [PhoneNumber(phone)]
+        ))
+    return customer
+
+
+def detector(session):
+    return DuplicateDetectionService(SQLAlchemyDuplicateCandidateRepository(session), "Customer")
+
+
+class TestMatchingRules:
+    def test_names_match_regardless_of_order_case_and_legal_form(self):
+        assert name_similarity("Acme Rentals Inc.", "ACME rentals") == 1.0
+        assert name_similarity("Smith, John", "john smith") == 1.0
+        assert name_similarity("John Smith", "Jon Smith") > 0.9
+        assert name_similarity("John Smith", "Mary Jones") < 0.5
+
+    def test_blocking_keys_skip_free_mail_domains(self):
+        assert blocking_keys("Acme Tools", "sales@acme.com") == {"n:acme", "n:tools", "m:sales@acme.com", "d:acme.com"}
+        assert blocking_keys("Jo Li", "jo@gmail.com") == {"m:jo@gmail.com"}
+
+    def test_shared_phone_raises_the_score(self):
+        first = MatchRecord(uuid4(), "Acme", phone_suffixes=frozenset({"7654321"}))
+        second = MatchRecord(uuid4(), "Acme Equipment", phone_suffixes=frozenset({"7654321"}))
+
+        match = score(first, second)
+
+        assert match.score >= 0.85
+        assert match.reasons == ("name", "phone")
+
+
+class TestDedupeKeys:
+    def test_keys_follow_inserts_renames_and_deletes(self, session):
+        customer = add_customer(session, "Jane Doe", "jane@doe.org")
+        keys = lambda: set(session.scalars(select(DedupeKeyModel.key).where(DedupeKeyModel.entity_id == customer.id)))
+
+        assert keys() == {"n:jane", "n:doe", "m:jane@doe.org", "d:doe.org"}
+
+        customer.name = "Jane Roe"
+        session.commit()
+        assert "n:roe" in keys() and "n:doe" not in keys()
+
+        session.delete(customer)
+        session.commit()
+        assert keys() == set()
+
+    def test_rebuild_recomputes_every_key(self, session):
+        add_customer(session, "Jane Doe")
+        session.execute(DedupeKeyModel.__table__.delete())
+        session.commit()
+
+        assert rebuild_dedupe_keys(session) == 1
+        assert session.query(DedupeKeyModel).count() == 2
+
+
+class TestDuplicateDetectionService:
+    def test_finds_likely_matches_in_one_query(self, session):
+        jane_id = add_customer(session, "Jane Doe", "jane@doe.org", phone="555-123-4567").id
+        add_customer(session, "John Smith")
+        statements = []
+        event.listen(session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        matches = asyncio.run(detector(session).find_matches("Doe, Jane", phone_numbers=["+1 555 123 4567"]))
+
+        assert [match.record.entity_id for match in matches] == [jane_id]
+        assert matches[0].reasons == ("name", "phone")
+        assert len(statements) == 1
+
+    def test_common_name_tokens_do_not_block(self, session):
+        jane = add_customer(session, "Jane Rental")
+        for name in ("Acme Rental", "Beta Rental", "Gamma Rental"):
+            add_customer(session, name)
+        repository = SQLAlchemyDuplicateCandidateRepository(session)
+
+        candidates = asyncio.run(repository.find_candidates(
+            "Customer", blocking_keys("Jane Rental", None), set(), max_block_size=3
+        ))
+
+        # "rental" is shared by four customers, so only "jane" selects candidates
+        assert [candidate.entity_id for candidate in candidates] == [jane.id]
+
+    def test_unrelated_names_are_not_matches(self, session):
+        add_customer(session, "Jane Doe")
+
+        assert asyncio.run(detector(session).find_matches("Mary Jones")) == []
+
+    def test_finds_duplicate_clusters(self, session):
+        first = add_customer(session, "Acme Tools Rental", phone="555-000-1111")
+        second = add_customer(session, "ACME tools")
+        third = add_customer(session, "Acme Tool Rentals", phone="+15550001111")
+        add_customer(session, "Beta Supplies")
+
+        clusters = asyncio.run(detector(session).find_clusters())
+
+        assert [{record.entity_id for record in cluster} for cluster in clusters] == [
+            {first.id, second.id, third.id}
+        ]
+
+
+class TestCreateCustomerDuplicateCheck:
+    def test_likely_duplicate_is_rejected_unless_allowed(self, session):
+        add_customer(session, "Jane Doe", "jane@doe.org")
+        repository = Mock()
+        repository.exists_by_email = AsyncMock(return_value=False)
+        repository.save = AsyncMock(side_effect=lambda customer: customer)
+        use_case = CreateCustomerUseCase(repository, detector(session))
+
+        with pytest.raises(PossibleDuplicateError) as error:
+            asyncio.run(use_case.execute("Jane  DOE"))
+        assert error.value.matches[0].record.name == "Jane Doe"
+
+        created = asyncio.run(use_case.execute("Jane  DOE", allow_duplicates=True))
+        assert created.name == "Jane  DOE"
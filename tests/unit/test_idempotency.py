@@ -0,0 +1,149 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import sessionmaker
+
+from src.api.v1.utils.idempotency import idempotent
+from src.infrastructure.database.idempotency import IdempotencyStore
+from src.infrastructure.database.models import IdempotencyKeyModel
+
+
+class Order(BaseModel):
+    quantity: int
+
+
+@pytest.fixture
+def tables():
+    return [IdempotencyKeyModel]
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    # The store is called from the threadpool, so every thread needs its own connection
+    return f"sqlite:///{tmp_path / 'idempotency.db'}"
+
+
+@pytest.fixture
+def store(engine):
+    return IdempotencyStore(session_factory=sessionmaker(bind=engine))
+
+
+@pytest.fixture
+def short_lease_store(store):
+    return IdempotencyStore(lease_seconds=0, session_factory=store.session_factory)
+
+
+@pytest.fixture
+def app(store):
+    app = FastAPI()
+    app.state.calls = []
+
+    @app.post("/orders", status_code=201)
+    @idempotent(status_code=201, store=store, wait_seconds=2)
+    async def create_order(order: Order):
+        app.state.calls.append(order.quantity)
+        await asyncio.sleep(0.05)
+        if order.quantity < 0:
+            raise HTTPException(status_code=400, detail="Quantity must be positive")
+        if order.quantity == 0:
+            raise HTTPException(status_code=500, detail="Failed to create order")
+        return {"number": len(app.state.calls), "quantity": order.quantity}
+
+    return app
+
+
+async def post_all(app, *requests):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.post("/orders", json={"quantity": quantity}, headers={"Idempotency-Key": key} if key else {})
+            for key, quantity in requests
+        ))
+
+
+class TestIdempotentEndpoint:
+    def test_retry_replays_the_stored_response(self, app):
+        first, = asyncio.run(post_all(app, ("k1", 3)))
+        retry, = asyncio.run(post_all(app, ("k1", 3)))
+
+        assert app.state.calls == [3]
+        assert retry.status_code == first.status_code == 201
+        assert retry.json() == first.json() == {"number": 1, "quantity": 3}
+        assert retry.headers["idempotent-replayed"] == "true"
+
+    def test_concurrent_duplicates_wait_for_the_first_request(self, app):
+        responses = asyncio.run(post_all(app, *[("k1", 3)] * 4))
+
+        assert app.state.calls == [3]
+        assert {r.status_code for r in responses} == {201}
+        assert {r.json()["number"] for r in responses} == {1}
+
+    def test_key_reused_for_another_request_is_rejected(self, app):
+        asyncio.run(post_all(app, ("k1", 3)))
+        reused, = asyncio.run(post_all(app, ("k1", 4)))
+
+        assert reused.status_code == 422
+        assert app.state.calls == [3]
+
+    def test_client_errors_are_replayed_and_server_errors_released(self, app):
+        asyncio.run(post_all(app, ("bad", -1), ("bad", -1)))
+        asyncio.run(post_all(app, ("boom", 0)))
+        retried, = asyncio.run(post_all(app, ("boom", 0)))
+
+        assert app.state.calls == [-1, 0, 0]
+        assert retried.status_code == 500
+
+    def test_requests_without_a_key_always_run(self, app):
+        asyncio.run(post_all(app, (None, 3), (None, 3)))
+
+        assert app.state.calls == [3, 3]
+
+    def test_slow_requests_keep_their_key_past_the_lease(self, store):
+        short_lease = IdempotencyStore(lease_seconds=0.15, session_factory=store.session_factory)
+        app = FastAPI()
+        app.state.calls = []
+
+        @app.post("/orders", status_code=201)
+        @idempotent(status_code=201, store=short_lease, wait_seconds=2)
+        async def create_order(order: Order):
+            app.state.calls.append(order.quantity)
+            await asyncio.sleep(0.5)
+            return {"number": len(app.state.calls)}
+
+        async def first_then_retry():
+            first = asyncio.ensure_future(post_all(app, ("k1", 3)))
+            # The retry arrives after the first request's initial lease ran out
+            await asyncio.sleep(0.3)
+            retry = await post_all(app, ("k1", 3))
+            return await first + retry
+
+        responses = asyncio.run(first_then_retry())
+
+        assert app.state.calls == [3]
+        assert [r.json()["number"] for r in responses] == [1, 1]
+
+
+class TestIdempotencyStore:
+    def test_renewed_claim_is_not_taken_over(self, store):
+        assert store.begin("POST /orders", "k1", "f1") is None
+        assert store.renew("POST /orders", "k1")
+        store.complete("POST /orders", "k1", 201, {"number": 1})
+
+        # Nothing left to renew once the response is stored
+        assert not store.renew("POST /orders", "k1")
+
+    def test_abandoned_claim_is_taken_over_after_its_lease(self, short_lease_store):
+        assert short_lease_store.begin("POST /orders", "k1", "f1") is None
+        # The first owner never finished; its lease has already run out
+        assert short_lease_store.begin("POST /orders", "k1", "f1") is None
+
+    def test_stored_response_outlives_the_lease(self, short_lease_store):
+        short_lease_store.begin("POST /orders", "k1", "f1")
+        short_lease_store.complete("POST /orders", "k1", 201, {"number": 1})
+
+        stored = short_lease_store.begin("POST /orders", "k1", "f1")
+
+        assert (stored.status_code, stored.body) == (201, {"number": 1})
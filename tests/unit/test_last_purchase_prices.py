@@ -0,0 +1,128 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.application.use_cases.purchase_order_use_cases import (
+    CancelPurchaseOrderUseCase,
+    GetLastPurchasePricesUseCase,
+)
+from src.domain.entities.purchase_order import PurchaseOrder
+from src.domain.entities.purchase_order_line_item import PurchaseOrderLineItem
+from src.infrastructure.database.last_prices import rebuild_last_prices
+from src.infrastructure.database.models import (
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    VendorModel,
+    VendorMonthlyRollupModel,
+)
+from src.infrastructure.repositories.purchase_order_line_item_repository_impl import SQLAlchemyPurchaseOrderLineItemRepository
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+
+
+VENDOR_A = uuid4()
+VENDOR_B = uuid4()
+ITEMS = [uuid4() for _ in range(3)]
+WAREHOUSE = uuid4()
+
+
+@pytest.fixture
+def tables():
+    return [
+        VendorModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+    ]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+_clock = [datetime(2025, 7, 1, 9, 0)]
+
+
+def create(session, number, vendor_id, order_date, prices):
+    """Create an order with one line per ``(item_id, unit_price)``."""
+    _clock[0] += timedelta(minutes=1)
+    order = PurchaseOrder(order_number=number, vendor_id=vendor_id, order_date=order_date, created_at=_clock[0])
+    lines = [
+        PurchaseOrderLineItem(
+            purchase_order_id=order.id,
+            inventory_item_master_id=item_id,
+            warehouse_id=WAREHOUSE,
+            quantity=1,
+            unit_price=Decimal(unit_price),
+            tax_amount=Decimal("0.50"),
+        )
+        for item_id, unit_price in prices
+    ]
+    return run(SQLAlchemyPurchaseOrderRepository(session).save_with_line_items(order, lines))
+
+
+def last_prices(session, vendor_id=None):
+    return {
+        (price.inventory_item_master_id, price.vendor_id): price.unit_price
+        for price in run(SQLAlchemyPurchaseOrderLineItemRepository(session).find_last_prices(ITEMS, vendor_id))
+    }
+
+
+class TestLastPurchasePrices:
+    def test_latest_order_wins_per_vendor(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 7, 1), [(ITEMS[0], "10.00"), (ITEMS[1], "20.00")])
+        create(session, "PO-2", VENDOR_A, date(2025, 7, 5), [(ITEMS[0], "11.00")])
+        # Entered later but dated earlier, so it does not replace the 11.00
+        create(session, "PO-3", VENDOR_A, date(2025, 7, 3), [(ITEMS[0], "9.00"), (ITEMS[1], "19.00")])
+        create(session, "PO-4", VENDOR_B, date(2025, 6, 1), [(ITEMS[0], "12.00")])
+
+        assert last_prices(session) == {
+            (ITEMS[0], VENDOR_A): Decimal("11.00"),
+            (ITEMS[1], VENDOR_A): Decimal("19.00"),
+            (ITEMS[0], VENDOR_B): Decimal("12.00"),
+        }
+        assert last_prices(session, VENDOR_B) == {(ITEMS[0], VENDOR_B): Decimal("12.00")}
+
+    def test_batch_lookup_is_one_statement(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 7, 1), [(item_id, "10.00") for item_id in ITEMS])
+        session.statements.clear()
+
+        prices = run(GetLastPurchasePricesUseCase(SQLAlchemyPurchaseOrderLineItemRepository(session)).execute(
+            ITEMS + [uuid4() for _ in range(300)], VENDOR_A
+        ))
+
+        assert {price.inventory_item_master_id for price in prices} == set(ITEMS)
+        assert prices[0].tax_amount == Decimal("0.50")
+        assert len(session.statements) == 1
+        assert "purchase_order_line_items" not in session.statements[0]
+
+    def test_cancel_and_line_edits_fall_back_and_match_rebuild(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 7, 1), [(ITEMS[0], "10.00"), (ITEMS[1], "20.00")])
+        latest = create(session, "PO-2", VENDOR_A, date(2025, 7, 5), [(ITEMS[0], "11.00")])
+        edited = create(session, "PO-3", VENDOR_A, date(2025, 7, 9), [(ITEMS[1], "21.00")])
+
+        run(CancelPurchaseOrderUseCase(SQLAlchemyPurchaseOrderRepository(session)).execute(latest.id))
+        line = session.scalars(select(PurchaseOrderLineItemModel).where(
+            PurchaseOrderLineItemModel.purchase_order_id == edited.id
+        )).one()
+        line.unit_price = Decimal("22.00")
+        session.commit()
+        incremental = last_prices(session)
+
+        rebuild_last_prices(session)
+
+        assert incremental == last_prices(session) == {
+            (ITEMS[0], VENDOR_A): Decimal("10.00"),
+            (ITEMS[1], VENDOR_A): Decimal("22.00"),
+        }
+
+    def test_lookup_requires_items(self, session):
+        use_case = GetLastPurchasePricesUseCase(SQLAlchemyPurchaseOrderLineItemRepository(session))
+
+        with pytest.raises(ValueError):
+            run(use_case.execute([]))
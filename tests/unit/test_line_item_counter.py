@@ -0,0 +1,118 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+
+from src.infrastructure.database.line_item_counter import (
+    find_line_items_count_mismatches,
+    rebuild_line_items_counts,
+)
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    StockBalanceModel,
+    TrackingType,
+)
+
+
+@pytest.fixture
+def tables():
+    return [
+        InventoryItemMasterModel,
+        LineItemModel,
+        InventoryItemStockMovementModel,
+        StockBalanceModel,
+    ]
+
+
+def make_master(session, name):
+    master = InventoryItemMasterModel(
+        name=name,
+        sku=name.upper(),
+        item_sub_category_id=uuid4(),
+        unit_of_measurement_id=uuid4(),
+        tracking_type=TrackingType.BULK,
+    )
+    session.add(master)
+    session.commit()
+    return master
+
+
+def add_line_item(session, master):
+    line_item = LineItemModel(inventory_item_master_id=master.id, warehouse_id=uuid4(), quantity=1)
+    session.add(line_item)
+    return line_item
+
+
+class TestLineItemCounter:
+    def test_counts_created_line_items(self, session):
+        master = make_master(session, "drill")
+        add_line_item(session, master)
+        add_line_item(session, master)
+        session.commit()
+
+        assert master.line_items_count == 2
+
+    def test_deactivate_and_reactivate(self, session):
+        master = make_master(session, "drill")
+        line_item = add_line_item(session, master)
+        session.commit()
+
+        line_item.is_active = False
+        session.commit()
+        assert master.line_items_count == 0
+
+        line_item.is_active = True
+        session.commit()
+        assert master.line_items_count == 1
+
+    def test_delete_only_counts_active_line_items(self, session):
+        master = make_master(session, "drill")
+        active = add_line_item(session, master)
+        inactive = add_line_item(session, master)
+        session.commit()
+        inactive.is_active = False
+        session.commit()
+
+        session.delete(inactive)
+        session.commit()
+        assert master.line_items_count == 1
+
+        session.delete(active)
+        session.commit()
+        assert master.line_items_count == 0
+
+    def test_moving_line_item_between_masters(self, session):
+        drill = make_master(session, "drill")
+        saw = make_master(session, "saw")
+        line_item = add_line_item(session, drill)
+        session.commit()
+
+        line_item.inventory_item_master_id = saw.id
+        session.commit()
+
+        assert (drill.line_items_count, saw.line_items_count) == (0, 1)
+
+    def test_rollback_discards_pending_changes(self, session):
+        master = make_master(session, "drill")
+        add_line_item(session, master)
+        session.flush()
+        session.rollback()
+
+        add_line_item(session, master)
+        session.commit()
+
+        assert master.line_items_count == 1
+
+    def test_consistency_check_and_rebuild(self, session):
+        master = make_master(session, "drill")
+        add_line_item(session, master)
+        session.commit()
+        session.execute(update(InventoryItemMasterModel).values(line_items_count=5))
+        session.commit()
+
+        assert find_line_items_count_mismatches(session) == [(master.id, 5, 1)]
+        assert rebuild_line_items_counts(session) == 1
+        assert find_line_items_count_mismatches(session) == []
+        assert master.line_items_count == 1
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.cache.lookup_name_cache import LookupNameCache
+from src.infrastructure.database.models import (
+    ItemCategoryModel,
+    ItemSubCategoryModel,
+    UnitOfMeasurementModel,
+    ItemPackagingModel,
+)
+
+
+@pytest.fixture
+def tables():
+    return [ItemCategoryModel, ItemSubCategoryModel, UnitOfMeasurementModel, ItemPackagingModel]
+
+
+@pytest.fixture
+def item(session):
+    """An item referencing one row of each lookup table; ``session.statements`` starts empty."""
+    tools = ItemCategoryModel(name="Tools", abbreviation="TOOLS")
+    drills = ItemSubCategoryModel(name="Drills", abbreviation="DRILLS", item_category=tools)
+    piece = UnitOfMeasurementModel(name="Piece", abbreviation="PC")
+    box = ItemPackagingModel(name="Box", label="BOX", unit="PC")
+    session.add_all([tools, drills, piece, box])
+    session.commit()
+    item = SimpleNamespace(item_sub_category_id=drills.id, unit_of_measurement_id=piece.id, packaging_id=box.id)
+    session.statements.clear()
+    return item
+
+
+class TestLookupNameCache:
+    def test_resolves_names_for_items(self, session, item):
+        cache = LookupNameCache()
+
+        names = cache.inventory_names(session, [item]).for_item(
+            item.item_sub_category_id, item.unit_of_measurement_id, item.packaging_id
+        )
+
+        assert names == {
+            "item_category_name": "Tools",
+            "item_sub_category_name": "Drills",
+            "unit_of_measurement_name": "Piece",
+            "packaging_name": "BOX",
+        }
+
+    def test_maps_are_reused_until_invalidated(self, session, item):
+        cache = LookupNameCache()
+
+        cache.inventory_names(session, [item])
+        cache.inventory_names(session, [item])
+        assert len(session.statements) == 4
+
+        cache.invalidate(UnitOfMeasurementModel.__tablename__)
+        cache.inventory_names(session, [item])
+        assert len(session.statements) == 5
+
+    def test_unknown_id_triggers_reload(self, session, item):
+        cache = LookupNameCache()
+        cache.get_map(session, UnitOfMeasurementModel.__tablename__)
+
+        cache.get_map(session, UnitOfMeasurementModel.__tablename__, [uuid4()])
+
+        assert len(session.statements) == 2
+
+    def test_expired_maps_are_reloaded(self, session, item):
+        cache = LookupNameCache(ttl_seconds=0)
+
+        cache.get_map(session, ItemPackagingModel.__tablename__)
+        cache.get_map(session, ItemPackagingModel.__tablename__)
+
+        assert len(session.statements) == 2
+
+    def test_missing_references_resolve_to_none(self, session, item):
+        cache = LookupNameCache()
+
+        names = cache.inventory_names(session, [item]).for_item(uuid4(), uuid4(), None)
+
+        assert set(names.values()) == {None}
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    MovementType,
+    StockBalanceModel,
+    StockSnapshotModel,
+)
+from src.infrastructure.database.movement_partitions import (
+    detach_movement_partitions,
+    ensure_movement_partitions,
+    next_month,
+    partition_name,
+)
+
+
+@pytest.fixture
+def tables():
+    return [
+        InventoryItemMasterModel,
+        LineItemModel,
+        InventoryItemStockMovementModel,
+        StockBalanceModel,
+        StockSnapshotModel,
+    ]
+
+
+class TestMovementPartitions:
+    def test_postgresql_table_is_partitioned_with_brin_index(self):
+        table = InventoryItemStockMovementModel.__table__
+        ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+        indexes = {index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect())) for index in table.indexes}
+
+        assert "PARTITION BY RANGE (created_at)" in ddl
+        assert "PRIMARY KEY (id, created_at)" in ddl
+        assert "USING brin (created_at)" in indexes["ix_inventory_movements_created_at"]
+        assert "(inventory_item_id)" in indexes["ix_inventory_movements_inventory_item_id"]
+
+    def test_partition_names_follow_the_months(self):
+        assert partition_name(date(2025, 7, 1)) == "inventory_item_stock_movements_p202507"
+        assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+        assert partition_name(date(2025, 12, 1)) < partition_name(date(2026, 1, 1))
+
+    def test_plain_table_elsewhere_keeps_id_identity(self, session):
+        line = LineItemModel(inventory_item_master_id=uuid4(), warehouse_id=uuid4())
+        session.add(line)
+        session.flush()
+        movement = InventoryItemStockMovementModel(
+            inventory_item_id=line.id, movement_type=MovementType.PURCHASE, inventory_transaction_id="T-1",
+            quantity=1, quantity_on_hand_before=0, quantity_on_hand_after=1,
+        )
+        session.add(movement)
+        session.commit()
+
+        assert session.get(InventoryItemStockMovementModel, movement.id) is movement
+        assert movement.created_at is not None
+        assert ensure_movement_partitions(session.connection()) == []
+
+    def test_detaching_keeps_the_months_stock_history_replays(self, session):
+        with pytest.raises(ValueError, match="no stock snapshot"):
+            detach_movement_partitions(session.connection(), date(2025, 1, 1))
+
+        session.execute(insert(StockSnapshotModel).values(taken_at=datetime(2025, 3, 15, tzinfo=timezone.utc)))
+
+        with pytest.raises(ValueError, match="before 2025-03"):
+            detach_movement_partitions(session.connection(), date(2025, 4, 1))
+        assert detach_movement_partitions(session.connection(), date(2025, 3, 1)) == []
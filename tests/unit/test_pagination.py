@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.infrastructure.cache.reference_data_cache import reference_data_cache
+from src.infrastructure.database.models import WarehouseModel
+from src.infrastructure.database.pagination import (
+    NEXT,
+    SeekPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+from src.infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
+
+
+paginator = SeekPaginator(
+    WarehouseModel,
+    sortable={
+        "name": WarehouseModel.name,
+        "label": WarehouseModel.label,
+        "created_at": WarehouseModel.created_at,
+    },
+    default_ordering="-created_at",
+)
+
+
+@pytest.fixture
+def tables():
+    return [WarehouseModel]
+
+
+@pytest.fixture
+def session(session):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # Duplicate names make the id tie-breaker matter
+    for i in range(7):
+        session.add(WarehouseModel(
+            name=f"Warehouse {i // 2}",
+            label=f"WH{i}",
+            created_at=start + timedelta(days=i),
+        ))
+    session.commit()
+    return session
+
+
+def walk_forward(session, ordering, page_size):
+    pages, cursor = [], None
+    while True:
+        page = paginator.paginate(session, select(WarehouseModel), ordering, page_size, cursor)
+        pages.append(page)
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+
+class TestCursorEncoding:
+    def test_round_trip(self):
+        cursor = encode_cursor("-name", "Main", "6f1c2f9e-6f0a-4a8e-9a53-0d8f3c4b1a2e", NEXT)
+
+        position = decode_cursor(cursor)
+
+        assert position.ordering == "-name"
+        assert position.value == "Main"
+        assert str(position.id) == "6f1c2f9e-6f0a-4a8e-9a53-0d8f3c4b1a2e"
+        assert position.direction == NEXT
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!"])
+    def test_rejects_garbage(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestSeekPaginator:
+    @pytest.mark.parametrize("ordering", ["name", "-name", "label", "-created_at", "created_at"])
+    def test_pages_cover_every_row_once_in_sql_order(self, session, ordering):
+        pages = walk_forward(session, ordering, page_size=3)
+
+        seen = [row.label for page in pages for row in page.items]
+        column = paginator.sortable[ordering.lstrip("-")]
+        expected_order = select(WarehouseModel.label).order_by(
+            column.desc() if ordering.startswith("-") else column.asc(),
+            WarehouseModel.id.desc() if ordering.startswith("-") else WarehouseModel.id.asc(),
+        )
+        assert seen == list(session.execute(expected_order).scalars())
+        assert [len(page.items) for page in pages] == [3, 3, 1]
+        assert all(page.total == 7 for page in pages)
+
+    def test_previous_cursor_returns_preceding_page(self, session):
+        first, second, _ = walk_forward(session, "name", page_size=3)
+
+        previous = paginator.paginate(session, select(WarehouseModel), "name", 3, second.previous_cursor)
+
+        assert [row.id for row in previous.items] == [row.id for row in first.items]
+        assert not previous.has_previous
+        assert previous.has_next
+
+    def test_first_page_has_no_previous_link(self, session):
+        page = paginator.paginate(session, select(WarehouseModel), "name", 3)
+
+        assert page.previous_cursor is None
+        assert page.next_cursor is not None
+
+    def test_page_number_still_supported(self, session):
+        by_cursor = walk_forward(session, "label", page_size=3)
+
+        by_number = paginator.paginate(session, select(WarehouseModel), "label", 3, page=2)
+
+        assert [row.id for row in by_number.items] == [row.id for row in by_cursor[1].items]
+        assert by_number.has_previous
+
+    def test_unknown_ordering_falls_back_to_default(self, session):
+        page = paginator.paginate(session, select(WarehouseModel), "remarks", 10)
+
+        assert [row.label for row in page.items] == [f"WH{i}" for i in reversed(range(7))]
+
+    def test_cursor_for_other_ordering_is_rejected(self, session):
+        page = paginator.paginate(session, select(WarehouseModel), "name", 3)
+
+        with pytest.raises(ValueError):
+            paginator.paginate(session, select(WarehouseModel), "label", 3, page.next_cursor)
+
+    def test_count_respects_filters(self, session):
+        stmt = select(WarehouseModel).where(WarehouseModel.name == "Warehouse 0")
+
+        page = paginator.paginate(session, stmt, "name", 1)
+
+        assert page.total == 2
+        assert page.has_next
+
+    def test_only_unfiltered_totals_are_cached(self, session):
+        reference_data_cache.clear()
+        repository = WarehouseRepositoryImpl(session)
+        cached = lambda: reference_data_cache.stats()["namespaces"].get("warehouses", {}).get("size", 0)
+
+        for search in ("Warehouse 0", "WH1", "no match"):
+            asyncio.run(repository.get_page(page_size=2, search=search))
+        assert cached() == 0
+
+        assert asyncio.run(repository.get_page(page_size=2)).total == 7
+        assert cached() == 1
+        reference_data_cache.clear()
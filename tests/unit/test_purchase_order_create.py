@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.application.use_cases.purchase_order_use_cases import CreatePurchaseOrderUseCase
+from src.infrastructure.database.models import (
+    DedupeKeyModel,
+    InventoryItemMasterModel,
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    TrackingType,
+    VendorModel,
+    VendorMonthlyRollupModel,
+    WarehouseModel,
+)
+from src.infrastructure.repositories.inventory_item_master_repository_impl import SQLAlchemyInventoryItemMasterRepository
+from src.infrastructure.repositories.purchase_order_line_item_repository_impl import SQLAlchemyPurchaseOrderLineItemRepository
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+from src.infrastructure.repositories.vendor_repository_impl import SQLAlchemyVendorRepository
+from src.infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
+
+
+@pytest.fixture
+def tables():
+    return [
+        VendorModel,
+        DedupeKeyModel,
+        WarehouseModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+        InventoryItemMasterModel,
+    ]
+
+
+@pytest.fixture
+def refs(session):
+    vendor = VendorModel(id=uuid4(), name="Acme")
+    warehouse = WarehouseModel(id=uuid4(), name="Main", label="MAIN")
+    items = [
+        InventoryItemMasterModel(
+            id=uuid4(),
+            name=f"Item {index}",
+            sku=f"SKU{index}",
+            item_sub_category_id=uuid4(),
+            unit_of_measurement_id=uuid4(),
+            tracking_type=TrackingType.BULK,
+        )
+        for index in range(3)
+    ]
+    session.add_all([vendor, warehouse, *items])
+    session.commit()
+    return vendor.id, warehouse.id, [item.id for item in items]
+
+
+def use_case(session):
+    return CreatePurchaseOrderUseCase(
+        SQLAlchemyPurchaseOrderRepository(session),
+        SQLAlchemyPurchaseOrderLineItemRepository(session),
+        SQLAlchemyVendorRepository(session),
+        SQLAlchemyInventoryItemMasterRepository(session),
+        WarehouseRepositoryImpl(session),
+    )
+
+
+def create(session, vendor_id, lines):
+    return asyncio.run(use_case(session).execute(vendor_id=vendor_id, order_date=date(2025, 7, 1), items=lines))
+
+
+def lines(warehouse_id, item_ids, count):
+    return [
+        {
+            "inventory_item_master_id": item_ids[index % len(item_ids)],
+            "warehouse_id": warehouse_id,
+            "quantity": 2,
+            "unit_price": "10.00",
+            "discount": "1.00",
+            "tax_amount": "0.50",
+        }
+        for index in range(count)
+    ]
+
+
+class TestCreatePurchaseOrder:
+    def test_saves_order_lines_and_totals(self, session, refs):
+        vendor_id, warehouse_id, item_ids = refs
+
+        order = create(session, vendor_id, lines(warehouse_id, item_ids, 4))
+
+        assert order.total_amount == Decimal("76.00")
+        assert order.total_tax_amount == Decimal("2.00")
+        assert order.total_discount == Decimal("4.00")
+        assert order.grand_total == Decimal("74.00")
+        stored = session.get(PurchaseOrderModel, order.id)
+        assert Decimal(str(stored.grand_total)) == Decimal("74.00")
+        assert session.scalar(select(func.count(PurchaseOrderLineItemModel.id))) == 4
+
+    def test_statement_count_does_not_grow_with_lines(self, session, refs):
+        vendor_id, warehouse_id, item_ids = refs
+
+        session.statements.clear()
+        create(session, vendor_id, lines(warehouse_id, item_ids, 2))
+        small = len(session.statements)
+
+        session.statements.clear()
+        create(session, vendor_id, lines(warehouse_id, item_ids, 40))
+
+        assert len(session.statements) == small
+
+    def test_unknown_references_are_rejected_before_writing(self, session, refs):
+        vendor_id, warehouse_id, item_ids = refs
+        missing_item, missing_warehouse = uuid4(), uuid4()
+
+        with pytest.raises(ValueError, match=str(missing_item)):
+            create(session, vendor_id, lines(warehouse_id, item_ids + [missing_item], 4))
+        with pytest.raises(ValueError, match=str(missing_warehouse)):
+            create(session, vendor_id, lines(missing_warehouse, item_ids, 1))
+
+        assert session.scalar(select(func.count(PurchaseOrderModel.id))) == 0
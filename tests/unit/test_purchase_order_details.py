@@ -0,0 +1,91 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.api.v1.endpoints.purchase_orders import purchase_order_details_to_response_schema
+from src.application.use_cases.purchase_order_use_cases import GetPurchaseOrderDetailsUseCase
+from src.infrastructure.database.models import (
+    DedupeKeyModel,
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    PurchaseOrderStatus,
+    VendorModel,
+    VendorMonthlyRollupModel,
+)
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+
+
+@pytest.fixture
+def tables():
+    return [
+        VendorModel,
+        DedupeKeyModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+    ]
+
+
+@pytest.fixture
+def purchase_order_id(session):
+    vendor = VendorModel(id=uuid4(), name="Acme")
+    order = PurchaseOrderModel(
+        id=uuid4(),
+        order_number="PO-1",
+        vendor_id=vendor.id,
+        order_date=date(2025, 7, 1),
+        status=PurchaseOrderStatus.PARTIAL_RECEIVED,
+    )
+    order.line_items = [
+        PurchaseOrderLineItemModel(
+            inventory_item_master_id=uuid4(),
+            warehouse_id=uuid4(),
+            quantity=quantity,
+            received_quantity=received,
+            unit_price=Decimal("10.00"),
+        )
+        for quantity, received in [(2, 2), (3, 1), (4, 0)]
+    ]
+    session.add_all([vendor, order])
+    session.commit()
+    order_id = order.id
+    session.expunge_all()
+    return order_id
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestPurchaseOrderDetails:
+    def test_order_vendor_and_lines_in_one_query(self, session, purchase_order_id):
+        session.statements.clear()
+
+        details = run(SQLAlchemyPurchaseOrderRepository(session).find_details(purchase_order_id))
+
+        assert len(session.statements) == 1
+        assert details.purchase_order.order_number == "PO-1"
+        assert details.vendor_name == "Acme"
+        assert sorted(item.quantity for item in details.line_items) == [2, 3, 4]
+        assert (details.total_items, details.items_received, details.items_pending) == (3, 1, 2)
+
+    def test_feeds_the_detail_response_schema(self, session, purchase_order_id):
+        details = run(SQLAlchemyPurchaseOrderRepository(session).find_details(purchase_order_id))
+
+        response = purchase_order_details_to_response_schema(details)
+
+        assert response.id == purchase_order_id
+        assert response.vendor_name == "Acme"
+        assert response.items_pending == 2
+        assert sorted(item.remaining_quantity for item in response.line_items) == [0, 2, 4]
+
+    def test_missing_order_is_rejected(self, session):
+        use_case = GetPurchaseOrderDetailsUseCase(SQLAlchemyPurchaseOrderRepository(session))
+
+        with pytest.raises(ValueError):
+            run(use_case.execute(uuid4()))
@@ -0,0 +1,165 @@
+import asyncio
+import csv
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.application.use_cases.purchase_order_use_cases import ImportPurchaseOrdersUseCase
+from src.infrastructure.database.models import (
+    DedupeKeyModel,
+    InventoryItemMasterModel,
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    TrackingType,
+    VendorModel,
+    VendorMonthlyRollupModel,
+    WarehouseModel,
+)
+from src.infrastructure.repositories.inventory_item_master_repository_impl import SQLAlchemyInventoryItemMasterRepository
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+from src.infrastructure.repositories.vendor_repository_impl import SQLAlchemyVendorRepository
+from src.infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
+
+
+@pytest.fixture
+def tables():
+    return [
+        VendorModel,
+        DedupeKeyModel,
+        WarehouseModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+        InventoryItemMasterModel,
+    ]
+
+
+@pytest.fixture
+def refs(session):
+    vendor = VendorModel(id=uuid4(), name="Acme")
+    warehouse = WarehouseModel(id=uuid4(), name="Main", label="MAIN")
+    items = [
+        InventoryItemMasterModel(
+            id=uuid4(),
+            name=f"Item {index}",
+            sku=f"SKU{index}",
+            item_sub_category_id=uuid4(),
+            unit_of_measurement_id=uuid4(),
+            tracking_type=TrackingType.BULK,
+        )
+        for index in range(2)
+    ]
+    session.add_all([vendor, warehouse, *items])
+    session.commit()
+    return str(vendor.id), str(warehouse.id), [str(item.id) for item in items]
+
+
+def import_rows(session, rows, batch_size=500):
+    use_case = ImportPurchaseOrdersUseCase(
+        SQLAlchemyPurchaseOrderRepository(session),
+        SQLAlchemyVendorRepository(session),
+        SQLAlchemyInventoryItemMasterRepository(session),
+        WarehouseRepositoryImpl(session),
+        batch_size=batch_size,
+    )
+    return asyncio.run(use_case.execute(iter(rows)))
+
+
+def row(reference, refs, item_index=0, **overrides):
+    vendor_id, warehouse_id, item_ids = refs
+    values = {
+        "order_reference": reference,
+        "vendor_id": vendor_id,
+        "order_date": "2024-03-01",
+        "inventory_item_master_id": item_ids[item_index],
+        "warehouse_id": warehouse_id,
+        "quantity": "2",
+        "unit_price": "10.00",
+        "discount": "1.00",
+        "tax_amount": "",
+        "status": "",
+    }
+    values.update(overrides)
+    return values
+
+
+class TestImportPurchaseOrders:
+    def test_groups_rows_into_orders_with_totals(self, session, refs):
+        result = import_rows(session, [
+            row("L-1", refs),
+            row("L-1", refs, item_index=1, unit_price="5.00", tax_amount="0.50"),
+            row("L-2", refs, status="received"),
+        ])
+
+        assert (result.orders_imported, result.line_items_imported, result.errors) == (2, 3, [])
+        orders = {po.reference_number: po for po in session.scalars(select(PurchaseOrderModel))}
+        assert [orders["L-1"].order_number, orders["L-2"].order_number] == ["PUR-000001", "PUR-000002"]
+        assert Decimal(str(orders["L-1"].grand_total)) == Decimal("26.50")
+        assert orders["L-2"].status.value == "RECEIVED"
+        assert session.scalar(select(func.sum(VendorMonthlyRollupModel.order_count))) == 2
+        assert session.scalar(select(func.count()).select_from(LastPurchasePriceModel)) == 2
+
+    def test_invalid_rows_skip_only_their_order(self, session, refs):
+        import_rows(session, [row("L-1", refs)])
+
+        result = import_rows(session, [
+            row("L-1", refs),
+            row("L-2", refs, quantity="0"),
+            row("L-2", refs, inventory_item_master_id=str(uuid4())),
+            row("L-3", refs),
+            row("L-4", refs, order_date="03/01/2024"),
+            row("L-3", refs),
+            row("L-5", refs),
+        ], batch_size=2)
+
+        assert result.orders_imported == 2
+        assert result.orders_skipped == 4
+        assert [(error.row, error.order_reference) for error in result.errors] == [
+            (2, "L-1"), (3, "L-2"), (4, "L-2"), (6, "L-4"), (7, "L-3"), (7, "L-3"),
+        ]
+        assert "already imported" in result.errors[0].message
+        assert "consecutive" in result.errors[-2].message
+        assert session.scalar(select(func.count()).select_from(PurchaseOrderModel)) == 3
+
+    def test_rows_after_an_invalid_first_row_are_not_blamed_for_it(self, session, refs):
+        result = import_rows(session, [
+            row("L-1", refs, vendor_id="not-a-uuid"),
+            row("L-1", refs, vendor_id="not-a-uuid"),
+            row("L-1", refs, vendor_id="not-a-uuid", item_index=1),
+        ])
+
+        assert result.orders_skipped == 1
+        assert [error.row for error in result.errors] == [2]
+        assert "vendor_id" in result.errors[0].message
+
+    def test_statement_count_does_not_grow_with_orders(self, session, refs):
+        session.statements.clear()
+        import_rows(session, [row(f"A-{index}", refs) for index in range(2)])
+        small = len(session.statements)
+
+        session.statements.clear()
+        import_rows(session, [row(f"B-{index}", refs, item_index=index % 2) for index in range(60)])
+
+        assert len(session.statements) == small
+
+    def test_missing_columns_are_rejected(self, session, refs):
+        with pytest.raises(ValueError, match="unit_price"):
+            import_rows(session, [{"order_reference": "L-1", "vendor_id": refs[0]}])
+
+    def test_read_error_keeps_the_report_of_earlier_orders(self, session, refs):
+        def rows():
+            yield row("L-1", refs)
+            yield row("L-2", refs)
+            yield row("L-3", refs)
+            raise csv.Error("line contains NUL")
+
+        result = import_rows(session, rows(), batch_size=1)
+
+        assert (result.orders_imported, result.orders_skipped) == (2, 1)
+        assert "after row 4" in result.read_error
+        assert [(error.row, error.order_reference) for error in result.errors] == [(4, "L-3")]
+        assert session.scalar(select(func.count()).select_from(PurchaseOrderModel)) == 2
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from src.application.use_cases.purchase_order_use_cases import ListPurchaseOrdersUseCase
+from src.domain.entities.purchase_order import PurchaseOrderStatus
+from src.infrastructure.database.models import (
+    PurchaseOrderModel,
+    PurchaseOrderStatus as PurchaseOrderStatusDB,
+    VendorMonthlyRollupModel,
+)
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+
+
+VENDOR_A = uuid4()
+VENDOR_B = uuid4()
+
+
+@pytest.fixture
+def tables():
+    return [PurchaseOrderModel, VendorMonthlyRollupModel]
+
+
+@pytest.fixture
+def orders(session):
+    rows = [
+        (VENDOR_A, PurchaseOrderStatusDB.ORDERED, date(2025, 1, 5)),
+        (VENDOR_A, PurchaseOrderStatusDB.ORDERED, date(2025, 2, 5)),
+        (VENDOR_A, PurchaseOrderStatusDB.ORDERED, date(2025, 2, 5)),
+        (VENDOR_A, PurchaseOrderStatusDB.ORDERED, date(2025, 3, 5)),
+        (VENDOR_A, PurchaseOrderStatusDB.DRAFT, date(2025, 2, 10)),
+        (VENDOR_B, PurchaseOrderStatusDB.ORDERED, date(2025, 2, 10)),
+    ]
+    models = [
+        PurchaseOrderModel(
+            id=uuid4(), order_number=f"PO-{index}", vendor_id=vendor_id, status=status, order_date=order_date
+        )
+        for index, (vendor_id, status, order_date) in enumerate(rows)
+    ]
+    session.add_all(models)
+    session.commit()
+    return models
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestPurchaseOrderListing:
+    def test_filters_are_combined(self, session, orders):
+        page = run(SQLAlchemyPurchaseOrderRepository(session).get_page(
+            vendor_id=VENDOR_A,
+            status=PurchaseOrderStatus.ORDERED,
+            start_date=date(2025, 2, 1),
+        ))
+
+        assert page.total == 3
+        assert [po.order_number for po in page.items][0] == "PO-3"
+        assert {po.order_number for po in page.items} == {"PO-1", "PO-2", "PO-3"}
+
+    def test_cursor_walks_every_row_once_across_equal_dates(self, session, orders):
+        repository = SQLAlchemyPurchaseOrderRepository(session)
+
+        seen = []
+        cursor = None
+        while True:
+            page = run(repository.get_page(page_size=2, cursor=cursor, vendor_id=VENDOR_A, ordering="order_date"))
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert len(seen) == 5
+        assert len({po.id for po in seen}) == 5
+        assert [po.order_date for po in seen] == sorted(po.order_date for po in seen)
+
+        previous = run(repository.get_page(page_size=2, cursor=page.previous_cursor, vendor_id=VENDOR_A,
+                                           ordering="order_date"))
+        assert [po.id for po in previous.items] == [po.id for po in seen[2:4]]
+
+    def test_end_date_before_start_date_is_rejected(self, session):
+        use_case = ListPurchaseOrdersUseCase(SQLAlchemyPurchaseOrderRepository(session))
+
+        with pytest.raises(ValueError):
+            run(use_case.execute(start_date=date(2025, 2, 1), end_date=date(2025, 1, 1)))
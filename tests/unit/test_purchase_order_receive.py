@@ -0,0 +1,149 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.application.use_cases.purchase_order_use_cases import ReceivePurchaseOrderUseCase
+from src.domain.entities.purchase_order import PurchaseOrderStatus
+from src.infrastructure.database.stock_balances import find_stock_balance_mismatches
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LastPurchasePriceModel,
+    LineItemModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    StockBalanceModel,
+    TrackingType,
+    VendorMonthlyRollupModel,
+)
+from src.infrastructure.repositories.purchase_order_line_item_repository_impl import SQLAlchemyPurchaseOrderLineItemRepository
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+
+
+@pytest.fixture
+def tables():
+    return [
+        LineItemModel,
+        InventoryItemStockMovementModel,
+        StockBalanceModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+        InventoryItemMasterModel,
+    ]
+
+
+WAREHOUSE = uuid4()
+
+
+def add_order(session, lines):
+    """Add an ORDERED purchase order with ``(item_id, quantity, serial_number)`` lines."""
+    order = PurchaseOrderModel(
+        id=uuid4(), order_number=f"PUR-{uuid4().hex[:6]}", vendor_id=uuid4(),
+        order_date=date(2025, 7, 1), status="ORDERED",
+    )
+    line_models = [
+        PurchaseOrderLineItemModel(
+            id=uuid4(), purchase_order_id=order.id, inventory_item_master_id=item_id, warehouse_id=WAREHOUSE,
+            quantity=quantity, unit_price=5, serial_number=serial_number, rental_rate=3,
+        )
+        for item_id, quantity, serial_number in lines
+    ]
+    session.add(order)
+    session.add_all(line_models)
+    session.commit()
+    return order.id, [line.id for line in line_models]
+
+
+@pytest.fixture
+def items(session):
+    masters = [
+        InventoryItemMasterModel(
+            id=uuid4(), name=f"Item {index}", sku=f"SKU{index}", item_sub_category_id=uuid4(),
+            unit_of_measurement_id=uuid4(), tracking_type=TrackingType.BULK,
+        )
+        for index in range(2)
+    ]
+    session.add_all(masters)
+    session.add(LineItemModel(id=uuid4(), inventory_item_master_id=masters[0].id, warehouse_id=WAREHOUSE, quantity=7))
+    session.commit()
+    return [master.id for master in masters]
+
+
+def receive(session, order_id, received):
+    use_case = ReceivePurchaseOrderUseCase(
+        SQLAlchemyPurchaseOrderRepository(session), SQLAlchemyPurchaseOrderLineItemRepository(session),
+    )
+    return asyncio.run(use_case.execute(order_id, [
+        {"line_item_id": line_id, "quantity": quantity} for line_id, quantity in received
+    ]))
+
+
+def stock(session, item_id):
+    return session.scalars(select(LineItemModel.quantity).where(LineItemModel.inventory_item_master_id == item_id)).all()
+
+
+class TestReceivePurchaseOrder:
+    def test_books_stock_movements_and_status(self, session, items):
+        order_id, (first, second, third) = add_order(session, [(items[0], 5, None), (items[0], 2, None), (items[1], 4, None)])
+
+        order = receive(session, order_id, [(first, 5), (second, 1), (third, 3)])
+
+        assert order.status == PurchaseOrderStatus.PARTIAL_RECEIVED
+        assert stock(session, items[0]) == [13]
+        assert stock(session, items[1]) == [3]
+        movements = session.scalars(select(InventoryItemStockMovementModel)).all()
+        steps = sorted((m.quantity_on_hand_before, m.quantity_on_hand_after) for m in movements)
+        # Receipts on the same stock row chain their before/after quantities
+        assert steps[0] == (0, 3)
+        assert steps[1][0] == 7 and steps[1][1] == steps[2][0] and steps[2][1] == 13
+        master = session.get(InventoryItemMasterModel, items[1])
+        assert master.line_items_count == 1
+
+        order = receive(session, order_id, [(second, 1), (third, 1)])
+
+        assert order.status == PurchaseOrderStatus.RECEIVED
+        assert session.get(PurchaseOrderModel, order_id).received_date is not None
+        assert session.scalars(select(VendorMonthlyRollupModel.received_order_count)).all() == [1]
+        assert stock(session, items[0]) == [14]
+        assert session.get(PurchaseOrderLineItemModel, third).received_quantity == 4
+        # Receipts bypass the ORM for the stock rows but keep the balances in step
+        assert session.get(StockBalanceModel, (items[0], WAREHOUSE, "AVAILABLE")).quantity == 14
+        assert find_stock_balance_mismatches(session) == []
+
+    def test_over_receiving_rolls_everything_back(self, session, items):
+        order_id, (first, second) = add_order(session, [(items[0], 5, None), (items[1], 1, None)])
+
+        with pytest.raises(ValueError, match="cannot exceed"):
+            receive(session, order_id, [(first, 2), (second, 2)])
+
+        assert stock(session, items[0]) == [7]
+        assert session.scalars(select(InventoryItemStockMovementModel)).all() == []
+        assert session.get(PurchaseOrderLineItemModel, first).received_quantity == 0
+        assert session.get(StockBalanceModel, (items[0], WAREHOUSE, "AVAILABLE")).quantity == 7
+
+    def test_serialised_lines_get_their_own_stock_rows(self, session, items):
+        order_id, lines = add_order(session, [(items[1], 1, "SN-1"), (items[1], 1, "SN-2")])
+
+        receive(session, order_id, [(line_id, 1) for line_id in lines])
+
+        assert stock(session, items[1]) == [1, 1]
+
+    def test_statement_count_does_not_grow_with_lines(self, session, items):
+        small_order, small_lines = add_order(session, [(items[index % 2], 2, None) for index in range(2)])
+        large_order, large_lines = add_order(session, [(items[index % 2], 2, None) for index in range(30)])
+        session.add(LineItemModel(id=uuid4(), inventory_item_master_id=items[1], warehouse_id=WAREHOUSE, quantity=0))
+        session.commit()
+
+        session.statements.clear()
+        receive(session, small_order, [(line_id, 1) for line_id in small_lines])
+        small = len(session.statements)
+
+        session.statements.clear()
+        receive(session, large_order, [(line_id, 1) for line_id in large_lines])
+
+        assert len(session.statements) == small
@@ -0,0 +1,87 @@
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from src.domain.entities.warehouse import Warehouse
+from src.infrastructure.cache.reference_data_cache import ReferenceDataCache
+
+
+@pytest.fixture
+def cache():
+    return ReferenceDataCache(max_entries=3, ttl_seconds=60)
+
+
+class TestReferenceDataCache:
+    def test_get_or_load_caches_and_counts(self, cache):
+        loader = Mock(return_value="Piece")
+
+        assert cache.get_or_load("units", ("id", 1), loader) == "Piece"
+        assert cache.get_or_load("units", ("id", 1), loader) == "Piece"
+
+        loader.assert_called_once()
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["namespaces"]["units"]["size"] == 1
+
+    def test_none_is_not_cached(self, cache):
+        loader = Mock(return_value=None)
+
+        cache.get_or_load("units", ("id", 1), loader)
+        cache.get_or_load("units", ("id", 1), loader)
+
+        assert loader.call_count == 2
+
+    def test_cached_entities_are_copies(self, cache):
+        warehouse = Warehouse(name="Main", label="MAIN", entity_id=uuid4())
+        cache.get_or_load("warehouses", ("id", warehouse.id), lambda: warehouse)
+
+        first = cache.get_or_load("warehouses", ("id", warehouse.id), Mock())
+        first.update_name("Renamed")
+        second = cache.get_or_load("warehouses", ("id", warehouse.id), Mock())
+
+        assert second.name == "Main"
+
+    def test_invalidate_only_drops_its_namespace(self, cache):
+        cache.get_or_load("units", ("id", 1), lambda: "Piece")
+        cache.get_or_load("warehouses", ("id", 1), lambda: "Main")
+
+        cache.invalidate("units")
+
+        reload_unit = Mock(return_value="Piece")
+        keep_warehouse = Mock()
+        cache.get_or_load("units", ("id", 1), reload_unit)
+        cache.get_or_load("warehouses", ("id", 1), keep_warehouse)
+        reload_unit.assert_called_once()
+        keep_warehouse.assert_not_called()
+
+    def test_load_racing_with_write_is_not_stored(self, cache):
+        def load_then_write():
+            cache.invalidate("units")  # a write commits while the row is being read
+            return "stale"
+
+        cache.get_or_load("units", ("id", 1), load_then_write)
+
+        loader = Mock(return_value="fresh")
+        assert cache.get_or_load("units", ("id", 1), loader) == "fresh"
+        loader.assert_called_once()
+
+    def test_lru_eviction(self, cache):
+        for key in range(3):
+            cache.get_or_load("units", key, lambda key=key: key)
+        cache.get_or_load("units", 0, Mock())  # touch 0 so 1 is least recently used
+        cache.get_or_load("units", 3, lambda: 3)
+
+        reload = Mock(return_value=1)
+        cache.get_or_load("units", 1, reload)
+        reload.assert_called_once()
+        assert cache.stats()["namespaces"]["units"]["evictions"] >= 1
+
+    def test_expired_entries_are_reloaded(self):
+        cache = ReferenceDataCache(ttl_seconds=0)
+        loader = Mock(return_value="Piece")
+
+        cache.get_or_load("units", 1, loader)
+        cache.get_or_load("units", 1, loader)
+
+        assert loader.call_count == 2
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.infrastructure.database.models import ItemPackagingModel, UnitOfMeasurementModel, WarehouseModel
+from src.infrastructure.repositories.item_packaging_repository_impl import ItemPackagingRepositoryImpl
+from src.infrastructure.repositories.unit_of_measurement_repository_impl import UnitOfMeasurementRepositoryImpl
+from src.infrastructure.repositories.warehouse_repository_impl import WarehouseRepositoryImpl
+
+
+NOW = datetime(2025, 7, 1, tzinfo=timezone.utc)
+OLD = NOW - timedelta(days=90)
+
+
+@pytest.fixture
+def tables():
+    return [WarehouseModel, ItemPackagingModel, UnitOfMeasurementModel]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestWarehouseStats:
+    def test_counts_in_one_query(self, session):
+        session.add_all([
+            WarehouseModel(name="A", label="A", remarks="dock", created_at=NOW),
+            WarehouseModel(name="B", label="B", remarks="   ", created_at=OLD),
+            WarehouseModel(name="C", label="C", created_at=OLD),
+            WarehouseModel(name="D", label="D", remarks="closed", created_at=NOW, is_active=False),
+        ])
+        session.commit()
+        session.statements.clear()
+
+        stats = run(WarehouseRepositoryImpl(session).get_stats(NOW - timedelta(days=30)))
+
+        assert stats == {"total": 3, "with_remarks": 1, "recent": 1}
+        assert len(session.statements) == 1
+
+
+class TestItemPackagingStats:
+    def test_counts_and_top_units_in_one_query(self, session):
+        rows = [("BOX", "dry", NOW), ("BOX", None, OLD), ("BOX", None, OLD), ("BAG", "x", NOW), ("CAN", None, OLD)]
+        session.add_all([
+            ItemPackagingModel(name=f"P{i}", label=f"P{i}", unit=unit, remarks=remarks, created_at=created_at)
+            for i, (unit, remarks, created_at) in enumerate(rows)
+        ])
+        session.add(ItemPackagingModel(name="Old", label="OLD", unit="CRATE", is_active=False))
+        session.commit()
+        session.statements.clear()
+
+        stats = run(ItemPackagingRepositoryImpl(session).get_stats(NOW - timedelta(days=30), top_units=2))
+
+        assert stats == {
+            "total": 5,
+            "with_remarks": 2,
+            "recent": 2,
+            "unique_units": 3,
+            "top_units": [("BOX", 3), ("BAG", 1)],
+        }
+        assert len(session.statements) == 1
+
+    def test_empty_table(self, session):
+        stats = run(ItemPackagingRepositoryImpl(session).get_stats(NOW))
+
+        assert stats == {"total": 0, "with_remarks": 0, "recent": 0, "unique_units": 0, "top_units": []}
+
+
+class TestUnitOfMeasurementStats:
+    def test_counts_in_one_query(self, session):
+        session.add_all([
+            UnitOfMeasurementModel(name="Piece", abbreviation="PC"),
+            UnitOfMeasurementModel(name="Box", abbreviation="BX"),
+            UnitOfMeasurementModel(name="Gross", abbreviation="GR", is_active=False),
+        ])
+        session.commit()
+        session.statements.clear()
+
+        stats = run(UnitOfMeasurementRepositoryImpl(session).get_stats())
+
+        assert stats == {"total": 3, "active": 2}
+        assert len(session.statements) == 1
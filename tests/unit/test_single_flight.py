@@ -0,0 +1,139 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Query, Request, Response
+
+from src.api.v1.utils.single_flight import SingleFlight, single_flight
+
+
+def make_app(group):
+    app = FastAPI()
+    app.state.calls = []
+
+    @app.get("/stats")
+    @single_flight(group=group)
+    async def stats(response: Response, term: str = Query("all")):
+        app.state.calls.append(term)
+        await asyncio.sleep(0.05)
+        response.headers["ETag"] = f'"{term}-{len(app.state.calls)}"'
+        return {"term": term, "version": len(app.state.calls)}
+
+    @app.get("/sync")
+    @single_flight(group=group)
+    def sync_endpoint():
+        app.state.calls.append("sync")
+        return {"ok": True}
+
+    @app.get("/broken")
+    @single_flight(group=group)
+    async def broken():
+        app.state.calls.append("broken")
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    return app
+
+
+async def fetch_all(app, *urls):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.get(url) for url in urls))
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_requests_share_one_computation(self):
+        app = make_app(SingleFlight())
+
+        responses = asyncio.run(fetch_all(app, *["/stats?term=a"] * 5))
+
+        assert app.state.calls == ["a"]
+        assert {r.json()["version"] for r in responses} == {1}
+        assert {r.headers["etag"] for r in responses} == {'"a-1"'}
+
+    def test_different_parameters_are_not_coalesced(self):
+        app = make_app(SingleFlight())
+
+        asyncio.run(fetch_all(app, "/stats?term=a", "/stats?term=b", "/stats?term=a"))
+
+        assert sorted(app.state.calls) == ["a", "b"]
+
+    def test_credentials_are_part_of_the_key(self):
+        app = make_app(SingleFlight())
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await asyncio.gather(
+                    client.get("/stats", headers={"Authorization": "Bearer one"}),
+                    client.get("/stats", headers={"Authorization": "Bearer two"}),
+                )
+
+        asyncio.run(run())
+
+        assert len(app.state.calls) == 2
+
+    def test_sequential_requests_recompute_without_caching(self):
+        app = make_app(SingleFlight())
+
+        asyncio.run(fetch_all(app, "/stats"))
+        asyncio.run(fetch_all(app, "/stats"))
+
+        assert len(app.state.calls) == 2
+
+    def test_returned_responses_are_not_shared(self):
+        returned = Response(status_code=304, headers={"ETag": '"v1"'})
+
+        @single_flight(group=SingleFlight())
+        async def not_modified():
+            await asyncio.sleep(0.01)
+            return returned
+
+        request = Request({"type": "http", "method": "GET", "path": "/items", "query_string": b"", "headers": []})
+
+        async def run():
+            return await asyncio.gather(*(not_modified(_single_flight_request=request) for _ in range(2)))
+
+        first, second = asyncio.run(run())
+
+        assert first is not second and returned not in (first, second)
+        assert [r.status_code for r in (first, second)] == [304, 304]
+        assert first.headers["etag"] == second.headers["etag"] == '"v1"'
+
+    def test_sync_endpoints_are_supported(self):
+        app = make_app(SingleFlight())
+
+        responses = asyncio.run(fetch_all(app, "/sync", "/sync"))
+
+        assert all(r.json() == {"ok": True} for r in responses)
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        app = make_app(SingleFlight())
+
+        responses = asyncio.run(fetch_all(app, "/broken", "/broken"))
+        asyncio.run(fetch_all(app, "/broken"))
+
+        assert all(r.status_code == 500 for r in responses)
+        assert app.state.calls == ["broken", "broken"]
+
+    def test_cancelled_first_caller_hands_over_to_a_waiter(self):
+        group = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(len(calls))
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def scenario():
+            first = asyncio.ensure_future(group.do("key", compute))
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(group.do("key", compute))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return first, await second
+
+        first, result = asyncio.run(scenario())
+
+        assert first.cancelled()
+        assert result == 2
+        assert calls == [0, 1]
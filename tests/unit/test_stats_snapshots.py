@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.cache import stats_snapshots as stats_snapshots_module
+from src.infrastructure.cache.stats_snapshots import StatsSnapshotService
+from src.infrastructure.database.models import WarehouseModel
+
+
+@pytest.fixture
+def tables():
+    return [WarehouseModel]
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def service(session_factory, monkeypatch):
+    service = StatsSnapshotService(refresh_interval_seconds=3600, session_factory=session_factory)
+    service.calls = 0
+    service.threads = set()
+
+    def count_warehouses(session):
+        service.calls += 1
+        service.threads.add(threading.get_ident())
+        return {"total_warehouses": session.execute(select(func.count(WarehouseModel.id))).scalar_one()}
+
+    service.register("warehouses", count_warehouses, tables=[WarehouseModel.__tablename__])
+    # The commit listeners report to the module-level service
+    monkeypatch.setattr(stats_snapshots_module, "stats_snapshots", service)
+    return service
+
+
+def add_warehouse(session_factory, label, commit=True):
+    session = session_factory()
+    session.add(WarehouseModel(name=label, label=label))
+    if commit:
+        session.commit()
+    else:
+        session.flush()
+        session.rollback()
+    session.close()
+
+
+class TestStatsSnapshotService:
+    def test_serves_snapshot_until_fresh_is_requested(self, service, session_factory):
+        first = asyncio.run(service.get("warehouses"))
+        add_warehouse(session_factory, "A")
+        cached = asyncio.run(service.get("warehouses"))
+        fresh = asyncio.run(service.get("warehouses", fresh=True))
+
+        assert cached is first
+        assert first.data == {"total_warehouses": 0}
+        assert fresh.data == {"total_warehouses": 1}
+        assert fresh.as_response()["computed_at"] == fresh.computed_at
+        assert service.calls == 2
+
+    def test_computes_off_the_event_loop_thread(self, service):
+        asyncio.run(service.get("warehouses"))
+
+        assert threading.get_ident() not in service.threads
+
+    def test_committed_write_marks_snapshot_dirty(self, service, session_factory):
+        asyncio.run(service.get("warehouses"))
+
+        add_warehouse(session_factory, "A")
+        assert service.is_dirty("warehouses")
+
+        asyncio.run(service.refresh_due())
+        assert not service.is_dirty("warehouses")
+        assert asyncio.run(service.get("warehouses")).data == {"total_warehouses": 1}
+
+    def test_bulk_update_marks_snapshot_dirty(self, service, session_factory):
+        add_warehouse(session_factory, "A")
+        asyncio.run(service.refresh_due())
+
+        session = session_factory()
+        session.execute(update(WarehouseModel).values(remarks="bulk"))
+        session.commit()
+        session.close()
+
+        assert service.is_dirty("warehouses")
+
+    def test_rolled_back_write_is_ignored(self, service, session_factory):
+        asyncio.run(service.get("warehouses"))
+
+        add_warehouse(session_factory, "A", commit=False)
+
+        assert not service.is_dirty("warehouses")
+        asyncio.run(service.refresh_due())
+        assert service.calls == 1
+
+    def test_old_snapshots_are_refreshed(self, service):
+        asyncio.run(service.get("warehouses"))
+        service.refresh_interval_seconds = 0
+
+        asyncio.run(service.refresh_due())
+
+        assert service.calls == 2
@@ -0,0 +1,121 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+
+from src.application.use_cases.inventory_item_master_use_cases import GetStockBalancesUseCase
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    StockBalanceModel,
+    TrackingType,
+)
+from src.infrastructure.database.stock_balances import find_stock_balance_mismatches, rebuild_stock_balances
+from src.infrastructure.repositories.stock_balance_repository_impl import SQLAlchemyStockBalanceRepository
+
+
+@pytest.fixture
+def tables():
+    return [
+        InventoryItemMasterModel,
+        LineItemModel,
+        InventoryItemStockMovementModel,
+        StockBalanceModel,
+    ]
+
+
+@pytest.fixture
+def master(session):
+    master = InventoryItemMasterModel(
+        name="drill",
+        sku="DRILL",
+        item_sub_category_id=uuid4(),
+        unit_of_measurement_id=uuid4(),
+        tracking_type=TrackingType.BULK,
+    )
+    session.add(master)
+    session.commit()
+    return master
+
+
+MAIN = uuid4()
+SPARE = uuid4()
+
+
+def balances(session, master_id, warehouse_id=None, status=None):
+    found = asyncio.run(GetStockBalancesUseCase(SQLAlchemyStockBalanceRepository(session)).execute(
+        master_id, warehouse_id, status
+    ))
+    return {(balance.warehouse_id, balance.status): balance.quantity for balance in found}
+
+
+class TestStockBalances:
+    def test_line_item_changes_move_quantities(self, session, master):
+        bulk = LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=10)
+        unit = LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN)
+        session.add_all([bulk, unit])
+        session.commit()
+        assert balances(session, master.id) == {(MAIN, "AVAILABLE"): 11}
+
+        bulk.quantity = 4
+        unit.status = "RENTED"
+        session.commit()
+        assert balances(session, master.id) == {(MAIN, "AVAILABLE"): 4, (MAIN, "RENTED"): 1}
+
+        bulk.warehouse_id = SPARE
+        unit.is_active = False
+        session.commit()
+        assert balances(session, master.id) == {(SPARE, "AVAILABLE"): 4}
+
+        session.delete(bulk)
+        session.commit()
+        assert balances(session, master.id) == {}
+        assert find_stock_balance_mismatches(session) == []
+
+    def test_rollback_discards_pending_changes(self, session, master):
+        session.add(LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=3))
+        session.flush()
+        session.rollback()
+
+        session.add(LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=2))
+        session.commit()
+
+        assert balances(session, master.id) == {(MAIN, "AVAILABLE"): 2}
+
+    def test_consistency_check_and_fix(self, session, master):
+        session.add(LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=3))
+        session.commit()
+        session.execute(update(StockBalanceModel).values(quantity=9))
+        session.commit()
+
+        assert find_stock_balance_mismatches(session) == [((master.id, MAIN, "AVAILABLE"), 9, 3)]
+        assert rebuild_stock_balances(session) == 1
+        assert find_stock_balance_mismatches(session) == []
+        assert balances(session, master.id) == {(MAIN, "AVAILABLE"): 3}
+
+    def test_lookup_reads_only_the_balances(self, session, master):
+        session.add_all([
+            LineItemModel(inventory_item_master_id=master.id, warehouse_id=warehouse_id, quantity=5, status=status)
+            for warehouse_id in (MAIN, SPARE) for status in ("AVAILABLE", "MAINTENANCE")
+        ])
+        session.commit()
+        master_id = master.id
+        session.statements.clear()
+
+        assert balances(session, master_id, MAIN, "available") == {(MAIN, "AVAILABLE"): 5}
+        assert len(session.statements) == 1
+        assert "line_items" not in session.statements[0]
+        with pytest.raises(ValueError, match="Invalid stock status"):
+            balances(session, master_id, status="MISSING")
+
+
+def test_sku_named_stock_is_routed_to_the_sku_lookup():
+    from starlette.routing import Match
+
+    from src.api.v1.endpoints.inventory_item_masters import router
+
+    scope = {"type": "http", "method": "GET", "path": router.prefix + "/by-sku/stock"}
+    matched = next(route for route in router.routes if route.matches(scope)[0] == Match.FULL)
+    assert matched.path == router.prefix + "/by-sku/{sku}"
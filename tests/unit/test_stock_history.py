@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from src.application.use_cases.inventory_item_master_use_cases import GetStockAsOfUseCase
+from src.infrastructure.database.models import (
+    InventoryItemMasterModel,
+    InventoryItemStockMovementModel,
+    LineItemModel,
+    MovementType,
+    StockBalanceModel,
+    StockSnapshotLevelModel,
+    StockSnapshotModel,
+    TrackingType,
+)
+from src.infrastructure.database.stock_history import take_stock_snapshot
+from src.infrastructure.repositories.stock_balance_repository_impl import SQLAlchemyStockBalanceRepository
+
+
+@pytest.fixture
+def tables():
+    return [
+        InventoryItemMasterModel,
+        LineItemModel,
+        InventoryItemStockMovementModel,
+        StockBalanceModel,
+        StockSnapshotModel,
+        StockSnapshotLevelModel,
+    ]
+
+
+MAIN = uuid4()
+SPARE = uuid4()
+JAN_1 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def history(session):
+    """An item with 10 in MAIN at a Jan 1 snapshot, then receipts on Jan 5 (+4, MAIN) and Jan 10 (+3, SPARE)."""
+    master = InventoryItemMasterModel(
+        name="drill", sku="DRILL", item_sub_category_id=uuid4(), unit_of_measurement_id=uuid4(),
+        tracking_type=TrackingType.BULK,
+    )
+    session.add(master)
+    session.flush()
+    main = LineItemModel(inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=14)
+    spare = LineItemModel(inventory_item_master_id=master.id, warehouse_id=SPARE, quantity=3)
+    session.add_all([main, spare])
+    session.flush()
+    session.execute(insert(StockSnapshotModel).values(taken_at=JAN_1))
+    session.execute(insert(StockSnapshotLevelModel).values(
+        taken_at=JAN_1, inventory_item_master_id=master.id, warehouse_id=MAIN, quantity=10,
+    ))
+    for line, before, after, day in ((main, 10, 14, 5), (spare, 0, 3, 10)):
+        session.add(InventoryItemStockMovementModel(
+            inventory_item_id=line.id, movement_type=MovementType.PURCHASE, inventory_transaction_id="PO-1",
+            quantity=after - before, quantity_on_hand_before=before, quantity_on_hand_after=after,
+            warehouse_to_id=line.warehouse_id, created_at=JAN_1 + timedelta(days=day - 1),
+        ))
+    session.commit()
+    return master.id
+
+
+def levels_as_of(session, as_of, **filters):
+    stock = asyncio.run(GetStockAsOfUseCase(SQLAlchemyStockBalanceRepository(session)).execute(as_of, **filters))
+    levels = {(level.inventory_item_master_id, level.warehouse_id): level.quantity for level in stock.levels}
+    return stock.snapshot_taken_at, levels
+
+
+class TestStockHistory:
+    def test_snapshot_plus_replayed_movements(self, session, history):
+        assert levels_as_of(session, datetime(2025, 1, 1)) == (JAN_1, {(history, MAIN): 10})
+        assert levels_as_of(session, datetime(2025, 1, 7)) == (JAN_1, {(history, MAIN): 14})
+        assert levels_as_of(session, datetime(2025, 1, 12)) == (
+            JAN_1, {(history, MAIN): 14, (history, SPARE): 3},
+        )
+        assert levels_as_of(session, datetime(2025, 1, 12), warehouse_id=SPARE) == (JAN_1, {(history, SPARE): 3})
+        # Before the first snapshot only the movements are known
+        assert levels_as_of(session, datetime(2024, 12, 31)) == (None, {})
+
+    def test_rolled_forward_snapshot_bounds_the_replay(self, session, history):
+        before = levels_as_of(session, datetime(2025, 2, 3))
+
+        assert take_stock_snapshot(session, datetime(2025, 2, 1)) == (datetime(2025, 2, 1, tzinfo=timezone.utc), 2)
+        assert take_stock_snapshot(session, datetime(2025, 1, 20)) is None
+        session.statements.clear()
+        snapshot_at, levels = levels_as_of(session, datetime(2025, 2, 3))
+
+        assert (snapshot_at, levels) == (datetime(2025, 2, 1, tzinfo=timezone.utc), before[1])
+        # Movements before the snapshot are excluded by the created_at index range
+        assert "inventory_item_stock_movements.created_at >" in session.statements[-1]
+
+    def test_first_snapshot_is_seeded_from_the_balances(self, session):
+        session.add(LineItemModel(inventory_item_master_id=uuid4(), warehouse_id=MAIN, quantity=6))
+        session.commit()
+
+        taken_at, count = take_stock_snapshot(session, safety_lag_seconds=600)
+
+        assert count == 1
+        assert abs(datetime.now(timezone.utc) - timedelta(seconds=600) - taken_at) < timedelta(minutes=1)
+        assert take_stock_snapshot(session, safety_lag_seconds=600) is None
+
+    def test_movements_committing_after_the_snapshot_are_not_lost(self, session):
+        line = LineItemModel(inventory_item_master_id=uuid4(), warehouse_id=MAIN, quantity=6)
+        session.add(line)
+        session.commit()
+
+        def receive(quantity, started_seconds_ago):
+            before = line.quantity
+            line.quantity = before + quantity
+            session.add(InventoryItemStockMovementModel(
+                inventory_item_id=line.id, movement_type=MovementType.PURCHASE, inventory_transaction_id="PO-1",
+                quantity=quantity, quantity_on_hand_before=before, quantity_on_hand_after=line.quantity,
+                warehouse_to_id=MAIN,
+                created_at=datetime.now(timezone.utc) - timedelta(seconds=started_seconds_ago),
+            ))
+            session.commit()
+
+        receive(2, started_seconds_ago=2)
+        taken_at, _ = take_stock_snapshot(session, safety_lag_seconds=60)
+        # Started before the snapshot was taken, committed after it
+        receive(4, started_seconds_ago=1)
+
+        snapshot_at, levels = levels_as_of(session, datetime.now(timezone.utc))
+        assert snapshot_at == taken_at
+        assert levels == {(line.inventory_item_master_id, MAIN): 12}
+        with pytest.raises(ValueError, match="at least 60 seconds old"):
+            take_stock_snapshot(session, datetime.now(timezone.utc), safety_lag_seconds=60)
+
+    def test_future_as_of_is_rejected(self, session):
+        with pytest.raises(ValueError, match="future"):
+            levels_as_of(session, datetime.now(timezone.utc) + timedelta(days=1))
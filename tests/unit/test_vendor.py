@@ -263,4 +263,39 @@ class TestVendorService:
         result = await service.get_vendors_by_city(city)
         
         assert result == [sample_vendor]
-        mock_repository.find_by_city.assert_called_once_with(city, None)
\ No newline at end of file
+        mock_repository.find_by_city.assert_called_once_with(city, None)
+    @pytest.mark.asyncio
+    async def test_get_contact_numbers_for_vendors_service(self, mock_vendor_repository, mock_contact_repository):
+        """Test loading contact numbers for a page of vendors at once"""
+        vendor_ids = [uuid4(), uuid4()]
+        mock_contact_repository.find_by_entities.return_value = {vendor_id: [] for vendor_id in vendor_ids}
+        
+        service = VendorService(mock_vendor_repository, mock_contact_repository)
+        result = await service.get_contact_numbers_for_vendors(vendor_ids)
+        
+        assert result == {vendor_id: [] for vendor_id in vendor_ids}
+        mock_contact_repository.find_by_entities.assert_called_once_with("Vendor", vendor_ids)
+
+    @pytest.mark.asyncio
+    async def test_vendor_contact_numbers_without_repository(self, mock_vendor_repository):
+        """Test that a service without a contact repository reports no contact numbers"""
+        vendor_id = uuid4()
+        service = VendorService(mock_vendor_repository)
+        
+        assert await service.get_vendor_contact_numbers(vendor_id) == []
+        assert await service.get_contact_numbers_for_vendors([vendor_id]) == {vendor_id: []}
+
+    @pytest.mark.asyncio
+    async def test_update_vendor_replaces_contact_numbers(self, sample_vendor, mock_vendor_repository, mock_contact_repository):
+        """Test updating a vendor replaces its contact numbers in one repository call"""
+        vendor_id = uuid4()
+        mock_vendor_repository.find_by_id.return_value = sample_vendor
+        mock_vendor_repository.update.return_value = sample_vendor
+        mock_contact_repository.replace_for_entity.return_value = []
+        
+        service = VendorService(mock_vendor_repository, mock_contact_repository)
+        await service.update_vendor(vendor_id, name="Renamed", contact_numbers=["+1111111111", "bad"])
+        
+        args = mock_contact_repository.replace_for_entity.call_args.args
+        assert args[:2] == ("Vendor", vendor_id)
+        assert [phone.number for phone in args[2]] == ["+1111111111"]
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.application.use_cases.purchase_order_use_cases import (
+    CancelPurchaseOrderUseCase,
+    GetVendorMonthlyRollupsUseCase,
+)
+from src.domain.entities.purchase_order import PurchaseOrder
+from src.infrastructure.database.models import (
+    LastPurchasePriceModel,
+    PurchaseOrderLineItemModel,
+    PurchaseOrderModel,
+    PurchaseOrderStatus,
+    VendorModel,
+    VendorMonthlyRollupModel,
+)
+from src.infrastructure.database.vendor_rollups import rebuild_vendor_rollups
+from src.infrastructure.repositories.purchase_order_repository_impl import SQLAlchemyPurchaseOrderRepository
+from src.infrastructure.repositories.vendor_rollup_repository_impl import SQLAlchemyVendorRollupRepository
+
+
+VENDOR_A = uuid4()
+VENDOR_B = uuid4()
+JULY = date(2025, 7, 1)
+
+
+@pytest.fixture
+def tables():
+    return [
+        VendorModel,
+        PurchaseOrderModel,
+        PurchaseOrderLineItemModel,
+        VendorMonthlyRollupModel,
+        LastPurchasePriceModel,
+    ]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def create(session, number, vendor_id, order_date, grand_total, expected=None):
+    order = PurchaseOrder(
+        order_number=number,
+        vendor_id=vendor_id,
+        order_date=order_date,
+        expected_delivery_date=expected,
+        total_amount=Decimal(grand_total),
+        grand_total=Decimal(grand_total),
+        total_tax_amount=Decimal("1.00"),
+    )
+    return run(SQLAlchemyPurchaseOrderRepository(session).save(order))
+
+
+def rollups(session):
+    rows = session.execute(select(VendorMonthlyRollupModel).where(VendorMonthlyRollupModel.order_count > 0))
+    return {
+        (row.vendor_id, row.month): (row.order_count, row.cancelled_order_count, Decimal(str(row.spend)),
+                                     row.received_order_count, row.total_delivery_delay_days)
+        for row in rows.scalars()
+    }
+
+
+class TestVendorRollups:
+    def test_create_cancel_and_edit_adjust_rollups(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 7, 3), "100.00")
+        cancelled = create(session, "PO-2", VENDOR_A, date(2025, 7, 20), "40.00")
+        moved = create(session, "PO-3", VENDOR_A, date(2025, 7, 9), "25.00")
+
+        run(CancelPurchaseOrderUseCase(SQLAlchemyPurchaseOrderRepository(session)).execute(cancelled.id))
+        moved._vendor_id = VENDOR_B
+        moved.update_dates(date(2025, 8, 2), None)
+        run(SQLAlchemyPurchaseOrderRepository(session).update(moved))
+
+        assert rollups(session) == {
+            (VENDOR_A, JULY): (2, 1, Decimal("100.00"), 0, 0),
+            (VENDOR_B, date(2025, 8, 1)): (1, 0, Decimal("25.00"), 0, 0),
+        }
+
+    def test_received_orders_record_delivery_lag(self, session):
+        early = create(session, "PO-1", VENDOR_A, date(2025, 7, 1), "10.00", expected=date(2025, 7, 10))
+        late = create(session, "PO-2", VENDOR_A, date(2025, 7, 2), "10.00", expected=date(2025, 7, 10))
+        for order_id, received in ((early.id, date(2025, 7, 8)), (late.id, date(2025, 7, 15))):
+            model = session.get(PurchaseOrderModel, order_id)
+            model.status = PurchaseOrderStatus.RECEIVED.value
+            model.received_date = received
+        session.commit()
+
+        report = run(GetVendorMonthlyRollupsUseCase(SQLAlchemyVendorRollupRepository(session)).execute(VENDOR_A))
+
+        assert len(report) == 1
+        assert report[0].received_order_count == 2
+        assert report[0].average_delivery_delay_days == 1.5
+
+    def test_rollback_discards_deltas_and_rebuild_matches(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 7, 3), "100.00")
+        session.add(PurchaseOrderModel(order_number="PO-X", vendor_id=VENDOR_A, order_date=date(2025, 7, 4),
+                                       grand_total=50))
+        session.flush()
+        session.rollback()
+        incremental = rollups(session)
+
+        rebuild_vendor_rollups(session)
+
+        assert incremental == rollups(session) == {(VENDOR_A, JULY): (1, 0, Decimal("100.00"), 0, 0)}
+
+    def test_report_reads_only_the_rollups(self, session):
+        create(session, "PO-1", VENDOR_A, date(2025, 6, 30), "10.00")
+        create(session, "PO-2", VENDOR_B, date(2025, 7, 1), "10.00")
+        session.statements.clear()
+
+        report = run(SQLAlchemyVendorRollupRepository(session).find_monthly(start_month=date(2025, 7, 15)))
+
+        assert [(row.vendor_id, row.month) for row in report] == [(VENDOR_B, JULY)]
+        assert len(session.statements) == 1
+        assert "purchase_orders" not in session.statements[0]